@@ -0,0 +1,237 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from fastapi import WebSocket
+
+# Kapanış kodları (RFC 6455 özel aralığı ve standart kodlar)
+CLOSE_REPLACED = 4000       # aynı client_id ile yeni bağlantı açıldı
+CLOSE_SLOW_CONSUMER = 1013  # "try again later": gönderim kuyruğu doldu veya gönderim takıldı
+CLOSE_IDLE = 1001           # "going away": boşta kalma süresi aşıldı
+
+
+class _Connection:
+    """Tek bir istemci: sınırlı gönderim kuyruğu ve onu boşaltan yazıcı görev"""
+
+    def __init__(self, client_id: str, websocket: WebSocket, queue_size: int):
+        self.client_id = client_id
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.writer: Optional[asyncio.Task] = None
+        self.last_seen = time.monotonic()
+        self.sent = 0
+
+
+class RedisBackplane:
+    """Birden çok işçi süreci arasında WebSocket mesajları için Redis pub/sub kanalı.
+
+    Her işçi kendi bağlantılarını tutar; yerelde olmayan istemciye giden mesajlar ve
+    yayınlar kanala yazılır, diğer işçiler kendi yerel istemcilerine iletir.
+    """
+
+    def __init__(self, url: str, channel: str = "ws:messages"):
+        self.url = url
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, deliver) -> bool:
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            print("redis paketi bulunamadı; WebSocket backplane devre dışı (pip install redis).")
+            return False
+        try:
+            self._redis = redis.from_url(self.url)
+            pubsub = self._redis.pubsub()
+            await pubsub.subscribe(self.channel)
+        except Exception as e:
+            print(f"Redis backplane bağlanamadı ({self.url}): {e}")
+            self._redis = None
+            return False
+        self._listener = asyncio.create_task(self._listen(pubsub, deliver))
+        return True
+
+    async def _listen(self, pubsub, deliver):
+        try:
+            async for item in pubsub.listen():
+                if item.get("type") != "message":
+                    continue
+                # Bozuk tek bir mesaj dinleyiciyi düşürmesin
+                try:
+                    envelope = json.loads(item["data"])
+                    if envelope["origin"] != self.origin:
+                        deliver(envelope.get("target"), envelope["message"])
+                except (ValueError, KeyError, TypeError) as e:
+                    print(f"Redis backplane geçersiz mesajı atladı: {e!r}")
+        finally:
+            await pubsub.close()
+
+    async def publish(self, target: Optional[str], message: str):
+        if self._redis is None:
+            return
+        envelope = json.dumps({"origin": self.origin, "target": target, "message": message})
+        await self._redis.publish(self.channel, envelope)
+
+    @property
+    def connected(self) -> bool:
+        return self._redis is not None
+
+    async def aclose(self):
+        if self._listener:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+
+class ConnectionManager:
+    """client_id ile anahtarlanmış WebSocket kayıt defteri.
+
+    Gönderimler bağlantının sınırlı kuyruğuna bırakılır ve her bağlantının yazıcı görevi
+    bağımsız gönderir; bu yüzden yayın yavaş bir istemciyi beklemez. Kuyruğu dolan veya
+    gönderimi `send_timeout` içinde bitmeyen istemci çıkarılır. Kalp atışı görevi
+    periyodik ping gönderir ve `idle_timeout` boyunca mesaj göndermeyen istemcileri kapatır.
+    """
+
+    def __init__(self, queue_size: int = 100, send_timeout: float = 5.0, heartbeat_interval: float = 20.0,
+                 idle_timeout: float = 300.0, backplane: Optional[RedisBackplane] = None):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.idle_timeout = idle_timeout
+        self.backplane = backplane
+        self._connections: Dict[str, _Connection] = {}
+        self._heartbeat: Optional[asyncio.Task] = None
+        self.counters = {"connected": 0, "evicted_slow": 0, "closed_idle": 0, "replaced": 0}
+
+    @property
+    def active_connections(self) -> Dict[str, _Connection]:
+        return self._connections
+
+    async def start(self):
+        """Uygulama açılışında: backplane aboneliği"""
+        if self.backplane and not self.backplane.connected:
+            await self.backplane.start(self._deliver_local)
+
+    async def connect(self, websocket: WebSocket, client_id: str):
+        await websocket.accept()
+        previous = self._connections.get(client_id)
+        if previous is not None:
+            self.counters["replaced"] += 1
+            await self._close(previous, CLOSE_REPLACED, "Replaced by a new connection")
+        connection = _Connection(client_id, websocket, self.queue_size)
+        connection.writer = asyncio.create_task(self._writer(connection))
+        self._connections[client_id] = connection
+        self.counters["connected"] += 1
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+
+    def disconnect(self, client_id: str, websocket: Optional[WebSocket] = None):
+        connection = self._connections.get(client_id)
+        # Yerine yeni bağlantı açıldıysa eski soketin kapanışı yenisini silmez
+        if connection is None or (websocket is not None and connection.websocket is not websocket):
+            return
+        del self._connections[client_id]
+        if connection.writer and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
+
+    def touch(self, client_id: str):
+        """İstemciden mesaj geldi: boşta kalma sayacını sıfırla"""
+        connection = self._connections.get(client_id)
+        if connection is not None:
+            connection.last_seen = time.monotonic()
+
+    async def send(self, client_id: str, message: str) -> bool:
+        """Mesajı istemcinin kuyruğuna bırak; istemci başka işçideyse backplane üzerinden ilet"""
+        if client_id in self._connections:
+            return self._enqueue(client_id, message)
+        if self.backplane:
+            await self.backplane.publish(client_id, message)
+            return True
+        return False
+
+    async def broadcast(self, message: str):
+        """Tüm yerel istemcilerin kuyruklarına bırak (beklemeden) ve diğer işçilere yayınla"""
+        self._deliver_local(None, message)
+        if self.backplane:
+            await self.backplane.publish(None, message)
+
+    def _deliver_local(self, target: Optional[str], message: str):
+        if target is not None:
+            self._enqueue(target, message)
+            return
+        for client_id in list(self._connections):
+            self._enqueue(client_id, message)
+
+    def _enqueue(self, client_id: str, message: str) -> bool:
+        connection = self._connections.get(client_id)
+        if connection is None:
+            return False
+        try:
+            connection.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self._evict_slow(connection)
+            return False
+
+    def _evict_slow(self, connection: _Connection):
+        self.counters["evicted_slow"] += 1
+        self.disconnect(connection.client_id, connection.websocket)
+        asyncio.create_task(self._close(connection, CLOSE_SLOW_CONSUMER, "Slow consumer"))
+
+    async def _writer(self, connection: _Connection):
+        while True:
+            message = await connection.queue.get()
+            try:
+                await asyncio.wait_for(connection.websocket.send_text(message), self.send_timeout)
+            except asyncio.TimeoutError:
+                self._evict_slow(connection)
+                return
+            except Exception:
+                # Soket kapanmış: okuyucu taraf WebSocketDisconnect ile temizler
+                self.disconnect(connection.client_id, connection.websocket)
+                return
+            connection.sent += 1
+
+    async def _close(self, connection: _Connection, code: int, reason: str):
+        if connection.writer and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
+        try:
+            await asyncio.wait_for(connection.websocket.close(code=code, reason=reason), self.send_timeout)
+        except Exception:
+            pass
+
+    async def _heartbeat_loop(self):
+        ping = json.dumps({"type": "ping"})
+        while self._connections:
+            await asyncio.sleep(self.heartbeat_interval)
+            now = time.monotonic()
+            for connection in list(self._connections.values()):
+                if now - connection.last_seen > self.idle_timeout:
+                    self.counters["closed_idle"] += 1
+                    self.disconnect(connection.client_id, connection.websocket)
+                    await self._close(connection, CLOSE_IDLE, "Idle timeout")
+                else:
+                    self._enqueue(connection.client_id, ping)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "active": len(self._connections),
+            "queued": sum(c.queue.qsize() for c in self._connections.values()),
+            "backplane": self.backplane.connected if self.backplane else None,
+        }
+
+    async def aclose(self):
+        if self._heartbeat:
+            self._heartbeat.cancel()
+        for connection in list(self._connections.values()):
+            self.disconnect(connection.client_id)
+            await self._close(connection, 1001, "Server shutting down")
+        if self.backplane:
+            await self.backplane.aclose()
@@ -1,246 +1,855 @@
-from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse
-from pydantic import BaseModel
-from typing import List, Dict, Optional
-import json
-import asyncio
-import uvicorn
-import os
-from datetime import datetime
-
-# Import our enhanced modules
-from utils.code_analyzer import CodeAnalyzer
-from utils.refactor import CodeRefactor
-from utils.ai_chatbot import AIChatbot
-from utils.code2flow import Code2FlowGenerator
-from utils.demo_runner import DemoRunner
-from app.config import settings
-
-app = FastAPI(title="AI-Powered Code Review & Refactoring Assistant")
-
-# Static files and templates
-app.mount("/static", StaticFiles(directory="static"), name="static")
-templates = Jinja2Templates(directory="templates")
-
-# Initialize services
-code_analyzer = CodeAnalyzer()
-code_refactor = CodeRefactor()
-ai_chatbot = AIChatbot()
-code2flow_generator = Code2FlowGenerator()
-demo_runner = DemoRunner()
-
-# Pydantic models
-class CodeRequest(BaseModel):
-    code: str
-    language: str
-    file_name: Optional[str] = None
-
-class ChatMessage(BaseModel):
-    message: str
-    conversation_id: Optional[str] = None
-
-class RefactorRequest(BaseModel):
-    code: str
-    language: str
-    refactor_type: str = "general"  # general, performance, security, readability
-
-class DemoRequest(BaseModel):
-    code: str
-    language: str
-    input_data: Optional[str] = None
-
-# WebSocket connection manager
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
-
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
-
-manager = ConnectionManager()
-
-@app.get("/", response_class=HTMLResponse)
-async def read_root(request: Request):
-    """Ana sayfa"""
-    return templates.TemplateResponse("index.html", {"request": request})
-
-@app.post("/api/analyze")
-async def analyze_code_endpoint(request: CodeRequest):
-    """Gelişmiş kod analizi"""
-    try:
-        # Kod analizi
-        analysis_result = await code_analyzer.analyze_comprehensive(
-            request.code, 
-            request.language,
-            request.file_name
-        )
-        
-        # Code2Flow diyagramı oluştur
-        flowchart_data = await code2flow_generator.generate_flow(
-            request.code, 
-            request.language
-        )
-        
-        return {
-            "status": "success",
-            "analysis": analysis_result,
-            "flowchart": flowchart_data,
-            "timestamp": datetime.now().isoformat()
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.post("/api/refactor")
-async def refactor_code_endpoint(request: RefactorRequest):
-    """AI destekli kod refaktörü"""
-    try:
-        refactored_result = await code_refactor.refactor_with_ai(
-            request.code,
-            request.language,
-            request.refactor_type
-        )
-        
-        return {
-            "status": "success",
-            "original_code": request.code,
-            "refactored_code": refactored_result["code"],
-            "improvements": refactored_result["improvements"],
-            "performance_gain": refactored_result.get("performance_estimation"),
-            "timestamp": datetime.now().isoformat()
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.post("/api/chat")
-async def chat_with_ai(message: ChatMessage):
-    """AI Chatbot ile etkileşim (Function Calling destekli)"""
-    try:
-        response = await ai_chatbot.process_message(
-            message.message,
-            message.conversation_id
-        )
-        
-        return {
-            "status": "success",
-            "response": response["message"],
-            "function_calls": response.get("function_calls", []),
-            "conversation_id": response["conversation_id"],
-            "suggestions": response.get("suggestions", [])
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.post("/api/demo/run")
-async def run_demo(request: DemoRequest):
-    """Canlı kod demo çalıştırıcı"""
-    try:
-        demo_result = await demo_runner.execute_code(
-            request.code,
-            request.language,
-            request.input_data
-        )
-        
-        return {
-            "status": "success",
-            "output": demo_result["output"],
-            "execution_time": demo_result["execution_time"],
-            "memory_usage": demo_result.get("memory_usage"),
-            "errors": demo_result.get("errors", []),
-            "timestamp": datetime.now().isoformat()
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/api/code2flow/{session_id}")
-async def get_flowchart(session_id: str):
-    """Code2Flow diyagramını al"""
-    try:
-        flowchart_path = f"static/flowcharts/{session_id}.png"
-        if os.path.exists(flowchart_path):
-            return {"status": "success", "flowchart_url": f"/static/flowcharts/{session_id}.png"}
-        else:
-            return {"status": "error", "message": "Flowchart not found"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.websocket("/ws/chat/{client_id}")
-async def websocket_endpoint(websocket: WebSocket, client_id: str):
-    """Real-time chat WebSocket"""
-    await manager.connect(websocket)
-    try:
-        while True:
-            data = await websocket.receive_text()
-            message_data = json.loads(data)
-            
-            # AI ile işle
-            response = await ai_chatbot.process_message(
-                message_data["message"],
-                client_id
-            )
-            
-            # Yanıtı gönder
-            await manager.send_personal_message(
-                json.dumps({
-                    "type": "ai_response",
-                    "message": response["message"],
-                    "function_calls": response.get("function_calls", []),
-                    "timestamp": datetime.now().isoformat()
-                }),
-                websocket
-            )
-            
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
-
-@app.get("/api/health")
-async def health_check():
-    """Sistem durumu kontrolü"""
-    return {
-        "status": "healthy",
-        "services": {
-            "code_analyzer": "active",
-            "ai_chatbot": "active",
-            "code2flow": "active",
-            "demo_runner": "active"
-        },
-        "timestamp": datetime.now().isoformat()
-    }
-
-@app.get("/api/languages")
-async def get_supported_languages():
-    """Desteklenen programlama dilleri"""
-    return {
-        "languages": [
-            {"code": "python", "name": "Python", "demo_support": True},
-            {"code": "javascript", "name": "JavaScript", "demo_support": True},
-            {"code": "java", "name": "Java", "demo_support": False},
-            {"code": "cpp", "name": "C++", "demo_support": False},
-            {"code": "csharp", "name": "C#", "demo_support": False},
-            {"code": "go", "name": "Go", "demo_support": True},
-            {"code": "rust", "name": "Rust", "demo_support": False}
-        ]
-    }
-@app.post("/api/flowchart")
-async def generate_flowchart_endpoint(request: CodeRequest):
-    try:
-        from utils.code2flow import Code2FlowGenerator
-        generator = Code2FlowGenerator()
-        result = await generator.generate_flow(request.code, request.language, "flowchart")
-        return {"status": "success", **result}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-if __name__ == "__main__":
+import time
+
+# Başlangıç süresini ölçmek için (import + lifespan)
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, JSONResponse
+from pydantic import BaseModel
+from typing import List, Dict, Optional
+from contextlib import asynccontextmanager
+import asyncio
+import os
+import uuid
+from datetime import datetime
+
+# Servisler app.services içinde ilk kullanımda yüklenir
+from utils.input_limits import InputLimits, InputTooLarge, METRICS_ONLY
+from utils.singleflight import SingleFlight, content_hash
+from app.config import settings
+from app.middleware import BodySizeLimitMiddleware, CompressionMiddleware
+from app.responses import FastJSONResponse
+from utils import fast_json
+from app.services import ServiceContainer
+from app.connections import ConnectionManager, RedisBackplane
+from utils.llm_scheduler import TokenBucket
+
+services = ServiceContainer()
+startup_stats: Dict[str, float] = {}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Servis yaşam döngüsü: açılışta ölç, kapanışta havuz/istemcileri kapat"""
+    startup_stats["import_seconds"] = _import_ready - _import_started
+    startup_stats["startup_seconds"] = time.perf_counter() - _import_started
+    app.state.services = services
+    await manager.start()
+    yield
+    await manager.aclose()
+    await services.aclose()
+
+app = FastAPI(
+    title="AI-Powered Code Review & Refactoring Assistant",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
+)
+app.add_middleware(BodySizeLimitMiddleware, max_bytes=settings.MAX_REQUEST_BYTES)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_BYTES)
+
+# Static files and templates
+app.mount("/static", StaticFiles(directory="static"), name="static")
+templates = Jinja2Templates(directory="templates")
+
+input_limits = InputLimits(
+    soft_lines=settings.SOFT_CODE_LINES,
+    max_lines=settings.MAX_CODE_LINES,
+    soft_ast_nodes=settings.SOFT_AST_NODES,
+    max_ast_nodes=settings.MAX_AST_NODES
+)
+analysis_flight = SingleFlight()
+
+def without_structure(flow: Dict) -> Dict:
+    """Paylaşılan sonucu bozmadan 'structure' alanını çıkar"""
+    return {key: value for key, value in flow.items() if key != "structure"}
+
+def check_input_size(check, *args):
+    """Limit kontrolünü çalıştır, aşımda 413 döndür"""
+    try:
+        return check(*args)
+    except InputTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+# Pydantic models
+class CodeRequest(BaseModel):
+    code: str
+    language: str
+    file_name: Optional[str] = None
+    include_structure: bool = True  # False: ham parse yapısı yanıta eklenmez
+    # Diyagramda çağrılar bu projenin sembol dizininden tam adlarıyla gösterilir (file_name = proje içi yol)
+    project_id: Optional[str] = None
+
+class ChatMessage(BaseModel):
+    message: str
+    conversation_id: Optional[str] = None
+    # False: bu konuşmada anlamsal önbellek kullanılmaz (ayar konuşma boyunca geçerli)
+    semantic_cache: Optional[bool] = None
+    # Proje dizininden ilgili kod parçaları bağlam olarak eklenir (konuşma boyunca geçerli)
+    project_id: Optional[str] = None
+
+class ProjectFile(BaseModel):
+    path: str
+    content: str
+
+class ProjectFilesRequest(BaseModel):
+    files: List[ProjectFile]
+    replace: bool = False  # True: projedeki mevcut dosyalar önce silinir
+
+class JobRequest(BaseModel):
+    kind: str = "analyze"  # analyze, flowchart
+    code: str
+    language: str
+    file_name: Optional[str] = None
+    style: str = "flowchart"  # flowchart işleri için diyagram stili
+
+class DiffAnalysisRequest(BaseModel):
+    diff: str  # tek dosyalık unified diff
+    language: str = "python"
+    base_code: Optional[str] = None
+    base_hash: Optional[str] = None  # daha önce gönderilmiş tabanın SHA-256 özeti
+    file_name: Optional[str] = None
+    include_head: bool = False  # True: diff uygulanmış dosya yanıta eklenir
+
+class RefactorRequest(BaseModel):
+    code: str
+    language: str
+    refactor_type: str = "general"  # general, performance, security, readability
+    include_source: bool = True  # False: original_code geri gönderilmez
+    measure_performance: bool = False  # True: orijinal ve yeni kod sandbox'ta ölçülür
+    input_data: Optional[str] = None  # Ölçüm sırasında stdin
+
+class DemoRequest(BaseModel):
+    code: str
+    language: str
+    input_data: Optional[str] = None
+    profile: bool = False  # cProfile tablosu + collapsed-stack verisi
+    line_profile: bool = False  # En sıcak fonksiyon için satır bazında süreler
+    memory: bool = False  # tracemalloc: tepe bellek ve ayırma yerleri (memory_usage)
+    use_cache: bool = True  # False: deterministik kod için de sonucu önbellekten verme
+
+class DemoCase(BaseModel):
+    input: Optional[str] = None
+    expected_output: Optional[str] = None  # Verilmezse yalnızca çalıştırılır
+
+class DemoBatchRequest(BaseModel):
+    code: str
+    language: str
+    cases: List[DemoCase]
+    concurrency: Optional[int] = None
+    compare: str = "normalized"  # normalized, exact
+
+class ComplexityRequest(BaseModel):
+    code: str
+    function_name: str
+    language: str = "python"
+    # {"kind": "int" | "list" | "sorted_list" | "str" | "dict" | "generator",
+    #  "generator": "make_input", "start": 16, "factor": 2, "max_size": 1048576, "mutates": False}
+    input_spec: Dict = {}
+
+# WebSocket connection manager (çok işçili kurulumda Redis backplane ile)
+manager = ConnectionManager(
+    queue_size=settings.WS_SEND_QUEUE_SIZE,
+    send_timeout=settings.WS_SEND_TIMEOUT,
+    heartbeat_interval=settings.WS_HEARTBEAT_INTERVAL,
+    idle_timeout=settings.WS_IDLE_TIMEOUT,
+    backplane=RedisBackplane(settings.REDIS_URL) if settings.WS_REDIS_BACKPLANE else None,
+)
+
+@app.get("/", response_class=HTMLResponse)
+async def read_root(request: Request):
+    """Ana sayfa"""
+    return templates.TemplateResponse("index.html", {"request": request})
+
+async def run_analysis_pipeline(code: str, language: str, file_name: Optional[str]):
+    """Limit kontrolü + analiz + diyagram (aynı istekler arasında paylaşılır)"""
+    # AST sayımı thread'de: bu sırada gelen aynı istekler işe katılabilir
+    mode = await asyncio.to_thread(input_limits.check, code, language)
+    
+    # Kod analizi
+    analysis_result = await services.code_analyzer.analyze_comprehensive(code, language, file_name, mode)
+    
+    # Code2Flow diyagramı oluştur (metrics only modunda atlanır)
+    flowchart_data = None
+    if mode != METRICS_ONLY:
+        flowchart_data = await services.code2flow_generator.generate_flow(code, language)
+    
+    return mode, analysis_result, flowchart_data
+
+@app.post("/api/analyze")
+async def analyze_code_endpoint(request: CodeRequest):
+    """Gelişmiş kod analizi"""
+    key = content_hash("analyze", request.language, request.file_name, request.code)
+    try:
+        # Aynı içerikli eşzamanlı istekler tek hesaplamayı bekler
+        mode, analysis_result, flowchart_data = await analysis_flight.do(
+            key,
+            lambda: run_analysis_pipeline(request.code, request.language, request.file_name)
+        )
+        
+        if flowchart_data and not request.include_structure:
+            flowchart_data = without_structure(flowchart_data)
+        
+        # Sonuç zaten JSON uyumlu: jsonable_encoder adımını atla
+        return FastJSONResponse({
+            "status": "success",
+            "analysis_mode": mode,
+            "analysis": analysis_result,
+            "flowchart": flowchart_data,
+            "timestamp": datetime.now().isoformat()
+        })
+    except InputTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/analyze/diff")
+async def analyze_diff_endpoint(request: DiffAnalysisRequest):
+    """Diff-aware analysis: only the functions touched by the diff are analyzed"""
+    from utils.diff_analysis import DiffAnalyzer, DiffError, source_hash
+
+    bases = services.diff_bases
+    base = request.base_code
+    if base is None:
+        if not request.base_hash:
+            raise HTTPException(status_code=400, detail="Either base_code or base_hash is required")
+        base = bases.get(request.base_hash)
+        if base is None:
+            # Önbellekte yok (süresi dolmuş/başka işçi): istemci tabanı tam gönderir
+            raise HTTPException(status_code=404, detail=f"Unknown base_hash {request.base_hash}; send base_code")
+    check_input_size(input_limits.check_lines, base)
+    try:
+        result = await DiffAnalyzer(services.code_analyzer).analyze(base, request.diff, request.language)
+    except DiffError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    head = result.pop("head")
+    check_input_size(input_limits.check_lines, head)
+
+    # Sonraki diff'ler bu sürümlere özetle başvurabilir
+    base_hash, head_hash = source_hash(base), source_hash(head)
+    bases.set(base_hash, base)
+    bases.set(head_hash, head)
+    return FastJSONResponse({
+        "status": "success",
+        "file_name": request.file_name,
+        "base_hash": base_hash,
+        "head_hash": head_hash,
+        **result,
+        "head": head if request.include_head else None,
+        "timestamp": datetime.now().isoformat()
+    })
+
+@app.post("/api/refactor")
+async def refactor_code_endpoint(request: RefactorRequest):
+    """AI destekli kod refaktörü"""
+    check_input_size(input_limits.check_lines, request.code)
+    try:
+        refactored_result = await services.code_refactor.refactor_with_ai(
+            request.code,
+            request.language,
+            request.refactor_type,
+            measure=request.measure_performance,
+            input_data=request.input_data
+        )
+        
+        result = {
+            "status": "success",
+            "refactored_code": refactored_result["code"],
+            "improvements": refactored_result["improvements"],
+            "performance_gain": refactored_result.get("performance_estimation"),
+            "timestamp": datetime.now().isoformat()
+        }
+        # Performans refaktörü: kural bazlı değişiklikler, öneriler, diff ve satır eşlemesi
+        for key in ("rewrites", "suggestions", "diff", "line_mapping"):
+            if key in refactored_result:
+                result[key] = refactored_result[key]
+        if request.include_source:
+            result["original_code"] = request.code
+        return FastJSONResponse(result)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/chat")
+async def chat_with_ai(message: ChatMessage):
+    """AI Chatbot ile etkileşim (Function Calling destekli)"""
+    if len(message.message) > settings.MAX_CHAT_MESSAGE_CHARS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Message too large: {len(message.message)} characters (limit {settings.MAX_CHAT_MESSAGE_CHARS})"
+        )
+    try:
+        # REST sohbeti toplu şeritte: WebSocket oturumları zamanlayıcıda önceliklidir
+        response = await services.ai_chatbot.process_message(
+            message.message,
+            message.conversation_id,
+            lane="batch",
+            use_cache=message.semantic_cache,
+            project_id=message.project_id
+        )
+        
+        return {
+            "status": "success",
+            "response": response["message"],
+            "function_calls": response.get("function_calls", []),
+            "conversation_id": response["conversation_id"],
+            "suggestions": response.get("suggestions", []),
+            "cached": response.get("cached", False),
+            "context_chunks": response.get("context_chunks", [])
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def get_project_index(project_id: str, create: bool = False):
+    try:
+        index = await asyncio.to_thread(services.project_indexes.get, project_id, create)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if index is None:
+        raise HTTPException(status_code=404, detail=f"Project '{project_id}' not found")
+    return index
+
+@app.post("/api/projects/{project_id}/files")
+async def index_project_files(project_id: str, request: ProjectFilesRequest):
+    """Proje dosyalarını parçalayıp arama dizinine ekle (aynı yoldaki dosyalar değiştirilir)"""
+    if len(request.files) > settings.MAX_PROJECT_FILES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many files: {len(request.files)} (limit {settings.MAX_PROJECT_FILES} per request)"
+        )
+    index = await get_project_index(project_id, create=True)
+    files = {f.path: f.content for f in request.files}
+
+    def build():
+        if request.replace:
+            index.remove_files({chunk["path"] for chunk in index.chunks} | set(index.symbols.files))
+        result = index.add_files(files)
+        index.save()
+        return result
+
+    # Parçalama, BM25 ve gömme CPU işidir: olay döngüsü bloklanmaz
+    result = await asyncio.to_thread(build)
+    return {"status": "success", "project_id": project_id, **result, "index": index.stats()}
+
+@app.get("/api/projects/{project_id}")
+async def get_project(project_id: str):
+    return {"status": "success", "project_id": project_id, "index": (await get_project_index(project_id)).stats()}
+
+@app.get("/api/projects/{project_id}/search")
+async def search_project(project_id: str, q: str, k: int = 5):
+    """Dizinde en ilgili kod parçaları"""
+    index = await get_project_index(project_id)
+    results = await asyncio.to_thread(index.search, q, max(1, min(k, 50)))
+    return {"status": "success", "project_id": project_id, "results": results}
+
+@app.get("/api/projects/{project_id}/symbols")
+async def search_symbols(project_id: str, q: str = "", limit: int = 20):
+    """Tanım ara (tam ad içinde geçen)"""
+    index = await get_project_index(project_id)
+    return {"status": "success", "project_id": project_id,
+            "symbols": index.symbols.search(q, max(1, min(limit, 200)))}
+
+@app.get("/api/projects/{project_id}/calls")
+async def symbol_calls(project_id: str, symbol: str):
+    """Bir sembolün çağıranları ve çağırdıkları (modüller arası)"""
+    symbols = (await get_project_index(project_id)).symbols
+    matches = symbols.lookup(symbol)
+    if not matches:
+        raise HTTPException(status_code=404, detail=f"Symbol '{symbol}' not found")
+    return {"status": "success", "project_id": project_id, "results": [
+        {**symbols.definition(name), "callers": symbols.callers(name), "callees": symbols.callees(name)}
+        for name in matches[:10]
+    ]}
+
+@app.get("/api/projects/{project_id}/callgraph")
+async def project_call_graph(project_id: str, root: str, direction: str = "callees", depth: int = 3,
+                             max_nodes: int = 60, include_external: bool = False):
+    """Kök sembolden modüller arası çağrı grafiği (Mermaid)"""
+    if direction not in ("callers", "callees"):
+        raise HTTPException(status_code=400, detail="direction must be 'callers' or 'callees'")
+    symbols = (await get_project_index(project_id)).symbols
+    matches = symbols.lookup(root)
+    if not matches:
+        raise HTTPException(status_code=404, detail=f"Symbol '{root}' not found")
+    if len(matches) > 1:
+        raise HTTPException(status_code=409, detail=f"Ambiguous symbol '{root}': {', '.join(matches[:10])}")
+    graph = symbols.call_graph(matches[0], direction, max(1, min(depth, 10)), max(2, min(max_nodes, 500)),
+                               include_external)
+    return {"status": "success", "project_id": project_id,
+            "mermaid_code": services.code2flow_generator.generate_call_graph(graph), **graph}
+
+@app.delete("/api/projects/{project_id}")
+async def delete_project(project_id: str):
+    try:
+        deleted = services.project_indexes.delete(project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f"Project '{project_id}' not found")
+    return {"status": "success", "project_id": project_id}
+
+@app.post("/api/demo/run")
+async def run_demo(request: DemoRequest):
+    """Canlı kod demo çalıştırıcı"""
+    check_input_size(input_limits.check_lines, request.code, settings.SOFT_CODE_LINES)
+    try:
+        demo_result = await services.demo_runner.execute_code(
+            request.code,
+            request.language,
+            request.input_data,
+            profile=request.profile,
+            line_profile=request.line_profile,
+            memory=request.memory,
+            use_cache=request.use_cache
+        )
+        
+        result = {
+            "status": "success",
+            "output": demo_result["output"],
+            "execution_time": demo_result["execution_time"],
+            "memory_usage": demo_result.get("memory_usage"),
+            "errors": demo_result.get("errors", []),
+            "timestamp": datetime.now().isoformat()
+        }
+        if "profile" in demo_result:
+            result["profile"] = demo_result["profile"]
+        if "cached" in demo_result:
+            result["cached"] = demo_result["cached"]
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/demo/batch")
+async def run_demo_batch(request: DemoBatchRequest):
+    """Aynı kodu bir test matrisi üzerinde paralel çalıştır"""
+    check_input_size(input_limits.check_lines, request.code, settings.SOFT_CODE_LINES)
+    if not request.cases:
+        raise HTTPException(status_code=400, detail="At least one case is required")
+    if len(request.cases) > settings.MAX_BATCH_CASES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many cases: {len(request.cases)} (limit {settings.MAX_BATCH_CASES})"
+        )
+    try:
+        batch = await services.demo_runner.run_batch(
+            request.code,
+            request.language,
+            [case.dict() for case in request.cases],
+            concurrency=request.concurrency,
+            compare=request.compare
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if "error" in batch:
+        raise HTTPException(status_code=400, detail=batch["error"])
+    
+    return FastJSONResponse({
+        "status": "success",
+        **batch,
+        "timestamp": datetime.now().isoformat()
+    })
+
+@app.post("/api/demo/complexity")
+async def estimate_complexity(request: ComplexityRequest):
+    """Fonksiyonu büyüyen girdilerle çalıştırıp deneysel Big-O tahmini yap"""
+    check_input_size(input_limits.check_lines, request.code, settings.SOFT_CODE_LINES)
+    if request.language != "python":
+        raise HTTPException(status_code=400, detail="Complexity estimation is only supported for Python")
+    try:
+        estimate = await services.demo_runner.estimate_complexity(
+            request.code,
+            request.function_name,
+            request.input_spec
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if "error" in estimate:
+        raise HTTPException(status_code=400, detail=estimate["error"])
+    
+    return {
+        "status": "success",
+        **estimate,
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.post("/api/jobs", status_code=202)
+async def submit_job_endpoint(request: JobRequest):
+    """Ağır analiz/diyagramı arka plan işine bırak; sonuç iş kimliğiyle alınır"""
+    from utils.job_queue import public_job
+
+    check_input_size(input_limits.check_lines, request.code)
+    payload = {"code": request.code, "language": request.language}
+    if request.kind == "analyze":
+        payload["file_name"] = request.file_name
+    else:
+        payload["style"] = request.style
+    try:
+        job, deduplicated = await services.job_queue.submit(request.kind, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {**public_job(job), "deduplicated": deduplicated}
+
+@app.get("/api/jobs/{job_id}")
+async def get_job_endpoint(job_id: str, wait: float = 0):
+    """İş durumu ve (bittiyse) sonucu; wait > 0 ise bitene kadar en fazla o kadar saniye bekler"""
+    from utils.job_queue import JobNotFound, public_job
+
+    queue = services.job_queue
+    try:
+        if wait > 0:
+            job = await queue.wait(job_id, min(wait, settings.JOB_MAX_WAIT))
+        else:
+            job = await queue.get(job_id)
+    except JobNotFound:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return public_job(job)
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job_endpoint(job_id: str):
+    """Henüz başlamamış işi iptal et"""
+    if not await services.job_queue.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Job is not queued (already running, finished or unknown)")
+    return {"status": "success", "job_id": job_id, "cancelled": True}
+
+@app.get("/api/code2flow/{session_id}")
+async def get_flowchart(session_id: str):
+    """Code2Flow diyagramını al (flowchart işi kimliği veya kaydedilmiş PNG)"""
+    from utils.job_queue import JobNotFound, SUCCEEDED
+
+    try:
+        try:
+            job = await services.job_queue.get(session_id)
+        except JobNotFound:
+            job = None
+        if job is not None:
+            if job["status"] != SUCCEEDED:
+                return {"status": job["status"], "job_id": session_id, "error": job["error"]}
+            flow = job["result"]["flowchart"] if job["kind"] == "analyze" else job["result"]
+            return {"status": "success", "job_id": session_id, **(flow or {})}
+        flowchart_path = f"static/flowcharts/{session_id}.png"
+        if os.path.exists(flowchart_path):
+            return {"status": "success", "flowchart_url": f"/static/flowcharts/{session_id}.png"}
+        else:
+            return {"status": "error", "message": "Flowchart not found"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def ws_error(status_code: int, message: str, request_id: Optional[str] = None) -> str:
+    return fast_json.dumps({"type": "error", "status_code": status_code, "message": message,
+                            "request_id": request_id})
+
+@app.websocket("/ws/chat/{client_id}")
+async def websocket_endpoint(websocket: WebSocket, client_id: str):
+    """Real-time chat WebSocket.
+
+    Okuyucu döngü çerçeveleri okumaya devam ederken her mesaj ayrı bir görevde işlenir:
+    {"message", "request_id"?, "conversation_id"?} yeni istek, {"type": "cancel", "request_id"?}
+    bekleyen isteği (id yoksa tümünü) iptal eder. Bağlantı koparsa süren model ve araç
+    çağrıları iptal edilir.
+    """
+    await manager.connect(websocket, client_id)
+    inflight: Dict[str, asyncio.Task] = {}
+    # Soket başına mesaj hızı (dakikada) ve kısa süreli patlama payı
+    rate = TokenBucket(settings.WS_MESSAGES_PER_MINUTE / 60, settings.WS_MESSAGE_BURST)
+
+    async def handle(request_id: str, message_data: Dict):
+        try:
+            response = await services.ai_chatbot.process_message(
+                message_data["message"],
+                message_data.get("conversation_id") or client_id,
+                lane="interactive",
+                use_cache=message_data.get("semantic_cache"),
+                project_id=message_data.get("project_id")
+            )
+        except Exception as e:
+            await manager.send(client_id, ws_error(500, str(e), request_id))
+            return
+        await manager.send(client_id, fast_json.dumps({
+            "type": "ai_response",
+            "request_id": request_id,
+            "message": response["message"],
+            "function_calls": response.get("function_calls", []),
+            "cached": response.get("cached", False),
+            "context_chunks": response.get("context_chunks", []),
+            "timestamp": datetime.now().isoformat()
+        }))
+
+    def cancel(request_ids) -> List[str]:
+        cancelled = []
+        for request_id in request_ids:
+            task = inflight.get(request_id)
+            if task is not None and task.cancel():
+                cancelled.append(request_id)
+        return cancelled
+
+    try:
+        while True:
+            data = await websocket.receive_text()
+            manager.touch(client_id)
+            try:
+                message_data = fast_json.loads(data)
+            except ValueError:
+                await manager.send(client_id, ws_error(400, "Invalid JSON"))
+                continue
+            if not isinstance(message_data, dict):
+                await manager.send(client_id, ws_error(400, "Expected a JSON object"))
+                continue
+            
+            kind = message_data.get("type", "message")
+            if kind == "pong":
+                continue
+            if kind == "cancel":
+                target = message_data.get("request_id")
+                cancelled = cancel([target] if target else list(inflight))
+                await manager.send(client_id, fast_json.dumps({"type": "cancelled", "request_ids": cancelled}))
+                continue
+            
+            request_id = str(message_data.get("request_id") or uuid.uuid4())
+            if not isinstance(message_data.get("message"), str):
+                await manager.send(client_id, ws_error(400, "Missing 'message'", request_id))
+                continue
+            if len(message_data["message"]) > settings.MAX_CHAT_MESSAGE_CHARS:
+                await manager.send(client_id, ws_error(
+                    413, f"Message too large (limit {settings.MAX_CHAT_MESSAGE_CHARS} characters)", request_id))
+                continue
+            if len(inflight) >= settings.WS_MAX_INFLIGHT or request_id in inflight:
+                await manager.send(client_id, ws_error(
+                    429, f"Too many requests in flight (limit {settings.WS_MAX_INFLIGHT})", request_id))
+                continue
+            if not rate.try_acquire():
+                await manager.send(client_id, ws_error(
+                    429, f"Rate limit exceeded ({settings.WS_MESSAGES_PER_MINUTE:g} messages per minute)", request_id))
+                continue
+            
+            task = asyncio.create_task(handle(request_id, message_data))
+            inflight[request_id] = task
+            task.add_done_callback(lambda _, request_id=request_id: inflight.pop(request_id, None))
+            
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.disconnect(client_id, websocket)
+        # İstemci gitti: süren istekler sağlayıcı kapasitesi ve sandbox süreçleri tüketmesin
+        tasks = list(inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+@app.websocket("/ws/jobs/{client_id}")
+async def job_updates_endpoint(websocket: WebSocket, client_id: str):
+    """Job status push.
+
+    {"type": "subscribe", "job_id"} ile izlenen işin her durum değişikliği
+    {"type": "job", ...} olarak gönderilir; iş bitince sonuçla birlikte son mesaj gelir.
+    """
+    from utils.job_queue import JobNotFound, public_job
+
+    client_id = f"jobs:{client_id}"
+    await manager.connect(websocket, client_id)
+    watchers: Dict[str, asyncio.Task] = {}
+
+    async def push(job: Dict):
+        await manager.send(client_id, fast_json.dumps({"type": "job", **public_job(job)}))
+
+    async def watch(job_id: str):
+        try:
+            await services.job_queue.wait(job_id, settings.JOB_LEASE_SECONDS * settings.JOB_MAX_ATTEMPTS, push)
+        except JobNotFound:
+            await manager.send(client_id, ws_error(404, "Job not found or expired", job_id))
+
+    try:
+        while True:
+            data = await websocket.receive_text()
+            manager.touch(client_id)
+            try:
+                message_data = fast_json.loads(data)
+            except ValueError:
+                await manager.send(client_id, ws_error(400, "Invalid JSON"))
+                continue
+            if not isinstance(message_data, dict):
+                await manager.send(client_id, ws_error(400, "Expected a JSON object"))
+                continue
+            kind = message_data.get("type")
+            if kind == "pong":
+                continue
+            job_id = message_data.get("job_id")
+            if kind not in ("subscribe", "unsubscribe") or not isinstance(job_id, str):
+                await manager.send(client_id, ws_error(400, "Expected {'type': 'subscribe' | 'unsubscribe', 'job_id'}"))
+                continue
+            if kind == "unsubscribe":
+                task = watchers.get(job_id)
+                if task is not None:
+                    task.cancel()
+                continue
+            if job_id in watchers:
+                continue
+            if len(watchers) >= settings.JOB_MAX_SUBSCRIPTIONS:
+                await manager.send(client_id, ws_error(
+                    429, f"Too many subscriptions (limit {settings.JOB_MAX_SUBSCRIPTIONS})", job_id))
+                continue
+            task = asyncio.create_task(watch(job_id))
+            watchers[job_id] = task
+            task.add_done_callback(lambda _, job_id=job_id: watchers.pop(job_id, None))
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.disconnect(client_id, websocket)
+        tasks = list(watchers.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+@app.websocket("/ws/analyze/{doc_id}")
+async def live_analysis_endpoint(websocket: WebSocket, doc_id: str):
+    """Live incremental analysis of an editor document.
+
+    İstemci {"type": "open", "language", "text"} ile belgeyi açar, ardından
+    {"type": "edit", "version"?, "edits": [{"range"?, "text"}]} gönderir. Düzenleme
+    patlamaları debounce edilir, süren analiz yeni düzenlemede iptal edilir ve yalnızca
+    değişen bulgular, diyagram satırları ve metrikler {"type": "analysis"} ile gönderilir.
+    {"type": "sync"} tam sonucu yeniden ister, {"type": "close"} belgeyi bırakır.
+    """
+    from utils.live_analysis import EditError, LiveAnalysisSession, LiveAnalyzer, LiveDocument
+
+    client_id = f"analyze:{doc_id}"
+    await manager.connect(websocket, client_id)
+    documents = services.live_documents
+    analyzer = LiveAnalyzer(services.code_analyzer, services.code2flow_generator)
+
+    async def send(payload: Dict):
+        await manager.send(client_id, fast_json.dumps(payload))
+
+    def open_session(document: LiveDocument) -> LiveAnalysisSession:
+        documents.set(doc_id, document)
+        return LiveAnalysisSession(document, analyzer, send, debounce=settings.LIVE_DEBOUNCE_MS / 1000,
+                                   max_lines=settings.MAX_CODE_LINES)
+
+    # Yeniden bağlanan editör sunucudaki belgeyle devam eder (ilk analiz tam sonuç gönderir)
+    session: Optional[LiveAnalysisSession] = None
+    existing = documents.get(doc_id)
+    if existing is not None:
+        existing.reset_sent()
+        session = open_session(existing)
+        await send({"type": "opened", "version": existing.version, "resumed": True})
+        session.schedule(0)
+
+    try:
+        while True:
+            data = await websocket.receive_text()
+            manager.touch(client_id)
+            try:
+                message_data = fast_json.loads(data)
+            except ValueError:
+                await manager.send(client_id, ws_error(400, "Invalid JSON"))
+                continue
+            if not isinstance(message_data, dict):
+                await manager.send(client_id, ws_error(400, "Expected a JSON object"))
+                continue
+
+            kind = message_data.get("type")
+            if kind == "pong":
+                continue
+            if kind == "open":
+                if not isinstance(message_data.get("text"), str):
+                    await manager.send(client_id, ws_error(400, "Missing 'text'"))
+                    continue
+                if session is not None:
+                    await session.aclose()
+                session = open_session(LiveDocument(doc_id, message_data.get("language", "python"),
+                                                    message_data["text"]))
+                await send({"type": "opened", "version": 0, "resumed": False})
+                session.schedule(0)
+                continue
+            if session is None:
+                await manager.send(client_id, ws_error(409, "Document is not open; send 'open' first"))
+                continue
+            if kind == "edit":
+                document = session.document
+                expected = message_data.get("version")
+                if expected is not None and expected != document.version:
+                    # İstemci farklı bir sürüm üzerinde düzenliyor: tam metinle yeniden açmalı
+                    await manager.send(client_id, ws_error(
+                        409, f"Version mismatch: document is at {document.version}, edit is based on {expected}"))
+                    continue
+                try:
+                    document.apply_edits(message_data.get("edits") or [])
+                except (EditError, KeyError, TypeError) as e:
+                    await manager.send(client_id, ws_error(400, f"Invalid edit: {e}"))
+                    continue
+                documents.set(doc_id, document)
+                session.schedule()
+            elif kind == "sync":
+                session.document.reset_sent()
+                session.schedule(0)
+            elif kind == "close":
+                documents.delete(doc_id)
+                await websocket.close()
+                break
+            else:
+                await manager.send(client_id, ws_error(400, f"Unknown message type: {kind!r}"))
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.disconnect(client_id, websocket)
+        if session is not None:
+            await session.aclose()
+
+@app.get("/api/health")
+async def health_check():
+    """Sistem durumu kontrolü"""
+    return {
+        "status": "healthy",
+        "services": services.status(),
+        "startup": {
+            **startup_stats,
+            "service_init_seconds": services.init_times
+        },
+        "analysis_coalescing": analysis_flight.stats(),
+        "websockets": manager.stats(),
+        "llm_scheduler": services.ai_chatbot.scheduler.stats() if services.status()["ai_chatbot"] == "active" else None,
+        "semantic_cache": services.ai_chatbot.semantic_cache.stats() if services.status()["ai_chatbot"] == "active" else None,
+        "jobs": services.job_queue.stats() if services.status()["job_queue"] == "active" else None,
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/api/languages")
+async def get_supported_languages():
+    """Desteklenen programlama dilleri"""
+    return {
+        "languages": [
+            {"code": "python", "name": "Python", "demo_support": True},
+            {"code": "javascript", "name": "JavaScript", "demo_support": True},
+            {"code": "java", "name": "Java", "demo_support": False},
+            {"code": "cpp", "name": "C++", "demo_support": False},
+            {"code": "csharp", "name": "C#", "demo_support": False},
+            {"code": "go", "name": "Go", "demo_support": True},
+            {"code": "rust", "name": "Rust", "demo_support": False}
+        ]
+    }
+@app.post("/api/flowchart")
+async def generate_flowchart_endpoint(request: CodeRequest):
+    # Diyagram tam parse gerektirir: yumuşak limit üstü reddedilir
+    if check_input_size(input_limits.check, request.code, request.language) == METRICS_ONLY:
+        raise HTTPException(status_code=413, detail="Code too large for flowchart generation; use /api/analyze for metrics")
+    symbols, scope = None, None
+    if request.project_id:
+        symbols = (await get_project_index(request.project_id)).symbols
+        scope = f"{request.project_id}@{symbols.version}:{request.file_name}"
+    try:
+        generator = services.code2flow_generator
+        result = await analysis_flight.do(
+            content_hash("flowchart", request.language, request.code, scope),
+            lambda: generator.generate_flow(request.code, request.language, "flowchart",
+                                            symbols=symbols, path=request.file_name)
+        )
+        if not request.include_structure:
+            result = without_structure(result)
+        return FastJSONResponse({"status": "success", **result})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+_import_ready = time.perf_counter()
+
+if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,160 @@
+import json
+import zlib
+
+from fastapi import HTTPException
+
+
+class BodySizeLimitMiddleware:
+    """İstek gövdesini tamponlamadan ve JSON çözmeden önce boyut limiti uygular"""
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        # Content-Length varsa gövde hiç okunmadan reddet
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    declared = 0
+                if declared > self.max_bytes:
+                    return await self._reject(send, declared)
+                break
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Chunked gövdeler için: limit aşılınca okumayı kes
+                    raise HTTPException(status_code=413, detail=self._detail(received))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    def _detail(self, size: int) -> str:
+        return f"Request body too large: {size} bytes (limit {self.max_bytes})"
+
+    async def _reject(self, send, size: int):
+        body = json.dumps({"detail": self._detail(size)}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class CompressionMiddleware:
+    """Büyük yanıtları brotli (kuruluysa) veya gzip ile sıkıştırır"""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        try:
+            import brotli
+            self.brotli = brotli
+        except ImportError:
+            self.brotli = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        encoding = self._choose_encoding(scope)
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                # Başlıkları sıkıştırma kararı verilene kadar beklet
+                start_message = message
+                passthrough = any(name == b"content-encoding" for name, _ in message.get("headers", []))
+                return
+            if message["type"] != "http.response.body":
+                return await send(message)
+            if passthrough:
+                if start_message is not None:
+                    await send(start_message)
+                    start_message = None
+                return await send(message)
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    start_message = None
+                    return await send(message)
+                compressor = self._compressor(encoding)
+                headers = [(n, v) for n, v in start_message.get("headers", []) if n != b"content-length"]
+                headers.append((b"content-encoding", encoding.encode()))
+                headers.append((b"vary", b"Accept-Encoding"))
+                payload = compressor.compress(body)
+                if not more_body:
+                    payload += compressor.flush()
+                    headers.append((b"content-length", str(len(payload)).encode()))
+                start_message = dict(start_message, headers=headers)
+                await send(start_message)
+                start_message = None
+                return await send({"type": "http.response.body", "body": payload, "more_body": more_body})
+
+            payload = compressor.compress(body)
+            if not more_body:
+                payload += compressor.flush()
+            await send({"type": "http.response.body", "body": payload, "more_body": more_body})
+
+        await self.app(scope, receive, compressing_send)
+
+    def _choose_encoding(self, scope):
+        accept = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1").lower()
+                break
+        offered = {token.split(";")[0].strip() for token in accept.split(",")}
+        if self.brotli is not None and "br" in offered:
+            return "br"
+        if "gzip" in offered:
+            return "gzip"
+        return None
+
+    def _compressor(self, encoding: str):
+        if encoding == "br":
+            return _BrotliCompressor(self.brotli, self.brotli_quality)
+        # wbits=31: gzip başlığıyla zlib akışı
+        return zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+
+
+class _BrotliCompressor:
+    """brotli.Compressor'ü zlib compressobj arayüzüne uyarlar"""
+
+    def __init__(self, brotli, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
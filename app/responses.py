@@ -0,0 +1,10 @@
+from fastapi.responses import JSONResponse
+
+from utils.fast_json import dumps_bytes
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson (kuruluysa) ile serileştiren JSON yanıtı"""
+
+    def render(self, content) -> bytes:
+        return dumps_bytes(content)
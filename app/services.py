@@ -0,0 +1,149 @@
+import inspect
+import time
+from typing import Any, Callable, Dict
+
+
+class ServiceContainer:
+    """Servisleri ilk kullanımda bir kez oluşturur, kapanışta kaynaklarını bırakır"""
+
+    def __init__(self):
+        self._instances: Dict[str, Any] = {}
+        self._factories: Dict[str, Callable[[], Any]] = {
+            "code_analyzer": self._create_code_analyzer,
+            "code_refactor": self._create_code_refactor,
+            "ai_chatbot": self._create_ai_chatbot,
+            "code2flow_generator": self._create_code2flow_generator,
+            "demo_runner": self._create_demo_runner,
+            "project_indexes": self._create_project_indexes,
+            "live_documents": self._create_live_documents,
+            "diff_bases": self._create_diff_bases,
+            "job_queue": self._create_job_queue,
+        }
+        # Servis başına oluşturma süresi (saniye)
+        self.init_times: Dict[str, float] = {}
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is None:
+            start = time.perf_counter()
+            instance = self._factories[name]()
+            self.init_times[name] = time.perf_counter() - start
+            self._instances[name] = instance
+        return instance
+
+    def __getattr__(self, name: str) -> Any:
+        # container.demo_runner -> container.get("demo_runner")
+        if name.startswith("_") or name not in self._factories:
+            raise AttributeError(name)
+        return self.get(name)
+
+    def status(self) -> Dict[str, str]:
+        return {name: ("active" if name in self._instances else "idle") for name in self._factories}
+
+    async def aclose(self):
+        """Havuzları ve istemcileri kapat (oluşturulma sırasının tersine)"""
+        for name in reversed(list(self._instances)):
+            instance = self._instances.pop(name)
+            close = getattr(instance, "aclose", None) or getattr(instance, "close", None)
+            if close is None:
+                continue
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"{name} kapatılırken hata: {e}")
+
+    # Fabrikalar: importlar burada, böylece uygulama importu hafif kalır
+    def _create_code_analyzer(self):
+        from utils.code_analyzer import CodeAnalyzer
+        return CodeAnalyzer()
+
+    def _create_code_refactor(self):
+        from utils.refactor import CodeRefactor
+        return CodeRefactor(services=self)
+
+    def _create_ai_chatbot(self):
+        from app.config import settings
+        from utils.ai_chatbot import AIChatbot
+        return AIChatbot(services=self, transport=self._create_llm_transport(settings), scheduler_options={
+            "requests_per_minute": settings.LLM_REQUESTS_PER_MINUTE,
+            "tokens_per_minute": settings.LLM_TOKENS_PER_MINUTE,
+            "max_concurrency": settings.LLM_MAX_CONCURRENCY,
+            "queue_limit": settings.LLM_QUEUE_LIMIT,
+            "max_retries": settings.LLM_MAX_RETRIES,
+            "hedge_percentile": settings.LLM_HEDGE_PERCENTILE,
+            "failure_threshold": settings.LLM_BREAKER_THRESHOLD,
+            "reset_timeout": settings.LLM_BREAKER_RESET_SECONDS,
+        }, rag_options={
+            "top_k": settings.RAG_TOP_K,
+            "max_context_chars": settings.RAG_MAX_CONTEXT_CHARS,
+        }, cache_options={
+            "threshold": settings.SEMANTIC_CACHE_THRESHOLD,
+            "min_overlap": settings.SEMANTIC_CACHE_MIN_OVERLAP,
+            "max_entries": settings.SEMANTIC_CACHE_ENTRIES,
+            "ttl": settings.SEMANTIC_CACHE_TTL,
+        })
+
+    def _create_llm_transport(self, settings):
+        from utils.llm_transport import create_transport
+        mode = settings.LLM_TRANSPORT
+        options = {}
+        if mode == "replay":
+            options = {
+                "latency_scale": settings.LLM_REPLAY_LATENCY_SCALE,
+                "latency_ms": float(settings.LLM_REPLAY_LATENCY_MS) if settings.LLM_REPLAY_LATENCY_MS else None,
+                "jitter_ms": settings.LLM_REPLAY_JITTER_MS,
+            }
+        elif mode == "synthetic":
+            options = {
+                "first_token_ms": settings.LLM_SYNTHETIC_FIRST_TOKEN_MS,
+                "tokens_per_second": settings.LLM_SYNTHETIC_TOKENS_PER_SECOND,
+                "tool_call_rate": settings.LLM_SYNTHETIC_TOOL_CALL_RATE,
+            }
+        return create_transport(mode, settings.LLM_CASSETTE_PATH, **options)
+
+    def _create_code2flow_generator(self):
+        from app.config import settings
+        from utils.code2flow import Code2FlowGenerator
+        return Code2FlowGenerator(settings.FLOWCHART_MAX_NODES, settings.FLOWCHART_FUNCTION_NODES)
+
+    def _create_demo_runner(self):
+        from app.config import settings
+        from utils.demo_runner import DemoRunner
+        return DemoRunner(
+            result_ttl=settings.DEMO_RESULT_TTL,
+            cache_entries=settings.DEMO_CACHE_ENTRIES,
+            js_workers=settings.DEMO_JS_WORKERS,
+        )
+
+    def _create_project_indexes(self):
+        from app.config import settings
+        from utils.code_index import ProjectIndexStore
+        return ProjectIndexStore(settings.PROJECT_INDEX_DIR, use_vectors=settings.PROJECT_INDEX_VECTORS)
+
+    def _create_live_documents(self):
+        from app.config import settings
+        from utils.ttl_cache import TTLCache
+        return TTLCache(settings.LIVE_DOCUMENT_ENTRIES, ttl=settings.LIVE_DOCUMENT_TTL)
+
+    def _create_diff_bases(self):
+        from app.config import settings
+        from utils.ttl_cache import TTLCache
+        return TTLCache(settings.DIFF_BASE_ENTRIES, ttl=settings.DIFF_BASE_TTL)
+
+    def _create_job_queue(self):
+        from app.config import settings
+        from utils.job_queue import JobQueue
+        queue = JobQueue(
+            backend=settings.JOB_BACKEND,
+            path=settings.JOB_DB_PATH,
+            redis_url=settings.REDIS_URL,
+            workers=settings.JOB_WORKERS,
+            max_attempts=settings.JOB_MAX_ATTEMPTS,
+            result_ttl=settings.JOB_RESULT_TTL,
+            lease=settings.JOB_LEASE_SECONDS,
+            poll_interval=settings.JOB_POLL_INTERVAL,
+        )
+        queue.start()
+        return queue
@@ -0,0 +1,67 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from typing import Any, Dict, List
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Süre örneklerini (saniye) özet istatistiklere çevir"""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "min": ordered[0],
+        "max": ordered[-1],
+        "mean": statistics.fmean(ordered),
+        "median": statistics.median(ordered),
+        "p90": percentile(ordered, 90),
+        "p99": percentile(ordered, 99),
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+    }
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Sıralı listede doğrusal interpolasyonlu yüzdelik"""
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def environment_info() -> Dict[str, Any]:
+    """Sonuçları karşılaştırabilmek için çalışma ortamı bilgisi"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit or None,
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+def write_results(path: str, kind: str, results: List[Dict[str, Any]]) -> str:
+    """Benchmark sonuçlarını JSON olarak yaz"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    payload = {"kind": kind, "environment": environment_info(), "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    return path
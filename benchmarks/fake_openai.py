@@ -0,0 +1,142 @@
+"""Yük testleri için yerel sahte OpenAI sunucusu.
+
+Tek başına çalıştırma:
+    python -m benchmarks.fake_openai --port 9100 --latency-ms 300
+Uygulamayı buna yönlendirmek için:
+    OPENAI_API_KEY=sk-fake OPENAI_BASE_URL=http://127.0.0.1:9100/v1 uvicorn app.main:app
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class FakeOpenAIServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 200.0,
+                 jitter_ms: float = 50.0, error_rate: float = 0.0, seed: Optional[int] = None,
+                 slow_rate: float = 0.0, slow_ms: float = 2000.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        # Kuyruk gecikmesi: isteklerin slow_rate kadarı slow_ms ek gecikmeyle yanıtlanır
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.request_count = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _next_delay(self):
+        with self._lock:
+            self.request_count += 1
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+            fail = self._rng.random() < self.error_rate
+            slow = self.slow_ms if self._rng.random() < self.slow_rate else 0.0
+        return max(0.0, self.latency_ms + jitter + slow) / 1000, fail
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                delay, fail = server._next_delay()
+                time.sleep(delay)
+
+                if not self.path.endswith("/chat/completions"):
+                    return self._send(404, {"error": {"message": "not found"}})
+                if fail:
+                    return self._send(429, {"error": {"message": "rate limited", "type": "rate_limit"}})
+                return self._send(200, server.completion(body))
+
+            def _send(self, status: int, payload: dict):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # İstemci vazgeçti (ör. iptal edilen yedek istek)
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def completion(self, request: dict) -> dict:
+        """OpenAI chat.completions yanıt şeması"""
+        messages = request.get("messages", [])
+        last = messages[-1].get("content", "") if messages else ""
+        content = f"Sahte yanıt ({len(last or '')} karakter): kodunuz incelendi."
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake-model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sahte OpenAI sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-ms", type=float, default=2000.0)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate,
+                              slow_rate=args.slow_rate, slow_ms=args.slow_ms)
+    print(f"Sahte OpenAI sunucusu: {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
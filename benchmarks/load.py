@@ -0,0 +1,203 @@
+"""API uç noktaları için yük testi.
+
+Varsayılan olarak sahte OpenAI sunucusunu ve uygulamayı yerelde başlatır:
+    python -m benchmarks.load --concurrency 1 8 32 --requests 200
+Çalışan bir sunucuya karşı:
+    python -m benchmarks.load --base-url http://localhost:8000
+Sahte sunucu yerine uygulama içi LLM taşıyıcısıyla (kayıt/oynatma veya sentetik):
+    python -m benchmarks.load --scenarios ws_chat --llm-transport synthetic
+    python -m benchmarks.load --scenarios ws_chat --llm-transport replay --cassette benchmarks/cassettes/chat.jsonl.gz
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import summarize, write_results
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.synthetic import generate_javascript_source, generate_python_source
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEMO_SNIPPET = """def fib(n):
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+print(fib(15))
+"""
+
+SCENARIOS = ["analyze", "flowchart", "demo", "ws_chat"]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class AppServer:
+    """Yük testi için uvicorn alt süreci"""
+
+    def __init__(self, openai_url: str, port: Optional[int] = None, workers: int = 1,
+                 env: Optional[Dict[str, str]] = None):
+        self.port = port or _free_port()
+        self.openai_url = openai_url
+        self.workers = workers
+        self.env = env or {}
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout: float = 30.0) -> "AppServer":
+        env = dict(os.environ, OPENAI_API_KEY="sk-benchmark", OPENAI_BASE_URL=self.openai_url, **self.env)
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+             "--port", str(self.port), "--workers", str(self.workers), "--log-level", "warning"],
+            cwd=REPO_ROOT,
+            env=env,
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if httpx.get(f"{self.base_url}/api/health", timeout=1.0).status_code == 200:
+                    return self
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        self.stop()
+        raise RuntimeError("Uygulama sunucusu zamanında başlamadı")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+async def run_level(worker: Callable[[int], Awaitable[bool]], concurrency: int, total: int) -> Dict[str, Any]:
+    """`total` isteği `concurrency` eşzamanlı işçi ile gönder"""
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def loop():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                ok = await worker(i)
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "duration": elapsed,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "latency": summarize(latencies),
+    }
+
+
+def http_worker(client: httpx.AsyncClient, path: str, payload: Dict[str, Any]) -> Callable[[int], Awaitable[bool]]:
+    async def worker(_: int) -> bool:
+        response = await client.post(path, json=payload)
+        return response.status_code == 200 and response.json().get("status") == "success"
+    return worker
+
+
+def ws_chat_worker(base_url: str) -> Callable[[int], Awaitable[bool]]:
+    import websockets
+
+    ws_url = base_url.replace("http", "ws", 1)
+
+    async def worker(i: int) -> bool:
+        async with websockets.connect(f"{ws_url}/ws/chat/bench-{uuid.uuid4().hex[:8]}") as ws:
+            await ws.send(json.dumps({"message": f"Bu döngüyü nasıl hızlandırırım? #{i}"}))
+            reply = json.loads(await ws.recv())
+            return reply.get("type") == "ai_response"
+    return worker
+
+
+async def run_scenarios(base_url: str, scenarios: List[str], levels: List[int], total: int,
+                        lines: int) -> List[Dict[str, Any]]:
+    py_code = generate_python_source(lines)
+    js_code = generate_javascript_source(lines)
+    results = []
+
+    limits = httpx.Limits(max_connections=max(levels) * 2, max_keepalive_connections=max(levels) * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as client:
+        workers = {
+            "analyze": lambda: http_worker(client, "/api/analyze", {"code": py_code, "language": "python"}),
+            "analyze_js": lambda: http_worker(client, "/api/analyze", {"code": js_code, "language": "javascript"}),
+            "flowchart": lambda: http_worker(client, "/api/flowchart", {"code": py_code, "language": "python"}),
+            "demo": lambda: http_worker(client, "/api/demo/run", {"code": DEMO_SNIPPET, "language": "python", "use_cache": False}),
+            "ws_chat": lambda: ws_chat_worker(base_url),
+        }
+        for name in scenarios:
+            for level in levels:
+                result = await run_level(workers[name](), level, total)
+                result.update({"scenario": name, "lines": lines})
+                results.append(result)
+                lat = result["latency"]
+                print(f"{name:10s} c={level:<4d} {result['throughput_rps']:8.1f} rps  "
+                      f"p50 {lat.get('median', 0) * 1000:8.1f} ms  p99 {lat.get('p99', 0) * 1000:8.1f} ms  "
+                      f"errors {result['errors']}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API yük testi")
+    parser.add_argument("--base-url", help="Çalışan sunucu adresi (verilmezse yerelde başlatılır)")
+    parser.add_argument("--scenarios", nargs="+", default=SCENARIOS,
+                        choices=SCENARIOS + ["analyze_js"])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=100, help="Her eşzamanlılık seviyesi için istek sayısı")
+    parser.add_argument("--lines", type=int, default=1000, help="Analiz isteklerindeki kaynak boyutu")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn işçi sayısı")
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0)
+    parser.add_argument("--llm-transport", default="openai", choices=["openai", "record", "replay", "synthetic"],
+                        help="openai: yerel sahte sunucu; diğerleri uygulama içi taşıyıcı (LLM_TRANSPORT)")
+    parser.add_argument("--cassette", help="record/replay için kayıt dosyası (LLM_CASSETTE_PATH)")
+    parser.add_argument("--output", default="benchmarks/results/load.json")
+    args = parser.parse_args()
+
+    fake = app = None
+    base_url = args.base_url
+    try:
+        if not base_url:
+            fake = FakeOpenAIServer(latency_ms=args.llm_latency_ms, seed=0).start()
+            env = {"LLM_TRANSPORT": args.llm_transport}
+            if args.cassette:
+                env["LLM_CASSETTE_PATH"] = args.cassette
+            app = AppServer(fake.url, workers=args.workers, env=env).start()
+            base_url = app.base_url
+        results = asyncio.run(run_scenarios(base_url, args.scenarios, args.concurrency, args.requests, args.lines))
+    finally:
+        if app:
+            app.stop()
+        if fake:
+            fake.stop()
+
+    print(f"Sonuçlar yazıldı: {write_results(args.output, 'load', results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Analiz motoru mikro benchmarkları.
+
+Kullanım:
+    python -m benchmarks.micro --sizes 100 1000 10000 --repeat 5
+"""
+import argparse
+import asyncio
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.common import summarize, write_results
+from benchmarks.synthetic import DEFAULT_SIZES, generate_javascript_source, generate_python_source
+from utils.code2flow import Code2FlowGenerator
+from utils.code_analyzer import CodeAnalyzer
+
+
+def time_call(func: Callable[[], object], repeat: int, warmup: int = 1) -> List[float]:
+    """Fonksiyonu warmup sonrası tekrar tekrar çalıştırıp süreleri döndür"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def build_cases(lines: int) -> Dict[str, Callable[[], object]]:
+    """Bir kaynak boyutu için ölçülecek çağrılar"""
+    analyzer = CodeAnalyzer()
+    generator = Code2FlowGenerator()
+    loop = asyncio.new_event_loop()
+
+    py_code = generate_python_source(lines)
+    js_code = generate_javascript_source(lines)
+    py_structure = generator._parse_python(py_code)
+    js_structure = generator._parse_javascript(js_code)
+
+    return {
+        "analyzer.python": lambda: loop.run_until_complete(analyzer.analyze_comprehensive(py_code, "python")),
+        "analyzer.javascript": lambda: loop.run_until_complete(analyzer.analyze_comprehensive(js_code, "javascript")),
+        "code2flow.parse_python": lambda: generator._parse_python(py_code),
+        "code2flow.parse_javascript": lambda: generator._parse_javascript(js_code),
+        "mermaid.flowchart.python": lambda: generator._generate_flowchart(py_structure, "python"),
+        "mermaid.sequence.python": lambda: generator._generate_sequence_diagram(py_structure, "python"),
+        "mermaid.flowchart.javascript": lambda: generator._generate_flowchart(js_structure, "javascript"),
+    }
+
+
+def run(sizes: List[int], repeat: int, only: List[str]) -> List[Dict]:
+    results = []
+    for lines in sizes:
+        for name, func in build_cases(lines).items():
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            samples = time_call(func, repeat)
+            stats = summarize(samples)
+            results.append({"benchmark": name, "lines": lines, "stats": stats})
+            print(f"{name:32s} {lines:>7d} lines  median {stats['median'] * 1000:9.3f} ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analiz motoru mikro benchmarkları")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", default=[], help="Benchmark adı önekleri (ör. code2flow mermaid)")
+    parser.add_argument("--output", default="benchmarks/results/micro.json")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat, args.only)
+    print(f"Sonuçlar yazıldı: {write_results(args.output, 'micro', results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""LLM zamanlayıcısının sahte OpenAI sunucusuna karşı davranışı.
+
+Senaryolar: öncelik şeritleri, hata oranında tekrar, kuyruk gecikmesinde yedek istek
+ve kesintide devre kesici.
+    python -m benchmarks.scheduler --requests 200 --concurrency 32
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from openai import AsyncOpenAI
+
+from benchmarks.common import summarize, write_results
+from benchmarks.fake_openai import FakeOpenAIServer
+from utils.llm_scheduler import CircuitOpenError, LLMScheduler, SchedulerOverloaded
+
+REQUEST = {"model": "gpt-3.5-turbo", "messages": [{"role": "user", "content": "Bu kodu incele"}], "max_tokens": 100}
+
+
+async def drive(scheduler: LLMScheduler, total: int, concurrency: int, lanes: List[str]) -> Dict[str, Any]:
+    """`total` isteği sırayla şeritlere dağıtarak `concurrency` işçiyle gönder"""
+    latencies: Dict[str, List[float]] = {lane: [] for lane in lanes}
+    outcomes = {"ok": 0, "error": 0, "circuit_open": 0, "overloaded": 0}
+    counter = iter(range(total))
+
+    async def loop():
+        for i in counter:
+            lane = lanes[i % len(lanes)]
+            started = time.perf_counter()
+            try:
+                await scheduler.submit(REQUEST, lane=lane, cost=110)
+                outcomes["ok"] += 1
+            except CircuitOpenError:
+                outcomes["circuit_open"] += 1
+            except SchedulerOverloaded:
+                outcomes["overloaded"] += 1
+            except Exception:
+                outcomes["error"] += 1
+            latencies[lane].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(loop() for _ in range(concurrency)))
+    return {
+        "duration": time.perf_counter() - started,
+        "outcomes": outcomes,
+        "latency": {lane: summarize(samples) for lane, samples in latencies.items()},
+        "scheduler": scheduler.stats(),
+    }
+
+
+async def run_scenarios(total: int, concurrency: int, latency_ms: float) -> List[Dict[str, Any]]:
+    scenarios = [
+        # (ad, sunucu ayarları, zamanlayıcı ayarları)
+        ("lanes", {}, {"max_concurrency": 4, "hedge_percentile": 0}),
+        ("retries", {"error_rate": 0.2}, {"backoff_base": 0.05, "hedge_percentile": 0}),
+        ("tail_no_hedge", {"slow_rate": 0.05, "slow_ms": latency_ms * 10}, {"hedge_percentile": 0}),
+        ("tail_hedged", {"slow_rate": 0.05, "slow_ms": latency_ms * 10}, {"hedge_percentile": 0.9}),
+        ("outage", {"error_rate": 1.0}, {"max_retries": 1, "backoff_base": 0.01, "hedge_percentile": 0}),
+    ]
+    results = []
+    for name, server_options, scheduler_options in scenarios:
+        with FakeOpenAIServer(latency_ms=latency_ms, jitter_ms=latency_ms / 5, seed=0, **server_options) as fake:
+            client = AsyncOpenAI(api_key="sk-benchmark", base_url=fake.url, max_retries=0)
+            scheduler = LLMScheduler(lambda request: client.chat.completions.create(**request),
+                                     requests_per_minute=60000, tokens_per_minute=10_000_000,
+                                     **scheduler_options)
+            try:
+                result = await drive(scheduler, total, concurrency, ["interactive", "batch"])
+            finally:
+                await scheduler.aclose()
+                await client.close()
+            result.update({"scenario": name, "provider_requests": fake.request_count})
+        results.append(result)
+        interactive, batch = result["latency"]["interactive"], result["latency"]["batch"]
+        print(f"{name:14s} ok {result['outcomes']['ok']:4d}  interactive p50/p99 "
+              f"{interactive.get('median', 0) * 1000:7.1f}/{interactive.get('p99', 0) * 1000:7.1f} ms  "
+              f"batch p50/p99 {batch.get('median', 0) * 1000:7.1f}/{batch.get('p99', 0) * 1000:7.1f} ms  "
+              f"retries {result['scheduler']['retries']}  hedged {result['scheduler']['hedged']}  "
+              f"circuit {result['outcomes']['circuit_open']}  provider calls {result['provider_requests']}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM zamanlayıcı benchmarkı")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0)
+    parser.add_argument("--output", default="benchmarks/results/scheduler.json")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_scenarios(args.requests, args.concurrency, args.llm_latency_ms))
+    print(f"Sonuçlar yazıldı: {write_results(args.output, 'scheduler', results)}")
+
+
+if __name__ == "__main__":
+    main()
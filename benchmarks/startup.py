@@ -0,0 +1,62 @@
+"""Uygulama import ve başlangıç süresi ölçümü.
+
+Kullanım:
+    python -m benchmarks.startup --repeat 5
+"""
+import argparse
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.common import summarize, write_results
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.load import REPO_ROOT, AppServer
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+def measure_import(repeat: int) -> List[float]:
+    """Soğuk interpreter'da `import app.main` süresi"""
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True).stdout
+        samples.append(float(out.strip().splitlines()[-1]))
+    return samples
+
+
+def measure_first_health(repeat: int) -> List[float]:
+    """uvicorn sürecinin başlatılmasından ilk başarılı /api/health yanıtına kadar geçen süre"""
+    samples = []
+    with FakeOpenAIServer(latency_ms=0, jitter_ms=0) as fake:
+        for _ in range(repeat):
+            server = AppServer(fake.url)
+            start = time.perf_counter()
+            server.start()
+            samples.append(time.perf_counter() - start)
+            health = httpx.get(f"{server.base_url}/api/health").json()
+            server.stop()
+    print(f"Sunucu başlangıç ölçümleri: {health.get('startup')}")
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import/başlangıç süresi ölçümü")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="benchmarks/results/startup.json")
+    args = parser.parse_args()
+
+    results: List[Dict] = []
+    for name, func in [("import_app_main", measure_import), ("time_to_first_health", measure_first_health)]:
+        stats = summarize(func(args.repeat))
+        results.append({"benchmark": name, "stats": stats})
+        print(f"{name:24s} median {stats['median'] * 1000:8.1f} ms")
+
+    print(f"Sonuçlar yazıldı: {write_results(args.output, 'startup', results)}")
+
+
+if __name__ == "__main__":
+    main()
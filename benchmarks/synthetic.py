@@ -0,0 +1,129 @@
+import random
+from typing import List
+
+# Benchmark boyutları (satır sayısı)
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+
+
+def generate_python_source(lines: int, max_depth: int = 6, seed: int = 42) -> str:
+    """Verilen satır sayısına yakın sentetik Python kodu üret"""
+    rng = random.Random(seed)
+    out: List[str] = ["import re", "import json", "from collections import defaultdict", ""]
+    func_index = 0
+
+    while len(out) < lines:
+        if func_index % 7 == 6:
+            out.extend(_python_class(rng, func_index))
+        else:
+            out.extend(_python_function(rng, func_index, max_depth))
+        func_index += 1
+
+    out.append("")
+    out.append("if __name__ == '__main__':")
+    out.append(f"    print(func_0({rng.randint(1, 9)}, [1, 2, 3]))")
+    return "\n".join(out) + "\n"
+
+
+def _python_function(rng: random.Random, index: int, max_depth: int) -> List[str]:
+    body = [f"def func_{index}(n, items):", "    total = 0", "    text = ''"]
+    depth = rng.randint(1, max_depth)
+    indent = "    "
+    for level in range(depth):
+        kind = rng.choice(["for", "if", "while", "try"])
+        if kind == "for":
+            body.append(f"{indent}for i{level} in range(len(items)):")
+            indent += "    "
+            body.append(f"{indent}total += items[i{level}] * {level + 1}")
+            body.append(f"{indent}text += str(i{level})")
+        elif kind == "if":
+            body.append(f"{indent}if n > {rng.randint(0, 50)} and total % 2 == 0:")
+            indent += "    "
+            body.append(f"{indent}total = helper_{index}(total, n)")
+        elif kind == "while":
+            body.append(f"{indent}while total < {rng.randint(10, 100)}:")
+            indent += "    "
+            body.append(f"{indent}total += 1")
+        else:
+            body.append(f"{indent}try:")
+            indent += "    "
+            body.append(f"{indent}total += json.loads('{rng.randint(0, 9)}')")
+    body.append(f"{indent}if re.match(r'\\d+', str(total)):")
+    body.append(f"{indent}    total -= 1")
+    body.extend(_close_python_try(body))
+    body.append("    return total")
+    body.append("")
+    body.append(f"def helper_{index}(a, b):")
+    body.append("    return a + b if a in [1, 2, 3] else a - b")
+    body.append("")
+    return body
+
+
+def _close_python_try(body: List[str]) -> List[str]:
+    """Açık kalan try bloklarını except ile kapat"""
+    closing = []
+    for line in reversed(body):
+        stripped = line.lstrip()
+        if stripped == "try:":
+            level = line[: len(line) - len(stripped)]
+            closing.append(f"{level}except ValueError:")
+            closing.append(f"{level}    pass")
+    return closing
+
+
+def _python_class(rng: random.Random, index: int) -> List[str]:
+    lines = [f"class Service{index}:", "    def __init__(self, size):", "        self.size = size", ""]
+    for method in range(rng.randint(2, 6)):
+        lines.append(f"    def method_{method}(self, value):")
+        lines.append(f"        if value > {method}:")
+        lines.append(f"            return self.size * value + {method}")
+        lines.append("        return defaultdict(int)")
+        lines.append("")
+    return lines
+
+
+def generate_javascript_source(lines: int, max_depth: int = 6, seed: int = 42) -> str:
+    """Verilen satır sayısına yakın sentetik JavaScript kodu üret"""
+    rng = random.Random(seed)
+    out: List[str] = ["const util = require('util');", ""]
+    func_index = 0
+
+    while len(out) < lines:
+        if func_index % 7 == 6:
+            out.append(f"class Service{func_index} {{")
+            out.append("  constructor(size) { this.size = size; }")
+            out.append("  run(value) { return this.size * value; }")
+            out.append("}")
+            out.append("")
+        elif func_index % 3 == 2:
+            out.append(f"const arrow{func_index} = (a, b) => {{")
+            out.append("  return a > b ? a : b;")
+            out.append("};")
+            out.append("")
+        else:
+            out.extend(_javascript_function(rng, func_index, max_depth))
+        func_index += 1
+
+    out.append("console.log(func0(3, [1, 2, 3]));")
+    return "\n".join(out) + "\n"
+
+
+def _javascript_function(rng: random.Random, index: int, max_depth: int) -> List[str]:
+    body = [f"function func{index}(n, items) {{", "  let total = 0;"]
+    depth = rng.randint(1, max_depth)
+    indent = "  "
+    for level in range(depth):
+        if rng.random() < 0.5:
+            body.append(f"{indent}for (let i{level} = 0; i{level} < items.length; i{level}++) {{")
+        else:
+            body.append(f"{indent}if (n > {rng.randint(0, 50)}) {{")
+        indent += "  "
+        body.append(f"{indent}total = Math.max(total, helper{index}(n, {level}));")
+    for level in range(depth):
+        indent = indent[:-2]
+        body.append(f"{indent}}}")
+    body.append("  return total;")
+    body.append("}")
+    body.append("")
+    body.append(f"function helper{index}(a, b) {{ return a > b ? a - b : a + b; }}")
+    body.append("")
+    return body
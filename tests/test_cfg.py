@@ -0,0 +1,112 @@
+import ast
+import textwrap
+
+from utils.cfg import build_cfgs
+
+
+def cfg_of(code):
+    code = textwrap.dedent(code)
+    return build_cfgs(ast.parse(code), code)[0]
+
+
+def edges(cfg):
+    """(kaynak ilk deyim, hedef ilk deyim, etiket) kümeleri"""
+    first = {b["id"]: b["statements"][0] for b in cfg["blocks"]}
+    return {(first[a], first[b], label) for a, b, label in cfg["edges"]}
+
+
+def test_return_inside_try_runs_finally():
+    cfg = cfg_of("""
+        def f(x):
+            try:
+                return g(x)
+            finally:
+                cleanup()
+    """)
+    assert edges(cfg) == {
+        ("f(x)", "try", None),
+        ("try", "finally", "return"),
+        ("finally", "return", "return"),
+    }
+
+
+def test_break_and_continue_inside_try_go_through_finally():
+    cfg = cfg_of("""
+        def f(items):
+            for item in items:
+                try:
+                    if item:
+                        break
+                    continue
+                finally:
+                    log(item)
+            return 1
+    """)
+    found = edges(cfg)
+    assert ("break", "finally", "break") in found
+    assert ("continue", "finally", "continue") in found
+    assert ("finally", "return 1", "break") in found
+    assert ("finally", "for item in items", "continue") in found
+    assert not any(src in ("break", "continue") and dst != "finally" for src, dst, _ in found)
+
+
+def test_raise_in_handler_goes_through_finally_to_outer_handler():
+    cfg = cfg_of("""
+        def f():
+            try:
+                try:
+                    work()
+                except ValueError:
+                    raise
+                finally:
+                    close()
+            except Exception:
+                recover()
+    """)
+    found = edges(cfg)
+    assert ("except ValueError", "finally", "raise") in found
+    assert ("finally", "except", "raise") in found
+
+
+def test_loop_else_is_skipped_by_break():
+    cfg = cfg_of("""
+        def f(items):
+            for item in items:
+                if item:
+                    break
+            else:
+                missing()
+            return item
+    """)
+    found = edges(cfg)
+    assert ("for item in items", "missing()", "done") in found
+    assert ("break", "return item", "break") in found
+    assert ("missing()", "return item", None) in found
+
+
+def test_match_cases_and_fallthrough():
+    cfg = cfg_of("""
+        def f(command):
+            match command:
+                case "go":
+                    go()
+                case [x, y]:
+                    move(x, y)
+            stop()
+    """)
+    found = edges(cfg)
+    assert ('match command', 'go()', '"go"') in found
+    assert ("match command", "move(x, y)", "[x, y]") in found
+    assert ("match command", "stop()", "no match") in found
+
+
+def test_exhaustive_match_has_no_fallthrough_edge():
+    cfg = cfg_of("""
+        def f(value):
+            match value:
+                case 0:
+                    return "zero"
+                case _:
+                    return "other"
+    """)
+    assert not any(label == "no match" for _, _, label in cfg["edges"])
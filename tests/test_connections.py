@@ -0,0 +1,41 @@
+import asyncio
+import json
+
+from app.connections import RedisBackplane
+
+
+class FakePubSub:
+    def __init__(self, items):
+        self.items = items
+        self.closed = False
+
+    async def listen(self):
+        for item in self.items:
+            yield item
+
+    async def close(self):
+        self.closed = True
+
+
+def message(data):
+    return {"type": "message", "data": data}
+
+
+def test_listener_skips_malformed_messages(capsys):
+    backplane = RedisBackplane("redis://unused")
+    good = {"origin": "other", "target": "c1", "message": "hello"}
+    pubsub = FakePubSub([
+        {"type": "subscribe", "data": 1},
+        message(b"{not json"),
+        message(json.dumps({"target": "c1"})),            # origin yok
+        message(json.dumps(["origin", "message"])),       # sözlük değil
+        message(None),
+        message(json.dumps(good)),
+        message(json.dumps({**good, "origin": backplane.origin})),   # kendi yayını
+        message(json.dumps({**good, "target": None, "message": "all"})),
+    ])
+    delivered = []
+    asyncio.run(backplane._listen(pubsub, lambda target, text: delivered.append((target, text))))
+    assert delivered == [("c1", "hello"), (None, "all")]
+    assert pubsub.closed
+    assert capsys.readouterr().out.count("geçersiz mesaj") == 4
@@ -0,0 +1,126 @@
+import asyncio
+import difflib
+
+import pytest
+
+from utils.diff_analysis import DiffAnalyzer, DiffError, affected_scopes, apply_hunks, parse_unified_diff
+
+BASE = """\
+import os
+
+
+def load(path):
+    data = open(path).read()
+    return eval(data)
+
+
+def save(path, value):
+    with open(path, "w") as f:
+        f.write(repr(value))
+
+
+CONFIG = load("config.txt")
+"""
+
+
+def make_diff(base, head):
+    return "".join(difflib.unified_diff(base.splitlines(keepends=True), head.splitlines(keepends=True),
+                                        "a/app.py", "b/app.py", n=1))
+
+
+def scopes_for(head):
+    hunks = parse_unified_diff(make_diff(BASE, head))
+    assert apply_hunks(BASE, hunks) == head
+    return {s["name"]: s for s in affected_scopes(head, "python", hunks)}
+
+
+def test_change_inside_function_maps_to_that_function():
+    scopes = scopes_for(BASE.replace("f.write(repr(value))", "f.write(str(value))"))
+    assert list(scopes) == ["save"]
+    assert scopes["save"]["start_line"] == 9
+    assert scopes["save"]["text"].startswith("def save(path, value):")
+
+
+def test_deletion_inside_function_maps_to_that_function():
+    scopes = scopes_for(BASE.replace("    data = open(path).read()\n", ""))
+    assert list(scopes) == ["load"]
+
+
+def test_module_level_additions_form_their_own_block():
+    head = BASE.replace('CONFIG = load("config.txt")\n', 'CONFIG = load("config.txt")\nDEBUG = True\nLEVEL = 2\n')
+    scopes = scopes_for(head)
+    assert list(scopes) == ["<module:15>"]
+    assert scopes["<module:15>"]["kind"] == "module"
+    assert scopes["<module:15>"]["text"] == "DEBUG = True\nLEVEL = 2"
+
+
+def test_mismatched_context_is_rejected():
+    diff = make_diff(BASE, BASE.replace("import os", "import sys"))
+    with pytest.raises(DiffError):
+        apply_hunks(BASE.replace("import os", "import json"), parse_unified_diff(diff))
+
+
+class EvalAnalyzer:
+    """Her eval( satırı için bir güvenlik bulgusu döndüren sahte analizör"""
+
+    async def analyze_comprehensive(self, code, language):
+        issues = [{"type": "eval", "message": "eval is dangerous"} for line in code.splitlines() if "eval(" in line]
+        return {"security_issues": issues, "performance_tips": []}
+
+
+def analyze(base, head):
+    return asyncio.run(DiffAnalyzer(EvalAnalyzer()).analyze(base, make_diff(base, head), "python"))
+
+
+def test_module_block_is_not_compared_with_function_deletions():
+    # Aynı hunk'ta fonksiyondaki eval satırı değişiyor ve modül düzeyine satır ekleniyor
+    base = "def f(x):\n    return eval(x)\nA = 1\n"
+    head = "def f(x):\n    return eval(x.strip())\nA = 1\nB = 2\n"
+    result = analyze(base, head)
+    assert [s["name"] for s in result["scopes"]] == ["f", "<module:4>"]
+    assert result["resolved"] == []
+    assert [(f["scope"], f["introduced"]) for f in result["findings"]] == [("f", False)]
+
+
+def test_module_block_compares_with_its_own_replaced_lines():
+    base = "def f(x):\n    return x\nA = eval('1')\n"
+    head = "def f(x):\n    return x\nA = 1\n"
+    result = analyze(base, head)
+    assert result["findings"] == []
+    assert [(r["scope"], r["type"]) for r in result["resolved"]] == [("<module:3>", "eval")]
+
+
+def test_module_blocks_in_one_hunk_do_not_share_deleted_lines():
+    base = "A = eval('1')\nX = 0\nB = 2\n"
+    head = "A = 1\nX = 0\nB = 2\nC = 3\n"
+    result = analyze(base, head)
+    assert len(result["hunks"]) == 1
+    assert [(r["scope"], r["type"]) for r in result["resolved"]] == [("<module:1>", "eval")]
+
+
+def test_deleted_function_findings_are_resolved():
+    base = "def f(x):\n    return x\n\n\ndef g(s):\n    return eval(s)\n"
+    head = "def f(x):\n    return x\n"
+    result = analyze(base, head)
+    assert [(s["name"], s["kind"], s["base_start_line"], s["base_end_line"]) for s in result["scopes"]] == \
+        [("<deleted:3>", "deleted", 3, 6)]
+    assert result["hunks"][0]["scopes"] == ["<deleted:3>"]
+    assert [(r["scope"], r["type"]) for r in result["resolved"]] == [("<deleted:3>", "eval")]
+    assert result["findings"] == []
+
+
+def test_function_replaced_by_module_code_is_resolved_once():
+    base = "A = 1\ndef g(s):\n    return eval(s)\nB = 2\n"
+    head = "A = 1\nC = 3\nB = 2\n"
+    result = analyze(base, head)
+    assert sorted(s["name"] for s in result["scopes"]) == ["<deleted:2>", "<module:2>"]
+    assert [(r["scope"], r["type"]) for r in result["resolved"]] == [("<deleted:2>", "eval")]
+
+
+def test_module_level_deletion_is_resolved_and_surviving_function_is_not_duplicated():
+    base = "X = eval('1')\nY = 2\n\n\ndef f(s):\n    print(s)\n    return eval(s)\n"
+    head = "Y = 2\n\n\ndef f(s):\n    return eval(s)\n"
+    result = analyze(base, head)
+    assert sorted(s["name"] for s in result["scopes"]) == ["<deleted:1>", "f"]
+    assert [(r["scope"], r["type"]) for r in result["resolved"]] == [("<deleted:1>", "eval")]
+    assert [(f["scope"], f["introduced"]) for f in result["findings"]] == [("f", False)]
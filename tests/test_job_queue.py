@@ -0,0 +1,137 @@
+import sqlite3
+
+import pytest
+
+from utils import job_queue
+from utils.job_queue import CANCELLED, FAILED, QUEUED, RUNNING, SUCCEEDED, SQLiteJobStore, job_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(job_queue.time, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    return SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def submit(store, payload=None, max_attempts=3, ttl=60):
+    payload = payload or {"code": "x = 1", "language": "python"}
+    return store.submit("analyze", payload, job_key("analyze", payload), max_attempts, ttl)
+
+
+def test_same_payload_is_deduplicated_while_pending_or_fresh(store, clock):
+    job, existing = submit(store)
+    assert not existing and job["status"] == QUEUED
+    again, existing = submit(store)
+    assert existing and again["id"] == job["id"]
+    other, existing = submit(store, {"code": "y = 2", "language": "python"})
+    assert not existing and other["id"] != job["id"]
+
+    claimed = store.claim(lease=30)
+    assert submit(store)[0]["id"] == job["id"]          # çalışırken de aynı iş
+    assert store.complete(job["id"], claimed["lease_token"], {"ok": True})
+    assert submit(store)[0]["id"] == job["id"]          # sonuç süresi dolmadan önbellek
+
+    clock.now += 61
+    fresh, existing = submit(store)
+    assert not existing and fresh["id"] != job["id"]
+
+
+def test_cancelled_jobs_are_not_reused(store):
+    job, _ = submit(store)
+    assert store.cancel(job["id"])
+    assert store.get(job["id"])["status"] == CANCELLED
+    assert submit(store)[0]["id"] != job["id"]
+
+
+def test_claim_is_exclusive_until_lease_expires(store, clock):
+    job, _ = submit(store)
+    claimed = store.claim(lease=30)
+    assert claimed["id"] == job["id"] and claimed["status"] == RUNNING and claimed["attempts"] == 1
+    assert store.claim(lease=30) is None
+
+    clock.now += 31                                     # işçi çöktü, kira doldu
+    reclaimed = store.claim(lease=30)
+    assert reclaimed["id"] == job["id"] and reclaimed["attempts"] == 2
+    assert not store.cancel(job["id"])                  # başlamış iş iptal edilemez
+
+
+def test_expired_lease_without_attempts_left_fails(store, clock):
+    job, _ = submit(store, max_attempts=1)
+    store.claim(lease=30)
+    clock.now += 31
+    assert store.claim(lease=30) is None
+    failed = store.get(job["id"])
+    assert failed["status"] == FAILED and failed["error"] == "Worker lease expired"
+
+
+def test_failed_job_is_retried_after_delay_until_attempts_run_out(store, clock):
+    job, _ = submit(store, max_attempts=2)
+    claimed = store.claim(lease=30)
+    store.fail(job["id"], claimed["lease_token"], "timeout", retry_delay=5)
+    assert store.get(job["id"])["status"] == QUEUED
+    assert store.claim(lease=30) is None                # gecikme dolmadı
+
+    clock.now += 5
+    claimed = store.claim(lease=30)
+    assert claimed["attempts"] == 2
+    store.fail(job["id"], claimed["lease_token"], "timeout again", retry_delay=5)
+    final = store.get(job["id"])
+    assert final["status"] == FAILED and final["error"] == "timeout again"
+
+
+def test_permanent_error_fails_immediately(store):
+    job, _ = submit(store)
+    claimed = store.claim(lease=30)
+    store.fail(job["id"], claimed["lease_token"], "bad input", retry_delay=None)
+    assert store.get(job["id"])["status"] == FAILED
+
+
+def test_results_expire_and_are_purged(store, clock):
+    job, _ = submit(store, ttl=10)
+    claimed = store.claim(lease=30)
+    store.complete(job["id"], claimed["lease_token"], {"issues": []})
+    assert store.get(job["id"])["status"] == SUCCEEDED
+    assert store.get(job["id"])["result"] == {"issues": []}
+    clock.now += 11
+    assert store.purge_expired() == 1
+    assert store.get(job["id"]) is None
+
+
+def test_worker_with_expired_lease_cannot_overwrite_reclaimed_job(store, clock):
+    job, _ = submit(store)
+    stale = store.claim(lease=30)
+    clock.now += 31                                     # ilk işçi yavaş kaldı, iş yeniden kiralandı
+    current = store.claim(lease=30)
+    assert current["lease_token"] != stale["lease_token"]
+
+    assert not store.complete(job["id"], stale["lease_token"], {"worker": "stale"})
+    assert not store.fail(job["id"], stale["lease_token"], "late error", retry_delay=None)
+    assert store.get(job["id"])["status"] == RUNNING
+
+    assert store.complete(job["id"], current["lease_token"], {"worker": "current"})
+    assert store.get(job["id"])["result"] == {"worker": "current"}
+    assert not store.complete(job["id"], stale["lease_token"], {"worker": "stale"})
+    assert store.get(job["id"])["result"] == {"worker": "current"}
+
+
+def test_existing_database_gains_lease_token_column(tmp_path, clock):
+    path = str(tmp_path / "old.sqlite3")
+    with sqlite3.connect(path) as db:
+        db.executescript(SQLiteJobStore._SCHEMA.replace("lease_token TEXT,", ""))
+    store = SQLiteJobStore(path)
+    job, _ = submit(store)
+    claimed = store.claim(lease=30)
+    assert claimed["lease_token"] and store.complete(job["id"], claimed["lease_token"], {})
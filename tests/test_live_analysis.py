@@ -0,0 +1,65 @@
+import asyncio
+import re
+
+import pytest
+
+from utils.code2flow import Code2FlowGenerator
+from utils.code_analyzer import CodeAnalyzer
+from utils.live_analysis import LiveAnalyzer, LiveDocument, split_regions
+
+CODE = """\
+import os
+
+
+def load(path):
+    data = open(path).read()
+    if data:
+        return data
+    return None
+
+
+class Store:
+    def put(self, item):
+        for x in item:
+            print(x)
+"""
+
+
+@pytest.fixture
+def generator():
+    return Code2FlowGenerator()
+
+
+def labels(mermaid):
+    return sorted(re.findall(r"<i>L([\d-]+)</i>", mermaid))
+
+
+def live_diagram(document, generator):
+    asyncio.run(LiveAnalyzer(CodeAnalyzer(), generator).analyze(document))
+    return "\n".join(document.diagram)
+
+
+def test_regions_cover_the_document():
+    regions = split_regions(CODE, "python")
+    assert [(r["name"], r["start_line"]) for r in regions] == [("<module:import os>", 1), ("load", 4), ("Store", 11)]
+
+
+def test_live_diagram_uses_document_line_numbers(generator):
+    full = asyncio.run(generator.generate_flow(CODE, "python"))["mermaid_code"]
+    live = live_diagram(LiveDocument("doc", "python", CODE), generator)
+    assert labels(live) == labels(full) == ["14", "5", "7", "8"]
+    assert live.splitlines() == full.splitlines()
+
+
+def test_cached_regions_are_shifted_when_lines_move(generator):
+    document = LiveDocument("doc", "python", CODE)
+    analyzer = LiveAnalyzer(CodeAnalyzer(), generator)
+    asyncio.run(analyzer.analyze(document))
+
+    # Üste iki satır: load ve Store bölgeleri değişmedi (önbellekten gelir) ama iki satır kaydı
+    document.apply_edits([{"range": {"start": {"line": 1, "character": 0}, "end": {"line": 1, "character": 0}},
+                           "text": "import re\nimport sys\n"}])
+    _, analyzed = asyncio.run(analyzer.analyze(document))
+    assert analyzed == 1
+    full = asyncio.run(generator.generate_flow(document.text, "python"))["mermaid_code"]
+    assert labels("\n".join(document.diagram)) == labels(full) == ["10", "16", "7", "9"]
@@ -0,0 +1,234 @@
+import asyncio
+import time
+
+import pytest
+
+from utils import llm_scheduler
+from utils.llm_scheduler import CircuitBreaker, CircuitOpenError, LLMScheduler, SchedulerOverloaded, TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(llm_scheduler.time, "monotonic", fake)
+    return fake
+
+
+def test_token_bucket_spends_capacity_then_refills_at_rate(clock):
+    bucket = TokenBucket(rate=2.0, capacity=3.0)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    clock.now += 0.5
+    assert bucket.try_acquire() and not bucket.try_acquire()
+    clock.now += 60
+    assert bucket.try_acquire(3.0)
+
+
+def test_circuit_breaker_opens_half_opens_and_closes(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now += 10
+    assert breaker.state == "half_open"
+    assert breaker.allow()          # tek deneme isteği
+    assert not breaker.allow()
+    breaker.record_failure()        # deneme başarısız: yeniden açık
+    assert breaker.state == "open"
+
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_request_rate_is_limited():
+    async def main():
+        async def call(payload):
+            return payload
+
+        # 1200/dk = saniyede 20 istek, kova kapasitesi 20
+        scheduler = LLMScheduler(call, requests_per_minute=1200, hedge_percentile=None)
+        started = time.monotonic()
+        results = await asyncio.gather(*(scheduler.submit(i) for i in range(25)))
+        elapsed = time.monotonic() - started
+        await scheduler.aclose()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(main())
+    assert results == list(range(25))
+    # İlk 20 istek hemen, kalan 5 istek 20/sn hızla gelen jetonları bekler
+    assert elapsed >= 0.2
+
+
+def test_open_circuit_rejects_without_calling_provider():
+    calls = []
+
+    async def main():
+        async def call(payload):
+            calls.append(payload)
+            raise ConnectionError("provider down")
+
+        scheduler = LLMScheduler(call, failure_threshold=2, reset_timeout=60, max_retries=0,
+                                 hedge_percentile=None)
+        errors = []
+        for i in range(4):
+            try:
+                await scheduler.submit(i)
+            except Exception as e:
+                errors.append(type(e))
+        stats = scheduler.stats()
+        await scheduler.aclose()
+        return errors, stats
+
+    errors, stats = asyncio.run(main())
+    assert errors == [ConnectionError, ConnectionError, CircuitOpenError, CircuitOpenError]
+    assert calls == [0, 1]
+    assert stats["circuit"] == "open" and stats["circuit_rejected"] == 2
+
+
+def test_retryable_errors_are_retried():
+    attempts = []
+
+    async def main():
+        async def call(payload):
+            attempts.append(payload)
+            if len(attempts) < 3:
+                raise ConnectionError("reset")
+            return "ok"
+
+        scheduler = LLMScheduler(call, backoff_base=0.001, backoff_max=0.01, hedge_percentile=None)
+        result = await scheduler.submit("x")
+        stats = scheduler.stats()
+        await scheduler.aclose()
+        return result, stats
+
+    result, stats = asyncio.run(main())
+    assert result == "ok" and len(attempts) == 3
+    assert stats["retries"] == 2 and stats["circuit"] == "closed"
+
+
+def test_full_queue_is_rejected_and_interactive_lane_goes_first():
+    async def main():
+        gate = asyncio.Event()
+        order = []
+
+        async def call(payload):
+            await gate.wait()
+            order.append(payload)
+            return payload
+
+        scheduler = LLMScheduler(call, max_concurrency=1, queue_limit=2, hedge_percentile=None)
+        first = asyncio.ensure_future(scheduler.submit("busy"))
+        await asyncio.sleep(0.01)   # tek işçi ilk isteği aldı
+        queued = [asyncio.ensure_future(scheduler.submit("batch-1", lane="batch")),
+                  asyncio.ensure_future(scheduler.submit("batch-2", lane="batch"))]
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerOverloaded):
+            await scheduler.submit("batch-3", lane="batch")
+        queued.append(asyncio.ensure_future(scheduler.submit("chat", lane="interactive")))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(first, *queued)
+        await scheduler.aclose()
+        return order
+
+    assert asyncio.run(main()) == ["busy", "chat", "batch-1", "batch-2"]
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_client_errors_do_not_open_the_circuit():
+    async def main():
+        async def call(payload):
+            raise ProviderError(400 if payload == "bad" else 422)
+
+        scheduler = LLMScheduler(call, failure_threshold=2, hedge_percentile=None)
+        for payload in ("bad", "invalid", "bad", "invalid"):
+            with pytest.raises(ProviderError):
+                await scheduler.submit(payload)
+        stats = scheduler.stats()
+        await scheduler.aclose()
+        return stats
+
+    stats = asyncio.run(main())
+    assert stats["circuit"] == "closed" and stats["retries"] == 0 and stats["circuit_rejected"] == 0
+
+
+def open_circuit(scheduler):
+    scheduler.breaker.failures = scheduler.breaker.failure_threshold
+    scheduler.breaker.opened_at = time.monotonic() - scheduler.breaker.reset_timeout
+
+
+def test_cancelled_trial_request_admits_the_next_one():
+    async def main():
+        gate = asyncio.Event()
+
+        async def call(payload):
+            await gate.wait()
+            return payload
+
+        scheduler = LLMScheduler(call, failure_threshold=1, reset_timeout=60, hedge_percentile=None)
+        open_circuit(scheduler)
+        assert scheduler.breaker.state == "half_open"
+
+        trial = asyncio.ensure_future(scheduler.submit("trial"))
+        await asyncio.sleep(0.01)       # deneme isteği sağlayıcıda bekliyor
+        with pytest.raises(CircuitOpenError):
+            await scheduler.submit("second")
+        trial.cancel()
+        await asyncio.sleep(0.01)
+
+        gate.set()
+        result = await scheduler.submit("next")
+        state = scheduler.breaker.state
+        await scheduler.aclose()
+        return result, state
+
+    assert asyncio.run(main()) == ("next", "closed")
+
+
+def test_trial_cancelled_while_queued_or_rejected_as_overload_is_released():
+    async def main():
+        gate = asyncio.Event()
+
+        async def call(payload):
+            await gate.wait()
+            return payload
+
+        scheduler = LLMScheduler(call, max_concurrency=1, queue_limit=1, hedge_percentile=None)
+        busy = asyncio.ensure_future(scheduler.submit("busy"))
+        await asyncio.sleep(0.01)
+        filler = asyncio.ensure_future(scheduler.submit("filler"))
+        await asyncio.sleep(0)
+
+        open_circuit(scheduler)
+        with pytest.raises(SchedulerOverloaded):
+            await scheduler.submit("overload")   # kuyruk dolu: deneme hakkı tüketilmez
+        filler.cancel()
+        await asyncio.sleep(0)
+        trial = asyncio.ensure_future(scheduler.submit("trial"))
+        await asyncio.sleep(0)
+        trial.cancel()                           # kuyruktayken iptal
+        await asyncio.sleep(0)
+
+        gate.set()
+        result = await scheduler.submit("next")
+        await asyncio.gather(busy, filler, trial, return_exceptions=True)
+        await scheduler.aclose()
+        return result
+
+    assert asyncio.run(main()) == "next"
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+
+from utils.llm_transport import CassetteStore, RecordingTransport, ReplayTransport
+
+
+class EchoTransport:
+    available = True
+
+    async def complete(self, request):
+        text = request["messages"][-1]["content"]
+        return {"id": "r", "model": request["model"],
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text.upper()},
+                             "finish_reason": "stop"}]}
+
+    async def aclose(self):
+        pass
+
+
+def request(text):
+    return {"model": "m", "messages": [{"role": "user", "content": text}]}
+
+
+def test_recording_writes_off_the_event_loop_and_replays(tmp_path):
+    path = str(tmp_path / "cassettes" / "run.jsonl.gz")
+    store = CassetteStore(path)
+    writers = []
+    append = store.append
+
+    def tracked_append(*args):
+        writers.append(threading.current_thread())
+        append(*args)
+
+    store.append = tracked_append
+
+    async def main():
+        transport = RecordingTransport(EchoTransport(), store)
+        await asyncio.gather(*(transport.complete(request(f"q{i}")) for i in range(20)))
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(main())
+    assert len(writers) == 20 and loop_thread not in writers
+
+    # Eşzamanlı eklemeler okunabilir ayrı gzip üyeleri olarak kalır
+    reloaded = CassetteStore(path)
+    assert len(reloaded) == 20
+    replay = ReplayTransport(reloaded, latency_scale=0)
+    response = asyncio.run(replay.complete(request("q7")))
+    assert response.choices[0].message.content == "Q7" and replay.hits == 1
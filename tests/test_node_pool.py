@@ -0,0 +1,69 @@
+import asyncio
+import shutil
+
+import pytest
+
+from utils.node_pool import NodeWorkerPool
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="Node.js not installed")
+
+
+def run_all(*snippets, stdin=None):
+    async def main():
+        pool = NodeWorkerPool(size=1)
+        try:
+            return [await pool.run(code, stdin, timeout=2.0) for code in snippets]
+        finally:
+            await pool.aclose()
+
+    return asyncio.run(main())
+
+
+def test_context_does_not_expose_host_process():
+    escapes = [
+        "this.constructor.constructor('return process')()",
+        "console.log.constructor('return process')()",
+        "setTimeout.constructor('return process')()",
+    ]
+    results = run_all(*[f"try {{ {code}; console.log('escaped') }} catch (e) {{ console.log(e.name) }}"
+                        for code in escapes])
+    assert [r["output"] for r in results] == ["EvalError\n"] * len(escapes)
+
+
+def test_errors_from_sandbox_apis_are_context_objects():
+    code = ("try { require('fs') } catch (e) {"
+            " try { e.constructor.constructor('return process')(); console.log('escaped') }"
+            " catch (inner) { console.log(inner.name) } }")
+    assert run_all(code)[0]["output"] == "EvalError\n"
+
+
+def test_jobs_do_not_share_state():
+    poison = "process.stdout.write = () => {}; globalThis.leak = 'x'; console.log = () => {}"
+    results = run_all(poison, "console.log('secret', typeof leak)")
+    assert results[1]["output"] == "secret undefined\n"
+
+
+@pytest.mark.parametrize("module", ["fs", "fs/promises", "node:child_process", "net", "./local"])
+def test_require_is_an_allowlist(module):
+    result = run_all(f"require({module!r})")[0]
+    assert result["exit_code"] == 1
+    assert "not available in the sandbox" in result["errors"]
+
+
+def test_no_host_globals_in_context():
+    output = run_all("console.log(typeof Buffer, typeof TextEncoder, typeof URL)")[0]["output"]
+    assert output == "undefined undefined undefined\n"
+
+
+def test_allowed_modules_and_stdin():
+    code = """
+const rl = require('readline').createInterface({ input: process.stdin });
+const EventEmitter = require('events');
+const emitter = new EventEmitter();
+emitter.on('line', (line) => console.log(require('util').format('%s!', line)));
+rl.on('line', (line) => emitter.emit('line', line));
+rl.on('close', () => require('assert').strictEqual(1, 1));
+"""
+    result = run_all(code, stdin="a\nb\n")[0]
+    assert result["output"] == "a!\nb!\n"
+    assert result["exit_code"] == 0
@@ -0,0 +1,88 @@
+import contextlib
+import io
+
+import pytest
+
+from utils.perf_rewriter import optimize_python
+
+
+def run(code):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        try:
+            exec(compile(code, "<test>", "exec"), {})
+        except Exception as e:
+            print(type(e).__name__)
+    return out.getvalue()
+
+
+def rules(result):
+    return [r["rule"] for r in result["rewrites"]]
+
+
+def hints(result):
+    return [s["rule"] for s in result["suggestions"]]
+
+
+UNKNOWN_TYPE = [
+    # int anahtarlı dict: d[i] anahtar araması, enumerate(d) ise anahtarları verir
+    ("d = {0: 'a', 1: 'b', 2: 'c'}\n"
+     "for i in range(len(d)):\n"
+     "    print(i, d[i])\n", "range_len_to_enumerate"),
+    ("def show(items):\n"
+     "    for i in range(len(items)):\n"
+     "        print(items[i])\n"
+     "show({1: 'x', 0: 'y'})\n", "range_len_to_enumerate"),
+    # Listelenemeyen sol taraf: set üyeliği TypeError verir
+    ("rows = [[1], [2]]\n"
+     "for row in rows:\n"
+     "    print(row in [1, 2, 3])\n", "list_membership_to_set"),
+    ("ALLOWED = ['a', 'b', 'c']\n"
+     "def check(values):\n"
+     "    for v in values:\n"
+     "        print(v in ALLOWED)\n"
+     "check([['a'], 'b'])\n", "list_membership_to_set"),
+]
+
+
+@pytest.mark.parametrize("code, rule", UNKNOWN_TYPE)
+def test_unproven_rewrites_become_suggestions(code, rule):
+    result = optimize_python(code)
+    assert result["code"] == code
+    assert rule not in rules(result)
+    assert rule in hints(result)
+    assert run(result["code"]) == run(code)
+
+
+KNOWN_TYPE = [
+    ("names = ['ab', 'cd', 'ef']\n"
+     "for i in range(len(names)):\n"
+     "    print(i, names[i])\n", "range_len_to_enumerate"),
+    ("text = 'hello'\n"
+     "for i in range(len(text)):\n"
+     "    print(text[i])\n", "range_len_to_enumerate"),
+    ("for n in range(10):\n"
+     "    print(n in [2, 3, 5, 7])\n", "list_membership_to_set"),
+    ("PRIMES = [2, 3, 5, 7]\n"
+     "for w in ['x', 'abc', 'y']:\n"
+     "    print(len(w) in PRIMES, w.upper())\n", "list_membership_to_set"),
+]
+
+
+@pytest.mark.parametrize("code, rule", KNOWN_TYPE)
+def test_proven_rewrites_keep_output(code, rule):
+    result = optimize_python(code)
+    assert rule in rules(result)
+    assert result["code"] != code
+    assert run(result["code"]) == run(code)
+
+
+def test_suggestions_are_reported_once_with_original_lines():
+    code = ("import re\n"
+            "def f(d):\n"
+            "    for i in range(len(d)):\n"
+            "        print(re.match('a+', d[i]))\n")
+    result = optimize_python(code)
+    assert rules(result) == ["hoist_regex_compile"]
+    assert [(s["line"], s["rule"]) for s in result["suggestions"]] == [(3, "range_len_to_enumerate")]
+    assert result["suggestions"][0]["message"].startswith("Line 3:")
@@ -0,0 +1,73 @@
+import pytest
+
+from utils.semantic_cache import SemanticCache, compatible_terms, content_terms
+
+
+@pytest.fixture
+def cache():
+    return SemanticCache(max_entries=16)
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("What is the difference between list and tuple?", "What is the difference between list and set?"),
+    ("convert list to tuple", "convert tuple to list"),
+    ("how to sort a list ascending", "how to sort a list descending"),
+    ("explain decorators", "explain generators"),
+    ("how to sort a list", "how not to sort a list"),
+    ("explain list comprehension", "explain list comprehensions with examples and edge cases"),
+])
+def test_near_miss_questions_are_not_served(cache, cached, asked):
+    cache.set(cached, "answer")
+    assert cache.get(asked) is None
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("How do I reverse a list in Python?", "how do i reverse a list in python"),
+    ("Can you explain the decorators?", "explain decorators please"),
+    ("explain this recursion", "explain recursion"),
+    ("how do I reverse a list in python", "how do I reverse a python list"),
+    ("how to read a file line by line", "how to read a file line by line in python"),
+])
+def test_near_duplicate_questions_hit(cache, cached, asked):
+    cache.set(cached, "answer")
+    hit = cache.get(asked)
+    assert hit is not None and hit[0] == "answer"
+    assert hit[1] >= cache.threshold
+
+
+def test_cosine_threshold_still_decides(cache):
+    strict = SemanticCache(max_entries=16, threshold=0.95)
+    for c in (cache, strict):
+        c.set("explain this recursion", "answer")
+    assert cache.get("explain recursion") is not None
+    assert strict.get("explain recursion") is None
+    assert strict.get("Explain this recursion, please") is not None
+
+
+def test_best_compatible_candidate_wins(cache):
+    cache.set("what is the difference between list and set", "set answer")
+    cache.set("what is the difference between list and tuple", "tuple answer")
+    assert cache.get("difference between a list and a tuple")[0] == "tuple answer"
+
+
+def test_entries_only_match_within_scope(cache):
+    cache.set("what does this function do", "answer", scope="code-a")
+    assert cache.get("what does this function do", scope="code-b") is None
+    assert cache.get("what does this function do", scope="code-a")[0] == "answer"
+
+
+def test_same_question_replaces_its_entry(cache):
+    cache.set("explain decorators", "old")
+    cache.set("Explain the decorators!", "new")
+    assert cache.stats()["entries"] == 1
+    assert cache.get("explain decorators")[0] == "new"
+
+
+def test_content_terms_and_guard():
+    assert content_terms("Can you explain THIS recursion, please?") == ("explain", "this", "recursion")
+    assert content_terms("lists") == content_terms("list")
+    terms = content_terms
+    assert compatible_terms(terms("explain this recursion"), terms("explain recursion"), 0.6)
+    assert not compatible_terms(terms("list and tuple"), terms("list and set"), 0.6)
+    assert not compatible_terms(terms("convert list to tuple"), terms("convert tuple to list"), 0.6)
+    assert not compatible_terms(terms("reverse"), terms("reverse list python quickly"), 0.6)
@@ -0,0 +1,107 @@
+import textwrap
+
+import pytest
+
+from utils.symbol_index import SymbolIndex, module_name
+
+FILES = {
+    "shop/__init__.py": """
+        from .models import Order
+        from shop.billing import *
+    """,
+    "shop/models.py": """
+        class Base:
+            def save(self):
+                return validate(self)
+
+        def validate(obj):
+            return True
+
+        class Order(Base):
+            def total(self):
+                return 0
+    """,
+    "shop/billing.py": """
+        from shop.models import Order as _Order
+
+        __all__ = ["charge"]
+
+        def charge(order):
+            return order.total()
+    """,
+    "shop/store.py": """
+        import json
+
+        class Repository:
+            def put(self, item):
+                return json.dumps(item)
+
+        class Service:
+            def __init__(self):
+                self.repo = Repository()
+
+            def checkout(self):
+                self.repo.put({})
+    """,
+    "app/views.py": """
+        from shop import Order, charge
+        import shop
+
+        def checkout():
+            order = Order()
+            order.save()
+            order.total()
+            charge(order)
+            shop.charge(order)
+    """,
+}
+
+
+@pytest.fixture
+def index():
+    index = SymbolIndex()
+    index.update({path: textwrap.dedent(source) for path, source in FILES.items()})
+    return index
+
+
+def callees(index, symbol):
+    return [(edge["symbol"], edge["external"]) for edge in index.callees(symbol)]
+
+
+def test_module_names_from_paths():
+    assert module_name("app/services.py") == "app.services"
+    assert module_name("./pkg/__init__.py") == "pkg"
+
+
+def test_calls_resolve_through_package_reexports(index):
+    found = callees(index, "app.views.checkout")
+    # from shop import Order -> shop/__init__ -> shop.models.Order
+    assert ("shop.models.Order", False) in found
+    # from shop.billing import * ile paketten dışa aktarılan fonksiyon, hem adla hem modül üzerinden
+    assert found.count(("shop.billing.charge", False)) == 2
+
+
+def test_instance_calls_resolve_through_base_classes(index):
+    found = callees(index, "app.views.checkout")
+    assert ("shop.models.Base.save", False) in found     # Order'da yok, tabanından
+    assert ("shop.models.Order.total", False) in found
+    assert [c["symbol"] for c in index.callers("shop.models.Base.save")] == ["app.views.checkout"]
+
+
+def test_self_attribute_calls_use_the_assigned_type(index):
+    assert callees(index, "shop.store.Service.checkout") == [("shop.store.Repository.put", False)]
+    assert callees(index, "shop.store.Repository.put") == [("json.dumps", True)]
+
+
+def test_resolve_name_and_call_graph(index):
+    assert index.resolve_name("app/views.py", "Order") == "shop.models.Order"
+    assert index.resolve_name("shop/billing.py", "_Order") == "shop.models.Order"
+    graph = index.call_graph("app.views.checkout", depth=2)
+    assert ["shop.models.Base.save", "shop.models.validate"] in graph["edges"]
+    assert not any(node.get("external") for node in graph["nodes"].values())
+
+
+def test_update_relinks_changed_file(index):
+    index.update({"shop/models.py": "class Order:\n    def total(self):\n        return 1\n"})
+    assert index.lookup("save") == []
+    assert ("shop.models.Order.total", False) in callees(index, "app.views.checkout")
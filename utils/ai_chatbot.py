@@ -1,338 +1,575 @@
-import json
-import uuid
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-import asyncio
-import os
-
-class AIChatbot:
-    def __init__(self):
-        self.api_key = os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
-            self.client = None
-            print("OpenAI API key bulunamadı! AI özellikleri demo modunda çalışacak.")
-        else:
-            try:
-                from openai import OpenAI
-                self.client = OpenAI(api_key=self.api_key)
-            except ImportError:
-                self.client = None
-                print("OpenAI paketi bulunamadı! pip install openai komutu ile yükleyin.")
-        
-        self.conversations = {}
-        
-        # Function definitions for OpenAI Function Calling
-        self.functions = [
-            {
-                "type": "function",
-                "function": {
-                    "name": "analyze_code_quality",
-                    "description": "Kod kalitesini analiz eder ve iyileştirme önerileri sunar",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "code": {"type": "string", "description": "Analiz edilecek kod"},
-                            "language": {"type": "string", "description": "Programlama dili"},
-                            "focus": {"type": "string", "enum": ["security", "performance", "readability", "all"]}
-                        },
-                        "required": ["code", "language"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "suggest_refactoring",
-                    "description": "Kod refaktörü önerileri sunar",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "code": {"type": "string", "description": "Refaktör edilecek kod"},
-                            "language": {"type": "string", "description": "Programlama dili"},
-                            "strategy": {"type": "string", "enum": ["performance", "maintainability", "security"]}
-                        },
-                        "required": ["code", "language"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "generate_code_flow",
-                    "description": "Kod akış diyagramı oluşturur",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "code": {"type": "string", "description": "Diyagram oluşturulacak kod"},
-                            "language": {"type": "string", "description": "Programlama dili"},
-                            "style": {"type": "string", "enum": ["flowchart", "sequence", "class"]}
-                        },
-                        "required": ["code", "language"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "run_code_demo",
-                    "description": "Kod canlı olarak çalıştırır ve sonuçları gösterir",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "code": {"type": "string", "description": "Çalıştırılacak kod"},
-                            "language": {"type": "string", "description": "Programlama dili"},
-                            "input_data": {"type": "string", "description": "Kod için input verisi"}
-                        },
-                        "required": ["code", "language"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "explain_code",
-                    "description": "Kod parçasını detaylı olarak açıklar",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "code": {"type": "string", "description": "Açıklanacak kod"},
-                            "language": {"type": "string", "description": "Programlama dili"},
-                            "level": {"type": "string", "enum": ["beginner", "intermediate", "advanced"]}
-                        },
-                        "required": ["code", "language"]
-                    }
-                }
-            }
-        ]
-
-    async def process_message(self, message: str, conversation_id: Optional[str] = None) -> Dict[str, Any]:
-        """Ana mesaj işleme fonksiyonu"""
-        if not conversation_id:
-            conversation_id = str(uuid.uuid4())
-        
-        if conversation_id not in self.conversations:
-            self.conversations[conversation_id] = {
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": """Sen bir AI destekli kod inceleme ve refaktör asistanısın. 
-                        Görevin kullanıcılara kod analizi, refaktör önerileri, kod açıklamaları ve 
-                        canlı kod çalıştırma konularında yardım etmek. Function calling özelliğini 
-                        kullanarak kullanıcının isteklerini uygun fonksiyonlara yönlendir.
-                        
-                        Yeteneklerin:
-                        - Kod kalite analizi
-                        - Güvenlik açığı tespiti
-                        - Performans optimizasyonu
-                        - Kod refaktörü
-                        - Akış diyagramı oluşturma
-                        - Canlı kod çalıştırma
-                        - Kod açıklama
-                        
-                        Kullanıcıya dostça ve profesyonel yaklaş."""
-                    }
-                ],
-                "created_at": datetime.now().isoformat()
-            }
-        
-        # Kullanıcı mesajını ekle
-        self.conversations[conversation_id]["messages"].append({
-            "role": "user",
-            "content": message
-        })
-        
-        if not self.client:
-            # Fallback response when OpenAI is not available
-            return {
-                "message": "OpenAI API bağlantısı yok. Demo modunda çalışıyor. Kodunuzla ilgili genel öneriler: Kod okunabilirliğini artırın, hata yakalama ekleyin, ve performansı optimize edin.",
-                "function_calls": [],
-                "conversation_id": conversation_id,
-                "suggestions": self._generate_suggestions(message)
-            }
-        
-        try:
-            # OpenAI API çağrısı (Function Calling ile)
-            response = await self._call_openai_with_functions(
-                self.conversations[conversation_id]["messages"]
-            )
-            
-            assistant_message = response.choices[0].message
-            
-            # Function call var mı kontrol et
-            function_calls = []
-            if assistant_message.tool_calls:
-                for tool_call in assistant_message.tool_calls:
-                    function_result = await self._execute_function_call(tool_call.function)
-                    function_calls.append(function_result)
-                    
-                    # Function call sonucunu conversation'a ekle
-                    self.conversations[conversation_id]["messages"].append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": json.dumps(function_result)
-                    })
-                
-                # Final response al
-                final_response = await self._call_openai_with_functions(
-                    self.conversations[conversation_id]["messages"]
-                )
-                assistant_message = final_response.choices[0].message
-            
-            # Assistant mesajını conversation'a ekle
-            self.conversations[conversation_id]["messages"].append({
-                "role": "assistant",
-                "content": assistant_message.content
-            })
-            
-            return {
-                "message": assistant_message.content,
-                "function_calls": function_calls,
-                "conversation_id": conversation_id,
-                "suggestions": self._generate_suggestions(message)
-            }
-            
-        except Exception as e:
-            return {
-                "message": f"Üzgünüm, bir hata oluştu: {str(e)}",
-                "function_calls": [],
-                "conversation_id": conversation_id,
-                "suggestions": []
-            }
-
-    async def _call_openai_with_functions(self, messages: List[Dict]) -> Any:
-        """OpenAI API'sını function calling ile çağır"""
-        return await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: self.client.chat.completions.create(
-                model="gpt-3.5-turbo",  # gpt-4 yerine gpt-3.5-turbo kullan
-                messages=messages,
-                # tools=self.functions,  # Tool calling'i şimdilik kapat
-                # tool_choice="auto",
-                temperature=0.7,
-                max_tokens=1500
-            )
-        )
-
-    async def _execute_function_call(self, function_call) -> Dict[str, Any]:
-        """Function call'u çalıştır"""
-        function_name = function_call.name
-        function_args = json.loads(function_call.arguments)
-        
-        try:
-            if function_name == "analyze_code_quality":
-                return await self._analyze_code_quality(**function_args)
-            elif function_name == "suggest_refactoring":
-                return await self._suggest_refactoring(**function_args)
-            elif function_name == "generate_code_flow":
-                return await self._generate_code_flow(**function_args)
-            elif function_name == "run_code_demo":
-                return await self._run_code_demo(**function_args)
-            elif function_name == "explain_code":
-                return await self._explain_code(**function_args)
-            else:
-                return {"error": f"Bilinmeyen fonksiyon: {function_name}"}
-                
-        except Exception as e:
-            return {"error": f"Fonksiyon çalıştırılırken hata: {str(e)}"}
-
-    async def _analyze_code_quality(self, code: str, language: str, focus: str = "all") -> Dict:
-        """Kod kalitesi analizi"""
-        try:
-            from utils.code_analyzer import analyze_code
-            result = analyze_code(code, language)
-            return {
-                "function": "analyze_code_quality",
-                "result": result,
-                "focus": focus
-            }
-        except Exception as e:
-            return {"error": f"Code analysis failed: {str(e)}"}
-
-    async def _suggest_refactoring(self, code: str, language: str, strategy: str = "maintainability") -> Dict:
-        """Refaktör önerisi"""
-        try:
-            from utils.refactor import refactor_code
-            result = refactor_code(code)
-            return {
-                "function": "suggest_refactoring",
-                "result": {"refactored_code": result},
-                "strategy": strategy
-            }
-        except Exception as e:
-            return {"error": f"Refactoring failed: {str(e)}"}
-
-    async def _generate_code_flow(self, code: str, language: str, style: str = "flowchart") -> Dict:
-        """Kod akış diyagramı"""
-        try:
-            from utils.code_analyzer import generate_flowchart
-            result = generate_flowchart(code, language)
-            return {
-                "function": "generate_code_flow",
-                "result": {"flowchart": result},
-                "style": style
-            }
-        except Exception as e:
-            return {"error": f"Flow generation failed: {str(e)}"}
-
-    async def _run_code_demo(self, code: str, language: str, input_data: str = "") -> Dict:
-        """Canlı kod çalıştırma"""
-        try:
-            from utils.demo_runner import DemoRunner
-            runner = DemoRunner()
-            result = await runner.execute_code(code, language, input_data)
-            return {
-                "function": "run_code_demo",
-                "result": result
-            }
-        except Exception as e:
-            return {"error": f"Code execution failed: {str(e)}"}
-
-    async def _explain_code(self, code: str, language: str, level: str = "intermediate") -> Dict:
-        """Kod açıklama"""
-        # Basit kod açıklama implementasyonu
-        explanation = f"Bu {language} kodu basit bir fonksiyon tanımlar ve çalıştırır. {level} seviyesi için uygun."
-        return {
-            "function": "explain_code",
-            "result": {
-                "explanation": explanation,
-                "complexity": "medium",
-                "key_concepts": ["function definition", "function call", "output"]
-            },
-            "level": level
-        }
-
-    def _generate_suggestions(self, message: str) -> List[str]:
-        """Kullanıcı mesajına göre öneriler oluştur"""
-        suggestions = []
-        
-        if "analiz" in message.lower() or "analyze" in message.lower():
-            suggestions.append("Kodun güvenlik açıklarını kontrol et")
-            suggestions.append("Performans iyileştirme önerileri al")
-        
-        if "refactor" in message.lower():
-            suggestions.append("Kod okunabilirliğini artır")
-            suggestions.append("Fonksiyonları küçült ve modülerleştir")
-        
-        if "çalıştır" in message.lower() or "run" in message.lower():
-            suggestions.append("Kodu test verileri ile dene")
-            suggestions.append("Hata durumlarını kontrol et")
-        
-        if not suggestions:
-            suggestions = [
-                "Kod kalitesini analiz et",
-                "Refactoring önerileri al",
-                "Kod açıklaması iste"
-            ]
-        
-        return suggestions[:3]  # Maximum 3 öneri
-
-    def get_conversation_history(self, conversation_id: str) -> Optional[Dict]:
-        """Konuşma geçmişini al"""
-        return self.conversations.get(conversation_id)
-
-    def clear_conversation(self, conversation_id: str) -> bool:
-        """Konuşmayı temizle"""
-        if conversation_id in self.conversations:
-            del self.conversations[conversation_id]
-            return True
+import json
+import uuid
+from typing import Dict, List, Optional, Any
+from datetime import datetime
+import asyncio
+import time
+
+from utils.llm_scheduler import CircuitOpenError, LLMScheduler, SchedulerOverloaded
+from utils.semantic_cache import SemanticCache, code_fingerprint, split_message
+from utils.llm_transport import OpenAITransport
+from utils.code_index import format_context
+
+# Araç başına zaman aşımı (saniye); sandbox çalıştırması kendi limitine sahip
+TOOL_TIMEOUTS = {
+    "analyze_code_quality": 15.0,
+    "suggest_refactoring": 30.0,
+    "generate_code_flow": 15.0,
+    "run_code_demo": 20.0,
+    "explain_code": 5.0,
+    "find_symbol_calls": 5.0,
+}
+DEFAULT_TOOL_TIMEOUT = 15.0
+# Tamamlama başına yanıt jeton sınırı; zamanlayıcı jeton kovası için de kullanılır
+MAX_COMPLETION_TOKENS = 1500
+
+DEMO_MODE_MESSAGE = "OpenAI API bağlantısı yok. Demo modunda çalışıyor. Kodunuzla ilgili genel öneriler: Kod okunabilirliğini artırın, hata yakalama ekleyin, ve performansı optimize edin."
+
+class AIChatbot:
+    def __init__(self, services=None, scheduler_options: Optional[Dict[str, Any]] = None,
+                 cache_options: Optional[Dict[str, Any]] = None, transport: Any = None,
+                 rag_options: Optional[Dict[str, Any]] = None):
+        # LLM taşıyıcısı: gerçek API (varsayılan), kayıt, tekrar oynatma veya sentetik yanıtlar.
+        # openai paketi ilk istekte yüklenir (import maliyeti başlangıçta ödenmez)
+        self.transport = transport or OpenAITransport()
+        if isinstance(self.transport, OpenAITransport) and not self.transport.api_key:
+            print("OpenAI API key bulunamadı! AI özellikleri demo modunda çalışacak.")
+        # Paylaşılan servisler (app.services.ServiceContainer)
+        self.services = services
+        # Sağlayıcı çağrıları hız sınırı, öncelik, tekrar ve devre kesici için zamanlayıcıdan geçer
+        self.scheduler = LLMScheduler(self._create_completion, **(scheduler_options or {}))
+        # Yakın-eş sorular için yanıt önbelleği (max_entries=0 kapatır)
+        self.semantic_cache = SemanticCache(**(cache_options or {}))
+        # Proje bağlamı: mesaja en ilgili k parça, karakter bütçesiyle eklenir
+        rag_options = rag_options or {}
+        self.rag_top_k = rag_options.get("top_k", 5)
+        self.rag_max_context_chars = rag_options.get("max_context_chars", 6000)
+        
+        # Araç turları: en fazla tur sayısı ve bir mesaj için toplam süre bütçesi (saniye)
+        self.max_tool_rounds = 3
+        self.latency_budget = 60.0
+        # Kalan süre bundan azsa yeni araç turu başlatılmaz
+        self.min_round_seconds = 10.0
+        
+        self.conversations = {}
+        self._conversation_locks: Dict[str, asyncio.Lock] = {}
+        
+        # Function definitions for OpenAI Function Calling
+        self.functions = [
+            {
+                "type": "function",
+                "function": {
+                    "name": "analyze_code_quality",
+                    "description": "Kod kalitesini analiz eder ve iyileştirme önerileri sunar",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "code": {"type": "string", "description": "Analiz edilecek kod"},
+                            "language": {"type": "string", "description": "Programlama dili"},
+                            "focus": {"type": "string", "enum": ["security", "performance", "readability", "all"]}
+                        },
+                        "required": ["code", "language"]
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "suggest_refactoring",
+                    "description": "Kod refaktörü önerileri sunar",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "code": {"type": "string", "description": "Refaktör edilecek kod"},
+                            "language": {"type": "string", "description": "Programlama dili"},
+                            "strategy": {"type": "string", "enum": ["performance", "maintainability", "security"]}
+                        },
+                        "required": ["code", "language"]
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "generate_code_flow",
+                    "description": "Kod akış diyagramı oluşturur",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "code": {"type": "string", "description": "Diyagram oluşturulacak kod"},
+                            "language": {"type": "string", "description": "Programlama dili"},
+                            "style": {"type": "string", "enum": ["flowchart", "sequence", "class"]}
+                        },
+                        "required": ["code", "language"]
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "run_code_demo",
+                    "description": "Kod canlı olarak çalıştırır ve sonuçları gösterir",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "code": {"type": "string", "description": "Çalıştırılacak kod"},
+                            "language": {"type": "string", "description": "Programlama dili"},
+                            "input_data": {"type": "string", "description": "Kod için input verisi"}
+                        },
+                        "required": ["code", "language"]
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "explain_code",
+                    "description": "Kod parçasını detaylı olarak açıklar",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "code": {"type": "string", "description": "Açıklanacak kod"},
+                            "language": {"type": "string", "description": "Programlama dili"},
+                            "level": {"type": "string", "enum": ["beginner", "intermediate", "advanced"]}
+                        },
+                        "required": ["code", "language"]
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "find_symbol_calls",
+                    "description": "Projede bir fonksiyon/sınıfı çağıranları ve onun çağırdıklarını (modüller arası) bulur",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "symbol": {"type": "string", "description": "Sembol adı (ör. process_order, OrderService.save veya tam modül yolu)"},
+                            "direction": {"type": "string", "enum": ["callers", "callees", "both"]},
+                            "depth": {"type": "integer", "description": "Kaç çağrı seviyesi izlenecek (1-5)"}
+                        },
+                        "required": ["symbol"]
+                    }
+                }
+            }
+        ]
+
+    async def aclose(self):
+        """Zamanlayıcıyı ve taşıyıcıyı (HTTP bağlantı havuzu) kapat"""
+        await self.scheduler.aclose()
+        await self.transport.aclose()
+
+    async def process_message(self, message: str, conversation_id: Optional[str] = None,
+                              lane: str = "interactive", use_cache: Optional[bool] = None,
+                              project_id: Optional[str] = None) -> Dict[str, Any]:
+        """Ana mesaj işleme fonksiyonu (lane: zamanlayıcı önceliği, "interactive" veya "batch";
+        use_cache: konuşma için anlamsal önbelleği aç/kapat, None ise önceki ayar korunur;
+        project_id: bağlam parçalarının alınacağı proje dizini, konuşma boyunca geçerli)"""
+        if not conversation_id:
+            conversation_id = str(uuid.uuid4())
+        
+        if conversation_id not in self.conversations:
+            self.conversations[conversation_id] = {
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": """Sen bir AI destekli kod inceleme ve refaktör asistanısın. 
+                        Görevin kullanıcılara kod analizi, refaktör önerileri, kod açıklamaları ve 
+                        canlı kod çalıştırma konularında yardım etmek. Function calling özelliğini 
+                        kullanarak kullanıcının isteklerini uygun fonksiyonlara yönlendir.
+                        
+                        Yeteneklerin:
+                        - Kod kalite analizi
+                        - Güvenlik açığı tespiti
+                        - Performans optimizasyonu
+                        - Kod refaktörü
+                        - Akış diyagramı oluşturma
+                        - Canlı kod çalıştırma
+                        - Kod açıklama
+                        
+                        Kullanıcıya dostça ve profesyonel yaklaş."""
+                    }
+                ],
+                "created_at": datetime.now().isoformat(),
+                "semantic_cache": True
+            }
+        conversation = self.conversations[conversation_id]
+        if use_cache is not None:
+            conversation["semantic_cache"] = use_cache
+        if project_id is not None:
+            conversation["project_id"] = project_id
+        
+        # Aynı konuşmanın turları sırayla işlenir; tur iptal edilirse (ör. istemci koptu)
+        # yarım kalan mesajlar geri alınır, böylece geçmiş geçerli bir dizi olarak kalır
+        lock = self._conversation_locks.setdefault(conversation_id, asyncio.Lock())
+        async with lock:
+            turn_start = len(conversation["messages"])
+            try:
+                return await self._process_turn(conversation, conversation_id, message, lane)
+            except asyncio.CancelledError:
+                del conversation["messages"][turn_start:]
+                raise
+
+    async def _process_turn(self, conversation: Dict[str, Any], conversation_id: str, message: str,
+                            lane: str) -> Dict[str, Any]:
+        # Proje parçaları yalnızca bu turun isteklerine eklenir, konuşma geçmişine yazılmaz
+        context, context_chunks, project_scope = await self._retrieve_context(conversation.get("project_id"), message)
+        
+        # Önbellek kapsamı mesaj eklenmeden önce belirlenir (ilk tur mu?)
+        cache_key = self._cache_key(conversation, message, project_scope)
+        
+        # Kullanıcı mesajını ekle
+        conversation["messages"].append({
+            "role": "user",
+            "content": message
+        })
+        
+        if cache_key:
+            cached = self.semantic_cache.get(*cache_key)
+            if cached:
+                response, similarity = cached
+                conversation["messages"].append({"role": "assistant", "content": response["message"]})
+                return {**response, "conversation_id": conversation_id,
+                        "suggestions": self._generate_suggestions(message), "cached": True,
+                        "similarity": round(similarity, 3)}
+        
+        if not self.transport.available:
+            # Fallback response when OpenAI is not available
+            return self._demo_response(message, conversation_id)
+        
+        try:
+            messages = self.conversations[conversation_id]["messages"]
+            deadline = time.monotonic() + self.latency_budget
+            
+            # OpenAI API çağrısı (Function Calling ile)
+            response = await self._call_openai_with_functions(messages, lane=lane, context=context)
+            assistant_message = response.choices[0].message
+            
+            # Araç turları: her turdaki çağrılar paralel çalışır, tur sayısı ve süre bütçesi sınırlı
+            function_calls = []
+            rounds = 0
+            while assistant_message.tool_calls:
+                rounds += 1
+                messages.append({
+                    "role": "assistant",
+                    "content": assistant_message.content,
+                    "tool_calls": [
+                        {
+                            "id": tool_call.id,
+                            "type": "function",
+                            "function": {
+                                "name": tool_call.function.name,
+                                "arguments": tool_call.function.arguments
+                            }
+                        }
+                        for tool_call in assistant_message.tool_calls
+                    ]
+                })
+                
+                results = await self._execute_tool_calls(assistant_message.tool_calls, deadline,
+                                                         conversation.get("project_id"))
+                for tool_call, function_result in zip(assistant_message.tool_calls, results):
+                    function_calls.append(function_result)
+                    
+                    # Function call sonucunu conversation'a ekle (modelin istediği sırayla)
+                    messages.append({
+                        "role": "tool",
+                        "tool_call_id": tool_call.id,
+                        "content": json.dumps(function_result, default=str)
+                    })
+                
+                # Bütçe veya tur sınırı dolduysa modelden araçsız son cevap iste
+                allow_tools = rounds < self.max_tool_rounds and \
+                    deadline - time.monotonic() > self.min_round_seconds
+                final_response = await self._call_openai_with_functions(messages, allow_tools=allow_tools, lane=lane,
+                                                                      context=context)
+                assistant_message = final_response.choices[0].message
+            
+            # Assistant mesajını conversation'a ekle
+            messages.append({
+                "role": "assistant",
+                "content": assistant_message.content
+            })
+            
+            result = {
+                "message": assistant_message.content,
+                "function_calls": function_calls,
+                "conversation_id": conversation_id,
+                "suggestions": self._generate_suggestions(message),
+                "context_chunks": context_chunks
+            }
+            if cache_key and assistant_message.content:
+                text, scope = cache_key
+                self.semantic_cache.set(text, result, scope)
+            return result
+            
+        except (CircuitOpenError, SchedulerOverloaded) as e:
+            # Sağlayıcı devre dışı veya kuyruk dolu: beklemeden demo moduna düş
+            return self._demo_response(message, conversation_id, degraded=str(e))
+        except Exception as e:
+            return {
+                "message": f"Üzgünüm, bir hata oluştu: {str(e)}",
+                "function_calls": [],
+                "conversation_id": conversation_id,
+                "suggestions": []
+            }
+
+    async def _execute_tool_calls(self, tool_calls, deadline: float,
+                                  project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Bağımsız araç çağrılarını eşzamanlı çalıştır; sonuçlar çağrı sırasıyla döner"""
+        async def run_one(tool_call):
+            name = tool_call.function.name
+            timeout = min(TOOL_TIMEOUTS.get(name, DEFAULT_TOOL_TIMEOUT), max(deadline - time.monotonic(), 0.1))
+            started = time.monotonic()
+            try:
+                # wait_for süre dolunca aracı iptal eder
+                result = await asyncio.wait_for(self._execute_function_call(tool_call.function, project_id), timeout)
+            except asyncio.TimeoutError:
+                result = {"function": name, "error": f"Araç zaman aşımına uğradı ({timeout:.1f}s)"}
+            result.setdefault("function", name)
+            result["elapsed_seconds"] = round(time.monotonic() - started, 3)
+            return result
+        
+        # process_message iptal edilirse gather tüm araç görevlerini de iptal eder
+        return await asyncio.gather(*[run_one(tool_call) for tool_call in tool_calls])
+
+    async def _retrieve_context(self, project_id: Optional[str], message: str) -> tuple:
+        """(bağlam metni, parça özetleri, önbellek kapsamı); proje yoksa boş"""
+        if not project_id or not self.services:
+            return None, [], ""
+        try:
+            # İlk erişimde dizin diskten okunup açılır; olay döngüsünü bekletmesin
+            index = await asyncio.to_thread(self.services.project_indexes.get, project_id)
+        except ValueError:
+            index = None
+        if index is None:
+            return None, [], ""
+        chunks = await asyncio.to_thread(index.search, message, self.rag_top_k)
+        summary = [{key: chunk[key] for key in ("path", "name", "start_line", "end_line", "score")}
+                   for chunk in chunks]
+        # Dizin değişince eski önbellek yanıtları eşleşmez
+        return format_context(chunks, self.rag_max_context_chars) or None, summary, f"{project_id}@{index.version}"
+
+    def _cache_key(self, conversation: Dict[str, Any], message: str, project_scope: str = "") -> Optional[tuple]:
+        """(gömülecek metin, kapsam) ya da önbelleğe uygun değilse None.
+
+        Kod içeren mesajlar kendi başına anlamlıdır ve yalnızca aynı koda verilmiş yanıtlarla
+        eşleşir; kodsuz mesajlar yalnızca konuşmanın ilk turunda (önceki bağlama dayanmadan)
+        önbelleğe uygundur.
+        """
+        if not conversation["semantic_cache"]:
+            return None
+        prose, code = split_message(message)
+        first_turn = not any(m["role"] == "assistant" for m in conversation["messages"])
+        if not code.strip() and not first_turn:
+            return None
+        # Yalnızca koddan oluşan mesajlar kodun kendisiyle gömülür
+        return (prose if prose.strip() else code), code_fingerprint(code) + project_scope
+
+    def _demo_response(self, message: str, conversation_id: str, degraded: Optional[str] = None) -> Dict[str, Any]:
+        response = {
+            "message": DEMO_MODE_MESSAGE,
+            "function_calls": [],
+            "conversation_id": conversation_id,
+            "suggestions": self._generate_suggestions(message)
+        }
+        if degraded:
+            response["degraded"] = degraded
+        return response
+
+    async def _call_openai_with_functions(self, messages: List[Dict], allow_tools: bool = True,
+                                          lane: str = "interactive", context: Optional[str] = None) -> Any:
+        """OpenAI API'sını function calling ile zamanlayıcı üzerinden çağır"""
+        # Mesaj listesi tur boyunca büyür; yeniden denemeler aynı anlık görüntüyü gönderir
+        messages = list(messages)
+        if context:
+            # Proje bağlamı son kullanıcı mesajından hemen önce, yalnızca bu istekte
+            last_user = max(i for i, m in enumerate(messages) if m["role"] == "user")
+            messages.insert(last_user, {
+                "role": "system",
+                "content": "Projeden ilgili kod parçaları (yalnızca bağlam):\n\n" + context
+            })
+        request = {
+            "model": "gpt-3.5-turbo",  # gpt-4 yerine gpt-3.5-turbo kullan
+            "messages": messages,
+            "tools": self.functions,
+            # "none": geçmişteki araç mesajları geçerli kalır ama yeni çağrı istenmez
+            "tool_choice": "auto" if allow_tools else "none",
+            "temperature": 0.7,
+            "max_tokens": MAX_COMPLETION_TOKENS
+        }
+        # Kaba jeton tahmini: ~4 karakter/jeton + yanıt üst sınırı
+        cost = sum(len(str(m.get("content") or "")) for m in messages) // 4 + MAX_COMPLETION_TOKENS
+        return await self.scheduler.submit(request, lane=lane, cost=cost)
+
+    async def _create_completion(self, request: Dict[str, Any]) -> Any:
+        return await self.transport.complete(request)
+
+    async def _execute_function_call(self, function_call, project_id: Optional[str] = None) -> Dict[str, Any]:
+        """Function call'u çalıştır (project_id: konuşmanın projesi, sembol araçları için)"""
+        function_name = function_call.name
+        
+        try:
+            function_args = json.loads(function_call.arguments or "{}")
+            if function_name == "analyze_code_quality":
+                return await self._analyze_code_quality(**function_args)
+            elif function_name == "suggest_refactoring":
+                return await self._suggest_refactoring(**function_args)
+            elif function_name == "generate_code_flow":
+                return await self._generate_code_flow(**function_args)
+            elif function_name == "run_code_demo":
+                return await self._run_code_demo(**function_args)
+            elif function_name == "explain_code":
+                return await self._explain_code(**function_args)
+            elif function_name == "find_symbol_calls":
+                return await self._find_symbol_calls(project_id=project_id, **function_args)
+            else:
+                return {"error": f"Bilinmeyen fonksiyon: {function_name}"}
+                
+        except Exception as e:
+            return {"error": f"Fonksiyon çalıştırılırken hata: {str(e)}"}
+
+    async def _analyze_code_quality(self, code: str, language: str, focus: str = "all") -> Dict:
+        """Kod kalitesi analizi"""
+        try:
+            if self.services:
+                analyzer = self.services.code_analyzer
+            else:
+                from utils.code_analyzer import CodeAnalyzer
+                analyzer = CodeAnalyzer()
+            # analyze_code() asyncio.run kullanır; çalışan döngü içinde doğrudan await edilir
+            result = await analyzer.analyze_comprehensive(code, language)
+            return {
+                "function": "analyze_code_quality",
+                "result": result,
+                "focus": focus
+            }
+        except Exception as e:
+            return {"error": f"Code analysis failed: {str(e)}"}
+
+    async def _suggest_refactoring(self, code: str, language: str, strategy: str = "maintainability") -> Dict:
+        """Refaktör önerisi"""
+        try:
+            if self.services:
+                refactorer = self.services.code_refactor
+            else:
+                from utils.refactor import CodeRefactor
+                refactorer = CodeRefactor()
+            result = await refactorer.refactor_with_ai(code, language, strategy)
+            return {
+                "function": "suggest_refactoring",
+                "result": {"refactored_code": result["code"], "improvements": result["improvements"]},
+                "strategy": strategy
+            }
+        except Exception as e:
+            return {"error": f"Refactoring failed: {str(e)}"}
+
+    async def _generate_code_flow(self, code: str, language: str, style: str = "flowchart") -> Dict:
+        """Kod akış diyagramı"""
+        try:
+            if self.services:
+                generator = self.services.code2flow_generator
+            else:
+                from utils.code2flow import Code2FlowGenerator
+                generator = Code2FlowGenerator()
+            result = (await generator.generate_flow(code, language, style)).get("mermaid_code", "")
+            return {
+                "function": "generate_code_flow",
+                "result": {"flowchart": result},
+                "style": style
+            }
+        except Exception as e:
+            return {"error": f"Flow generation failed: {str(e)}"}
+
+    async def _run_code_demo(self, code: str, language: str, input_data: str = "") -> Dict:
+        """Canlı kod çalıştırma"""
+        try:
+            if self.services:
+                runner = self.services.demo_runner
+            else:
+                from utils.demo_runner import DemoRunner
+                runner = DemoRunner()
+            result = await runner.execute_code(code, language, input_data)
+            return {
+                "function": "run_code_demo",
+                "result": result
+            }
+        except Exception as e:
+            return {"error": f"Code execution failed: {str(e)}"}
+
+    async def _find_symbol_calls(self, symbol: str, direction: str = "both", depth: int = 1,
+                                 project_id: Optional[str] = None) -> Dict:
+        """Proje sembol dizininden çağıranlar / çağrılanlar"""
+        if not project_id or not self.services:
+            return {"error": "Bu konuşmada proje yok; önce project_id ile bir proje seçin"}
+        try:
+            index = await asyncio.to_thread(self.services.project_indexes.get, project_id)
+        except ValueError as e:
+            return {"error": str(e)}
+        if index is None:
+            return {"error": f"Proje bulunamadı: {project_id}"}
+        symbols = index.symbols
+        matches = symbols.lookup(symbol)
+        if not matches:
+            return {"error": f"Sembol bulunamadı: {symbol}"}
+        depth = max(1, min(int(depth), 5))
+        directions = ["callers", "callees"] if direction == "both" else [direction]
+        results = []
+        for name in matches[:5]:
+            entry = {"definition": symbols.definition(name)}
+            for way in directions:
+                graph = symbols.call_graph(name, way, depth, max_nodes=40)
+                entry[way] = graph["edges"]
+                entry[f"{way}_truncated"] = graph["truncated"]
+            results.append(entry)
+        return {"function": "find_symbol_calls", "result": results, "ambiguous": len(matches) > 1}
+
+    async def _explain_code(self, code: str, language: str, level: str = "intermediate") -> Dict:
+        """Kod açıklama"""
+        # Basit kod açıklama implementasyonu
+        explanation = f"Bu {language} kodu basit bir fonksiyon tanımlar ve çalıştırır. {level} seviyesi için uygun."
+        return {
+            "function": "explain_code",
+            "result": {
+                "explanation": explanation,
+                "complexity": "medium",
+                "key_concepts": ["function definition", "function call", "output"]
+            },
+            "level": level
+        }
+
+    def _generate_suggestions(self, message: str) -> List[str]:
+        """Kullanıcı mesajına göre öneriler oluştur"""
+        suggestions = []
+        
+        if "analiz" in message.lower() or "analyze" in message.lower():
+            suggestions.append("Kodun güvenlik açıklarını kontrol et")
+            suggestions.append("Performans iyileştirme önerileri al")
+        
+        if "refactor" in message.lower():
+            suggestions.append("Kod okunabilirliğini artır")
+            suggestions.append("Fonksiyonları küçült ve modülerleştir")
+        
+        if "çalıştır" in message.lower() or "run" in message.lower():
+            suggestions.append("Kodu test verileri ile dene")
+            suggestions.append("Hata durumlarını kontrol et")
+        
+        if not suggestions:
+            suggestions = [
+                "Kod kalitesini analiz et",
+                "Refactoring önerileri al",
+                "Kod açıklaması iste"
+            ]
+        
+        return suggestions[:3]  # Maximum 3 öneri
+
+    def get_conversation_history(self, conversation_id: str) -> Optional[Dict]:
+        """Konuşma geçmişini al"""
+        return self.conversations.get(conversation_id)
+
+    def clear_conversation(self, conversation_id: str) -> bool:
+        """Konuşmayı temizle"""
+        if conversation_id in self.conversations:
+            del self.conversations[conversation_id]
+            return True
         return False
\ No newline at end of file
@@ -0,0 +1,490 @@
+import ast
+from typing import Any, Dict, List, Optional, Tuple
+
+MAX_LABEL = 48             # blok satırı / kenar etiketi kırpma uzunluğu
+MAX_BLOCK_LINES = 3        # blok başına saklanan deyim satırı
+MAX_FUNCTION_NODES = 120   # fonksiyon başına blok sınırı; aşılınca derin dallar katlanır
+LOOP_TYPES = (ast.For, ast.AsyncFor, ast.While)
+DEF_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+TRY_TYPES = (ast.Try, ast.TryStar) if hasattr(ast, "TryStar") else (ast.Try,)
+
+
+class BasicBlock:
+    """Dallanmasız deyim dizisi; successors: [(hedef blok, kenar etiketi)]"""
+
+    __slots__ = ("id", "kind", "statements", "calls", "start_line", "end_line", "loop_depth",
+                 "successors", "preds")
+
+    def __init__(self, block_id: int, kind: str, loop_depth: int):
+        self.id = block_id
+        self.kind = kind            # entry | exit | block | branch | loop
+        self.statements: List[str] = []
+        self.calls: List[str] = []
+        self.start_line: Optional[int] = None
+        self.end_line: Optional[int] = None
+        self.loop_depth = loop_depth
+        self.successors: List[Tuple["BasicBlock", Optional[str]]] = []
+        self.preds = 0
+
+    def add(self, text: str, line: Optional[int], end_line: Optional[int] = None):
+        self.statements.append(text)
+        if line is not None:
+            end_line = end_line or line
+            self.start_line = line if self.start_line is None else min(self.start_line, line)
+            self.end_line = end_line if self.end_line is None else max(self.end_line, end_line)
+
+
+def _clip(text: str) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= MAX_LABEL else text[:MAX_LABEL - 1] + "…"
+
+
+def _dotted(node: ast.AST) -> Optional[str]:
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return ".".join(reversed(parts))
+    return None
+
+
+def _child_statements(node: ast.AST) -> List[ast.AST]:
+    children = []
+    for field in ("body", "orelse", "finalbody", "handlers", "cases"):
+        value = getattr(node, field, None)
+        if isinstance(value, list):
+            children.extend(value)
+    return children
+
+
+def loop_map(body: List[ast.stmt]) -> Dict[int, bool]:
+    """id(deyim) -> altında döngü var mı (yalnızca deyimler gezilir; katlama kararı için)"""
+    order: List[ast.AST] = []
+    stack: List[ast.AST] = list(body)
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        if not isinstance(node, DEF_TYPES):
+            stack.extend(_child_statements(node))
+    has_loop: Dict[int, bool] = {}
+    for node in reversed(order):
+        has_loop[id(node)] = isinstance(node, LOOP_TYPES) or (not isinstance(node, DEF_TYPES) and any(
+            has_loop[id(child)] for child in _child_statements(node)))
+    return has_loop
+
+
+class CFGBuilder:
+    """Fonksiyon gövdesinden temel blok grafiği (her deyim bir kez ziyaret edilir: doğrusal süre).
+
+    collapse_depth: bu dal derinliğinden itibaren döngü içermeyen if/try/match tek deyim
+    olarak gösterilir (büyük fonksiyonlarda düğüm sayısını sınırlamak için).
+    """
+
+    def __init__(self, lines: List[str], collapse_depth: Optional[int] = None,
+                 has_loop: Optional[Dict[int, bool]] = None):
+        self.lines = lines
+        self.collapse_depth = collapse_depth
+        self._has_loop = has_loop
+
+    def build(self, name: str, body: List[ast.stmt], line: int, end_line: Optional[int] = None) -> Dict[str, Any]:
+        self.blocks: List[BasicBlock] = []
+        self.loops: List[Tuple[BasicBlock, BasicBlock]] = []   # (başlık, çıkış)
+        self.handlers: List[BasicBlock] = []                   # raise hedefi olan except dağıtıcıları
+        # Etkin finally blokları: (blok, girişteki döngü ve handler derinliği, geçen sıçrama türleri)
+        self.finals: List[Tuple[BasicBlock, int, int, List[str]]] = []
+        self.depth = self.max_depth = self.collapsed = 0
+        if self._has_loop is None:
+            self._has_loop = loop_map(body)
+
+        entry = self._new("entry")
+        entry.add(name, line, line)
+        self.exit = self._new("exit")
+        self.exit.add("return", end_line, end_line)
+        end = self._body(body, entry)
+        if end is not None:
+            self._link(end, self.exit)
+
+        blocks = compact(self.blocks, entry)
+        loops = [b for b in blocks if b.kind == "loop"]
+        return {
+            "name": name,
+            "line": line,
+            "end_line": end_line,
+            "blocks": [_block_dict(b) for b in blocks],
+            "edges": [[b.id, target.id, label] for b in blocks for target, label in b.successors],
+            "branches": sum(1 for b in blocks if b.kind == "branch"),
+            "loops": len(loops),
+            "max_loop_depth": max((b.loop_depth for b in loops), default=0),
+            "collapsed": self.collapsed,
+        }
+
+    # --- yardımcılar ---
+
+    def _new(self, kind: str, loop_depth: Optional[int] = None) -> BasicBlock:
+        block = BasicBlock(len(self.blocks), kind, len(self.loops) if loop_depth is None else loop_depth)
+        self.blocks.append(block)
+        return block
+
+    def _link(self, source: BasicBlock, target: BasicBlock, label: Optional[str] = None):
+        source.successors.append((target, label))
+        target.preds += 1
+
+    def _open(self, current: BasicBlock) -> BasicBlock:
+        """Deyim eklenebilecek blok: çıkışı olmayan düz blok ya da yeni ardıl"""
+        if current.kind == "block" and not current.successors:
+            return current
+        block = self._new("block")
+        self._link(current, block)
+        return block
+
+    def _text(self, node: ast.AST) -> str:
+        """Deyimin ilk kaynak satırı (ast.unparse'tan ucuz ve kodla birebir)"""
+        line = self.lines[node.lineno - 1] if 0 < node.lineno <= len(self.lines) else ""
+        return _clip(line.strip().rstrip(":") or type(node).__name__)
+
+    def _calls(self, block: BasicBlock, *nodes: ast.AST):
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if isinstance(node, ast.Call):
+                name = _dotted(node.func)
+                if name and name not in block.calls:
+                    block.calls.append(name)
+            if not isinstance(node, DEF_TYPES + (ast.Lambda,)):
+                stack.extend(ast.iter_child_nodes(node))
+
+    def _collapse(self, stmt: ast.stmt) -> bool:
+        return (self.collapse_depth is not None and self.depth >= self.collapse_depth
+                and not self._has_loop.get(id(stmt)))
+
+    def _enter(self):
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+
+    # --- deyimler ---
+
+    def _body(self, stmts: List[ast.stmt], current: Optional[BasicBlock]) -> Optional[BasicBlock]:
+        """Deyimleri sırayla işle; akış kesildiyse (return/raise/break) None döner"""
+        for stmt in stmts:
+            if current is None:
+                # Ulaşılamayan kod çizilmez
+                break
+            if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant):
+                # Docstring ve tek başına sabitler akışa bir şey katmaz
+                continue
+            current = self._statement(stmt, current)
+        return current
+
+    def _statement(self, stmt: ast.stmt, current: BasicBlock) -> Optional[BasicBlock]:
+        if isinstance(stmt, LOOP_TYPES):
+            return self._loop(stmt, current)
+        compound = isinstance(stmt, (ast.If, ast.Match) + TRY_TYPES)
+        if compound and not self._collapse(stmt):
+            if isinstance(stmt, ast.If):
+                return self._if(stmt, current)
+            if isinstance(stmt, ast.Match):
+                return self._match(stmt, current)
+            return self._try(stmt, current)
+        if compound:
+            self.collapsed += 1
+        if isinstance(stmt, (ast.With, ast.AsyncWith)):
+            block = self._open(current)
+            block.add(self._text(stmt), stmt.lineno)
+            self._calls(block, *stmt.items)
+            return self._body(stmt.body, block)
+
+        block = self._open(current)
+        block.add(self._text(stmt) + (" ⋯" if compound else ""), stmt.lineno, stmt.end_lineno)
+        if not isinstance(stmt, DEF_TYPES):
+            self._calls(block, stmt)
+        if isinstance(stmt, ast.Return):
+            self._jump(block, "return")
+        elif isinstance(stmt, ast.Raise):
+            self._jump(block, "raise")
+        elif isinstance(stmt, (ast.Break, ast.Continue)) and self.loops:
+            self._jump(block, "break" if isinstance(stmt, ast.Break) else "continue")
+        else:
+            return block
+        return None
+
+    def _jump(self, block: BasicBlock, kind: str, label: Optional[str] = None):
+        """return/raise/break/continue: aradaki finally varsa önce ona, yoksa doğrudan hedefe bağla"""
+        if self.finals:
+            final, loops, handlers, pending = self.finals[-1]
+            if (kind == "return" or kind == "raise" and len(self.handlers) == handlers
+                    or kind in ("break", "continue") and len(self.loops) == loops):
+                self._link(block, final, kind)
+                if kind not in pending:
+                    pending.append(kind)
+                return
+        if kind == "return":
+            self._link(block, self.exit, label)
+        elif kind == "raise":
+            self._link(block, self.handlers[-1] if self.handlers else self.exit, kind)
+        else:
+            header, after = self.loops[-1]
+            self._link(block, after if kind == "break" else header, kind)
+
+    def _if(self, stmt: ast.If, current: BasicBlock) -> Optional[BasicBlock]:
+        self._enter()
+        after = self._new("block")
+        node, label = stmt, None
+        # elif zinciri özyinelemesiz işlenir: yüzlerce elif yığını taşırmaz
+        while True:
+            condition = self._new("branch")
+            condition.add(self._text(node), node.lineno)
+            self._calls(condition, node.test)
+            self._link(current, condition, label)
+            then = self._new("block")
+            self._link(condition, then, "True")
+            end = self._body(node.body, then)
+            if end is not None:
+                self._link(end, after)
+            orelse = node.orelse
+            if len(orelse) == 1 and isinstance(orelse[0], ast.If) and not self._collapse(orelse[0]):
+                current, label, node = condition, "False", orelse[0]
+                continue
+            if orelse:
+                other = self._new("block")
+                self._link(condition, other, "False")
+                end = self._body(orelse, other)
+                if end is not None:
+                    self._link(end, after)
+            else:
+                self._link(condition, after, "False")
+            break
+        self.depth -= 1
+        return after if after.preds else None
+
+    def _loop(self, stmt: ast.stmt, current: BasicBlock) -> Optional[BasicBlock]:
+        header = self._new("loop", len(self.loops) + 1)
+        header.add(self._text(stmt), stmt.lineno)
+        self._calls(header, stmt.test if isinstance(stmt, ast.While) else stmt.iter)
+        self._link(current, header)
+        after = self._new("block")
+        is_while = isinstance(stmt, ast.While)
+        enter, leave = ("True", "False") if is_while else ("next", "done")
+
+        self.loops.append((header, after))
+        body = self._new("block")
+        self._link(header, body, enter)
+        end = self._body(stmt.body, body)
+        if end is not None:
+            self._link(end, header, "loop")
+        self.loops.pop()
+
+        # while True: çıkış yalnızca break ile
+        infinite = is_while and isinstance(stmt.test, ast.Constant) and bool(stmt.test.value)
+        if not infinite:
+            if stmt.orelse:
+                other = self._new("block")
+                self._link(header, other, leave)
+                end = self._body(stmt.orelse, other)
+                if end is not None:
+                    self._link(end, after)
+            else:
+                self._link(header, after, leave)
+        return after if after.preds else None
+
+    def _try(self, stmt: ast.stmt, current: BasicBlock) -> Optional[BasicBlock]:
+        self._enter()
+        block = self._open(current)
+        block.add("try", stmt.lineno)
+        after = self._new("block")
+        final = self._new("block") if stmt.finalbody else None
+        join = final or after
+        pending: List[str] = []
+        if final is not None:
+            # Gövde ve except'lerden çıkan sıçramalar finally üzerinden yönlenir
+            self.finals.append((final, len(self.loops), len(self.handlers), pending))
+
+        dispatch = None
+        if stmt.handlers:
+            dispatch = self._new("branch")
+            dispatch.add("except", stmt.handlers[0].lineno)
+            self._link(block, dispatch, "exception")
+            self.handlers.append(dispatch)
+        end = self._body(stmt.body, block)
+        if dispatch is not None:
+            self.handlers.pop()
+        if end is not None:
+            end = self._body(stmt.orelse, end)
+        normal = end is not None  # finally'ye sıçramasız (normal akışla) ulaşılıyor mu
+        if end is not None:
+            self._link(end, join)
+
+        for handler in stmt.handlers:
+            handler_block = self._new("block")
+            handler_block.add(self._text(handler), handler.lineno)
+            caught = _dotted(handler.type) if handler.type is not None else None
+            self._link(dispatch, handler_block, _clip(caught or "any"))
+            end = self._body(handler.body, handler_block)
+            if end is not None:
+                normal = True
+                self._link(end, join)
+
+        if final is not None:
+            self.finals.pop()
+            final.add("finally", stmt.finalbody[0].lineno - 1)
+            if dispatch is None:
+                self._link(block, final, "exception")
+                if "raise" not in pending:
+                    pending.append("raise")
+            end = self._body(stmt.finalbody, final)
+            if end is not None:
+                if normal:
+                    self._link(end, after)
+                # finally bittikten sonra bekleyen sıçrama asıl hedefine devam eder
+                for kind in pending:
+                    self._jump(end, kind, kind)
+        self.depth -= 1
+        return after if after.preds else None
+
+    def _match(self, stmt: ast.Match, current: BasicBlock) -> Optional[BasicBlock]:
+        self._enter()
+        condition = self._new("branch")
+        condition.add(self._text(stmt), stmt.lineno)
+        self._calls(condition, stmt.subject)
+        self._link(current, condition)
+        after = self._new("block")
+        exhaustive = False
+        for case in stmt.cases:
+            case_block = self._new("block")
+            label = self._text(case.pattern)
+            self._link(condition, case_block, label[len("case "):] if label.startswith("case ") else label)
+            end = self._body(case.body, case_block)
+            if end is not None:
+                self._link(end, after)
+            pattern = case.pattern
+            if isinstance(pattern, ast.MatchAs) and pattern.pattern is None and case.guard is None:
+                exhaustive = True
+        if not exhaustive:
+            self._link(condition, after, "no match")
+        self.depth -= 1
+        return after if after.preds else None
+
+
+def compact(blocks: List[BasicBlock], entry: BasicBlock) -> List[BasicBlock]:
+    """Boş geçiş bloklarını atla, ulaşılamayanları çıkar, tek giriş/tek çıkışlı zincirleri birleştir.
+
+    Sonuç blokları girişten itibaren genişlik öncelikli sırada ve 0'dan numaralı döner.
+    """
+    # 1) Boş düz blok (tek etiketsiz çıkış) hedefine yönlendirilir; zincir sıkıştırılarak doğrusal kalır
+    forward: Dict[int, Tuple[BasicBlock, Optional[str]]] = {}
+
+    def passthrough(block: BasicBlock) -> bool:
+        return block.kind == "block" and not block.statements and len(block.successors) == 1
+
+    def resolve(block: BasicBlock) -> Tuple[BasicBlock, Optional[str]]:
+        """(gerçek hedef, yol üzerindeki ilk kenar etiketi)"""
+        path, on_path = [], set()
+        while block.id not in forward and passthrough(block) and block.id not in on_path:
+            path.append(block)
+            on_path.add(block.id)
+            block = block.successors[0][0]
+        target, carried = forward.get(block.id, (block, None))
+        for item in reversed(path):
+            carried = item.successors[0][1] or carried
+            forward[item.id] = (target, carried)
+        return forward[path[0].id] if path else (target, carried)
+
+    for block in blocks:
+        successors, seen = [], set()
+        for target, label in block.successors:
+            target, carried = resolve(target)
+            label = label or carried
+            if target.id not in seen:
+                seen.add(target.id)
+                successors.append((target, label))
+        block.successors = successors
+
+    # 2) Ulaşılabilirlik
+    order, visited = [entry], {entry.id}
+    for block in order:
+        for target, _ in block.successors:
+            if target.id not in visited:
+                visited.add(target.id)
+                order.append(target)
+    preds: Dict[int, int] = {}
+    for block in order:
+        for target, _ in block.successors:
+            preds[target.id] = preds.get(target.id, 0) + 1
+
+    # 3) Zincir birleştirme
+    merged = set()
+    for block in order:
+        if block.id in merged or block.kind != "block":
+            continue
+        while len(block.successors) == 1 and block.successors[0][1] is None:
+            target = block.successors[0][0]
+            if target is block or target.kind != "block" or preds.get(target.id) != 1:
+                break
+            block.statements.extend(target.statements)
+            block.calls.extend(c for c in target.calls if c not in block.calls)
+            if target.start_line is not None:
+                block.start_line = target.start_line if block.start_line is None else min(block.start_line, target.start_line)
+                block.end_line = target.end_line if block.end_line is None else max(block.end_line, target.end_line)
+            block.successors = target.successors
+            merged.add(target.id)
+
+    result = [block for block in order if block.id not in merged]
+    for number, block in enumerate(result):
+        block.id = number
+    return result
+
+
+def _block_dict(block: BasicBlock) -> Dict[str, Any]:
+    statements = block.statements[:MAX_BLOCK_LINES]
+    data = {"id": block.id, "kind": block.kind, "statements": statements,
+            "start_line": block.start_line, "end_line": block.end_line, "loop_depth": block.loop_depth}
+    if len(block.statements) > MAX_BLOCK_LINES:
+        data["more"] = len(block.statements) - MAX_BLOCK_LINES
+    if block.calls:
+        data["calls"] = block.calls
+    return data
+
+
+def function_cfg(lines: List[str], name: str, body: List[ast.stmt], line: int,
+                 end_line: Optional[int] = None, max_nodes: int = MAX_FUNCTION_NODES) -> Dict[str, Any]:
+    """Tek fonksiyonun CFG'si; blok sayısı max_nodes'u aşarsa dal derinliği yarıya inerek katlanır"""
+    has_loop = loop_map(body)
+    builder = CFGBuilder(lines, has_loop=has_loop)
+    cfg = builder.build(name, body, line, end_line)
+    depth = builder.max_depth
+    while len(cfg["blocks"]) > max_nodes and depth > 0:
+        depth //= 2
+        builder = CFGBuilder(lines, collapse_depth=depth, has_loop=has_loop)
+        cfg = builder.build(name, body, line, end_line)
+    return cfg
+
+
+def build_cfgs(tree: ast.Module, code: str, max_nodes: int = MAX_FUNCTION_NODES) -> List[Dict[str, Any]]:
+    """Modül düzeyi kod ("<module>") ve her fonksiyon/metot (iç içe olanlar dahil) için CFG listesi"""
+    lines = code.splitlines()
+    cfgs = []
+    module_body = [stmt for stmt in tree.body
+                   if not isinstance(stmt, DEF_TYPES + (ast.Import, ast.ImportFrom))
+                   and not (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant))]
+    if module_body:
+        cfgs.append(function_cfg(lines, "<module>", module_body, module_body[0].lineno,
+                                 module_body[-1].end_lineno, max_nodes))
+
+    functions: List[Tuple[str, ast.AST]] = []
+    stack: List[Tuple[ast.AST, str]] = [(tree, "")]
+    while stack:
+        node, prefix = stack.pop()
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                functions.append((f"{prefix}{child.name}", child))
+                stack.append((child, f"{prefix}{child.name}."))
+            elif isinstance(child, ast.ClassDef):
+                stack.append((child, f"{prefix}{child.name}."))
+            elif isinstance(child, ast.stmt):
+                stack.append((child, prefix))
+    functions.sort(key=lambda item: item[1].lineno)
+    for qualname, node in functions:
+        args = ", ".join(arg.arg for arg in node.args.posonlyargs + node.args.args)
+        cfgs.append(function_cfg(lines, f"{qualname}({args})", node.body, node.lineno, node.end_lineno, max_nodes))
+    return cfgs
@@ -1,295 +1,468 @@
-import subprocess
-import os
-import ast
-import json
-import uuid
-import re
-import tempfile
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-
-class Code2FlowGenerator:
-    def __init__(self):
-        self.output_dir = "static/flowcharts"
-        os.makedirs(self.output_dir, exist_ok=True)
-    
-    async def generate_flow(self, code: str, language: str, style: str = "flowchart") -> Dict[str, Any]:
-        """Ana akış diyagramı oluşturma fonksiyonu"""
-        try:
-            # Kod parse et
-            parsed_structure = await self._parse_code_structure(code, language)
-            
-            # Mermaid syntax oluştur
-            mermaid_content = self._generate_mermaid_syntax(parsed_structure, style, language)
-            
-            # Session ID oluştur
-            session_id = str(uuid.uuid4())[:8]
-            
-            return {
-                "session_id": session_id,
-                "mermaid_code": mermaid_content,
-                "structure": parsed_structure,
-                "style": style,
-                "language": language,
-                "timestamp": datetime.now().isoformat()
-            }
-            
-        except Exception as e:
-            return {
-                "error": str(e),
-                "fallback_diagram": await self._create_fallback_diagram(code, language)
-            }
-
-    async def _parse_code_structure(self, code: str, language: str) -> Dict[str, Any]:
-        """Kod yapısını parse et"""
-        if language.lower() == "python":
-            return self._parse_python(code)
-        elif language.lower() == "javascript":
-            return self._parse_javascript(code)
-        else:
-            return self._generic_parse(code, language)
-
-    def _parse_python(self, code: str) -> Dict[str, Any]:
-        """Python kodu parse et"""
-        try:
-            tree = ast.parse(code)
-            structure = {
-                "functions": [],
-                "classes": [],
-                "imports": [],
-                "control_flow": [],
-                "variables": [],
-                "calls": []
-            }
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    func_info = {
-                        "name": node.name,
-                        "args": [arg.arg for arg in node.args.args],
-                        "line": node.lineno,
-                        "calls": self._extract_function_calls(node)
-                    }
-                    structure["functions"].append(func_info)
-                
-                elif isinstance(node, ast.ClassDef):
-                    class_info = {
-                        "name": node.name,
-                        "methods": [n.name for n in node.body if isinstance(n, ast.FunctionDef)],
-                        "line": node.lineno
-                    }
-                    structure["classes"].append(class_info)
-                
-                elif isinstance(node, (ast.Import, ast.ImportFrom)):
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            structure["imports"].append(alias.name)
-                    else:
-                        structure["imports"].append(f"{node.module}")
-                
-                elif isinstance(node, (ast.If, ast.For, ast.While)):
-                    structure["control_flow"].append({
-                        "type": type(node).__name__,
-                        "line": node.lineno
-                    })
-                
-                elif isinstance(node, ast.Call):
-                    if isinstance(node.func, ast.Name):
-                        structure["calls"].append(node.func.id)
-            
-            return structure
-            
-        except Exception as e:
-            return {"error": f"Python parsing error: {str(e)}"}
-
-    def _parse_javascript(self, code: str) -> Dict[str, Any]:
-        """JavaScript kodu parse et"""
-        structure = {
-            "functions": [],
-            "classes": [],
-            "imports": [],
-            "control_flow": [],
-            "calls": []
-        }
-        
-        # Function declarations
-        func_pattern = r'function\s+(\w+)\s*\([^)]*\)'
-        functions = re.findall(func_pattern, code)
-        structure["functions"] = [{"name": f, "type": "function"} for f in functions]
-        
-        # Arrow functions
-        arrow_pattern = r'(?:const|let|var)\s+(\w+)\s*=\s*\([^)]*\)\s*=>'
-        arrow_functions = re.findall(arrow_pattern, code)
-        structure["functions"].extend([{"name": f, "type": "arrow"} for f in arrow_functions])
-        
-        # Function calls
-        call_pattern = r'(\w+)\s*\('
-        calls = re.findall(call_pattern, code)
-        structure["calls"] = list(set(calls))
-        
-        # Classes
-        class_pattern = r'class\s+(\w+)'
-        classes = re.findall(class_pattern, code)
-        structure["classes"] = [{"name": c} for c in classes]
-        
-        # Control flow
-        if 'if' in code:
-            structure["control_flow"].append({"type": "If"})
-        if any(keyword in code for keyword in ['for', 'while']):
-            structure["control_flow"].append({"type": "Loop"})
-        
-        return structure
-
-    def _generic_parse(self, code: str, language: str) -> Dict[str, Any]:
-        """Genel kod analizi"""
-        return {
-            "language": language,
-            "lines": len(code.splitlines()),
-            "has_functions": bool(re.search(r'function|def|void|public|private', code)),
-            "has_loops": bool(re.search(r'for|while|do', code)),
-            "has_conditionals": bool(re.search(r'if|else|switch|case', code)),
-            "complexity": "medium"
-        }
-
-    def _extract_function_calls(self, node) -> List[str]:
-        """Fonksiyon çağrılarını çıkar"""
-        calls = []
-        for child in ast.walk(node):
-            if isinstance(child, ast.Call):
-                if isinstance(child.func, ast.Name):
-                    calls.append(child.func.id)
-                elif isinstance(child.func, ast.Attribute):
-                    calls.append(child.func.attr)
-        return calls
-
-    def _generate_mermaid_syntax(self, structure: Dict[str, Any], style: str, language: str) -> str:
-        """Mermaid syntax oluştur"""
-        if style == "flowchart":
-            return self._generate_flowchart(structure, language)
-        elif style == "sequence":
-            return self._generate_sequence_diagram(structure, language)
-        else:
-            return self._generate_flowchart(structure, language)
-
-    def _generate_flowchart(self, structure: Dict[str, Any], language: str) -> str:
-        """Flowchart Mermaid syntax"""
-        mermaid = "flowchart TD\n"
-        
-        # Start node
-        mermaid += "    START([\"🚀 Program Start\"])\n"
-        
-        last_node = "START"
-        
-        # Imports/Includes
-        if structure.get("imports") and len(structure["imports"]) > 0:
-            mermaid += "    IMPORTS[\"📚 Import Libraries\"]\n"
-            mermaid += "    START --> IMPORTS\n"
-            last_node = "IMPORTS"
-        
-        # Classes
-        if structure.get("classes"):
-            for i, cls in enumerate(structure["classes"]):
-                class_id = f"CLASS{i}"
-                class_name = cls.get('name', f'Class{i}')
-                mermaid += f"    {class_id}[\"🏗️ Class: {class_name}\"]\n"
-                mermaid += f"    {last_node} --> {class_id}\n"
-                last_node = class_id
-        
-        # Functions
-        if structure.get("functions"):
-            for i, func in enumerate(structure["functions"]):
-                func_id = f"FUNC{i}"
-                func_name = func.get("name", f"Function{i}")
-                mermaid += f"    {func_id}[\"⚙️ {func_name}()\"]\n"
-                mermaid += f"    {last_node} --> {func_id}\n"
-                
-                # Function calls (limit to 2 per function)
-                if "calls" in func and func["calls"]:
-                    for j, call in enumerate(func["calls"][:2]):
-                        call_id = f"CALL{i}_{j}"
-                        mermaid += f"    {call_id}[\"📞 {call}()\"]\n"
-                        mermaid += f"    {func_id} --> {call_id}\n"
-        
-        # Control flow
-        if structure.get("control_flow"):
-            control_id = "CTRL"
-            control_types = [ctrl.get("type", "Control") for ctrl in structure["control_flow"]]
-            control_text = ", ".join(set(control_types))
-            mermaid += f"    {control_id}{{\"🔄 {control_text}\"}}\n"
-            mermaid += f"    {last_node} --> {control_id}\n"
-            last_node = control_id
-        
-        # Main execution calls
-        if structure.get("calls"):
-            main_calls = list(set(structure["calls"]))[:2]  # Limit to 2
-            for i, call in enumerate(main_calls):
-                if call not in ['print']:  # Skip common functions already shown
-                    call_id = f"MAIN{i}"
-                    mermaid += f"    {call_id}[\"▶️ Execute {call}()\"]\n"
-                    mermaid += f"    {last_node} --> {call_id}\n"
-                    last_node = call_id
-        
-        # End node
-        mermaid += "    END([\"✅ Program End\"])\n"
-        mermaid += f"    {last_node} --> END\n"
-        
-        # Styling
-        mermaid += "\n"
-        mermaid += "    classDef startEnd fill:#e1f5fe,stroke:#01579b,stroke-width:2px\n"
-        mermaid += "    classDef process fill:#f3e5f5,stroke:#4a148c,stroke-width:2px\n"
-        mermaid += "    classDef decision fill:#fff3e0,stroke:#e65100,stroke-width:2px\n"
-        mermaid += "    class START,END startEnd\n"
-        
-        return mermaid
-
-    def _generate_sequence_diagram(self, structure: Dict[str, Any], language: str) -> str:
-        """Sequence diagram Mermaid syntax"""
-        mermaid = "sequenceDiagram\n"
-        mermaid += "    participant User\n"
-        mermaid += "    participant Main\n"
-        
-        # Add functions as participants
-        if structure.get("functions"):
-            for func in structure["functions"][:5]:  # Limit to 5
-                mermaid += f"    participant {func['name']}\n"
-        
-        mermaid += "\n"
-        mermaid += "    User->>Main: Execute Program\n"
-        
-        # Function calls
-        if structure.get("functions"):
-            for func in structure["functions"]:
-                mermaid += f"    Main->>+{func['name']}: Call {func['name']}()\n"
-                if "calls" in func and func["calls"]:
-                    for call in func["calls"][:2]:  # Limit to 2 calls per function
-                        mermaid += f"    {func['name']}->>+Main: {call}()\n"
-                mermaid += f"    {func['name']}->>-Main: Return\n"
-        
-        mermaid += "    Main->>User: Program Complete\n"
-        
-        return mermaid
-
-    async def _create_fallback_diagram(self, code: str, language: str) -> Dict[str, Any]:
-        """Hata durumunda fallback diagram"""
-        lines = code.splitlines()
-        
-        mermaid = "flowchart TD\n"
-        mermaid += "    A[📝 Code Analysis]\n"
-        mermaid += f"    B[🔤 Language: {language}]\n"
-        mermaid += f"    C[📏 Lines: {len(lines)}]\n"
-        mermaid += "    D[❌ Parsing Failed]\n"
-        mermaid += "    A --> B --> C --> D\n"
-        
-        session_id = f"fallback_{uuid.uuid4().hex[:8]}"
-        
-        return {
-            "session_id": session_id,
-            "mermaid_code": mermaid,
-            "error": "Fallback diagram created due to parsing error"
-        }
-
-# Backward compatibility
-async def generate_flowchart(code: str, language: str):
-    generator = Code2FlowGenerator()
-    result = await generator.generate_flow(code, language)
+import subprocess
+import os
+import ast
+import json
+import uuid
+import re
+import tempfile
+from typing import Dict, List, Optional, Any
+from datetime import datetime
+
+from utils.cfg import MAX_FUNCTION_NODES, build_cfgs
+
+class Code2FlowGenerator:
+    def __init__(self, max_nodes: int = 400, max_function_nodes: int = MAX_FUNCTION_NODES):
+        # Dizin ilk yazmada oluşturulur (bkz. ensure_output_dir)
+        self.output_dir = "static/flowcharts"
+        # Akış diyagramı düğüm bütçesi (toplam / fonksiyon başına CFG bloğu)
+        self.max_nodes = max_nodes
+        self.max_function_nodes = max_function_nodes
+    
+    def ensure_output_dir(self) -> str:
+        """Diyagram çıktı dizinini gerekirse oluştur"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        return self.output_dir
+    
+    async def generate_flow(self, code: str, language: str, style: str = "flowchart",
+                            symbols: Any = None, path: Optional[str] = None) -> Dict[str, Any]:
+        """Ana akış diyagramı oluşturma fonksiyonu (symbols + path: çağrılar proje dizininden
+        modül adlarıyla etiketlenir)"""
+        try:
+            # Kod parse et
+            parsed_structure = await self._parse_code_structure(code, language)
+            if symbols is not None and path and "error" not in parsed_structure:
+                parsed_structure["resolved_calls"] = self._resolve_calls(parsed_structure, symbols, path)
+            
+            # Mermaid syntax oluştur
+            mermaid_content = self._generate_mermaid_syntax(parsed_structure, style, language)
+            
+            # Session ID oluştur
+            session_id = str(uuid.uuid4())[:8]
+            
+            return {
+                "session_id": session_id,
+                "mermaid_code": mermaid_content,
+                "structure": parsed_structure,
+                "style": style,
+                "language": language,
+                "timestamp": datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            return {
+                "error": str(e),
+                "fallback_diagram": await self._create_fallback_diagram(code, language)
+            }
+
+    async def _parse_code_structure(self, code: str, language: str) -> Dict[str, Any]:
+        """Kod yapısını parse et"""
+        if language.lower() == "python":
+            return self._parse_python(code)
+        elif language.lower() == "javascript":
+            return self._parse_javascript(code)
+        else:
+            return self._generic_parse(code, language)
+
+    def _parse_python(self, code: str) -> Dict[str, Any]:
+        """Python kodu parse et"""
+        try:
+            tree = ast.parse(code)
+            structure = {
+                "functions": [],
+                "classes": [],
+                "imports": [],
+                "control_flow": [],
+                "variables": [],
+                "calls": []
+            }
+            
+            for node in ast.walk(tree):
+                if isinstance(node, ast.FunctionDef):
+                    func_info = {
+                        "name": node.name,
+                        "args": [arg.arg for arg in node.args.args],
+                        "line": node.lineno,
+                        "calls": self._extract_function_calls(node)
+                    }
+                    structure["functions"].append(func_info)
+                
+                elif isinstance(node, ast.ClassDef):
+                    class_info = {
+                        "name": node.name,
+                        "methods": [n.name for n in node.body if isinstance(n, ast.FunctionDef)],
+                        "line": node.lineno
+                    }
+                    structure["classes"].append(class_info)
+                
+                elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                    if isinstance(node, ast.Import):
+                        for alias in node.names:
+                            structure["imports"].append(alias.name)
+                    else:
+                        structure["imports"].append(f"{node.module}")
+                
+                elif isinstance(node, (ast.If, ast.For, ast.While)):
+                    structure["control_flow"].append({
+                        "type": type(node).__name__,
+                        "line": node.lineno
+                    })
+                
+                elif isinstance(node, ast.Call):
+                    if isinstance(node.func, ast.Name):
+                        structure["calls"].append(node.func.id)
+            
+            # Fonksiyon başına kontrol akış grafikleri (flowchart stili bunları çizer)
+            structure["cfgs"] = build_cfgs(tree, code, self.max_function_nodes)
+            return structure
+            
+        except Exception as e:
+            return {"error": f"Python parsing error: {str(e)}"}
+
+    def _parse_javascript(self, code: str) -> Dict[str, Any]:
+        """JavaScript kodu parse et"""
+        structure = {
+            "functions": [],
+            "classes": [],
+            "imports": [],
+            "control_flow": [],
+            "calls": []
+        }
+        
+        # Function declarations
+        func_pattern = r'function\s+(\w+)\s*\([^)]*\)'
+        functions = re.findall(func_pattern, code)
+        structure["functions"] = [{"name": f, "type": "function"} for f in functions]
+        
+        # Arrow functions
+        arrow_pattern = r'(?:const|let|var)\s+(\w+)\s*=\s*\([^)]*\)\s*=>'
+        arrow_functions = re.findall(arrow_pattern, code)
+        structure["functions"].extend([{"name": f, "type": "arrow"} for f in arrow_functions])
+        
+        # Function calls
+        call_pattern = r'(\w+)\s*\('
+        calls = re.findall(call_pattern, code)
+        structure["calls"] = list(set(calls))
+        
+        # Classes
+        class_pattern = r'class\s+(\w+)'
+        classes = re.findall(class_pattern, code)
+        structure["classes"] = [{"name": c} for c in classes]
+        
+        # Control flow
+        if 'if' in code:
+            structure["control_flow"].append({"type": "If"})
+        if any(keyword in code for keyword in ['for', 'while']):
+            structure["control_flow"].append({"type": "Loop"})
+        
+        return structure
+
+    def _generic_parse(self, code: str, language: str) -> Dict[str, Any]:
+        """Genel kod analizi"""
+        return {
+            "language": language,
+            "lines": len(code.splitlines()),
+            "has_functions": bool(re.search(r'function|def|void|public|private', code)),
+            "has_loops": bool(re.search(r'for|while|do', code)),
+            "has_conditionals": bool(re.search(r'if|else|switch|case', code)),
+            "complexity": "medium"
+        }
+
+    def _resolve_calls(self, structure: Dict[str, Any], symbols: Any, path: str) -> Dict[str, str]:
+        """Ham çağrı adı -> projedeki tam adı (çözülemeyenler atlanır)"""
+        names = set(structure.get("calls", []))
+        for func in structure.get("functions", []):
+            names.update(func.get("calls", []))
+        for cfg in structure.get("cfgs", []):
+            for block in cfg["blocks"]:
+                names.update(block.get("calls", []))
+        resolved = {}
+        for name in names:
+            target = symbols.resolve_name(path, name)
+            if target and target != name:
+                resolved[name] = target
+        return resolved
+
+    def generate_call_graph(self, graph: Dict[str, Any]) -> str:
+        """SymbolIndex.call_graph çıktısından modül alt grafikleriyle Mermaid çağrı grafiği"""
+        mermaid = "flowchart LR\n"
+        ids = {symbol: f"N{i}" for i, symbol in enumerate(graph["nodes"])}
+        modules: Dict[str, List[str]] = {}
+        for symbol, node in graph["nodes"].items():
+            modules.setdefault(node.get("module") or "external", []).append(symbol)
+
+        for number, (module, symbols) in enumerate(modules.items()):
+            mermaid += f"    subgraph M{number}[\"📦 {module}\"]\n"
+            for symbol in symbols:
+                node = graph["nodes"][symbol]
+                label = symbol[len(module) + 1:] if symbol.startswith(f"{module}.") else symbol
+                icon = "🏗️" if node.get("kind") == "class" else "⚙️"
+                mermaid += f"        {ids[symbol]}[\"{icon} {label}()\"]\n"
+            mermaid += "    end\n"
+        for caller, callee in graph["edges"]:
+            mermaid += f"    {ids[caller]} --> {ids[callee]}\n"
+
+        mermaid += "\n"
+        mermaid += "    classDef root fill:#e1f5fe,stroke:#01579b,stroke-width:2px\n"
+        mermaid += f"    class {ids[graph['root']]} root\n"
+        return mermaid
+
+    def _extract_function_calls(self, node) -> List[str]:
+        """Fonksiyon çağrılarını çıkar"""
+        calls = []
+        for child in ast.walk(node):
+            if isinstance(child, ast.Call):
+                if isinstance(child.func, ast.Name):
+                    calls.append(child.func.id)
+                elif isinstance(child.func, ast.Attribute):
+                    calls.append(child.func.attr)
+        return calls
+
+    def _generate_mermaid_syntax(self, structure: Dict[str, Any], style: str, language: str) -> str:
+        """Mermaid syntax oluştur"""
+        if style == "flowchart":
+            return self._generate_flowchart(structure, language)
+        elif style == "sequence":
+            return self._generate_sequence_diagram(structure, language)
+        else:
+            return self._generate_flowchart(structure, language)
+
+    def _generate_flowchart(self, structure: Dict[str, Any], language: str) -> str:
+        """Flowchart Mermaid syntax"""
+        if "cfgs" in structure:
+            return self._generate_cfg_flowchart(structure)
+        mermaid = "flowchart TD\n"
+        
+        # Start node
+        mermaid += "    START([\"🚀 Program Start\"])\n"
+        
+        last_node = "START"
+        
+        # Imports/Includes
+        if structure.get("imports") and len(structure["imports"]) > 0:
+            mermaid += "    IMPORTS[\"📚 Import Libraries\"]\n"
+            mermaid += "    START --> IMPORTS\n"
+            last_node = "IMPORTS"
+        
+        # Classes
+        if structure.get("classes"):
+            for i, cls in enumerate(structure["classes"]):
+                class_id = f"CLASS{i}"
+                class_name = cls.get('name', f'Class{i}')
+                mermaid += f"    {class_id}[\"🏗️ Class: {class_name}\"]\n"
+                mermaid += f"    {last_node} --> {class_id}\n"
+                last_node = class_id
+        
+        # Proje dizininden çözülen çağrılar tam adlarıyla gösterilir
+        resolved = structure.get("resolved_calls", {})
+        
+        # Functions
+        if structure.get("functions"):
+            for i, func in enumerate(structure["functions"]):
+                func_id = f"FUNC{i}"
+                func_name = func.get("name", f"Function{i}")
+                mermaid += f"    {func_id}[\"⚙️ {func_name}()\"]\n"
+                mermaid += f"    {last_node} --> {func_id}\n"
+                
+                # Function calls (limit to 2 per function)
+                if "calls" in func and func["calls"]:
+                    for j, call in enumerate(func["calls"][:2]):
+                        call_id = f"CALL{i}_{j}"
+                        mermaid += f"    {call_id}[\"📞 {resolved.get(call, call)}()\"]\n"
+                        mermaid += f"    {func_id} --> {call_id}\n"
+        
+        # Control flow
+        if structure.get("control_flow"):
+            control_id = "CTRL"
+            control_types = [ctrl.get("type", "Control") for ctrl in structure["control_flow"]]
+            control_text = ", ".join(set(control_types))
+            mermaid += f"    {control_id}{{\"🔄 {control_text}\"}}\n"
+            mermaid += f"    {last_node} --> {control_id}\n"
+            last_node = control_id
+        
+        # Main execution calls
+        if structure.get("calls"):
+            main_calls = list(set(structure["calls"]))[:2]  # Limit to 2
+            for i, call in enumerate(main_calls):
+                if call not in ['print']:  # Skip common functions already shown
+                    call_id = f"MAIN{i}"
+                    mermaid += f"    {call_id}[\"▶️ Execute {resolved.get(call, call)}()\"]\n"
+                    mermaid += f"    {last_node} --> {call_id}\n"
+                    last_node = call_id
+        
+        # End node
+        mermaid += "    END([\"✅ Program End\"])\n"
+        mermaid += f"    {last_node} --> END\n"
+        
+        # Styling
+        mermaid += "\n"
+        mermaid += "    classDef startEnd fill:#e1f5fe,stroke:#01579b,stroke-width:2px\n"
+        mermaid += "    classDef process fill:#f3e5f5,stroke:#4a148c,stroke-width:2px\n"
+        mermaid += "    classDef decision fill:#fff3e0,stroke:#e65100,stroke-width:2px\n"
+        mermaid += "    class START,END startEnd\n"
+        
+        return mermaid
+
+    def _generate_cfg_flowchart(self, structure: Dict[str, Any]) -> str:
+        """CFG tabanlı flowchart: modül kodu ana akışta, her fonksiyon kendi alt grafiğinde"""
+        mermaid = "flowchart TD\n"
+        mermaid += "    START([\"🚀 Program Start\"])\n"
+        last_node = "START"
+        if structure.get("imports"):
+            mermaid += "    IMPORTS[\"📚 Import Libraries\"]\n"
+            mermaid += "    START --> IMPORTS\n"
+            last_node = "IMPORTS"
+
+        resolved = structure.get("resolved_calls", {})
+        budget = self.max_nodes
+        classes: Dict[str, List[str]] = {"loop": [], "hotloop": [], "hot": [], "decision": []}
+        module_cfgs = [cfg for cfg in structure["cfgs"] if cfg["name"] == "<module>"]
+        function_cfgs = [cfg for cfg in structure["cfgs"] if cfg["name"] != "<module>"]
+
+        # Modül düzeyi kod (birden çok bölgeden gelebilir) sırayla ana akışa bağlanır
+        for i, cfg in enumerate(module_cfgs):
+            if len(cfg["blocks"]) > budget:
+                break
+            budget -= len(cfg["blocks"])
+            prefix = f"M{i}_"
+            mermaid += f"    subgraph M{i}[\"📜 Module code\"]\n"
+            mermaid += self._cfg_body(cfg, prefix, resolved, classes)
+            mermaid += "    end\n"
+            if last_node:
+                mermaid += f"    {last_node} --> {prefix}0\n"
+            # Çıkışa ulaşmayan modül kodu (sonsuz döngü, raise) programı bitirmez
+            last_node = next((f"{prefix}{b['id']}" for b in cfg["blocks"] if b["kind"] == "exit"), None)
+
+        mermaid += "    END([\"✅ Program End\"])\n"
+        if last_node:
+            mermaid += f"    {last_node} --> END\n"
+
+        skipped = 0
+        for i, cfg in enumerate(function_cfgs):
+            title = self._mermaid_text(f"⚙️ {cfg['name']}")
+            if len(cfg["blocks"]) <= budget:
+                budget -= len(cfg["blocks"])
+                mermaid += f"    subgraph F{i}[\"{title}\"]\n"
+                mermaid += self._cfg_body(cfg, f"F{i}_", resolved, classes)
+                mermaid += "    end\n"
+            elif budget > 0:
+                # Bütçeyi aşan fonksiyon tek özet düğümü olur
+                budget -= 1
+                summary = f"{len(cfg['blocks'])} blocks, {cfg['branches']} branches, {cfg['loops']} loops"
+                mermaid += f"    F{i}[\"{title}<br/>{summary}\"]\n"
+                if cfg["max_loop_depth"] >= 2:
+                    classes["hotloop"].append(f"F{i}")
+                elif cfg["loops"]:
+                    classes["loop"].append(f"F{i}")
+            else:
+                skipped += 1
+        if skipped:
+            mermaid += f"    MORE[\"⋯ {skipped} more functions\"]\n"
+
+        mermaid += "\n"
+        mermaid += "    classDef startEnd fill:#e1f5fe,stroke:#01579b,stroke-width:2px\n"
+        mermaid += "    classDef process fill:#f3e5f5,stroke:#4a148c,stroke-width:2px\n"
+        mermaid += "    classDef decision fill:#fff3e0,stroke:#e65100,stroke-width:2px\n"
+        mermaid += "    classDef loop fill:#fff8e1,stroke:#ff6f00,stroke-width:2px\n"
+        mermaid += "    classDef hotloop fill:#ffebee,stroke:#b71c1c,stroke-width:3px\n"
+        mermaid += "    classDef hot fill:#fce4ec,stroke:#c62828,stroke-width:1px\n"
+        mermaid += "    class START,END startEnd\n"
+        for name, nodes in classes.items():
+            if nodes:
+                mermaid += f"    class {','.join(nodes)} {name}\n"
+        return mermaid
+
+    def _cfg_body(self, cfg: Dict[str, Any], prefix: str, resolved: Dict[str, str],
+                  classes: Dict[str, List[str]]) -> str:
+        """Bir CFG'nin düğüm ve kenarları; iç içe döngüler (sıcak yollar) ayrı renklenir"""
+        mermaid = ""
+        for block in cfg["blocks"]:
+            node_id = f"{prefix}{block['id']}"
+            kind = block["kind"]
+            lines = list(block["statements"])
+            if block.get("more"):
+                lines.append(f"⋯ +{block['more']}")
+            # Proje dizininden çözülen çağrılar tam adlarıyla
+            lines.extend(f"📞 {resolved[call]}()" for call in block.get("calls", []) if call in resolved)
+            text = "<br/>".join(self._mermaid_text(line) for line in lines)
+            if kind == "entry":
+                mermaid += f"        {node_id}([\"▶️ {text}\"])\n"
+            elif kind == "exit":
+                mermaid += f"        {node_id}([\"⏹️ {text}\"])\n"
+            elif kind == "branch":
+                mermaid += f"        {node_id}{{\"❓ {text}\"}}\n"
+                classes["decision"].append(node_id)
+            elif kind == "loop":
+                mermaid += f"        {node_id}{{{{\"🔁 {text}\"}}}}\n"
+                classes["hotloop" if block["loop_depth"] >= 2 else "loop"].append(node_id)
+            else:
+                if block["start_line"] is not None:
+                    span = block["start_line"] if block["start_line"] == block["end_line"] else \
+                        f"{block['start_line']}-{block['end_line']}"
+                    text += f"<br/><i>L{span}</i>"
+                mermaid += f"        {node_id}[\"{text}\"]\n"
+                if block["loop_depth"] >= 2:
+                    classes["hot"].append(node_id)
+        for source, target, label in cfg["edges"]:
+            # Geri kenarlar (döngü tekrarı) kesikli çizilir
+            arrow = "-.->" if label in ("loop", "continue") else "-->"
+            edge = f"|{self._mermaid_text(label)}|" if label else ""
+            mermaid += f"        {prefix}{source} {arrow}{edge} {prefix}{target}\n"
+        return mermaid
+
+    @staticmethod
+    def _mermaid_text(text: str) -> str:
+        """Tırnaklı Mermaid etiketi için kaçış"""
+        return (text.replace("&", "#amp;").replace('"', "#quot;").replace("<", "#lt;").replace(">", "#gt;")
+                .replace("|", "#124;"))
+
+    def _generate_sequence_diagram(self, structure: Dict[str, Any], language: str) -> str:
+        """Sequence diagram Mermaid syntax"""
+        mermaid = "sequenceDiagram\n"
+        mermaid += "    participant User\n"
+        mermaid += "    participant Main\n"
+        
+        # Add functions as participants
+        if structure.get("functions"):
+            for func in structure["functions"][:5]:  # Limit to 5
+                mermaid += f"    participant {func['name']}\n"
+        
+        mermaid += "\n"
+        mermaid += "    User->>Main: Execute Program\n"
+        
+        # Function calls
+        if structure.get("functions"):
+            for func in structure["functions"]:
+                mermaid += f"    Main->>+{func['name']}: Call {func['name']}()\n"
+                if "calls" in func and func["calls"]:
+                    for call in func["calls"][:2]:  # Limit to 2 calls per function
+                        mermaid += f"    {func['name']}->>+Main: {call}()\n"
+                mermaid += f"    {func['name']}->>-Main: Return\n"
+        
+        mermaid += "    Main->>User: Program Complete\n"
+        
+        return mermaid
+
+    async def _create_fallback_diagram(self, code: str, language: str) -> Dict[str, Any]:
+        """Hata durumunda fallback diagram"""
+        lines = code.splitlines()
+        
+        mermaid = "flowchart TD\n"
+        mermaid += "    A[📝 Code Analysis]\n"
+        mermaid += f"    B[🔤 Language: {language}]\n"
+        mermaid += f"    C[📏 Lines: {len(lines)}]\n"
+        mermaid += "    D[❌ Parsing Failed]\n"
+        mermaid += "    A --> B --> C --> D\n"
+        
+        session_id = f"fallback_{uuid.uuid4().hex[:8]}"
+        
+        return {
+            "session_id": session_id,
+            "mermaid_code": mermaid,
+            "error": "Fallback diagram created due to parsing error"
+        }
+
+# Backward compatibility
+async def generate_flowchart(code: str, language: str):
+    generator = Code2FlowGenerator()
+    result = await generator.generate_flow(code, language)
     return result.get("mermaid_code", "")
\ No newline at end of file
@@ -1,55 +1,71 @@
-import ast
-import re
-from typing import Dict, List, Any
-from datetime import datetime
-
-class CodeAnalyzer:
-    def __init__(self):
-        pass
-    
-    async def analyze_comprehensive(self, code: str, language: str, filename=None):
-        return {
-            "timestamp": datetime.now().isoformat(),
-            "language": language,
-            "filename": filename,
-            "metrics": self._calculate_basic_metrics(code),
-            "security_issues": self._analyze_security(code, language),
-            "performance_tips": self._analyze_performance(code, language),
-            "quality_score": 85.0,
-            "complexity_analysis": {},
-            "code_smells": []
-        }
-    
-    def _calculate_basic_metrics(self, code: str):
-        lines = code.splitlines()
-        return {
-            "total_lines": len(lines),
-            "non_empty_lines": len([line for line in lines if line.strip()]),
-            "characters": len(code),
-            "functions": len(re.findall(r'def\s+\w+|function\s+\w+', code))
-        }
-    
-    def _analyze_security(self, code: str, language: str):
-        issues = []
-        if "eval(" in code:
-            issues.append({"type": "security", "message": "Potential code injection with eval()"})
-        if "exec(" in code:
-            issues.append({"type": "security", "message": "Potential code injection with exec()"})
-        return issues
-    
-    def _analyze_performance(self, code: str, language: str):
-        tips = []
-        if "for i in range(len(" in code:
-            tips.append({"type": "performance", "message": "Consider using enumerate() instead of range(len())"})
-        return tips
-
-def analyze_code(code: str, language: str):
-    analyzer = CodeAnalyzer()
-    import asyncio
-    return asyncio.run(analyzer.analyze_comprehensive(code, language))
-
-def check_security(code: str, language: str):
-    return ["Security check completed"]
-
-def check_performance(code: str, language: str):
-    return ["Performance check completed"]
+import ast
+import re
+from typing import Dict, List, Any
+from datetime import datetime
+
+class CodeAnalyzer:
+    def __init__(self):
+        pass
+    
+    async def analyze_comprehensive(self, code: str, language: str, filename=None, mode: str = "full"):
+        if mode == "metrics_only":
+            # Büyük girdiler için ucuz mod: regex/AST taramaları atlanır
+            return {
+                "timestamp": datetime.now().isoformat(),
+                "language": language,
+                "filename": filename,
+                "analysis_mode": mode,
+                "metrics": self._calculate_basic_metrics(code),
+                "security_issues": [],
+                "performance_tips": [],
+                "quality_score": None,
+                "complexity_analysis": {},
+                "code_smells": []
+            }
+
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "language": language,
+            "filename": filename,
+            "analysis_mode": mode,
+            "metrics": self._calculate_basic_metrics(code),
+            "security_issues": self._analyze_security(code, language),
+            "performance_tips": self._analyze_performance(code, language),
+            "quality_score": 85.0,
+            "complexity_analysis": {},
+            "code_smells": []
+        }
+    
+    def _calculate_basic_metrics(self, code: str):
+        lines = code.splitlines()
+        return {
+            "total_lines": len(lines),
+            "non_empty_lines": len([line for line in lines if line.strip()]),
+            "characters": len(code),
+            "functions": len(re.findall(r'def\s+\w+|function\s+\w+', code))
+        }
+    
+    def _analyze_security(self, code: str, language: str):
+        issues = []
+        if "eval(" in code:
+            issues.append({"type": "security", "message": "Potential code injection with eval()"})
+        if "exec(" in code:
+            issues.append({"type": "security", "message": "Potential code injection with exec()"})
+        return issues
+    
+    def _analyze_performance(self, code: str, language: str):
+        tips = []
+        if "for i in range(len(" in code:
+            tips.append({"type": "performance", "message": "Consider using enumerate() instead of range(len())"})
+        return tips
+
+def analyze_code(code: str, language: str):
+    analyzer = CodeAnalyzer()
+    import asyncio
+    return asyncio.run(analyzer.analyze_comprehensive(code, language))
+
+def check_security(code: str, language: str):
+    return ["Security check completed"]
+
+def check_performance(code: str, language: str):
+    return ["Performance check completed"]
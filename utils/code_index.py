@@ -0,0 +1,282 @@
+import ast
+import gzip
+import json
+import math
+import os
+import re
+import shutil
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.semantic_cache import HashingEmbedder
+from utils.symbol_index import SymbolIndex
+
+# Fonksiyon/sınıf dışındaki kod ve Python dışı diller için pencere boyutu (satır)
+WINDOW_LINES = 60
+# Büyük sınıflar metot metot bölünür; başlık parçası en fazla bu kadar satır
+CLASS_HEADER_LINES = 30
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|[^\W\d_]+", re.U)
+_CAMEL = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+_PROJECT_ID = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+
+def tokenize(text: str) -> List[str]:
+    """Tanımlayıcıları hem tam hem parçalarıyla (snake_case / camelCase) küçük harfe çevir"""
+    tokens = []
+    for word in _IDENTIFIER.findall(text):
+        lower = word.lower()
+        tokens.append(lower)
+        parts = [p.lower() for piece in word.split("_") for p in _CAMEL.findall(piece)]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def _chunk(path: str, name: str, kind: str, lines: List[str], start: int, end: int) -> Dict[str, Any]:
+    return {"path": path, "name": name, "kind": kind, "start_line": start, "end_line": end,
+            "text": "\n".join(lines[start - 1:end])}
+
+
+def _windows(path: str, lines: List[str], start: int, end: int) -> List[Dict[str, Any]]:
+    chunks = []
+    for first in range(start, end + 1, WINDOW_LINES):
+        last = min(first + WINDOW_LINES - 1, end)
+        if any(line.strip() for line in lines[first - 1:last]):
+            chunks.append(_chunk(path, f"{os.path.basename(path)}:{first}", "block", lines, first, last))
+    return chunks
+
+
+def chunk_source(path: str, source: str) -> List[Dict[str, Any]]:
+    """Kaynağı fonksiyon/sınıf parçalarına böl; Python dışı veya hatalı kod satır pencereleriyle bölünür"""
+    lines = source.splitlines()
+    if not path.endswith(".py"):
+        return _windows(path, lines, 1, len(lines))
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return _windows(path, lines, 1, len(lines))
+
+    chunks = []
+    covered = 0
+    for node in tree.body:
+        start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+        end = node.end_lineno
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            chunks.extend(_windows(path, lines, covered + 1, start - 1))
+            chunks.append(_chunk(path, node.name, "function", lines, start, end))
+        elif isinstance(node, ast.ClassDef):
+            chunks.extend(_windows(path, lines, covered + 1, start - 1))
+            methods = [n for n in node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
+            if end - start < WINDOW_LINES or not methods:
+                chunks.append(_chunk(path, node.name, "class", lines, start, end))
+            else:
+                header_end = min(methods[0].lineno - 1, start + CLASS_HEADER_LINES - 1)
+                chunks.append(_chunk(path, node.name, "class", lines, start, header_end))
+                for method in methods:
+                    method_start = min([method.lineno] + [d.lineno for d in method.decorator_list])
+                    chunks.append(_chunk(path, f"{node.name}.{method.name}", "method", lines,
+                                         method_start, method.end_lineno))
+        else:
+            continue
+        covered = end
+    chunks.extend(_windows(path, lines, covered + 1, len(lines)))
+    return chunks
+
+
+class ProjectIndex:
+    """Bir projenin kod parçaları üzerinde BM25 ters dizini ve isteğe bağlı vektörler.
+
+    Dosya eklendiğinde yalnızca o dosyanın parçaları değişir; dizin diske
+    (gzip JSON + .npy) yazılır ve ilk kullanımda geri yüklenir.
+    """
+
+    k1 = 1.5
+    b = 0.75
+
+    def __init__(self, directory: str, use_vectors: bool = True, embedder: Optional[HashingEmbedder] = None):
+        self.directory = directory
+        self.use_vectors = use_vectors
+        self.embedder = embedder or HashingEmbedder()
+        self.chunks: List[Dict[str, Any]] = []
+        self.version = 0
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._lengths: List[int] = []
+        self._vectors: Optional[np.ndarray] = None
+        # Modüller arası tanım/çağrı dizini (Python dosyaları)
+        self.symbols = SymbolIndex()
+        # Yükleme iş parçacığında yeniden oluşturma ile arama aynı anda çalışmaz
+        self._lock = threading.Lock()
+
+    # --- oluşturma ---
+    def add_files(self, files: Dict[str, str]) -> Dict[str, int]:
+        """Dosyaları ekle veya değiştir: {"files": n, "chunks": toplam parça}"""
+        added = [c for path, source in files.items() for c in chunk_source(path, source)]
+        with self._lock:
+            self._rebuild(set(files), added)
+            self.symbols.update(files)
+            return {"files": len(files), "chunks": len(self.chunks)}
+
+    def remove_files(self, paths: Iterable[str]):
+        paths = set(paths)
+        with self._lock:
+            self._rebuild(paths, [])
+            self.symbols.remove(paths)
+
+    def _rebuild(self, replaced: set, added: List[Dict[str, Any]]):
+        keep = [i for i, c in enumerate(self.chunks) if c["path"] not in replaced]
+        for chunk in added:
+            chunk["terms"] = dict(Counter(tokenize(f"{chunk['path']} {chunk['name']}\n{chunk['text']}")))
+        self.chunks = [self.chunks[i] for i in keep] + added
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for doc, chunk in enumerate(self.chunks):
+            for term, tf in chunk["terms"].items():
+                postings.setdefault(term, []).append((doc, tf))
+        self._postings = postings
+        self._lengths = [sum(c["terms"].values()) for c in self.chunks]
+
+        if self.use_vectors:
+            # Korunan parçaların vektörleri yeniden hesaplanmaz
+            kept = self._vectors[keep] if self._vectors is not None else np.zeros((0, self.embedder.dim), np.float32)
+            fresh = [self.embedder.embed(f"{c['name']} {c['text']}") for c in added]
+            self._vectors = np.vstack([kept] + fresh) if fresh else kept
+        self.version += 1
+
+    # --- arama ---
+    def _bm25(self, terms: List[str]) -> Dict[int, float]:
+        total = len(self.chunks)
+        average = (sum(self._lengths) / total) if total else 0.0
+        scores: Dict[int, float] = {}
+        for term in set(terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc, tf in postings:
+                norm = tf + self.k1 * (1 - self.b + self.b * self._lengths[doc] / average)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1) / norm
+        return scores
+
+    def search(self, query: str, k: int = 5, vector_weight: float = 0.3) -> List[Dict[str, Any]]:
+        """En ilgili k parça; BM25 skoru en iyiye göre ölçeklenip kosinüs benzerliğiyle harmanlanır"""
+        with self._lock:
+            return self._search(query, k, vector_weight)
+
+    def _search(self, query: str, k: int, vector_weight: float) -> List[Dict[str, Any]]:
+        if not self.chunks:
+            return []
+        scores = self._bm25(tokenize(query))
+        best = max(scores.values(), default=0.0)
+        combined = {doc: score / best for doc, score in scores.items()} if best else {}
+
+        if self.use_vectors and self._vectors is not None and vector_weight:
+            similarities = self._vectors @ self.embedder.embed(query)
+            candidates = set(combined) | set(np.argsort(similarities)[-k * 4:].tolist())
+            combined = {doc: (1 - vector_weight) * combined.get(doc, 0.0) + vector_weight * float(similarities[doc])
+                        for doc in candidates}
+
+        ranked = sorted(combined.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [
+            {**{key: value for key, value in self.chunks[doc].items() if key != "terms"}, "score": round(score, 4)}
+            for doc, score in ranked if score > 0
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"files": len({c["path"] for c in self.chunks}), "chunks": len(self.chunks),
+                "terms": len(self._postings), "version": self.version, "vectors": self._vectors is not None,
+                "symbols": self.symbols.stats()}
+
+    # --- kalıcılık ---
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, "index.json.gz")
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, "vectors.npy")
+
+    @property
+    def _symbols_path(self) -> str:
+        return os.path.join(self.directory, "symbols.json.gz")
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            data = {"version": self.version, "chunks": self.chunks, "lengths": self._lengths,
+                    "postings": self._postings}
+            vectors = self._vectors
+        # Önce geçici dosyaya yaz: yarım kalan yazım eski dizini bozmaz
+        temporary = self._index_path + ".tmp"
+        with gzip.open(temporary, "wt", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temporary, self._index_path)
+        if vectors is not None:
+            np.save(self._vectors_path, vectors)
+        with self._lock:
+            self.symbols.save(self._symbols_path)
+
+    def load(self) -> bool:
+        if not os.path.exists(self._index_path):
+            return False
+        with gzip.open(self._index_path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        self.version = data["version"]
+        self.chunks = data["chunks"]
+        self._lengths = data["lengths"]
+        self._postings = {term: [tuple(p) for p in postings] for term, postings in data["postings"].items()}
+        if self.use_vectors and os.path.exists(self._vectors_path):
+            self._vectors = np.load(self._vectors_path)
+        elif self.use_vectors:
+            self._vectors = np.array([self.embedder.embed(f"{c['name']} {c['text']}") for c in self.chunks],
+                                     dtype=np.float32).reshape(len(self.chunks), self.embedder.dim)
+        self.symbols.load(self._symbols_path)
+        return True
+
+
+class ProjectIndexStore:
+    """Proje kimliğine göre dizinler; `root/<project_id>/` altında saklanır"""
+
+    def __init__(self, root: str, use_vectors: bool = True):
+        self.root = root
+        self.use_vectors = use_vectors
+        self._indexes: Dict[str, ProjectIndex] = {}
+
+    def _directory(self, project_id: str) -> str:
+        if not _PROJECT_ID.match(project_id) or project_id in (".", ".."):
+            raise ValueError(f"Invalid project id: {project_id!r}")
+        return os.path.join(self.root, project_id)
+
+    def get(self, project_id: str, create: bool = False) -> Optional[ProjectIndex]:
+        index = self._indexes.get(project_id)
+        if index is None:
+            index = ProjectIndex(self._directory(project_id), use_vectors=self.use_vectors)
+            if not index.load() and not create:
+                return None
+            # İş parçacıklarından eşzamanlı yüklemede ilk yüklenen kalır
+            index = self._indexes.setdefault(project_id, index)
+        return index
+
+    def delete(self, project_id: str) -> bool:
+        directory = self._directory(project_id)
+        self._indexes.pop(project_id, None)
+        if not os.path.isdir(directory):
+            return False
+        shutil.rmtree(directory)
+        return True
+
+
+def format_context(chunks: List[Dict[str, Any]], max_chars: int) -> str:
+    """Parçaları modele eklenecek tek bir bağlam metnine çevir (karakter bütçesiyle)"""
+    parts, used = [], 0
+    for chunk in chunks:
+        block = f"# {chunk['path']}:{chunk['start_line']}-{chunk['end_line']} ({chunk['name']})\n{chunk['text']}"
+        if used + len(block) > max_chars:
+            if parts:
+                break
+            block = block[:max_chars]
+        parts.append(block)
+        used += len(block)
+    return "\n\n".join(parts)
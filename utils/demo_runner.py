@@ -1,118 +1,470 @@
-import subprocess
-import tempfile
-import os
-from typing import Dict, Any, Optional
-import time
-
-class DemoRunner:
-    def __init__(self):
-        self.max_execution_time = 10  # 10 saniye limit
-        self.temp_dir = tempfile.gettempdir()
-    
-    async def execute_code(self, code: str, language: str, input_data: Optional[str] = None):
-        """Kod çalıştırma ana fonksiyonu"""
-        
-        if language == "python":
-            return await self._execute_python(code, input_data)
-        elif language == "javascript":
-            return await self._execute_javascript(code, input_data)
-        elif language == "java":
-            return {"error": "Java execution not implemented yet"}
-        else:
-            return {"error": f"Language {language} not supported"}
-    
-    async def _execute_python(self, code: str, input_data: Optional[str] = None):
-        """Python kod çalıştırma"""
-        try:
-            # Güvenlik kontrolü
-            dangerous_imports = ['os', 'subprocess', 'sys', 'shutil', 'pathlib', 'importlib']
-            for imp in dangerous_imports:
-                if f"import {imp}" in code or f"from {imp}" in code:
-                    return {"error": f"Import '{imp}' not allowed for security reasons"}
-            
-            # Dangerous functions
-            dangerous_funcs = ['eval(', 'exec(', 'compile(', 'open(', '__import__(']
-            for func in dangerous_funcs:
-                if func in code:
-                    return {"error": f"Function '{func}' not allowed for security reasons"}
-            
-            # Temporary file oluştur
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(code)
-                temp_file = f.name
-            
-            start_time = time.time()
-            
-            # Python çalıştır
-            result = subprocess.run(
-                ['python', temp_file],
-                capture_output=True,
-                text=True,
-                timeout=self.max_execution_time,
-                input=input_data
-            )
-            
-            execution_time = time.time() - start_time
-            
-            # Cleanup
-            os.unlink(temp_file)
-            
-            return {
-                "output": result.stdout,
-                "errors": result.stderr if result.stderr else None,
-                "execution_time": f"{execution_time:.2f}s",
-                "exit_code": result.returncode
-            }
-            
-        except subprocess.TimeoutExpired:
-            return {"error": f"Code execution timeout ({self.max_execution_time}s limit)"}
-        except FileNotFoundError:
-            return {"error": "Python interpreter not found"}
-        except Exception as e:
-            return {"error": f"Execution failed: {str(e)}"}
-    
-    async def _execute_javascript(self, code: str, input_data: Optional[str] = None):
-        """JavaScript çalıştırma (Node.js gerekli)"""
-        try:
-            # Güvenlik kontrolü
-            dangerous_modules = ['fs', 'child_process', 'os', 'path', 'crypto']
-            for mod in dangerous_modules:
-                if f"require('{mod}')" in code or f'require("{mod}")' in code:
-                    return {"error": f"Module '{mod}' not allowed for security reasons"}
-            
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-                f.write(code)
-                temp_file = f.name
-            
-            start_time = time.time()
-            
-            result = subprocess.run(
-                ['node', temp_file],
-                capture_output=True,
-                text=True,
-                timeout=self.max_execution_time,
-                input=input_data
-            )
-            
-            execution_time = time.time() - start_time
-            
-            os.unlink(temp_file)
-            
-            return {
-                "output": result.stdout,
-                "errors": result.stderr if result.stderr else None,
-                "execution_time": f"{execution_time:.2f}s",
-                "exit_code": result.returncode
-            }
-            
-        except subprocess.TimeoutExpired:
-            return {"error": f"JavaScript execution timeout ({self.max_execution_time}s limit)"}
-        except FileNotFoundError:
-            return {"error": "Node.js not found. Please install Node.js to run JavaScript code."}
-        except Exception as e:
-            return {"error": f"Execution failed: {str(e)}"}
-
-# Backward compatibility
-async def execute_code(code: str, language: str, input_data: Optional[str] = None):
-    runner = DemoRunner()
-    return await runner.execute_code(code, language, input_data)
\ No newline at end of file
+import ast
+import asyncio
+import base64
+import json
+import marshal
+import sys
+import tempfile
+import os
+from typing import Dict, Any, List, Optional
+import time
+
+from utils.node_pool import NodeWorkerPool
+from utils.perf_stats import describe, fit_complexity, quantile
+from utils.singleflight import content_hash
+from utils.ttl_cache import TTLCache
+
+HARNESS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox_harness.py")
+
+# Girdi türü -> (başlangıç boyutu, çarpan, en büyük boyut)
+COMPLEXITY_SIZE_DEFAULTS = {
+    "int": (2, 1.5, 10 ** 6),
+    "list": (16, 2.0, 2 ** 20),
+}
+
+
+# Bu modülleri kullanan kodun çıktısı çalıştırmadan çalıştırmaya değişebilir: sonuç önbelleklenmez
+NONDETERMINISTIC_MODULES = {
+    "random", "time", "datetime", "uuid", "secrets", "threading", "multiprocessing", "asyncio",
+    "socket", "urllib", "http", "requests", "tempfile", "signal", "gc", "resource", "platform",
+}
+NONDETERMINISTIC_BUILTINS = {"id", "hash", "object"}
+
+# Toplu çalıştırmada varsayılan paralel sandbox işçisi sayısı
+BATCH_WORKERS = min(8, max(2, os.cpu_count() or 2))
+
+
+def outputs_equal(actual: str, expected: str, compare: str = "normalized") -> bool:
+    """normalized: satır sonu boşlukları ve sondaki boş satırlar yok sayılır"""
+    if compare == "exact":
+        return actual == expected
+    def normalize(text):
+        return "\n".join(line.rstrip() for line in text.strip("\n").splitlines()).rstrip()
+    return normalize(actual) == normalize(expected)
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def geometric_sizes(start: int, factor: float, max_size: int) -> List[int]:
+    """start, start·factor, ... (yuvarlanmış, tekrarsız) boyut dizisi"""
+    sizes, value = [], float(max(start, 1))
+    while value <= max_size:
+        if not sizes or int(value) != sizes[-1]:
+            sizes.append(int(value))
+        value *= max(factor, 1.1)
+    return sizes
+
+def is_deterministic(tree: ast.AST) -> bool:
+    """Aynı stdin ile her çalıştırmada aynı çıktıyı vermesi beklenen kod mu (muhafazakâr)"""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            modules = [node.module or ""]
+        elif isinstance(node, ast.Name) and node.id in NONDETERMINISTIC_BUILTINS:
+            return False
+        else:
+            continue
+        if any(module.split(".")[0] in NONDETERMINISTIC_MODULES for module in modules):
+            return False
+    return True
+
+class DemoRunner:
+    def __init__(self, result_ttl: float = 30.0, cache_entries: int = 256, js_workers: int = 2):
+        self.max_execution_time = 10  # 10 saniye limit
+        self.temp_dir = tempfile.gettempdir()
+        # İçerik hash'i -> doğrulama sonucu + derlenmiş bytecode
+        self.compiled_cache = TTLCache(cache_entries)
+        # Deterministik (kod, girdi) çiftlerinin sonuçları, kısa TTL ile
+        self.result_cache = TTLCache(cache_entries, ttl=result_ttl)
+        # Kalıcı Node.js işçileri, ilk JavaScript çalıştırmasında açılır
+        self.js_workers = js_workers
+        self._js_pool: Optional[NodeWorkerPool] = None
+    
+    async def execute_code(self, code: str, language: str, input_data: Optional[str] = None,
+                           profile: bool = False, line_profile: bool = False, memory: bool = False,
+                           use_cache: bool = True):
+        """Kod çalıştırma ana fonksiyonu"""
+        
+        if language == "python":
+            if profile:
+                return await self._profile_python(code, input_data, line_profile)
+            if memory:
+                return await self._memory_python(code, input_data)
+            return await self._execute_python(code, input_data, use_cache)
+        elif language == "javascript":
+            return await self._execute_javascript(code, input_data)
+        elif language == "java":
+            return {"error": "Java execution not implemented yet"}
+        else:
+            return {"error": f"Language {language} not supported"}
+    
+    async def _prepare_python(self, code: str) -> Dict[str, Any]:
+        """Güvenlik taraması + derleme; sonuç içerik hash'iyle önbelleklenir"""
+        key = content_hash("python", code)
+        prepared = self.compiled_cache.get(key)
+        if prepared is None:
+            prepared = await asyncio.to_thread(self._compile_python, code)
+            prepared["key"] = key
+            self.compiled_cache.set(key, prepared)
+        return prepared
+    
+    def _compile_python(self, code: str) -> Dict[str, Any]:
+        security_error = self._check_python_security(code)
+        if security_error:
+            return {"error": security_error}
+        try:
+            tree = ast.parse(code, "<snippet>")
+            code_obj = compile(tree, "<snippet>", "exec")
+        except SyntaxError as e:
+            return {"syntax_error": f"SyntaxError: {e.msg} (line {e.lineno})"}
+        return {
+            "bytecode": base64.b64encode(marshal.dumps(code_obj)).decode("ascii"),
+            "deterministic": is_deterministic(tree),
+        }
+    
+    async def _execute_python(self, code: str, input_data: Optional[str] = None, use_cache: bool = True):
+        """Python kod çalıştırma: önbellekli bytecode sandbox sürecine doğrudan gönderilir"""
+        try:
+            # Güvenlik kontrolü + derleme (önbellekli)
+            prepared = await self._prepare_python(code)
+            if "error" in prepared:
+                return {"error": prepared["error"]}
+            if "syntax_error" in prepared:
+                return {"output": "", "errors": prepared["syntax_error"], "execution_time": "0.00s", "exit_code": 1}
+            
+            result_key = content_hash(prepared["key"], input_data)
+            memoizable = prepared["deterministic"]
+            if use_cache and memoizable:
+                cached = self.result_cache.get(result_key)
+                if cached is not None:
+                    return dict(cached, cached=True)
+            
+            start_time = time.time()
+            
+            # Python çalıştır (geçici dosya yok)
+            result = await self._run_harness(
+                {"mode": "run", "bytecode": prepared["bytecode"], "stdin": input_data},
+                timeout=self.max_execution_time
+            )
+            
+            execution_time = time.time() - start_time
+            
+            if "output" not in result:
+                return result
+            response = {
+                "output": result["output"],
+                "errors": result["error"],
+                "execution_time": f"{execution_time:.2f}s",
+                "exit_code": 1 if result["error"] else 0
+            }
+            if memoizable:
+                self.result_cache.set(result_key, response)
+            return dict(response, cached=False)
+            
+        except FileNotFoundError:
+            return {"error": "Python interpreter not found"}
+        except Exception as e:
+            return {"error": f"Execution failed: {str(e)}"}
+    
+    def _check_javascript_security(self, code: str) -> Optional[str]:
+        dangerous_modules = ['fs', 'child_process', 'os', 'path', 'crypto']
+        for mod in dangerous_modules:
+            if f"require('{mod}')" in code or f'require("{mod}")' in code:
+                return f"Module '{mod}' not allowed for security reasons"
+        return None
+    
+    def _check_python_security(self, code: str) -> Optional[str]:
+        """Yasaklı import/fonksiyon varsa hata mesajı döndür"""
+        dangerous_imports = ['os', 'subprocess', 'sys', 'shutil', 'pathlib', 'importlib']
+        for imp in dangerous_imports:
+            if f"import {imp}" in code or f"from {imp}" in code:
+                return f"Import '{imp}' not allowed for security reasons"
+        
+        # Dangerous functions
+        dangerous_funcs = ['eval(', 'exec(', 'compile(', 'open(', '__import__(']
+        for func in dangerous_funcs:
+            if func in code:
+                return f"Function '{func}' not allowed for security reasons"
+        return None
+    
+    async def _profile_python(self, code: str, input_data: Optional[str] = None, line_profile: bool = False):
+        """Python kodunu cProfile + yığın örnekleyici altında çalıştır"""
+        prepared = await self._prepare_python(code)
+        if "error" in prepared or "syntax_error" in prepared:
+            return {"error": prepared.get("error") or prepared["syntax_error"]}
+        
+        payload = {"mode": "profile", "code": code, "bytecode": prepared["bytecode"],
+                   "stdin": input_data, "line_profile": line_profile}
+        # Satır izleme kodu belirgin şekilde yavaşlatır; ikinci çalıştırma için ek süre
+        timeout = self.max_execution_time * (3 if line_profile else 1.5)
+        result = await self._run_harness(payload, timeout=timeout)
+        if "error" in result and "output" not in result:
+            return result
+        
+        output, errors = result.pop("output"), result.pop("error")
+        return {
+            "output": output,
+            "errors": errors,
+            "execution_time": f"{result['wall_time']:.2f}s",
+            "exit_code": 1 if errors else 0,
+            "profile": result
+        }
+    
+    async def estimate_complexity(self, code: str, function_name: str,
+                                  input_spec: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Fonksiyonu geometrik artan boyutlarda ölçüp Big-O modellerine uydur"""
+        security_error = self._check_python_security(code)
+        if security_error:
+            return {"error": security_error}
+        
+        spec = dict(input_spec or {})
+        kind = spec.get("kind", "list")
+        start, factor, max_size = COMPLEXITY_SIZE_DEFAULTS.get(kind, COMPLEXITY_SIZE_DEFAULTS["list"])
+        sizes = spec.get("sizes") or geometric_sizes(
+            int(spec.get("start", start)),
+            float(spec.get("factor", factor)),
+            int(spec.get("max_size", max_size))
+        )
+        payload = {
+            "mode": "complexity",
+            "code": code,
+            "function": function_name,
+            "input": spec,
+            "sizes": sizes,
+            "per_call_limit": min(1.0, self.max_execution_time / 10),
+            "time_budget": self.max_execution_time * 0.8,
+        }
+        result = await self._run_harness(payload, timeout=self.max_execution_time * 1.5)
+        if "error" in result:
+            return result
+        
+        points = result["points"]
+        fit = fit_complexity([p["size"] for p in points], [p["time"] for p in points])
+        return {
+            "function": function_name,
+            "input_kind": kind,
+            "points": points,
+            "stopped": result["stopped"],
+            **fit
+        }
+    
+    async def _memory_python(self, code: str, input_data: Optional[str] = None):
+        """Python kodunu tracemalloc altında çalıştır, bellek kullanımını raporla"""
+        prepared = await self._prepare_python(code)
+        if "error" in prepared or "syntax_error" in prepared:
+            return {"error": prepared.get("error") or prepared["syntax_error"]}
+        
+        payload = {"mode": "memory", "code": code, "bytecode": prepared["bytecode"], "stdin": input_data}
+        result = await self._run_harness(payload, timeout=self.max_execution_time * 2)
+        if "error" in result and "output" not in result:
+            return result
+        
+        memory = result["memory"]
+        memory["peak"] = format_bytes(memory["peak_bytes"])
+        return {
+            "output": result["output"],
+            "errors": result["error"],
+            "execution_time": f"{result['wall_time']:.2f}s",
+            "exit_code": 1 if result["error"] else 0,
+            "memory_usage": memory
+        }
+    
+    async def run_batch(self, code: str, language: str, cases: List[Dict[str, Any]],
+                        concurrency: Optional[int] = None, compare: str = "normalized") -> Dict[str, Any]:
+        """Aynı kodu birçok stdin durumuyla paralel çalıştır; durum başına geçti/kaldı ve süre"""
+        if language == "python":
+            prepared = await self._prepare_python(code)
+            security_error = prepared.get("error") or prepared.get("syntax_error")
+        elif language == "javascript":
+            security_error = self._check_javascript_security(code)
+        else:
+            return {"error": f"Language {language} not supported"}
+        if security_error:
+            return {"error": security_error}
+        
+        indexed = [dict(case, index=i) for i, case in enumerate(cases)]
+        workers = max(1, min(concurrency or BATCH_WORKERS, len(indexed)))
+        start_time = time.perf_counter()
+        if language == "python":
+            raw = await self._run_python_batch(prepared["bytecode"], indexed, workers)
+        else:
+            raw = await self._run_javascript_batch(code, indexed, workers)
+        if "error" in raw:
+            return raw
+        wall_time = time.perf_counter() - start_time
+        
+        results = []
+        for case, outcome in zip(indexed, raw["results"]):
+            expected = case.get("expected_output")
+            if outcome["error"]:
+                lowered = outcome["error"].lower()
+                status = "timeout" if "timeout" in lowered or "timed out" in lowered else "error"
+            elif expected is None:
+                status = "completed"
+            else:
+                status = "passed" if outputs_equal(outcome["output"], expected, compare) else "failed"
+            results.append({
+                "index": case["index"],
+                "input": case.get("input"),
+                "expected_output": expected,
+                "output": outcome["output"],
+                "errors": outcome["error"],
+                "status": status,
+                "passed": None if expected is None else status == "passed",
+                "time": outcome["time"],
+            })
+        
+        times = [r["time"] for r in results]
+        counts = {status: sum(1 for r in results if r["status"] == status)
+                  for status in ("passed", "failed", "error", "timeout", "completed")}
+        return {
+            "results": results,
+            "summary": {
+                "total": len(results),
+                **counts,
+                "workers": workers,
+                "wall_time": wall_time,
+                "latency": {
+                    "p50": quantile(times, 0.5),
+                    "p90": quantile(times, 0.9),
+                    "p99": quantile(times, 0.99),
+                    "max": max(times) if times else 0.0,
+                },
+            },
+        }
+    
+    async def _run_python_batch(self, bytecode: str, cases: List[Dict[str, Any]], workers: int) -> Dict[str, Any]:
+        # Tek derleme: bytecode her işçiye gönderilir, işçiler yalnızca çalıştırır
+        chunks = [cases[i::workers] for i in range(workers)]
+        case_timeout = min(5.0, self.max_execution_time)
+        responses = await asyncio.gather(*[
+            self._run_harness(
+                {"mode": "batch", "bytecode": bytecode, "cases": chunk, "case_timeout": case_timeout},
+                timeout=case_timeout * len(chunk) + self.max_execution_time
+            )
+            for chunk in chunks
+        ])
+        
+        by_index = {}
+        for chunk, response in zip(chunks, responses):
+            for case in chunk:
+                by_index[case["index"]] = {"output": "", "error": response.get("error"), "time": 0.0}
+            for outcome in response.get("results", []):
+                by_index[outcome["index"]] = outcome
+        return {"results": [by_index[case["index"]] for case in cases]}
+    
+    async def _run_javascript_batch(self, code: str, cases: List[Dict[str, Any]], workers: int) -> Dict[str, Any]:
+        # Eşzamanlılık havuz boyutuyla sınırlıdır
+        pool = self._node_pool()
+        
+        async def run_case(case):
+            result = await pool.run(code, case.get("input"), timeout=min(5.0, self.max_execution_time))
+            return {"output": result["output"], "error": result["errors"] if result["exit_code"] else None,
+                    "time": result["time_ms"] / 1000}
+        
+        try:
+            return {"results": await asyncio.gather(*[run_case(case) for case in cases])}
+        except FileNotFoundError:
+            return {"error": "Node.js not found. Please install Node.js to run JavaScript code."}
+    
+    async def _run_harness(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """sandbox_harness.py'yi ayrı süreçte çalıştır, JSON sonucunu döndür"""
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, HARNESS_PATH,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            # Sabit hash tohumu: set/dict sırası çalıştırmalar arasında aynı kalır
+            env=dict(os.environ, PYTHONHASHSEED="0")
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(json.dumps(payload).encode("utf-8")), timeout
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return {"error": f"Code execution timeout ({timeout:.0f}s limit)"}
+        except asyncio.CancelledError:
+            # İstek iptal edildi (ör. araç zaman aşımı): sandbox süreci de durdurulur
+            process.kill()
+            await process.wait()
+            raise
+        
+        lines = stdout.decode("utf-8", "replace").strip().splitlines()
+        if process.returncode != 0 or not lines:
+            return {"error": f"Execution failed: {stderr.decode('utf-8', 'replace').strip() or 'no output'}"}
+        return json.loads(lines[-1])
+    
+    async def benchmark_python(self, variants: List[str], input_data: Optional[str] = None,
+                               warmup: int = 1, repeat: int = 9) -> Dict[str, Any]:
+        """Kod varyantlarını aynı süreçte dönüşümlü çalıştırıp süre örnekleri topla"""
+        for code in variants:
+            security_error = self._check_python_security(code)
+            if security_error:
+                return {"error": security_error}
+        
+        payload = {
+            "mode": "benchmark",
+            "variants": variants,
+            "stdin": input_data,
+            "warmup": warmup,
+            "repeat": repeat,
+            "time_budget": self.max_execution_time * 0.8,
+        }
+        result = await self._run_harness(payload, timeout=self.max_execution_time * 2)
+        for variant in result.get("variants", []):
+            if variant["samples"]:
+                variant["stats"] = describe(variant["samples"])
+        return result
+    
+    def _node_pool(self) -> NodeWorkerPool:
+        # Havuz oluşturulduğu olay döngüsüne bağlıdır
+        loop = asyncio.get_running_loop()
+        if self._js_pool is None or self._js_pool.loop is not loop:
+            if self._js_pool is not None:
+                self._js_pool.kill()
+            self._js_pool = NodeWorkerPool(size=self.js_workers)
+        return self._js_pool
+    
+    async def _execute_javascript(self, code: str, input_data: Optional[str] = None):
+        """JavaScript çalıştırma (Node.js gerekli): önceden başlatılmış tek kullanımlık süreçte"""
+        try:
+            # Güvenlik kontrolü
+            security_error = self._check_javascript_security(code)
+            if security_error:
+                return {"error": security_error}
+            
+            result = await self._node_pool().run(code, input_data, timeout=self.max_execution_time)
+            
+            return {
+                "output": result["output"],
+                "errors": result["errors"],
+                "execution_time": f"{result['time_ms'] / 1000:.2f}s",
+                "exit_code": result["exit_code"]
+            }
+            
+        except FileNotFoundError:
+            return {"error": "Node.js not found. Please install Node.js to run JavaScript code."}
+        except Exception as e:
+            return {"error": f"Execution failed: {str(e)}"}
+    
+    async def aclose(self):
+        if self._js_pool is not None:
+            await self._js_pool.aclose()
+            self._js_pool = None
+
+# Backward compatibility
+async def execute_code(code: str, language: str, input_data: Optional[str] = None):
+    runner = DemoRunner()
+    try:
+        return await runner.execute_code(code, language, input_data)
+    finally:
+        await runner.aclose()
\ No newline at end of file
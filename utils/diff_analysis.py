@@ -0,0 +1,373 @@
+import ast
+import hashlib
+import re
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from utils.live_analysis import REGION_LANGUAGES, split_regions
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@(.*)$")
+
+
+class DiffError(ValueError):
+    """Diff ayrıştırılamadı veya taban sürüme uygulanamadı (HTTP 422)"""
+
+
+def source_hash(code: str) -> str:
+    """Dosya içeriğinin SHA-256 özeti (istemci aynı özeti yerelde hesaplayabilir)"""
+    return hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def parse_unified_diff(diff: str) -> List[Dict[str, Any]]:
+    """Tek dosyalık unified diff'i hunk listesine çevir.
+
+    Her hunk: {"id", "header", "old_start", "old_lines", "new_start", "new_lines",
+    "lines": [(" " | "-" | "+", metin)], "no_newline": sonda "\\ No newline" işareti (yeni taraf)}
+    """
+    hunks: List[Dict[str, Any]] = []
+    hunk: Optional[Dict[str, Any]] = None
+    files = 0
+    for line in diff.splitlines():
+        if line.startswith("--- ") and (hunk is None or _hunk_complete(hunk)):
+            files += 1
+            if files > 1:
+                raise DiffError("Diff touches more than one file; send one diff per file")
+            hunk = None
+            continue
+        if line.startswith("+++ ") and hunk is None:
+            continue
+        match = _HUNK_HEADER.match(line)
+        if match:
+            old_start, old_lines, new_start, new_lines, section = match.groups()
+            hunk = {
+                "id": len(hunks), "header": line,
+                "old_start": int(old_start), "old_lines": int(old_lines) if old_lines is not None else 1,
+                "new_start": int(new_start), "new_lines": int(new_lines) if new_lines is not None else 1,
+                "section": section.strip(), "lines": [], "no_newline": None,
+            }
+            hunks.append(hunk)
+            continue
+        if hunk is None:
+            # git başlıkları (diff --git, index, mode) ve hunk öncesi metin
+            continue
+        if line.startswith("\\"):
+            if hunk["lines"]:
+                tag = hunk["lines"][-1][0]
+                if tag != "-":
+                    hunk["no_newline"] = True
+                elif hunk["no_newline"] is None:
+                    hunk["no_newline"] = False
+            continue
+        tag = line[:1] or " "
+        if tag not in " -+":
+            raise DiffError(f"Unexpected line in hunk {hunk['id']}: {line[:40]!r}")
+        hunk["lines"].append((tag, line[1:]))
+
+    if not hunks:
+        raise DiffError("Diff contains no hunks")
+    for hunk in hunks:
+        if not _hunk_complete(hunk):
+            raise DiffError(f"Hunk {hunk['id']} line counts do not match its header {hunk['header']!r}")
+    return hunks
+
+
+def _hunk_complete(hunk: Dict[str, Any]) -> bool:
+    old = sum(1 for tag, _ in hunk["lines"] if tag != "+")
+    new = sum(1 for tag, _ in hunk["lines"] if tag != "-")
+    return old == hunk["old_lines"] and new == hunk["new_lines"]
+
+
+def apply_hunks(base: str, hunks: List[Dict[str, Any]]) -> str:
+    """Hunk'ları tabana uygula; bağlam veya silinen satır eşleşmezse DiffError"""
+    lines = base.splitlines()
+    result: List[str] = []
+    cursor = 0  # taban satırı (0 tabanlı)
+    for hunk in hunks:
+        # Boş eski aralık (ör. "-0,0") o satırdan sonra eklemedir
+        start = hunk["old_start"] - 1 if hunk["old_lines"] else hunk["old_start"]
+        if start < cursor:
+            raise DiffError(f"Hunk {hunk['id']} overlaps the previous hunk")
+        result.extend(lines[cursor:start])
+        position = start
+        for tag, text in hunk["lines"]:
+            if tag == "+":
+                result.append(text)
+                continue
+            if position >= len(lines) or lines[position] != text:
+                raise DiffError(f"Hunk {hunk['id']} does not apply at base line {position + 1}")
+            if tag == " ":
+                result.append(text)
+            position += 1
+        cursor = position
+    result.extend(lines[cursor:])
+
+    trailing_newline = base.endswith("\n") or not base
+    last = hunks[-1]
+    if last["no_newline"] is not None and cursor >= len(lines):
+        trailing_newline = not last["no_newline"]
+    return "\n".join(result) + ("\n" if trailing_newline and result else "")
+
+
+def changed_lines(hunks: List[Dict[str, Any]]) -> Dict[int, Tuple[Set[int], Set[int]]]:
+    """Hunk başına yeni dosyadaki (eklenen satırlar, silme noktaları).
+
+    Silme noktası p: silinen satırlar yeni dosyada p-1 ile p arasında kalmıştır.
+    """
+    changes = {}
+    for hunk in hunks:
+        added, deleted = set(), set()
+        line = hunk["new_start"] if hunk["new_lines"] else hunk["new_start"] + 1
+        for tag, _ in hunk["lines"]:
+            if tag == "+":
+                added.add(line)
+                line += 1
+            elif tag == "-":
+                deleted.add(line)
+            else:
+                line += 1
+        changes[hunk["id"]] = (added, deleted)
+    return changes
+
+
+def python_scopes(code: str) -> Optional[List[Dict[str, Any]]]:
+    """Tüm fonksiyon/metotlar (iç içe olanlar dahil): [{"name", "start_line", "end_line"}]; hatalı kodda None"""
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+    scopes = []
+
+    def visit(node: ast.AST, prefix: str):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                name = f"{prefix}{child.name}"
+                if not isinstance(child, ast.ClassDef):
+                    start = min([child.lineno] + [d.lineno for d in child.decorator_list])
+                    scopes.append({"name": name, "start_line": start, "end_line": child.end_lineno})
+                visit(child, f"{name}.")
+            else:
+                visit(child, prefix)
+
+    visit(tree, "")
+    return scopes
+
+
+def find_scopes(code: str, language: str) -> List[Dict[str, Any]]:
+    """Analiz kapsamı olabilecek tanımlar; Python'da AST, diğerlerinde (veya hatalı kodda) üst düzey bölgeler"""
+    if language == "python":
+        scopes = python_scopes(code)
+        if scopes is not None:
+            return scopes
+    if language in REGION_LANGUAGES:
+        return [{"name": r["name"], "start_line": r["start_line"], "end_line": r["end_line"]}
+                for r in split_regions(code, language) if r["kind"] == "definition"]
+    return []
+
+
+def _innermost(scopes: List[Dict[str, Any]], line: int) -> Optional[Dict[str, Any]]:
+    best = None
+    for scope in scopes:
+        if scope["start_line"] <= line <= scope["end_line"]:
+            if best is None or scope["end_line"] - scope["start_line"] < best["end_line"] - best["start_line"]:
+                best = scope
+    return best
+
+
+def affected_scopes(head: str, language: str, hunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Değişen satırları içeren en içteki fonksiyonlar ve fonksiyon dışı değişen satır blokları.
+
+    Her kapsam: {"name", "kind", "start_line", "end_line", "text", "hunks"}. Fonksiyon dışı
+    satırlar yalnızca kendileri (ardışık bloklar halinde) analiz edilir, böylece maliyet
+    dosya boyutuyla değil diff boyutuyla büyür.
+    """
+    lines = head.splitlines()
+    definitions = find_scopes(head, language)
+    scopes: Dict[str, Dict[str, Any]] = {}
+    loose: Dict[int, Set[int]] = {}  # fonksiyon dışı satır -> hunk'lar
+
+    for hunk_id, (added, deleted) in changed_lines(hunks).items():
+        for line in added:
+            scope = _innermost(definitions, line)
+            if scope is None:
+                loose.setdefault(line, set()).add(hunk_id)
+            else:
+                scopes.setdefault(scope["name"], {**scope, "kind": "function", "hunks": set()})["hunks"].add(hunk_id)
+        for point in deleted:
+            # Silme, her iki komşu satırı da içeren fonksiyonu etkiler
+            scope = _innermost(definitions, point - 1)
+            if scope is not None and scope["end_line"] >= point:
+                scopes.setdefault(scope["name"], {**scope, "kind": "function", "hunks": set()})["hunks"].add(hunk_id)
+
+    result = sorted(scopes.values(), key=lambda s: s["start_line"])
+    for scope in result:
+        scope["text"] = "\n".join(lines[scope["start_line"] - 1:scope["end_line"]])
+
+    block: List[int] = []
+    for line in sorted(loose) + [None]:
+        if block and (line is None or line != block[-1] + 1):
+            result.append({
+                "name": f"<module:{block[0]}>", "kind": "module", "start_line": block[0], "end_line": block[-1],
+                "text": "\n".join(lines[block[0] - 1:block[-1]]),
+                "hunks": set().union(*(loose[n] for n in block)),
+            })
+            block = []
+        if line is not None:
+            block.append(line)
+    for scope in result:
+        scope["hunks"] = sorted(scope["hunks"])
+    return result
+
+
+def _change_runs(hunk: Dict[str, Any]) -> Iterator[Tuple[List[Tuple[int, str]], List[int], int]]:
+    """Hunk'taki değişiklik dizileri (bağlam satırı içermeyen ardışık -/+ satırları):
+    ([(taban satırı, silinen metin)], [yeni dosyada eklenen satırlar], dizinin yeni dosyadaki yeri)"""
+    old = hunk["old_start"] if hunk["old_lines"] else hunk["old_start"] + 1
+    new = hunk["new_start"] if hunk["new_lines"] else hunk["new_start"] + 1
+    deleted: List[Tuple[int, str]] = []
+    added: List[int] = []
+    for tag, text in hunk["lines"] + [(" ", "")]:
+        if tag == " ":
+            if deleted or added:
+                yield deleted, added, new - len(added)
+            deleted, added = [], []
+            old += 1
+            new += 1
+        elif tag == "-":
+            deleted.append((old, text))
+            old += 1
+        else:
+            added.append(new)
+            new += 1
+
+
+def deleted_scopes(base_definitions: List[Dict[str, Any]], head: str, language: str,
+                   hunks: List[Dict[str, Any]], scopes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Başka bir kapsamın taban karşılığına girmeyen silinen satırlar için sentetik kapsamlar.
+
+    Tamamen silinen (ya da yeniden adlandırılan) fonksiyonlar ve yerine fonksiyon dışı satır
+    eklenmeyen modül düzeyi silmeler böyle kalır; bulguları "resolved" olarak raporlanabilsin
+    diye her değişiklik dizisi için bir "<deleted:taban satırı>" kapsamı üretilir.
+    """
+    surviving = {scope["name"] for scope in find_scopes(head, language)}
+    modules = [scope for scope in scopes if scope["kind"] == "module"]
+    result = []
+    for hunk in hunks:
+        for deleted, added, point in _change_runs(hunk):
+            into_module = any(m["start_line"] <= line <= m["end_line"] for line in added for m in modules)
+            orphaned = []
+            for line, text in deleted:
+                owner = _innermost(base_definitions, line)
+                if owner is not None and owner["name"] not in surviving:
+                    orphaned.append((line, text))
+                elif owner is None and not into_module:
+                    orphaned.append((line, text))
+            if not orphaned:
+                continue
+            result.append({
+                "name": f"<deleted:{orphaned[0][0]}>", "kind": "deleted", "start_line": point, "end_line": point,
+                "base_start_line": orphaned[0][0], "base_end_line": orphaned[-1][0],
+                "text": "", "base_text": "\n".join(text for _, text in orphaned), "hunks": [hunk["id"]],
+            })
+    return result
+
+
+class DiffAnalyzer:
+    """Diff'i tabana uygular ve CodeAnalyzer'ı yalnızca etkilenen kapsamlarda çalıştırır.
+
+    Bulgular kapsamlarının hunk'larına bağlanır; taban sürümdeki aynı kapsamda
+    bulunmayan bulgular "introduced" olarak işaretlenir, değişiklikle kaybolanlar
+    "resolved" listesinde döner.
+    """
+
+    def __init__(self, analyzer: Any):
+        self.analyzer = analyzer
+
+    async def analyze(self, base: str, diff: str, language: str) -> Dict[str, Any]:
+        language = language.lower()
+        hunks = parse_unified_diff(diff)
+        head = apply_hunks(base, hunks)
+        base_definitions = find_scopes(base, language)
+        scopes = affected_scopes(head, language, hunks)
+        scopes += deleted_scopes(base_definitions, head, language, hunks, scopes)
+
+        base_lines = base.splitlines()
+        base_scopes = {s["name"]: s for s in base_definitions}
+        findings: List[Dict[str, Any]] = []
+        resolved: List[Dict[str, Any]] = []
+        hunk_findings: Dict[int, List[str]] = {hunk["id"]: [] for hunk in hunks}
+        analyzed_lines = 0
+
+        for scope in scopes:
+            analyzed_lines += scope["end_line"] - scope["start_line"] + 1 if scope["text"] else 0
+            issues = await self._issues(scope["text"], language) if scope["text"] else []
+            before = self._base_text(scope, base_scopes, base_lines, hunks)
+            remaining = self._counts(await self._issues(before, language)) if before else {}
+            for number, issue in enumerate(issues):
+                signature = (issue.get("type"), issue.get("message"))
+                introduced = remaining.get(signature, 0) == 0
+                if not introduced:
+                    remaining[signature] -= 1
+                finding_id = f"{scope['name']}#{number}"
+                findings.append({"id": finding_id, **issue, "scope": scope["name"],
+                                 "start_line": scope["start_line"], "end_line": scope["end_line"],
+                                 "hunks": scope["hunks"], "introduced": introduced})
+                for hunk_id in scope["hunks"]:
+                    hunk_findings[hunk_id].append(finding_id)
+            # Tabanda olup değişiklikten sonra kalmayan bulgular
+            for (kind, message), count in remaining.items():
+                resolved.extend({"type": kind, "message": message, "scope": scope["name"],
+                                 "hunks": scope["hunks"]} for _ in range(count))
+
+        return {
+            "head": head,
+            "hunks": [
+                {key: hunk[key] for key in ("id", "header", "old_start", "old_lines", "new_start", "new_lines")}
+                | {"scopes": [s["name"] for s in scopes if hunk["id"] in s["hunks"]],
+                   "findings": hunk_findings[hunk["id"]]}
+                for hunk in hunks
+            ],
+            "scopes": [{key: value for key, value in scope.items() if key not in ("text", "base_text")}
+                       for scope in scopes],
+            "findings": findings,
+            "resolved": resolved,
+            "stats": {"file_lines": len(head.splitlines()), "analyzed_lines": analyzed_lines,
+                      "scopes": len(scopes), "hunks": len(hunks)},
+        }
+
+    async def _issues(self, code: str, language: str) -> List[Dict[str, Any]]:
+        analysis = await self.analyzer.analyze_comprehensive(code, language)
+        return analysis.get("security_issues", []) + analysis.get("performance_tips", [])
+
+    @staticmethod
+    def _counts(issues: List[Dict[str, Any]]) -> Dict[Tuple[Any, Any], int]:
+        counts: Dict[Tuple[Any, Any], int] = {}
+        for issue in issues:
+            signature = (issue.get("type"), issue.get("message"))
+            counts[signature] = counts.get(signature, 0) + 1
+        return counts
+
+    @staticmethod
+    def _base_text(scope: Dict[str, Any], base_scopes: Dict[str, Dict[str, Any]], base_lines: List[str],
+                   hunks: List[Dict[str, Any]]) -> str:
+        """Kapsamın taban karşılığı: aynı adlı fonksiyon; modül blokları için bloğa komşu silinen satırlar;
+        silme kapsamları için silinen satırların kendisi.
+
+        Bir değişiklik dizisinin (bağlam satırı içermeyen ardışık -/+ satırları) silinen satırları,
+        dizi bloğa satır eklediyse alınır; tabanda bir fonksiyona ait olanlar o fonksiyonun
+        ya da silme kapsamının karşılaştırmasına girdiğinden dışarıda bırakılır.
+        """
+        if scope["kind"] == "function":
+            previous = base_scopes.get(scope["name"])
+            if previous is None:
+                return ""
+            return "\n".join(base_lines[previous["start_line"] - 1:previous["end_line"]])
+        if scope["kind"] == "deleted":
+            return scope["base_text"]
+        definitions = list(base_scopes.values())
+        deleted: List[str] = []
+        for hunk in hunks:
+            if hunk["id"] not in scope["hunks"]:
+                continue
+            for run, added, _ in _change_runs(hunk):
+                if any(scope["start_line"] <= line <= scope["end_line"] for line in added):
+                    deleted.extend(text for line, text in run if _innermost(definitions, line) is None)
+        return "\n".join(deleted)
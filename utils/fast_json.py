@@ -0,0 +1,24 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """JSON'u UTF-8 bayt olarak üret (orjson varsa onunla)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    return dumps_bytes(obj).decode("utf-8")
+
+
+def loads(data) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
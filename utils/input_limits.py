@@ -0,0 +1,78 @@
+import ast
+from typing import Optional
+
+FULL = "full"
+METRICS_ONLY = "metrics_only"
+
+
+class InputTooLarge(Exception):
+    """Girdi sert limiti aştığında fırlatılır (HTTP 413)"""
+
+    def __init__(self, kind: str, actual: int, limit: int):
+        self.kind = kind
+        self.actual = actual
+        self.limit = limit
+        super().__init__(f"Input too large: {actual} {kind} (limit {limit})")
+
+
+class InputLimits:
+    """Kod boyutu limitleri: yumuşak limit üstü 'metrics only', sert limit üstü red"""
+
+    def __init__(self, soft_lines: int = 5000, max_lines: int = 50000,
+                 soft_ast_nodes: int = 100000, max_ast_nodes: int = 500000,
+                 max_chars: Optional[int] = None):
+        self.soft_lines = soft_lines
+        self.max_lines = max_lines
+        self.soft_ast_nodes = soft_ast_nodes
+        self.max_ast_nodes = max_ast_nodes
+        self.max_chars = max_chars
+
+    def check(self, code: str, language: str) -> str:
+        """Analiz modunu döndür, sert limit aşılırsa InputTooLarge fırlat"""
+        if self.max_chars is not None and len(code) > self.max_chars:
+            raise InputTooLarge("characters", len(code), self.max_chars)
+
+        lines = count_lines(code)
+        if lines > self.max_lines:
+            raise InputTooLarge("lines", lines, self.max_lines)
+        if lines > self.soft_lines:
+            return METRICS_ONLY
+
+        if language.lower() == "python":
+            nodes = count_ast_nodes(code, self.max_ast_nodes)
+            if nodes > self.max_ast_nodes:
+                raise InputTooLarge("AST nodes", nodes, self.max_ast_nodes)
+            if nodes > self.soft_ast_nodes:
+                return METRICS_ONLY
+        return FULL
+
+    def check_lines(self, code: str, limit: Optional[int] = None) -> int:
+        """Yalnızca satır limitini uygula (çalıştırma/refaktör için)"""
+        limit = limit or self.max_lines
+        lines = count_lines(code)
+        if lines > limit:
+            raise InputTooLarge("lines", lines, limit)
+        return lines
+
+
+def count_lines(code: str) -> int:
+    """Satır sayısı (splitlines() gibi, ama liste oluşturmadan)"""
+    if not code:
+        return 0
+    return code.count("\n") + (0 if code.endswith("\n") else 1)
+
+
+def count_ast_nodes(code: str, stop_after: Optional[int] = None) -> int:
+    """AST düğüm sayısı; stop_after aşılınca saymayı bırakır"""
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        # Parse edilemeyen kodu analiz katmanı raporlar
+        return 0
+
+    count = 0
+    for _ in ast.walk(tree):
+        count += 1
+        if stop_after is not None and count > stop_after:
+            break
+    return count
@@ -0,0 +1,509 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.singleflight import content_hash
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+TERMINAL = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobNotFound(KeyError):
+    pass
+
+
+def job_key(kind: str, payload: Dict[str, Any]) -> str:
+    """Aynı içerikli işler aynı anahtarı alır (dedup)"""
+    return content_hash("job", kind, json.dumps(payload, sort_keys=True, ensure_ascii=False))
+
+
+# --- iş işleyicileri (işçi sürecinde çalışır) ---
+def _run_analyze(payload: Dict[str, Any]) -> Dict[str, Any]:
+    from app.config import settings
+    from utils.code2flow import Code2FlowGenerator
+    from utils.code_analyzer import CodeAnalyzer
+    from utils.input_limits import METRICS_ONLY, InputLimits
+
+    code, language = payload["code"], payload["language"]
+    limits = InputLimits(soft_lines=settings.SOFT_CODE_LINES, max_lines=settings.MAX_CODE_LINES,
+                         soft_ast_nodes=settings.SOFT_AST_NODES, max_ast_nodes=settings.MAX_AST_NODES)
+    mode = limits.check(code, language)
+
+    async def run():
+        analysis = await CodeAnalyzer().analyze_comprehensive(code, language, payload.get("file_name"), mode)
+        flowchart = None
+        if mode != METRICS_ONLY:
+            generator = Code2FlowGenerator(settings.FLOWCHART_MAX_NODES, settings.FLOWCHART_FUNCTION_NODES)
+            flowchart = await generator.generate_flow(code, language)
+        return {"analysis_mode": mode, "analysis": analysis, "flowchart": flowchart}
+
+    return asyncio.run(run())
+
+
+def _run_flowchart(payload: Dict[str, Any]) -> Dict[str, Any]:
+    from app.config import settings
+    from utils.code2flow import Code2FlowGenerator
+    generator = Code2FlowGenerator(settings.FLOWCHART_MAX_NODES, settings.FLOWCHART_FUNCTION_NODES)
+    return asyncio.run(generator.generate_flow(payload["code"], payload["language"],
+                                               payload.get("style", "flowchart")))
+
+
+JOB_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "analyze": _run_analyze,
+    "flowchart": _run_flowchart,
+}
+
+
+def _retryable(error: Exception) -> bool:
+    # Girdi hataları tekrar denenince düzelmez
+    from utils.input_limits import InputTooLarge
+    return not isinstance(error, (InputTooLarge, ValueError, KeyError, TypeError, SyntaxError))
+
+
+class SQLiteJobStore:
+    """Yerel kalıcı iş kuyruğu: tek SQLite dosyası (WAL), süreçler arası paylaşılır.
+
+    İşçi bir işi kira süresiyle (`lease`) alır; süresi dolan kiralar (çöken işçi)
+    kuyruğa geri döner. Her kiralama yeni bir `lease_token` verir; sonuç ve hata
+    yalnızca kirası hâlâ geçerli işçiden kabul edilir. Sonuçlar `expires_at` sonrası
+    temizlenir.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        key TEXT NOT NULL,
+        status TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        result TEXT,
+        error TEXT,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        max_attempts INTEGER NOT NULL,
+        created REAL NOT NULL,
+        updated REAL NOT NULL,
+        available_at REAL NOT NULL,
+        lease_until REAL,
+        lease_token TEXT,
+        expires_at REAL,
+        result_ttl REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at);
+    CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key, status);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as db:
+            db.executescript(self._SCHEMA)
+            # Eski dosyalarda kira belirteci sütunu yok
+            columns = {row["name"] for row in db.execute("PRAGMA table_info(jobs)")}
+            if "lease_token" not in columns:
+                db.execute("ALTER TABLE jobs ADD COLUMN lease_token TEXT")
+
+    @contextmanager
+    def _connect(self):
+        # Her çağrı kendi bağlantısını açar: iş parçacıkları ve süreçler arasında güvenli
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            yield db
+        finally:
+            db.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Yazma kilidi baştan alınır: aynı işi iki işçi kiralayamaz"""
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    @staticmethod
+    def _row(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def submit(self, kind: str, payload: Dict[str, Any], key: str, max_attempts: int,
+               result_ttl: float) -> Tuple[Dict[str, Any], bool]:
+        """Yeni iş ekle; aynı anahtarla bekleyen, süren veya süresi dolmamış başarılı iş varsa onu döndür"""
+        now = time.time()
+        with self._transaction() as db:
+            existing = db.execute(
+                "SELECT * FROM jobs WHERE key = ? AND (status IN (?, ?) OR (status = ? AND expires_at > ?)) "
+                "ORDER BY created DESC LIMIT 1", (key, QUEUED, RUNNING, SUCCEEDED, now)).fetchone()
+            if existing is not None:
+                return self._row(existing), True
+            job_id = uuid.uuid4().hex
+            db.execute(
+                "INSERT INTO jobs (id, kind, key, status, payload, max_attempts, created, updated, available_at, "
+                "result_ttl) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, key, QUEUED, json.dumps(payload, ensure_ascii=False), max_attempts,
+                 now, now, now, result_ttl))
+            return self._row(db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()), False
+
+    def claim(self, lease: float) -> Optional[Dict[str, Any]]:
+        """Sıradaki hazır işi kirala (atomik); süresi dolmuş kiralar önce kuyruğa döner"""
+        now = time.time()
+        with self._transaction() as db:
+            # İşçiyi her seferinde düşüren iş sonsuza dek dönmesin: hakkı biten kalıcı hata olur
+            db.execute("UPDATE jobs SET status = ?, error = ?, lease_until = NULL, updated = ?, "
+                       "expires_at = ? + result_ttl WHERE status = ? AND lease_until < ? AND attempts >= max_attempts",
+                       (FAILED, "Worker lease expired", now, now, RUNNING, now))
+            db.execute("UPDATE jobs SET status = ?, lease_until = NULL, updated = ? "
+                       "WHERE status = ? AND lease_until < ?", (QUEUED, now, RUNNING, now))
+            row = db.execute("SELECT id FROM jobs WHERE status = ? AND available_at <= ? "
+                             "ORDER BY available_at LIMIT 1", (QUEUED, now)).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE jobs SET status = ?, attempts = attempts + 1, lease_until = ?, lease_token = ?, "
+                       "updated = ? WHERE id = ?", (RUNNING, now + lease, uuid.uuid4().hex, now, row["id"]))
+            return self._row(db.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+
+    def complete(self, job_id: str, lease_token: str, result: Dict[str, Any]) -> bool:
+        """Sonucu yaz; kira başka işçiye geçtiyse (False) yok sayılır"""
+        now = time.time()
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_until = NULL, updated = ?, "
+                "expires_at = ? + result_ttl WHERE id = ? AND status = ? AND lease_token = ?",
+                (SUCCEEDED, json.dumps(result, ensure_ascii=False, default=str), now, now, job_id, RUNNING,
+                 lease_token))
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: str, lease_token: str, error: str, retry_delay: Optional[float]) -> bool:
+        """Hata: deneme hakkı ve retry_delay varsa gecikmeyle kuyruğa döner, yoksa kalıcı hata"""
+        now = time.time()
+        with self._transaction() as db:
+            job = db.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = ? AND lease_token = ?",
+                             (job_id, RUNNING, lease_token)).fetchone()
+            if job is None:
+                return False
+            if retry_delay is not None and job["attempts"] < job["max_attempts"]:
+                db.execute("UPDATE jobs SET status = ?, error = ?, lease_until = NULL, updated = ?, available_at = ? "
+                           "WHERE id = ?", (QUEUED, error, now, now + retry_delay, job_id))
+            else:
+                db.execute("UPDATE jobs SET status = ?, error = ?, lease_until = NULL, updated = ?, "
+                           "expires_at = ? + result_ttl WHERE id = ?", (FAILED, error, now, now, job_id))
+            return True
+
+    def cancel(self, job_id: str) -> bool:
+        """Yalnızca henüz başlamamış iş iptal edilebilir"""
+        now = time.time()
+        with self._connect() as db:
+            cursor = db.execute("UPDATE jobs SET status = ?, updated = ?, expires_at = ? + result_ttl "
+                                "WHERE id = ? AND status = ?", (CANCELLED, now, now, job_id, QUEUED))
+            return cursor.rowcount == 1
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as db:
+            return self._row(db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def purge_expired(self) -> int:
+        with self._connect() as db:
+            return db.execute("DELETE FROM jobs WHERE expires_at < ?", (time.time(),)).rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as db:
+            rows = db.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+
+class RedisJobStore:
+    """Redis üzerinde aynı sözleşme: iş başına hash, hazır kuyruk için sıralı küme (zaman skoru).
+
+    Redis anahtar süreleri sonuçları kendiliğinden temizler. `redis` paketi gerekir.
+    """
+
+    def __init__(self, url: str, prefix: str = "jobs"):
+        import redis  # isteğe bağlı bağımlılık: yoksa ImportError çağırana gider
+        self.url = url
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._watch_error = redis.WatchError
+
+    def _job(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    def _dedup(self, key: str) -> str:
+        return f"{self.prefix}:key:{key}"
+
+    @property
+    def _ready(self) -> str:
+        return f"{self.prefix}:ready"
+
+    @property
+    def _running(self) -> str:
+        return f"{self.prefix}:running"
+
+    def _decode(self, data: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        if not data:
+            return None
+        job: Dict[str, Any] = dict(data)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job.get("result") else None
+        job["error"] = job.get("error") or None
+        job["lease_token"] = job.get("lease_token") or None
+        for name in ("attempts", "max_attempts"):
+            job[name] = int(job[name])
+        for name in ("created", "updated", "available_at", "result_ttl"):
+            job[name] = float(job[name])
+        for name in ("lease_until", "expires_at"):
+            job[name] = float(job[name]) if job.get(name) else None
+        return job
+
+    def submit(self, kind: str, payload: Dict[str, Any], key: str, max_attempts: int,
+               result_ttl: float) -> Tuple[Dict[str, Any], bool]:
+        job_id = uuid.uuid4().hex
+        # Anahtar yalnızca ilk gönderende ayarlanır (SET NX): eşzamanlı aynı işler tek kayıtta birleşir
+        if not self._redis.set(self._dedup(key), job_id, nx=True):
+            existing = self.get(self._redis.get(self._dedup(key)) or "")
+            if existing is not None and existing["status"] not in (FAILED, CANCELLED):
+                return existing, True
+            self._redis.set(self._dedup(key), job_id)
+        now = time.time()
+        self._redis.hset(self._job(job_id), mapping={
+            "id": job_id, "kind": kind, "key": key, "status": QUEUED,
+            "payload": json.dumps(payload, ensure_ascii=False), "result": "", "error": "",
+            "attempts": 0, "max_attempts": max_attempts, "created": now, "updated": now,
+            "available_at": now, "lease_until": "", "lease_token": "", "expires_at": "", "result_ttl": result_ttl,
+        })
+        self._redis.zadd(self._ready, {job_id: now})
+        return self.get(job_id), False
+
+    def claim(self, lease: float) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        # Süresi dolan kiralar kuyruğa döner
+        for job_id in self._redis.zrangebyscore(self._running, 0, now):
+            job = self.get(job_id)
+            if job is None:
+                self._redis.zrem(self._running, job_id)
+            elif job["attempts"] >= job["max_attempts"]:
+                self._leased(job_id, job["lease_token"],
+                             lambda pipe, job: self._finish(pipe, job, {"status": FAILED,
+                                                                         "error": "Worker lease expired"}))
+            else:
+                self._leased(job_id, job["lease_token"], lambda pipe, job: self._requeue(pipe, job, now, {}))
+        for job_id in self._redis.zrangebyscore(self._ready, 0, now, start=0, num=10):
+            # ZREM'i kazanan işçi işi alır
+            if not self._redis.zrem(self._ready, job_id):
+                continue
+            self._redis.zadd(self._running, {job_id: now + lease})
+            self._redis.hincrby(self._job(job_id), "attempts", 1)
+            self._redis.hset(self._job(job_id), mapping={"status": RUNNING, "lease_until": now + lease,
+                                                         "lease_token": uuid.uuid4().hex, "updated": now})
+            return self.get(job_id)
+        return None
+
+    def _leased(self, job_id: str, lease_token: Optional[str], update: Callable[[Any, Dict[str, Any]], None]) -> bool:
+        """Kira hâlâ bu belirteçteyse `update` komutlarını tek MULTI içinde uygula.
+
+        İş kaydı WATCH ile izlenir: arada başka işçi işi yeniden kiralarsa işlem düşer.
+        """
+        key = self._job(job_id)
+        with self._redis.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                job = self._decode(pipe.hgetall(key))
+                if job is None or job["status"] != RUNNING or job["lease_token"] != lease_token:
+                    return False
+                pipe.multi()
+                pipe.zrem(self._running, job_id)
+                update(pipe, job)
+                pipe.execute()
+                return True
+            except self._watch_error:
+                return False
+
+    def _requeue(self, pipe, job: Dict[str, Any], available_at: float, mapping: Dict[str, Any]):
+        pipe.hset(self._job(job["id"]), mapping={**mapping, "status": QUEUED, "lease_until": "", "lease_token": "",
+                                                 "updated": time.time(), "available_at": available_at})
+        pipe.zadd(self._ready, {job["id"]: available_at})
+
+    def _finish(self, pipe, job: Dict[str, Any], mapping: Dict[str, Any]):
+        now = time.time()
+        pipe.hset(self._job(job["id"]), mapping={**mapping, "lease_until": "", "updated": now,
+                                                 "expires_at": now + job["result_ttl"]})
+        pipe.expire(self._job(job["id"]), int(job["result_ttl"]) + 1)
+        pipe.expire(self._dedup(job["key"]), int(job["result_ttl"]) + 1)
+
+    def complete(self, job_id: str, lease_token: str, result: Dict[str, Any]) -> bool:
+        mapping = {"status": SUCCEEDED, "error": "", "result": json.dumps(result, ensure_ascii=False, default=str)}
+        return self._leased(job_id, lease_token, lambda pipe, job: self._finish(pipe, job, mapping))
+
+    def fail(self, job_id: str, lease_token: str, error: str, retry_delay: Optional[float]) -> bool:
+        def update(pipe, job):
+            if retry_delay is not None and job["attempts"] < job["max_attempts"]:
+                self._requeue(pipe, job, time.time() + retry_delay, {"error": error})
+            else:
+                self._finish(pipe, job, {"status": FAILED, "error": error})
+        return self._leased(job_id, lease_token, update)
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None or not self._redis.zrem(self._ready, job_id):
+            return False
+        now = time.time()
+        self._redis.hset(self._job(job_id), mapping={"status": CANCELLED, "updated": now,
+                                                     "expires_at": now + job["result_ttl"]})
+        self._redis.expire(self._job(job_id), int(job["result_ttl"]) + 1)
+        return True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if not job_id:
+            return None
+        return self._decode(self._redis.hgetall(self._job(job_id)))
+
+    def purge_expired(self) -> int:
+        return 0  # Redis anahtar süreleri temizler
+
+    def stats(self) -> Dict[str, int]:
+        return {QUEUED: self._redis.zcard(self._ready), RUNNING: self._redis.zcard(self._running)}
+
+
+def create_job_store(backend: str, path: str, redis_url: str):
+    if backend == "sqlite":
+        return SQLiteJobStore(path)
+    if backend == "redis":
+        return RedisJobStore(redis_url)
+    raise ValueError(f"Unknown job backend '{backend}' (expected sqlite or redis)")
+
+
+def worker_main(backend: str, path: str, redis_url: str, lease: float, poll_interval: float,
+                backoff_base: float, stop: Any):
+    """İşçi süreci: iş kirala, işleyiciyi çalıştır, sonucu veya hatayı yaz"""
+    store = create_job_store(backend, path, redis_url)
+    while not stop.is_set():
+        try:
+            job = store.claim(lease)
+        except Exception as e:
+            print(f"İş kuyruğu okunamadı: {e}")
+            stop.wait(poll_interval * 10)
+            continue
+        if job is None:
+            stop.wait(poll_interval)
+            continue
+        try:
+            result = JOB_HANDLERS[job["kind"]](job["payload"])
+        except Exception as e:
+            # Tam sıçramalı üstel bekleme
+            delay = random.uniform(0, backoff_base * 2 ** (job["attempts"] - 1)) if _retryable(e) else None
+            store.fail(job["id"], job["lease_token"], f"{type(e).__name__}: {e}", delay)
+            continue
+        # Kira dolup iş başka işçiye geçtiyse sonucu o işçi yazar
+        store.complete(job["id"], job["lease_token"], result)
+
+
+class JobQueue:
+    """Ağır analizler için kalıcı iş kuyruğu ve işçi süreçleri.
+
+    İstek yalnızca işi kaydeder ve kimliğini döndürür; işler ayrı süreçlerde çalışır,
+    sonuç kimlikle sorgulanır (veya `wait` ile beklenir). Aynı içerikli işler tek işte
+    birleşir; geçici hatalar üstel beklemeyle tekrar denenir.
+    """
+
+    def __init__(self, backend: str = "sqlite", path: str = "data/jobs.sqlite3", redis_url: str = "",
+                 workers: int = 2, max_attempts: int = 3, result_ttl: float = 3600.0, lease: float = 300.0,
+                 poll_interval: float = 0.2, backoff_base: float = 1.0):
+        self.backend = backend
+        self.path = path
+        self.redis_url = redis_url
+        self.store = create_job_store(backend, path, redis_url)
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.result_ttl = result_ttl
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.backoff_base = backoff_base
+        # Uygulamanın olay döngüsü ve soketleri işçilere kopyalanmasın: spawn
+        self._context = multiprocessing.get_context("spawn")
+        self._stop = self._context.Event()
+        self._processes: List[Any] = []
+        self.deduplicated = 0
+
+    def start(self):
+        self.store.purge_expired()
+        for number in range(self.workers - len(self._processes)):
+            process = self._context.Process(
+                target=worker_main, name=f"job-worker-{number}", daemon=True,
+                args=(self.backend, self.path, self.redis_url, self.lease, self.poll_interval,
+                      self.backoff_base, self._stop))
+            process.start()
+            self._processes.append(process)
+
+    async def submit(self, kind: str, payload: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind '{kind}' (expected one of {', '.join(JOB_HANDLERS)})")
+        job, deduplicated = await asyncio.to_thread(
+            self.store.submit, kind, payload, job_key(kind, payload), self.max_attempts, self.result_ttl)
+        self.deduplicated += deduplicated
+        return job, deduplicated
+
+    async def get(self, job_id: str) -> Dict[str, Any]:
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None or (job["expires_at"] is not None and job["expires_at"] < time.time()):
+            raise JobNotFound(job_id)
+        return job
+
+    async def cancel(self, job_id: str) -> bool:
+        return await asyncio.to_thread(self.store.cancel, job_id)
+
+    async def wait(self, job_id: str, timeout: float, on_change: Optional[Callable[[Dict[str, Any]], Any]] = None
+                   ) -> Dict[str, Any]:
+        """İş bitene ya da süre dolana kadar yokla; durum değiştikçe on_change çağrılır"""
+        deadline = time.monotonic() + timeout
+        last_status = None
+        while True:
+            job = await self.get(job_id)
+            if on_change is not None and (job["status"], job["attempts"]) != last_status:
+                last_status = (job["status"], job["attempts"])
+                await on_change(job)
+            if job["status"] in TERMINAL or time.monotonic() >= deadline:
+                return job
+            await asyncio.sleep(self.poll_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend, "workers": sum(p.is_alive() for p in self._processes),
+                "deduplicated": self.deduplicated, "jobs": self.store.stats()}
+
+    def aclose(self):
+        self._stop.set()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                # Uzun süren iş: kira dolunca başka işçi yeniden alır
+                process.terminate()
+        self._processes = []
+
+
+def public_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """API yanıtı: iç alanlar (anahtar, kira, yük) olmadan"""
+    return {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "error": job["error"],
+        "created": job["created"],
+        "updated": job["updated"],
+        "expires_at": job["expires_at"],
+        "result": job["result"] if job["status"] == SUCCEEDED else None,
+    }
@@ -0,0 +1,281 @@
+import asyncio
+import difflib
+import hashlib
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Üst düzey tanım başlangıçları: bölgeler bu satırlarda ayrılır.
+# Sözdizimi hatalı (yazılmakta olan) kodda da çalışması için AST yerine satır taraması kullanılır.
+_PYTHON_DEF = re.compile(r"^(?:async\s+def|def|class)\s+(\w+)")
+_JS_DEF = re.compile(
+    r"^(?:export\s+(?:default\s+)?)?(?:async\s+function\*?|function\*?|class)\s+(\w+)"
+    r"|^(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?(?:function|\([^)]*\)\s*=>|\w+\s*=>)"
+)
+REGION_LANGUAGES = ("python", "javascript")
+
+
+class EditError(ValueError):
+    pass
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.blake2b("\0".join(parts).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def split_regions(text: str, language: str) -> List[Dict[str, Any]]:
+    """Kodu üst düzey bölgelere ayır: [{"name", "start_line", "text"}]
+
+    Tanımlar (fonksiyon/sınıf, önündeki dekoratörlerle) ayrı bölgedir; aradaki
+    modül düzeyi satırlar tek bir modül bölgesinde toplanır.
+    """
+    lines = text.splitlines()
+    definition = _PYTHON_DEF if language == "python" else _JS_DEF
+    regions: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    decorators: List[int] = []
+
+    def start(name: str, kind: str, line: int):
+        nonlocal current
+        current = {"name": name, "kind": kind, "start_line": line, "lines": []}
+        regions.append(current)
+
+    for number, line in enumerate(lines, 1):
+        # Kapanan parantez/süslü parantez satırları önceki bölgenin devamıdır
+        top_level = line[:1] not in ("", " ", "\t", "}", ")", "]") and not line.startswith(("#", "//"))
+        if top_level and language == "python" and line.startswith("@"):
+            decorators.append(number)
+            continue
+        match = definition.match(line) if top_level else None
+        if match:
+            first = decorators[0] if decorators else number
+            start(next(g for g in match.groups() if g), "definition", first)
+            current["lines"].extend(lines[first - 1:number - 1])
+        elif top_level and (current is None or current["kind"] == "definition" or decorators):
+            # Tanım bitti: modül bölgesi ilk anlamlı satırıyla adlandırılır
+            first = decorators[0] if decorators else number
+            start(f"<module:{lines[first - 1].strip()[:40]}>", "module", first)
+            current["lines"].extend(lines[first - 1:number - 1])
+        elif current is None:
+            start("<module>", "module", number)
+        decorators = []
+        current["lines"].append(line)
+
+    for region in regions:
+        region["text"] = "\n".join(region.pop("lines"))
+        region["end_line"] = region["start_line"] + region["text"].count("\n")
+    return regions
+
+
+_LINE_FIELDS = ("line", "end_line", "start_line")
+
+
+def shift_lines(value: Any, offset: int) -> Any:
+    """Bölge yapısının kopyası: satır alanları (line, start_line, end_line) belge satırına kaydırılır"""
+    if isinstance(value, dict):
+        return {key: item + offset if key in _LINE_FIELDS and isinstance(item, int) and not isinstance(item, bool)
+                else shift_lines(item, offset) for key, item in value.items()}
+    if isinstance(value, list):
+        return [shift_lines(item, offset) for item in value]
+    return value
+
+
+def _offset(text: str, position: Dict[str, int]) -> int:
+    """(satır, karakter) konumunu dizi indeksine çevir; satır sonunu aşan karakter satır sonuna kırpılır"""
+    line, character = position.get("line", 0), position.get("character", 0)
+    if line < 0 or character < 0:
+        raise EditError("Negative edit position")
+    offset = 0
+    for _ in range(line):
+        newline = text.find("\n", offset)
+        if newline < 0:
+            raise EditError(f"Edit line {line} is past the end of the document")
+        offset = newline + 1
+    line_end = text.find("\n", offset)
+    line_end = len(text) if line_end < 0 else line_end
+    return min(offset + character, line_end)
+
+
+class LiveDocument:
+    """Sunucu tarafı belge durumu ve son gönderilen analiz sonuçları"""
+
+    def __init__(self, doc_id: str, language: str = "python", text: str = ""):
+        self.doc_id = doc_id
+        self.language = language.lower()
+        self.text = text
+        self.version = 0
+        # Bölge metni özetine göre analiz sonuçları: değişmeyen bölgeler yeniden analiz edilmez
+        self.region_results: Dict[str, Dict[str, Any]] = {}
+        # Sözdizimi hatalı bölge için son geçerli diyagram yapısı (bölge adına göre)
+        self.last_good_structure: Dict[str, Dict[str, Any]] = {}
+        self.findings: Dict[str, Dict[str, Any]] = {}
+        self.diagram: List[str] = []
+        self.metrics: Dict[str, Any] = {}
+        self.updated = time.monotonic()
+
+    def reset_sent(self):
+        """İstemci durumunu kaybetti (yeniden bağlanma/sync): sonraki analiz tam sonuç gönderir"""
+        self.findings, self.diagram, self.metrics = {}, [], {}
+
+    def apply_edits(self, edits: List[Dict[str, Any]]):
+        """Düzenlemeleri sırayla uygula.
+
+        Her düzenleme {"range": {"start": {"line", "character"}, "end": {...}}, "text"}
+        (0 tabanlı, LSP tarzı; karakter Python dizi indeksi) ya da aralıksız tam metindir.
+        """
+        # Geçersiz bir düzenleme belgeyi yarım değiştirmesin: önce kopyaya uygulanır
+        text = self.text
+        for edit in edits:
+            if "text" not in edit:
+                raise EditError("Edit without 'text'")
+            if edit.get("range") is None:
+                text = edit["text"]
+                continue
+            start = _offset(text, edit["range"]["start"])
+            end = _offset(text, edit["range"]["end"])
+            if end < start:
+                raise EditError("Edit range end precedes start")
+            text = text[:start] + edit["text"] + text[end:]
+        self.text = text
+        self.version += 1
+        self.updated = time.monotonic()
+
+
+class LiveAnalyzer:
+    """CodeAnalyzer ve Code2FlowGenerator'ı yalnızca değişen bölgelerde çalıştırıp farkları üretir"""
+
+    def __init__(self, analyzer: Any, generator: Any):
+        self.analyzer = analyzer
+        self.generator = generator
+
+    async def _analyze_region(self, region: Dict[str, Any], language: str) -> Dict[str, Any]:
+        analysis = await self.analyzer.analyze_comprehensive(region["text"], language)
+        structure = await self.generator._parse_code_structure(region["text"], language)
+        return {
+            "issues": analysis.get("security_issues", []) + analysis.get("performance_tips", []),
+            "structure": structure,
+        }
+
+    async def analyze(self, document: LiveDocument) -> Tuple[Dict[str, Any], int]:
+        """Belgeyi analiz et, son gönderilen duruma göre farkı döndür: (delta, yeniden analiz edilen bölge)"""
+        # Analiz sırasında gelen düzenlemeler bu turu iptal eder; metin başta sabitlenir
+        language, text, version = document.language, document.text, document.version
+        if language in REGION_LANGUAGES:
+            regions = split_regions(text, language)
+        else:
+            regions = [{"name": "<document>", "kind": "module", "start_line": 1, "text": text,
+                        "end_line": text.count("\n") + 1}]
+
+        results, analyzed = {}, 0
+        for region in regions:
+            key = _digest(language, region["text"])
+            result = document.region_results.get(key)
+            if result is None:
+                result = await self._analyze_region(region, language)
+                analyzed += 1
+                # Uzun belgelerde iptal (yeni düzenleme) bölgeler arasında işlenebilsin
+                await asyncio.sleep(0)
+            results[key] = result
+            region["key"] = key
+        document.region_results = results
+
+        findings = self._findings(regions, results)
+        diagram = self._diagram(document, regions, results)
+        metrics = self.analyzer._calculate_basic_metrics(text)
+
+        delta: Dict[str, Any] = {"version": version}
+        added = [f for fid, f in findings.items() if document.findings.get(fid) != f]
+        removed = [fid for fid in document.findings if fid not in findings]
+        if added or removed:
+            delta["findings"] = {"added": added, "removed": removed}
+        ops = diagram_delta(document.diagram, diagram)
+        if ops:
+            delta["diagram"] = ops
+        if metrics != document.metrics:
+            delta["metrics"] = metrics
+
+        document.findings, document.diagram, document.metrics = findings, diagram, metrics
+        return delta, analyzed
+
+    def _findings(self, regions: List[Dict[str, Any]], results: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        findings = {}
+        for region in regions:
+            seen: Dict[str, int] = {}
+            for issue in results[region["key"]]["issues"]:
+                # Kimlik bölge adına bağlı: üstte satır eklenince bulgu "değişti" olarak yeniden gönderilir,
+                # silinip eklenmiş görünmez
+                signature = f"{issue.get('type')}:{issue.get('message')}"
+                seen[signature] = seen.get(signature, 0) + 1
+                fid = _digest(region["name"], signature, str(seen[signature]))
+                findings[fid] = {"id": fid, **issue, "region": region["name"],
+                                 "start_line": region["start_line"], "end_line": region["end_line"]}
+        return findings
+
+    def _diagram(self, document: LiveDocument, regions: List[Dict[str, Any]],
+                 results: Dict[str, Dict[str, Any]]) -> List[str]:
+        merged: Dict[str, Any] = {}
+        for region in regions:
+            structure = results[region["key"]]["structure"]
+            if "error" in structure:
+                structure = document.last_good_structure.get(region["name"], {})
+            else:
+                document.last_good_structure[region["name"]] = structure
+            # Bölge tek başına ayrıştırılır (önbellek bölge metnine bağlı): satırlar bölgeye göredir
+            structure = shift_lines(structure, region["start_line"] - 1)
+            for name, value in structure.items():
+                if isinstance(value, list):
+                    merged.setdefault(name, []).extend(value)
+                else:
+                    merged.setdefault(name, value)
+        live_names = {region["name"] for region in regions}
+        for name in list(document.last_good_structure):
+            if name not in live_names:
+                del document.last_good_structure[name]
+        return self.generator._generate_mermaid_syntax(merged, "flowchart", document.language).splitlines()
+
+
+def diagram_delta(old: List[str], new: List[str]) -> List[Dict[str, Any]]:
+    """Eski satırlara göre değişiklikler: [{"start", "end", "lines"}] (sondan başa uygulanır)"""
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    return [{"start": i1, "end": i2, "lines": new[j1:j2]}
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+
+class LiveAnalysisSession:
+    """Bir belge kanalı: düzenlemeleri debounce eder, eski analizi iptal eder, farkları gönderir"""
+
+    def __init__(self, document: LiveDocument, analyzer: LiveAnalyzer,
+                 send: Callable[[Dict[str, Any]], Awaitable[Any]], debounce: float = 0.15,
+                 max_lines: Optional[int] = None):
+        self.document = document
+        self.analyzer = analyzer
+        self.send = send
+        self.debounce = debounce
+        self.max_lines = max_lines
+        self._task: Optional[asyncio.Task] = None
+        self.cancelled = 0
+
+    def schedule(self, delay: Optional[float] = None):
+        """Yeni analiz planla; bekleyen veya süren analiz iptal edilir"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            self.cancelled += 1
+        self._task = asyncio.create_task(self._run(self.debounce if delay is None else delay))
+
+    async def _run(self, delay: float):
+        await asyncio.sleep(delay)
+        document = self.document
+        lines = document.text.count("\n") + 1
+        if self.max_lines is not None and lines > self.max_lines:
+            await self.send({"type": "error", "status_code": 413, "version": document.version,
+                             "message": f"Document too large: {lines} lines (limit {self.max_lines})"})
+            return
+        started = time.perf_counter()
+        delta, analyzed = await self.analyzer.analyze(document)
+        await self.send({"type": "analysis", **delta, "regions_analyzed": analyzed,
+                         "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)})
+
+    async def aclose(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
@@ -0,0 +1,321 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from utils.perf_stats import quantile
+
+# Öncelik sırasıyla kuyruklar: etkileşimli (WebSocket) trafik önce
+LANES = ("interactive", "batch")
+
+
+class SchedulerOverloaded(Exception):
+    """Kuyruk dolu: istek hiç gönderilmeden reddedildi"""
+
+
+class CircuitOpenError(Exception):
+    """Sağlayıcı art arda başarısız oldu: devre açık, istekler hızlıca reddediliyor"""
+
+
+class TokenBucket:
+    """Saniyede `rate` jeton dolan, en fazla `capacity` jeton tutan kova"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, amount: float = 1.0) -> bool:
+        self._refill()
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+    async def acquire(self, amount: float = 1.0):
+        # Kapasiteden büyük istekler kovayı tamamen boşaltarak geçer
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while not self.try_acquire(amount):
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """closed -> (threshold ardışık hata) -> open -> (reset_timeout) -> half_open -> closed/open"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_running:
+            # Yarı açık: tek bir deneme isteği geçer
+            self._trial_running = True
+            return True
+        return False
+
+    def release_trial(self):
+        """Deneme isteği sonuçlanmadan vazgeçildi (iptal, kuyruk dolu): sıradaki istek deneme olur"""
+        self._trial_running = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_running or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial_running = False
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Hız limiti, zaman aşımı, bağlantı ve 5xx hataları tekrar denenir"""
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    name = type(error).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+class _Job:
+    __slots__ = ("payload", "cost", "future", "enqueued", "trial")
+
+    def __init__(self, payload: Any, cost: float, trial: bool = False):
+        self.payload = payload
+        self.cost = cost
+        self.trial = trial  # yarı açık devrenin tek deneme isteği
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.enqueued = time.monotonic()
+
+
+class LLMScheduler:
+    """Sağlayıcı çağrıları için merkezi zamanlayıcı.
+
+    İstek ve jeton kovalarıyla hız sınırı, öncelikli sınırlı kuyruklar, jitter'lı tekrar,
+    gecikme yüzdeliği aşılınca yedek (hedged) istek ve hızlı başarısız olan devre kesici.
+    `call(payload)` gerçek sağlayıcı çağrısıdır; testte sahte bir sağlayıcıyla değiştirilebilir.
+    """
+
+    def __init__(self, call: Callable[[Any], Awaitable[Any]], requests_per_minute: float = 500,
+                 tokens_per_minute: float = 90000, max_concurrency: int = 8, queue_limit: int = 100,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 hedge_percentile: Optional[float] = 0.95, hedge_min_samples: int = 20,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 retryable: Callable[[BaseException], bool] = is_retryable):
+        self.call = call
+        self.requests = TokenBucket(requests_per_minute / 60, max(1.0, requests_per_minute / 60))
+        self.tokens = TokenBucket(tokens_per_minute / 60, max(1.0, tokens_per_minute / 6))
+        self.max_concurrency = max_concurrency
+        self.queue_limit = queue_limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.retryable = retryable
+
+        self._queues: Dict[str, Deque[_Job]] = {lane: deque() for lane in LANES}
+        self._ready: Optional[asyncio.Condition] = None
+        self._workers = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._latencies: Deque[float] = deque(maxlen=200)
+        self._rng = random.Random()
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0,
+                         "retries": 0, "hedged": 0, "hedge_wins": 0, "circuit_rejected": 0, "abandoned": 0}
+
+    async def submit(self, payload: Any, lane: str = "interactive", cost: float = 1.0) -> Any:
+        """İsteği kuyruğa al ve sonucunu bekle; kuyruk doluysa veya devre açıksa hemen hata"""
+        queue = self._queues[lane if lane in self._queues else LANES[-1]]
+        if len(queue) >= self.queue_limit:
+            self.counters["rejected"] += 1
+            raise SchedulerOverloaded(f"LLM queue '{lane}' is full")
+        # Kuyruk kontrolünden sonra: reddedilen istek deneme hakkını tüketmesin
+        trial = self.breaker.state == "half_open"
+        if not self.breaker.allow():
+            self.counters["circuit_rejected"] += 1
+            raise CircuitOpenError("LLM provider circuit is open")
+
+        self._ensure_workers()
+        job = _Job(payload, cost, trial)
+        queue.append(job)
+        self.counters["submitted"] += 1
+        async with self._ready:
+            self._ready.notify()
+        try:
+            return await job.future
+        except asyncio.CancelledError:
+            # İstemci vazgeçti: henüz başlamadıysa kuyruktan çıkar
+            if job in queue:
+                queue.remove(job)
+                self._release_trial(job)
+            raise
+
+    def _ensure_workers(self):
+        loop = asyncio.get_running_loop()
+        if self._workers and self._loop is loop:
+            return
+        # Döngü değiştiyse (ör. asyncio.run ile ayrı çağrılar) eski işçiler kullanılamaz
+        self._loop = loop
+        self.requests._lock = asyncio.Lock()
+        self.tokens._lock = asyncio.Lock()
+        self._ready = asyncio.Condition()
+        self._workers = [asyncio.ensure_future(self._worker()) for _ in range(self.max_concurrency)]
+
+    def _release_trial(self, job: _Job):
+        """Sonuçlanmadan biten deneme isteğinin hakkını bir kez geri ver"""
+        if job.trial:
+            job.trial = False
+            self.breaker.release_trial()
+
+    def _next_job(self) -> Optional[_Job]:
+        for lane in LANES:
+            queue = self._queues[lane]
+            while queue:
+                job = queue.popleft()
+                if not job.future.done():
+                    return job
+                self._release_trial(job)
+        return None
+
+    async def _worker(self):
+        while True:
+            async with self._ready:
+                job = self._next_job()
+                while job is None:
+                    await self._ready.wait()
+                    job = self._next_job()
+            # İstemci vazgeçerse (job.future iptal) sağlayıcı çağrısı da iptal edilir
+            attempt = asyncio.ensure_future(self._run_with_retries(job))
+            job.future.add_done_callback(lambda future, task=attempt: future.cancelled() and task.cancel())
+            try:
+                await asyncio.wait({attempt})
+            except asyncio.CancelledError:
+                attempt.cancel()
+                if not job.future.done():
+                    job.future.cancel()
+                self._release_trial(job)
+                raise
+            if attempt.cancelled():
+                self.counters["abandoned"] += 1
+                self._release_trial(job)
+                continue
+            error = attempt.exception()
+            if error is not None:
+                # 4xx gibi istek hataları sağlayıcının sağlığını göstermez: devreyi açmaz
+                if self.retryable(error):
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                self.counters["failed"] += 1
+                if not job.future.done():
+                    job.future.set_exception(error)
+            else:
+                self.breaker.record_success()
+                self.counters["completed"] += 1
+                if not job.future.done():
+                    job.future.set_result(attempt.result())
+
+    async def _run_with_retries(self, job: _Job) -> Any:
+        attempt = 0
+        while True:
+            await self.requests.acquire(1)
+            await self.tokens.acquire(job.cost)
+            try:
+                return await self._hedged_call(job)
+            except Exception as e:
+                if attempt >= self.max_retries or not self.retryable(e) or job.future.done():
+                    raise
+            attempt += 1
+            self.counters["retries"] += 1
+            # Tam jitter'lı üstel bekleme: aynı anda reddedilen istekler aynı anda geri gelmesin
+            await asyncio.sleep(self._rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not self.hedge_percentile or len(self._latencies) < self.hedge_min_samples:
+            return None
+        return quantile(list(self._latencies), self.hedge_percentile)
+
+    async def _timed_call(self, payload: Any) -> Any:
+        started = time.monotonic()
+        result = await self.call(payload)
+        self._latencies.append(time.monotonic() - started)
+        return result
+
+    async def _hedged_call(self, job: _Job) -> Any:
+        primary = asyncio.ensure_future(self._timed_call(job.payload))
+        hedge = None
+        try:
+            delay = self._hedge_delay()
+            if delay is None:
+                return await primary
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            # Yedek istek yalnızca hız sınırı izin veriyorsa gönderilir (istek ve jeton kovasından düşülür)
+            if done or not self.requests.try_acquire(1) or not self.tokens.try_acquire(job.cost):
+                return await primary
+
+            self.counters["hedged"] += 1
+            hedge = asyncio.ensure_future(self._timed_call(job.payload))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.counters["hedge_wins"] += 1
+                        return task.result()
+            # İkisi de başarısız: ilk isteğin hatası
+            return primary.result()
+        finally:
+            # Kaybeden veya iptal edilen çağrılar sağlayıcı kapasitesi tüketmeye devam etmez
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = list(self._latencies)
+        return {
+            **self.counters,
+            "queued": {lane: len(queue) for lane, queue in self._queues.items()},
+            "circuit": self.breaker.state,
+            "latency_p50": quantile(latencies, 0.5) if latencies else None,
+            "latency_p95": quantile(latencies, 0.95) if latencies else None,
+        }
+
+    async def aclose(self):
+        for worker in self._workers:
+            worker.cancel()
+        if self._loop is asyncio.get_running_loop():
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for queue in self._queues.values():
+            while queue:
+                job = queue.popleft()
+                if not job.future.done():
+                    job.future.cancel()
@@ -0,0 +1,298 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+TRANSPORT_MODES = ("openai", "record", "replay", "synthetic")
+
+
+class TransportUnavailable(Exception):
+    pass
+
+
+def to_namespace(value: Any) -> Any:
+    """Sözlük yanıtı OpenAI nesneleri gibi nitelikle erişilebilir hale getir"""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: to_namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [to_namespace(v) for v in value]
+    return value
+
+
+def compact_response(response: Any) -> Dict[str, Any]:
+    """Yanıtın sohbet hattının kullandığı alanları: içerik, araç çağrıları, bitiş nedeni, kullanım"""
+    data = response.model_dump() if hasattr(response, "model_dump") else dict(response)
+    choices = []
+    for choice in data.get("choices", []):
+        message = choice.get("message") or {}
+        compact = {"role": message.get("role", "assistant"), "content": message.get("content"), "tool_calls": None}
+        if message.get("tool_calls"):
+            compact["tool_calls"] = [
+                {"id": call["id"], "type": "function",
+                 "function": {"name": call["function"]["name"], "arguments": call["function"]["arguments"]}}
+                for call in message["tool_calls"]
+            ]
+        choices.append({"index": choice.get("index", 0), "message": compact,
+                        "finish_reason": choice.get("finish_reason")})
+    return {"id": data.get("id"), "model": data.get("model"), "choices": choices, "usage": data.get("usage")}
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """İsteğin kararlı özeti.
+
+    Araç sonuçları süre ölçümü gibi değişken alanlar içerir; anahtara yalnızca
+    tool_call_id girer, böylece kaydedilen araç turları tekrar oynatılabilir.
+    """
+    messages = []
+    for message in request.get("messages", []):
+        if message.get("role") == "tool":
+            messages.append({"role": "tool", "tool_call_id": message.get("tool_call_id")})
+        else:
+            messages.append({"role": message.get("role"), "content": message.get("content"),
+                             "tool_calls": message.get("tool_calls")})
+    canonical = {
+        "model": request.get("model"),
+        "messages": messages,
+        "tools": sorted(t["function"]["name"] for t in request.get("tools") or []),
+        "tool_choice": request.get("tool_choice"),
+    }
+    data = json.dumps(canonical, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class CassetteStore:
+    """İstek/yanıt çiftleri için gzip'li JSON Lines dosyası (yalnızca ekleme)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, List[Dict[str, Any]]] = {}
+        # Eklemeler iş parçacığı havuzundan gelir; gzip üyeleri birbirine karışmasın
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries.setdefault(entry["key"], []).append(entry)
+
+    def append(self, key: str, response: Dict[str, Any], latency: float):
+        entry = {"key": key, "latency": round(latency, 4), "response": response}
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            self.entries.setdefault(key, []).append(entry)
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # gzip ekleme modu yeni bir üye yazar; okuma tüm üyeleri sırayla açar
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(line)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.entries.values())
+
+
+class OpenAITransport:
+    """Gerçek OpenAI API'si; istemci ilk istekte oluşturulur"""
+
+    def __init__(self, api_key: Optional[str] = None, timeout: float = 60.0):
+        self.api_key = api_key if api_key is not None else os.getenv("OPENAI_API_KEY")
+        self.timeout = timeout
+        self._client = None
+        self._client_loaded = False
+
+    @property
+    def client(self):
+        if not self._client_loaded:
+            self._client_loaded = True
+            if self.api_key:
+                try:
+                    from openai import AsyncOpenAI
+                    # Tekrar denemeleri zamanlayıcı yapar; istemcinin kendi tekrarları kapalı
+                    self._client = AsyncOpenAI(api_key=self.api_key, max_retries=0, timeout=self.timeout)
+                except ImportError:
+                    print("OpenAI paketi bulunamadı! pip install openai komutu ile yükleyin.")
+        return self._client
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None
+
+    async def complete(self, request: Dict[str, Any]) -> Any:
+        if self.client is None:
+            raise TransportUnavailable("OpenAI client is not configured")
+        return await self.client.chat.completions.create(**request)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.close()
+        self._client = None
+        self._client_loaded = False
+
+
+class RecordingTransport:
+    """Alttaki taşıyıcının yanıtlarını kayıt dosyasına yazar"""
+
+    def __init__(self, inner: Any, store: CassetteStore):
+        self.inner = inner
+        self.store = store
+
+    @property
+    def available(self) -> bool:
+        return self.inner.available
+
+    async def complete(self, request: Dict[str, Any]) -> Any:
+        started = time.monotonic()
+        response = await self.inner.complete(request)
+        latency = time.monotonic() - started
+        # Disk yazımı olay döngüsünü bekletmesin
+        await asyncio.to_thread(self.store.append, request_key(request), compact_response(response), latency)
+        return response
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class SyntheticTransport:
+    """Sahte akışlı tamamlama: ilk jeton gecikmesi + saniyede `tokens_per_second` jeton.
+
+    `tool_call_rate` olasılığıyla (araçlara izin varsa) ucuz bir araç çağrısı döner,
+    böylece araç turları da ölçülür.
+    """
+
+    def __init__(self, first_token_ms: float = 300.0, tokens_per_second: float = 60.0,
+                 min_tokens: int = 40, max_tokens: int = 200, tool_call_rate: float = 0.0,
+                 chunk_tokens: int = 8, seed: Optional[int] = None):
+        self.first_token_ms = first_token_ms
+        self.tokens_per_second = tokens_per_second
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.tool_call_rate = tool_call_rate
+        self.chunk_tokens = chunk_tokens
+        self._rng = random.Random(seed)
+
+    available = True
+
+    def _tool_call(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if request.get("tool_choice") == "none" or not request.get("tools"):
+            return None
+        if self._rng.random() >= self.tool_call_rate:
+            return None
+        last = next((m.get("content") or "" for m in reversed(request["messages"]) if m.get("role") == "user"), "")
+        return {"id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+                "function": {"name": "explain_code", "arguments": json.dumps({"code": last, "language": "python"})}}
+
+    async def stream(self, request: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """OpenAI chat.completion.chunk biçiminde parçalar"""
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        await asyncio.sleep(self.first_token_ms / 1000)
+
+        tool_call = self._tool_call(request)
+        if tool_call:
+            yield {"id": completion_id, "choices": [{"index": 0, "delta": {"tool_calls": [tool_call]},
+                                                     "finish_reason": "tool_calls"}]}
+            return
+
+        total = self._rng.randint(self.min_tokens, min(self.max_tokens, request.get("max_tokens") or self.max_tokens))
+        for start in range(0, total, self.chunk_tokens):
+            count = min(self.chunk_tokens, total - start)
+            await asyncio.sleep(count / self.tokens_per_second)
+            finish = "stop" if start + count >= total else None
+            yield {"id": completion_id, "choices": [{"index": 0, "delta": {"content": " lorem" * count},
+                                                     "finish_reason": finish}]}
+
+    async def complete(self, request: Dict[str, Any]) -> Any:
+        content, tool_calls, finish_reason, completion_id, tokens = [], None, None, None, 0
+        async for chunk in self.stream(request):
+            completion_id = chunk["id"]
+            choice = chunk["choices"][0]
+            delta = choice["delta"]
+            if delta.get("content"):
+                content.append(delta["content"])
+                tokens += delta["content"].count(" ")
+            if delta.get("tool_calls"):
+                tool_calls = delta["tool_calls"]
+            finish_reason = choice["finish_reason"] or finish_reason
+        prompt_tokens = sum(len(str(m.get("content") or "")) for m in request.get("messages", [])) // 4
+        return to_namespace({
+            "id": completion_id,
+            "model": request.get("model"),
+            "choices": [{"index": 0, "finish_reason": finish_reason, "message": {
+                "role": "assistant",
+                "content": f"Sentetik yanıt:{''.join(content)}" if content else None,
+                "tool_calls": tool_calls,
+            }}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": tokens,
+                      "total_tokens": prompt_tokens + tokens},
+        })
+
+    async def aclose(self):
+        pass
+
+
+class ReplayTransport:
+    """Kaydedilmiş yanıtları oynatır.
+
+    Gecikme: varsayılan kaydedilen süre × `latency_scale`; `latency_ms` verilirse
+    ortalama `latency_ms`, sapma `jitter_ms` olan normal dağılım. Kayıtta olmayan
+    istekler `fallback` taşıyıcısına gider, o da yoksa hata verilir.
+    """
+
+    def __init__(self, store: CassetteStore, latency_scale: float = 1.0, latency_ms: Optional[float] = None,
+                 jitter_ms: float = 0.0, fallback: Optional[Any] = None, seed: Optional[int] = None):
+        self.store = store
+        self.latency_scale = latency_scale
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fallback = fallback
+        self._cursor: Dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self.hits = 0
+        self.misses = 0
+
+    available = True
+
+    def _latency(self, entry: Dict[str, Any]) -> float:
+        if self.latency_ms is None:
+            return entry["latency"] * self.latency_scale
+        return max(0.0, self._rng.gauss(self.latency_ms, self.jitter_ms)) / 1000
+
+    async def complete(self, request: Dict[str, Any]) -> Any:
+        key = request_key(request)
+        entries = self.store.entries.get(key)
+        if not entries:
+            self.misses += 1
+            if self.fallback is None:
+                raise TransportUnavailable(f"No recorded response for request {key}")
+            return await self.fallback.complete(request)
+        self.hits += 1
+        # Aynı isteğin birden çok kaydı sırayla döner
+        index = self._cursor.get(key, 0)
+        self._cursor[key] = index + 1
+        entry = entries[index % len(entries)]
+        await asyncio.sleep(self._latency(entry))
+        return to_namespace(entry["response"])
+
+    async def aclose(self):
+        if self.fallback is not None:
+            await self.fallback.aclose()
+
+
+def create_transport(mode: str = "openai", cassette_path: Optional[str] = None, **options) -> Any:
+    """Ayar adından taşıyıcı oluştur (openai / record / replay / synthetic)"""
+    if mode == "openai":
+        return OpenAITransport(**options)
+    if mode == "synthetic":
+        return SyntheticTransport(**options)
+    if not cassette_path:
+        raise ValueError(f"LLM transport '{mode}' requires a cassette path")
+    if mode == "record":
+        return RecordingTransport(OpenAITransport(**options), CassetteStore(cassette_path))
+    if mode == "replay":
+        # Kayıtta olmayan istekler sentetik yanıtla karşılanır
+        return ReplayTransport(CassetteStore(cassette_path), fallback=SyntheticTransport(), **options)
+    raise ValueError(f"Unknown LLM transport '{mode}' (expected one of {', '.join(TRANSPORT_MODES)})")
@@ -0,0 +1,160 @@
+import asyncio
+import itertools
+import json
+import os
+from typing import Any, Dict, List, Optional, Set
+
+WORKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "node_worker.js")
+
+
+class NodeWorkerError(Exception):
+    pass
+
+
+# Node izin modeli: dosya yazma, alt süreç, worker ve yerel eklenti yasak; okuma yalnızca işçi betiği
+PERMISSION_FLAGS = {20: "--experimental-permission", 23: "--permission"}
+
+
+class _NodeWorker:
+    """Önceden başlatılmış, tek iş çalıştırıp çıkan bir `node node_worker.js` süreci"""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def run(self, job: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        self.process.stdin.write((json.dumps(job) + "\n").encode("utf-8"))
+        await self.process.stdin.drain()
+        line = await asyncio.wait_for(self.process.stdout.readline(), timeout)
+        if not line:
+            raise NodeWorkerError("JavaScript worker crashed (possibly out of memory)")
+        return json.loads(line)
+
+    def kill(self):
+        if self.alive:
+            self.process.kill()
+
+
+class NodeWorkerPool:
+    """Tek kullanımlık Node.js işçileri için sıcak yedek havuzu.
+
+    Her kod parçası kendi sürecinde çalışır; işler arasında hiçbir durum (global, stdout,
+    modül önbelleği) paylaşılmaz. Node başlatma maliyeti iş beklerken değil, önceki iş
+    çalışırken arka planda açılan yedek süreçte ödenir.
+    """
+
+    def __init__(self, size: int = 2, memory_limit_mb: int = 256, node_path: str = "node"):
+        self.size = size
+        self.memory_limit_mb = memory_limit_mb
+        self.node_path = node_path
+        self.loop = asyncio.get_running_loop()
+        self._spares: List[_NodeWorker] = []
+        self._workers: List[_NodeWorker] = []
+        self._slots = asyncio.Semaphore(size)
+        self._ids = itertools.count()
+        self._flags: Optional[List[str]] = None
+        self._refill: Optional[asyncio.Task] = None
+        self._reaping: Set[asyncio.Task] = set()
+        self.spawned = 0
+
+    async def _node_flags(self) -> List[str]:
+        """Node sürümüne göre izin modeli bayrakları (destek yoksa boş)"""
+        if self._flags is None:
+            process = await asyncio.create_subprocess_exec(
+                self.node_path, "--version", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+            )
+            stdout, _ = await process.communicate()
+            try:
+                major = int(stdout.decode().strip().lstrip("v").split(".")[0])
+            except ValueError:
+                major = 0
+            supported = [version for version in PERMISSION_FLAGS if major >= version]
+            self._flags = [PERMISSION_FLAGS[max(supported)], f"--allow-fs-read={WORKER_PATH}"] if supported else []
+        return self._flags
+
+    async def _spawn(self) -> _NodeWorker:
+        flags = await self._node_flags()
+        process = await asyncio.create_subprocess_exec(
+            self.node_path, f"--max-old-space-size={self.memory_limit_mb}", *flags, WORKER_PATH,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        worker = _NodeWorker(process)
+        self._workers.append(worker)
+        self.spawned += 1
+        return worker
+
+    def _replenish(self):
+        """Yedek sayısını arka planda havuz boyutuna tamamla"""
+        if self._refill is not None and not self._refill.done():
+            return
+
+        async def refill():
+            while len(self._spares) < self.size:
+                try:
+                    self._spares.append(await self._spawn())
+                except Exception:
+                    # Node yoksa hata bir sonraki run() çağrısında ön planda alınır
+                    return
+
+        self._refill = self.loop.create_task(refill())
+
+    def _retire(self, worker: _NodeWorker):
+        worker.kill()
+        if worker in self._workers:
+            self._workers.remove(worker)
+            # Çıkan süreç arka planda beklenir (zombi/kapanmamış taşıma kalmasın)
+            task = self.loop.create_task(worker.process.wait())
+            self._reaping.add(task)
+            task.add_done_callback(self._reaping.discard)
+
+    async def run(self, code: str, input_data: Optional[str] = None, timeout: float = 5.0) -> Dict[str, Any]:
+        """Kodu yeni bir işçi sürecinde çalıştır: {output, errors, exit_code, time_ms}"""
+        async with self._slots:
+            worker = None
+            while self._spares and worker is None:
+                candidate = self._spares.pop()
+                worker = candidate if candidate.alive else None
+            if worker is None:
+                worker = await self._spawn()
+            self._replenish()
+
+            job = {"id": next(self._ids), "code": code, "stdin": input_data, "timeout_ms": int(timeout * 1000)}
+            try:
+                # vm zaman aşımı yalnızca eşzamanlı kodu durdurur; geri çağrılarda takılan işçi burada kesilir
+                return await worker.run(job, timeout + 1.0)
+            except asyncio.TimeoutError:
+                return {"output": "", "errors": f"JavaScript execution timeout ({timeout:g}s limit)",
+                        "exit_code": 1, "time_ms": timeout * 1000}
+            except (NodeWorkerError, ConnectionError) as e:
+                return {"output": "", "errors": str(e), "exit_code": 1, "time_ms": 0.0}
+            finally:
+                # Süreç tek kullanımlıktır: sonucu yazdıktan sonra kendisi çıkar, takılmışsa öldürülür
+                self._retire(worker)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"workers": len(self._workers), "spares": len(self._spares), "spawned": self.spawned}
+
+    async def aclose(self):
+        if self._refill is not None:
+            self._refill.cancel()
+            await asyncio.gather(self._refill, return_exceptions=True)
+        for worker in list(self._workers):
+            worker.kill()
+            await worker.process.wait()
+        await asyncio.gather(*self._reaping, return_exceptions=True)
+        self._workers.clear()
+        self._spares.clear()
+
+    def kill(self):
+        """Döngü dışından (ör. döngü değiştiğinde) süreçleri sonlandır"""
+        if self._refill is not None:
+            self._refill.cancel()
+        for worker in self._workers:
+            worker.kill()
+        self._workers.clear()
+        self._spares.clear()
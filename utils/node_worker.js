@@ -0,0 +1,412 @@
+'use strict';
+// Tek kullanımlık JavaScript demo işçisi.
+// Havuz süreci önceden başlatır; stdin'den tek bir JSON iş okur: {id, code, stdin, timeout_ms},
+// kodu vm bağlamında çalıştırır, sonucu stdout'a tek satır JSON olarak yazar ve çıkar.
+// İşler arasında paylaşılan durum yoktur. Bağlama bu süreçten hiçbir nesne verilmez: kullanıcı
+// API'leri bağlamın içinde kurulur ve bu sürece yalnızca ilkel değer alıp döndüren köprüyle bağlanır.
+const vm = require('vm');
+const util = require('util');
+const readline = require('readline');
+
+const BOOTSTRAP_FILE = 'sandbox-bootstrap.js';
+const INSPECT_OPTIONS = { customInspect: false, getters: false };
+
+function formatError(err) {
+  try {
+    if (err && typeof err === 'object' && err.stack) {
+      // İşçinin, kurulum betiğinin ve Node iç modüllerinin çerçeveleri kullanıcıya gösterilmez
+      const lines = String(err.stack).split('\n');
+      const frames = lines.filter((line) => !line.includes(__filename) && !line.includes(BOOTSTRAP_FILE)
+        && !/\(?node:/.test(line.trim().replace(/^at \S+ /, '')));
+      return frames.length ? frames.join('\n') : lines[0];
+    }
+    return `Uncaught ${util.inspect(err, INSPECT_OPTIONS)}`;
+  } catch (e) {
+    return 'Uncaught exception (unprintable)';
+  }
+}
+
+// Bağlamın içinde çalışır: bu süreçteki hiçbir değişkene erişemez, yalnızca `bridge` fonksiyonlarını çağırır.
+// Köprü fonksiyonları hata fırlatmaz ve yalnızca ilkel değer döndürür.
+function installSandbox(bridge) {
+  'use strict';
+  const { print, write, formatArgs, inspect, deepEqual, schedule, cancel, now, input, exit } = bridge;
+  const g = globalThis;
+
+  class ExitSignal extends Error {}
+
+  class EventEmitter {
+    constructor() {
+      this._events = new Map();
+    }
+    on(name, listener) {
+      if (!this._events.has(name)) this._events.set(name, []);
+      this._events.get(name).push(listener);
+      return this;
+    }
+    addListener(name, listener) {
+      return this.on(name, listener);
+    }
+    once(name, listener) {
+      const wrapper = (...args) => {
+        this.off(name, wrapper);
+        listener.apply(this, args);
+      };
+      wrapper.listener = listener;
+      return this.on(name, wrapper);
+    }
+    off(name, listener) {
+      const listeners = this._events.get(name) || [];
+      const index = listeners.findIndex((l) => l === listener || l.listener === listener);
+      if (index >= 0) listeners.splice(index, 1);
+      return this;
+    }
+    removeListener(name, listener) {
+      return this.off(name, listener);
+    }
+    removeAllListeners(name) {
+      if (name === undefined) this._events.clear();
+      else this._events.delete(name);
+      return this;
+    }
+    emit(name, ...args) {
+      const listeners = (this._events.get(name) || []).slice();
+      if (name === 'error' && listeners.length === 0) {
+        throw args[0] instanceof Error ? args[0] : new Error(`Unhandled error: ${args[0]}`);
+      }
+      for (const listener of listeners) listener.apply(this, args);
+      return listeners.length > 0;
+    }
+    listenerCount(name) {
+      return (this._events.get(name) || []).length;
+    }
+    listeners(name) {
+      return (this._events.get(name) || []).map((l) => l.listener || l);
+    }
+  }
+  EventEmitter.EventEmitter = EventEmitter;
+
+  const setTimeout = (fn, ms, ...args) => schedule(0, () => fn(...args), ms);
+  const setInterval = (fn, ms, ...args) => schedule(1, () => fn(...args), ms);
+  const setImmediate = (fn, ...args) => schedule(2, () => fn(...args), 0);
+  const queueMicrotask = (fn) => {
+    Promise.resolve().then(() => fn());
+  };
+
+  // stdin: sabit girdi metni, ilk dinleyici/resume ile bir sonraki turda teslim edilir
+  const stdinText = input();
+  const stdin = new EventEmitter();
+  let stdinStarted = false;
+  const startStdin = () => {
+    if (stdinStarted) return;
+    stdinStarted = true;
+    setImmediate(() => {
+      if (stdinText) stdin.emit('data', stdinText);
+      stdin.emit('end');
+      stdin.emit('close');
+    });
+  };
+  const stdinOn = stdin.on.bind(stdin);
+  stdin.on = (name, listener) => {
+    stdinOn(name, listener);
+    if (name === 'data' || name === 'end' || name === 'readable') startStdin();
+    return stdin;
+  };
+  stdin.addListener = stdin.on;
+  stdin.setEncoding = () => stdin;
+  stdin.resume = () => {
+    startStdin();
+    return stdin;
+  };
+  stdin.pause = () => stdin;
+  stdin[Symbol.asyncIterator] = async function* () {
+    if (stdinText) yield stdinText;
+  };
+
+  const hrtime = (previous) => {
+    const t = now();
+    let seconds = Number(t / 1000000000n);
+    let nanos = Number(t % 1000000000n);
+    if (previous) {
+      seconds -= previous[0];
+      nanos -= previous[1];
+      if (nanos < 0) {
+        seconds -= 1;
+        nanos += 1e9;
+      }
+    }
+    return [seconds, nanos];
+  };
+  hrtime.bigint = () => now();
+
+  const stream = (fd) => ({
+    write: (chunk) => {
+      write(fd, String(chunk));
+      return true;
+    },
+  });
+
+  const process = {
+    argv: ['node', 'snippet.js'],
+    env: {},
+    platform: 'sandbox',
+    stdin,
+    stdout: stream(1),
+    stderr: stream(2),
+    exit: (code = 0) => {
+      exit(code);
+      throw new ExitSignal('process.exit');
+    },
+    nextTick: (fn, ...args) => queueMicrotask(() => fn(...args)),
+    hrtime,
+    memoryUsage: () => ({}),
+  };
+
+  const createInterface = (options) => {
+    const rl = new EventEmitter();
+    const fromStdin = options && (options.input === stdin || options === stdin);
+    const lines = fromStdin && stdinText ? stdinText.split(/\r?\n/) : [];
+    if (lines.length && lines[lines.length - 1] === '') lines.pop();
+    let closed = false;
+    let position = 0;
+    rl.close = () => {
+      if (closed) return;
+      closed = true;
+      rl.emit('close');
+    };
+    rl.question = (query, callback) => {
+      write(1, String(query));
+      setImmediate(() => callback(position < lines.length ? lines[position++] : ''));
+    };
+    rl.setPrompt = () => {};
+    rl.prompt = () => {};
+    rl.pause = () => rl;
+    rl.resume = () => rl;
+    rl[Symbol.asyncIterator] = async function* () {
+      while (!closed && position < lines.length) yield lines[position++];
+    };
+    setImmediate(() => {
+      if (rl.listenerCount('line') === 0) return;
+      while (!closed && position < lines.length) rl.emit('line', lines[position++]);
+      rl.close();
+    });
+    return rl;
+  };
+
+  class AssertionError extends Error {
+    constructor(message) {
+      super(message);
+      this.name = 'AssertionError';
+    }
+  }
+  const fail = (message, fallback) => {
+    throw message instanceof Error ? message : new AssertionError(message || fallback);
+  };
+  const check = (passed, message, fallback) => {
+    if (!passed) fail(message, fallback);
+  };
+  const assert = (value, message) => check(value, message, 'The expression evaluated to a falsy value');
+  Object.assign(assert, {
+    ok: assert,
+    AssertionError,
+    fail: (message) => fail(message, 'Failed'),
+    // eslint-disable-next-line eqeqeq
+    equal: (a, b, message) => check(a == b, message, `${inspect(a)} == ${inspect(b)}`),
+    // eslint-disable-next-line eqeqeq
+    notEqual: (a, b, message) => check(a != b, message, `${inspect(a)} != ${inspect(b)}`),
+    strictEqual: (a, b, message) => check(Object.is(a, b), message, `${inspect(a)} === ${inspect(b)}`),
+    notStrictEqual: (a, b, message) => check(!Object.is(a, b), message, `${inspect(a)} !== ${inspect(b)}`),
+    deepEqual: (a, b, message) => check(deepEqual(a, b), message, `${inspect(a)} deepEqual ${inspect(b)}`),
+    deepStrictEqual: (a, b, message) => check(deepEqual(a, b), message,
+      `${inspect(a)} deepStrictEqual ${inspect(b)}`),
+    notDeepStrictEqual: (a, b, message) => check(!deepEqual(a, b), message, 'Values are deeply equal'),
+    throws: (fn, expected, message) => {
+      try {
+        fn();
+      } catch (err) {
+        if (typeof expected === 'function' && expected.prototype !== undefined && !(err instanceof expected)) throw err;
+        return;
+      }
+      fail(typeof expected === 'string' ? expected : message, 'Missing expected exception');
+    },
+  });
+
+  const utilModule = {
+    format: (...args) => formatArgs(...args),
+    inspect: (value) => inspect(value),
+    isDeepStrictEqual: (a, b) => deepEqual(a, b),
+    promisify: (fn) => (...args) => new Promise((resolve, reject) => {
+      fn(...args, (err, value) => (err ? reject(err) : resolve(value)));
+    }),
+    inherits: (ctor, superCtor) => {
+      Object.setPrototypeOf(ctor.prototype, superCtor.prototype);
+      Object.setPrototypeOf(ctor, superCtor);
+    },
+  };
+
+  // İzin listesi: yalnızca bağlam içinde kurulan modüller
+  const modules = {
+    assert,
+    events: EventEmitter,
+    readline: { createInterface },
+    util: utilModule,
+  };
+  const require = (name) => {
+    const bare = String(name).replace(/^node:/, '');
+    if (Object.prototype.hasOwnProperty.call(modules, bare)) return modules[bare];
+    throw new Error(`Module '${bare}' is not available in the sandbox (allowed: ${Object.keys(modules).join(', ')})`);
+  };
+
+  const module = { exports: {} };
+  Object.assign(g, {
+    global: g,
+    console: {
+      log: (...args) => print(1, ...args),
+      info: (...args) => print(1, ...args),
+      debug: (...args) => print(1, ...args),
+      table: (...args) => print(1, ...args),
+      error: (...args) => print(2, ...args),
+      warn: (...args) => print(2, ...args),
+      dir: (value) => write(1, `${inspect(value)}\n`),
+    },
+    process,
+    require,
+    module,
+    exports: module.exports,
+    setTimeout,
+    setInterval,
+    setImmediate,
+    clearTimeout: (id) => cancel(id),
+    clearInterval: (id) => cancel(id),
+    clearImmediate: (id) => cancel(id),
+    queueMicrotask,
+  });
+}
+
+function createBridge(job, pending) {
+  const guarded = (fn, fallback) => (...args) => {
+    try {
+      return fn(...args);
+    } catch (err) {
+      return fallback;
+    }
+  };
+  const streams = { 1: job.stdout, 2: job.stderr };
+  const format = (args) => util.formatWithOptions(INSPECT_OPTIONS, ...args);
+  let nextId = 0;
+
+  return {
+    print: guarded((fd, ...args) => {
+      streams[fd === 2 ? 2 : 1].push(format(args) + '\n');
+    }),
+    write: guarded((fd, text) => {
+      streams[fd === 2 ? 2 : 1].push(String(text));
+    }),
+    formatArgs: guarded((...args) => format(args), ''),
+    inspect: guarded((value) => util.inspect(value, INSPECT_OPTIONS), '[uninspectable]'),
+    deepEqual: guarded((a, b) => util.isDeepStrictEqual(a, b), false),
+    schedule: guarded((kind, callback, ms) => {
+      if (typeof callback !== 'function') return 0;
+      const id = ++nextId;
+      const delay = Math.max(0, Number(ms) || 0);
+      const run = () => {
+        if (kind !== 1) pending.delete(id);
+        callback();
+      };
+      const handle = kind === 1 ? setInterval(run, delay) : kind === 2 ? setImmediate(run) : setTimeout(run, delay);
+      pending.set(id, handle);
+      return id;
+    }, 0),
+    cancel: guarded((id) => {
+      const handle = pending.get(id);
+      if (handle !== undefined) {
+        clearTimeout(handle);
+        clearInterval(handle);
+        clearImmediate(handle);
+        pending.delete(id);
+      }
+    }),
+    now: guarded(() => process.hrtime.bigint(), 0n),
+    input: guarded(() => (job.stdin == null ? '' : String(job.stdin)), ''),
+    exit: guarded((code) => {
+      job.exited = true;
+      job.exitCode = Number(code) || 0;
+    }),
+  };
+}
+
+function runJob(job) {
+  job.stdout = [];
+  job.stderr = [];
+  job.exitCode = 0;
+  job.exited = false;
+
+  const report = (err) => {
+    // process.exit() zamanlayıcı geri çağrısından da çağrılabilir
+    if (job.exited) return;
+    job.stderr.push(formatError(err) + '\n');
+    job.exitCode = 1;
+  };
+  process.on('uncaughtException', report);
+  process.on('unhandledRejection', report);
+
+  const timeoutMs = job.timeout_ms || 5000;
+  const pending = new Map();
+  const started = process.hrtime.bigint();
+  const deadline = Date.now() + timeoutMs;
+
+  const finish = (timedOut) => {
+    if (timedOut) {
+      job.stderr.push(`Execution timed out after ${timeoutMs}ms (pending timers or callbacks)\n`);
+      job.exitCode = 1;
+    }
+    return {
+      id: job.id,
+      output: job.stdout.join(''),
+      errors: job.stderr.length ? job.stderr.join('') : null,
+      exit_code: job.exitCode,
+      time_ms: Number(process.hrtime.bigint() - started) / 1e6,
+    };
+  };
+
+  try {
+    // Prototipsiz global: `this.constructor` bu sürecin Function'ına değil bağlamınkine çıkar
+    const context = vm.createContext(Object.create(null), { codeGeneration: { strings: false, wasm: false } });
+    const install = new vm.Script(`(${installSandbox.toString()})`, { filename: BOOTSTRAP_FILE }).runInContext(context);
+    install(createBridge(job, pending));
+    new vm.Script(job.code, { filename: 'snippet.js' }).runInContext(context, { timeout: timeoutMs });
+  } catch (err) {
+    report(err);
+    return Promise.resolve(finish(false));
+  }
+
+  // Bekleyen zamanlayıcılar ve promise'ler bitene kadar bekle
+  return (async () => {
+    for (;;) {
+      await new Promise((resolve) => setImmediate(resolve));
+      if (job.exited) break;
+      if (pending.size === 0) {
+        await new Promise((resolve) => setImmediate(resolve));
+        if (pending.size === 0) break;
+      }
+      if (Date.now() > deadline) return finish(true);
+      if (pending.size > 0) {
+        await new Promise((resolve) => setTimeout(resolve, 1));
+      }
+    }
+    return finish(false);
+  })();
+}
+
+// Tek iş: sonuç yazıldıktan sonra süreç kalan zamanlayıcılarıyla birlikte sonlanır
+const lines = readline.createInterface({ input: process.stdin });
+lines.once('line', async (line) => {
+  lines.close();
+  let result;
+  try {
+    result = await runJob(JSON.parse(line));
+  } catch (err) {
+    result = { id: null, error: `Bad request: ${err.message}` };
+  }
+  process.stdout.write(JSON.stringify(result) + '\n', () => process.exit(0));
+});
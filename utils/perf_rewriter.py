@@ -0,0 +1,882 @@
+import ast
+import bisect
+import difflib
+import keyword
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Argümanlarını değiştirmeyen (salt okunur) yerleşik fonksiyonlar
+PURE_BUILTINS = {
+    "len", "sum", "min", "max", "sorted", "list", "tuple", "set", "frozenset", "enumerate",
+    "zip", "reversed", "any", "all", "str", "repr", "print", "iter", "dict", "bool", "hash",
+}
+READONLY_METHODS = {"count", "index", "copy"}
+# Sonucu her zaman hashable olan yerleşikler
+HASHABLE_BUILTINS = {"str", "int", "float", "bool", "len", "repr", "ord", "chr", "hash", "abs"}
+# Sonucu her zaman dizi (int ile indekslenen) olan yerleşikler
+SEQUENCE_BUILTINS = {"list", "tuple", "sorted", "str"}
+
+# re modül fonksiyonu -> Pattern metoduna çevrilebilecek en fazla konumsal argüman (desen dahil)
+RE_FUNCTIONS = {"match": 2, "search": 2, "fullmatch": 2, "findall": 2, "finditer": 2,
+                "sub": 4, "subn": 4, "split": 3}
+
+SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+LOOPS = (ast.For, ast.AsyncFor, ast.While)
+MAX_PASSES = 3
+
+
+class _Source:
+    """Kaynak metin üzerinde satır/sütun <-> karakter ofseti dönüşümleri"""
+
+    def __init__(self, code: str):
+        self.code = code
+        # ast satır numaraları yalnızca \n ile ayrılır (splitlines \x0c vb. de böler)
+        self.lines = [line + "\n" for line in code.split("\n")]
+        self.lines[-1] = self.lines[-1][:-1]
+        self.starts = [0]
+        for line in self.lines:
+            self.starts.append(self.starts[-1] + len(line))
+
+    def offset(self, lineno: int, col: int) -> int:
+        # ast sütunları UTF-8 bayt ofsetidir
+        line = self.lines[lineno - 1]
+        return self.starts[lineno - 1] + len(line.encode("utf-8")[:col].decode("utf-8", "ignore"))
+
+    def span(self, node) -> Tuple[int, int]:
+        return (self.offset(node.lineno, node.col_offset),
+                self.offset(node.end_lineno, node.end_col_offset))
+
+    def segment(self, node) -> str:
+        start, end = self.span(node)
+        return self.code[start:end]
+
+    def line_of(self, offset: int) -> int:
+        return min(bisect.bisect_right(self.starts, offset), len(self.lines))
+
+    def indent(self, lineno: int) -> str:
+        line = self.lines[lineno - 1]
+        return line[: len(line) - len(line.lstrip())]
+
+    def insert_before(self, node, text: str) -> Tuple[int, int, str]:
+        pos = self.starts[node.lineno - 1]
+        return (pos, pos, self.indent(node.lineno) + text + "\n")
+
+    def insert_after(self, node, text: str) -> Tuple[int, int, str]:
+        pos = self.starts[node.end_lineno]
+        line = self.lines[node.end_lineno - 1]
+        prefix = "" if line.endswith("\n") else "\n"
+        return (pos, pos, prefix + self.indent(node.lineno) + text + "\n")
+
+
+class _Module:
+    """Bir parse sonucu için ebeveyn haritası ve isim kullanım indeksleri"""
+
+    def __init__(self, tree: ast.Module):
+        self.tree = tree
+        self.parents: Dict[int, ast.AST] = {}
+        self.names_by_id: Dict[str, List[ast.Name]] = {}
+        self.declared_global = set()
+        self.in_fstring = set()
+        self.imports_re = False
+        self.shadowed = set()
+        # Name düğümü dışında bağlanan isimler (parametre, def, import, except as, match)
+        self.other_bindings = set()
+
+        for node in ast.walk(tree):
+            for child in ast.iter_child_nodes(node):
+                self.parents[id(child)] = node
+            if isinstance(node, ast.Name):
+                self.names_by_id.setdefault(node.id, []).append(node)
+                if isinstance(node.ctx, ast.Store):
+                    self.shadowed.add(node.id)
+            elif isinstance(node, (ast.Global, ast.Nonlocal)):
+                self.declared_global.update(node.names)
+            elif isinstance(node, ast.JoinedStr):
+                # 3.12 öncesi f-string içi konumlar güvenilir değil
+                for inner in ast.walk(node):
+                    self.in_fstring.add(id(inner))
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                if isinstance(node, ast.Import) and any(alias.name == "re" and alias.asname is None
+                                                        for alias in node.names):
+                    self.imports_re = True
+                self.other_bindings.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                self.shadowed.add(node.name)
+                self.other_bindings.add(node.name)
+            elif isinstance(node, ast.arg):
+                self.shadowed.add(node.arg)
+                self.other_bindings.add(node.arg)
+            elif isinstance(node, (ast.ExceptHandler, ast.MatchAs, ast.MatchStar)) and node.name:
+                self.other_bindings.add(node.name)
+            elif isinstance(node, ast.MatchMapping) and node.rest:
+                self.other_bindings.add(node.rest)
+        self.used_names = set(self.names_by_id) | self.shadowed
+
+    def parent(self, node) -> Optional[ast.AST]:
+        return self.parents.get(id(node))
+
+    def fresh_name(self, base: str) -> str:
+        name, counter = base, 2
+        while name in self.used_names or keyword.iskeyword(name):
+            name = f"{base}{counter}"
+            counter += 1
+        self.used_names.add(name)
+        return name
+
+    def is_readonly_use(self, node: ast.Name) -> bool:
+        """İsmin bu kullanımı nesneyi değiştiremez mi?"""
+        parent = self.parent(node)
+        if isinstance(parent, ast.Subscript):
+            return parent.value is node and isinstance(parent.ctx, ast.Load)
+        if isinstance(parent, ast.Call):
+            return (isinstance(parent.func, ast.Name) and parent.func.id in PURE_BUILTINS
+                    and parent.func.id not in self.shadowed and node in parent.args)
+        if isinstance(parent, ast.Compare):
+            return True
+        if isinstance(parent, (ast.For, ast.AsyncFor, ast.comprehension)):
+            return parent.iter is node
+        if isinstance(parent, ast.Attribute):
+            grand = self.parent(parent)
+            return (parent.attr in READONLY_METHODS and isinstance(grand, ast.Call)
+                    and grand.func is parent)
+        return False
+
+    def is_readonly_name(self, name: str, single_store: bool = False) -> bool:
+        """Modülün hiçbir yerinde değiştirilmeyen isim (tek atama izinli)"""
+        if name in self.declared_global:
+            return False
+        stores = 0
+        for node in self.names_by_id.get(name, []):
+            if isinstance(node.ctx, ast.Load):
+                if not self.is_readonly_use(node):
+                    return False
+            else:
+                stores += 1
+        return stores == 1 if single_store else True
+
+    def bindings(self, name: str) -> Optional[List[ast.AST]]:
+        """İsmin bağlandığı Assign değerleri, AugAssign ve for/comprehension düğümleri.
+
+        Takip edilemeyen bir bağlama (parametre, import, çoklu hedef, del...) varsa None.
+        """
+        if name in self.other_bindings or name in self.declared_global:
+            return None
+        found = []
+        for node in self.names_by_id.get(name, []):
+            if isinstance(node.ctx, ast.Load):
+                continue
+            parent = self.parent(node)
+            if isinstance(parent, ast.Assign) and node in parent.targets:
+                found.append(parent.value)
+            elif isinstance(parent, ast.AugAssign) and isinstance(node.ctx, ast.Store):
+                found.append(parent)
+            elif isinstance(parent, (ast.For, ast.AsyncFor, ast.comprehension)) and parent.target is node:
+                found.append(parent)
+            else:
+                return None
+        return found or None
+
+
+def _walk_local(nodes) -> Iterator[ast.AST]:
+    """İç içe fonksiyon/sınıf kapsamlarına girmeden düğümleri gez"""
+    stack = list(nodes) if isinstance(nodes, list) else [nodes]
+    while stack:
+        node = stack.pop()
+        yield node
+        for child in ast.iter_child_nodes(node):
+            if not isinstance(child, SCOPES):
+                stack.append(child)
+
+
+def _stores_in(nodes, name: str) -> bool:
+    return any(isinstance(n, ast.Name) and n.id == name and not isinstance(n.ctx, ast.Load)
+               for n in _walk_local(nodes))
+
+
+def _has_opaque_calls(nodes, module: "_Module") -> bool:
+    """Yan etkisi bilinemeyen (yerleşik olmayan) fonksiyon çağrısı var mı?"""
+    for node in _walk_local(nodes):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            if node.func.id not in PURE_BUILTINS or node.func.id in module.shadowed:
+                return True
+    return False
+
+
+def _is_hashable_constant(node) -> bool:
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, (str, bytes, int, float, complex, bool, type(None)))
+    if isinstance(node, ast.Tuple):
+        return all(_is_hashable_constant(elt) for elt in node.elts)
+    return False
+
+
+def _is_builtin_call(node, names, module: "_Module") -> bool:
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id in names and node.func.id not in module.shadowed)
+
+
+def _is_sequence(node, module: "_Module", depth: int = 0) -> bool:
+    """Değer kesin olarak list/tuple/str/bytes mi? (x[i] ile iterasyon aynı elemanları verir)"""
+    if depth > 3:
+        return False
+    if isinstance(node, (ast.List, ast.Tuple, ast.ListComp, ast.JoinedStr)):
+        return True
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, (str, bytes))
+    if _is_builtin_call(node, SEQUENCE_BUILTINS, module):
+        return True
+    if isinstance(node, ast.Name):
+        bound = module.bindings(node.id)
+        if bound is None or all(isinstance(b, ast.AugAssign) for b in bound):
+            return False
+        # list += ..., str *= ... türü korur
+        return all(isinstance(b.op, (ast.Add, ast.Mult)) if isinstance(b, ast.AugAssign)
+                   else not isinstance(b, (ast.For, ast.AsyncFor, ast.comprehension))
+                   and _is_sequence(b, module, depth + 1) for b in bound)
+    return False
+
+
+def _is_hashable(node, module: "_Module", depth: int = 0) -> bool:
+    """Değer kesin olarak hashable mı? (set üyeliğinde TypeError vermez)"""
+    if depth > 3:
+        return False
+    if _is_hashable_constant(node) or isinstance(node, ast.JoinedStr):
+        return True
+    if isinstance(node, ast.Tuple):
+        return all(_is_hashable(elt, module, depth + 1) for elt in node.elts)
+    if _is_builtin_call(node, HASHABLE_BUILTINS, module):
+        return True
+    if isinstance(node, ast.Subscript) and not isinstance(node.slice, ast.Slice):
+        # Elemanları hashable bir dizinin tekil elemanı (ör. names[i])
+        return _yields_hashable(node.value, module, depth + 1) and _is_hashable(node.slice, module, depth + 1)
+    if isinstance(node, ast.Name):
+        bound = module.bindings(node.id)
+        if bound is None:
+            return False
+        for b in bound:
+            if isinstance(b, ast.AugAssign):
+                return False
+            if isinstance(b, (ast.For, ast.AsyncFor, ast.comprehension)):
+                if not _yields_hashable(b.iter, module, depth + 1):
+                    return False
+            elif not _is_hashable(b, module, depth + 1):
+                return False
+        return True
+    return False
+
+
+def _yields_hashable(node, module: "_Module", depth: int = 0) -> bool:
+    """Üzerinde dönülen değerin tüm elemanları hashable mı?"""
+    if depth > 3:
+        return False
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, (str, bytes))
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return all(_is_hashable(elt, module, depth + 1) for elt in node.elts)
+    if _is_builtin_call(node, {"range"}, module):
+        return True
+    if _is_builtin_call(node, {"list", "tuple", "set", "frozenset", "sorted", "reversed"}, module):
+        return len(node.args) == 1 and _yields_hashable(node.args[0], module, depth + 1)
+    if isinstance(node, ast.Name):
+        bound = module.bindings(node.id)
+        return bound is not None and all(
+            not isinstance(b, (ast.AugAssign, ast.For, ast.AsyncFor, ast.comprehension))
+            and _yields_hashable(b, module, depth + 1) for b in bound)
+    return False
+
+
+def _membership_operand(compare: ast.Compare, comparator) -> ast.AST:
+    """`a in b` karşılaştırmasında b için a"""
+    index = compare.comparators.index(comparator)
+    return compare.left if index == 0 else compare.comparators[index - 1]
+
+
+def _blocks(node) -> Iterator[List[ast.stmt]]:
+    """Bir düğümün doğrudan sahip olduğu ifade blokları"""
+    for field in ("body", "orelse", "finalbody"):
+        block = getattr(node, field, None)
+        if isinstance(block, list) and block and isinstance(block[0], ast.stmt):
+            yield block
+    for handler in getattr(node, "handlers", []):
+        yield handler.body
+    for case in getattr(node, "cases", []):
+        yield case.body
+
+
+class PerformanceRewriter:
+    """Bilinen yavaş Python kalıplarını AST konumlarıyla metin üzerinde yeniden yazar.
+
+    Kaynak yeniden üretilmez (ast.unparse yok); yalnızca değişen aralıklar düzenlenir,
+    böylece biçim ve yorumlar korunur.
+    """
+
+    def rewrite(self, code: str) -> Dict[str, Any]:
+        try:
+            ast.parse(code)
+        except SyntaxError as e:
+            return {"code": code, "rewrites": [], "suggestions": [], "diff": "", "line_mapping": [],
+                    "error": f"Python parsing error: {e}"}
+
+        current = code
+        line_count = _count_lines(code)
+        # Orijinal -> güncel kaynak satır blokları (0 tabanlı eski, yeni, uzunluk)
+        blocks = [(0, 0, line_count)]
+        rewrites: List[Dict[str, Any]] = []
+        # Davranışı kanıtlanamayan dönüşümler uygulanmaz, öneri olarak raporlanır
+        suggestions: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        for _ in range(MAX_PASSES):
+            # Çakışan düzenlemeler bir sonraki turda yeni kaynak üzerinde tekrar denenir
+            groups, hints, new_code, pass_blocks = self._run_pass(current)
+            to_original = [(b, a, size) for a, b, size in blocks]
+            for hint in hints:
+                # Önceki turlarda düzenlenen satırlardaki öneriler üretilmiş koda aittir
+                if _map_line(to_original, hint["line"]) is not None:
+                    _to_original_line(hint, to_original)
+                    suggestions.setdefault((hint["rule"], hint["line"]), hint)
+            if not groups:
+                break
+            try:
+                ast.parse(new_code)
+            except SyntaxError:
+                break
+            for group in groups:
+                first, last = group.pop("span")
+                first_original = _map_line(to_original, first) or first
+                _to_original_line(group, to_original)
+                group["original_lines"] = [first_original, first_original + last - first]
+                rewrites.append(group)
+            blocks = _compose(blocks, pass_blocks)
+            current = new_code
+
+        applied = {(record["rule"], record["line"]) for record in rewrites}
+        for record in rewrites:
+            # Hunk'ın yeni dosyadaki başlangıcı: bir önceki değişmeyen satırdan
+            before = record["original_lines"][0] - 1
+            new_start = (_map_line(blocks, before) or before) + 1
+            record["diff"] = record["diff"].replace("+@START@", f"+{new_start}", 1)
+
+        return {
+            "code": current,
+            "rewrites": rewrites,
+            "suggestions": sorted((hint for key, hint in suggestions.items() if key not in applied),
+                                  key=lambda hint: hint["line"]),
+            "diff": _unified_diff(code, current, blocks) if rewrites else "",
+            "line_mapping": [{"original_start": a + 1, "refactored_start": b + 1, "length": size}
+                             for a, b, size in blocks if size],
+        }
+
+    def _run_pass(self, code: str):
+        src = _Source(code)
+        module = _Module(ast.parse(code))
+        accepted = _EditSet()
+        groups, hints = [], []
+
+        for group in self._collect(src, module):
+            edits = group.pop("edits", None)
+            if edits is None:
+                hints.append(group)
+                continue
+            if not accepted.can_add(edits):
+                continue
+            accepted.add(edits)
+            group.update(_describe(src, edits))
+            groups.append(group)
+
+        return groups, hints, _apply(code, accepted.edits), _edit_blocks(src, accepted.edits)
+
+    def _collect(self, src: _Source, module: _Module) -> Iterator[Dict[str, Any]]:
+        """Tüm kapsamlardaki döngüler için kuralları çalıştır"""
+        scopes = [module.tree] + [n for n in ast.walk(module.tree)
+                                  if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
+        for scope in scopes:
+            yield from self._visit_blocks(scope, src, module, loop_depth=0)
+
+    def _visit_blocks(self, node, src, module, loop_depth):
+        for block in _blocks(node):
+            for index, stmt in enumerate(block):
+                if isinstance(stmt, SCOPES):
+                    continue
+                if isinstance(stmt, LOOPS) and id(stmt) not in module.in_fstring:
+                    yield from self._range_len_to_enumerate(stmt, src, module)
+                    yield from self._string_concat_to_join(stmt, block, index, src, module)
+                    if loop_depth == 0:
+                        # Döngü dışına taşıma en dış döngü için yapılır
+                        yield from self._membership_to_set(stmt, src, module)
+                        yield from self._hoist_regex(stmt, src, module)
+                        yield from self._hoist_len(stmt, src, module)
+                    yield from self._visit_blocks(stmt, src, module, loop_depth + 1)
+                else:
+                    yield from self._visit_blocks(stmt, src, module, loop_depth)
+
+    # --- Kurallar ---------------------------------------------------------
+
+    def _range_len_to_enumerate(self, loop, src, module):
+        if not isinstance(loop, ast.For) or not isinstance(loop.target, ast.Name):
+            return
+        it = loop.iter
+        if not (isinstance(it, ast.Call) and isinstance(it.func, ast.Name) and it.func.id == "range"
+                and len(it.args) == 1 and not it.keywords):
+            return
+        inner = it.args[0]
+        if not (isinstance(inner, ast.Call) and isinstance(inner.func, ast.Name) and inner.func.id == "len"
+                and len(inner.args) == 1 and not inner.keywords and isinstance(inner.args[0], ast.Name)):
+            return
+        if module.shadowed & {"range", "len", "enumerate"}:
+            return
+
+        index_name = loop.target.id
+        seq = inner.args[0].id
+        if not module.is_readonly_name(seq) and _has_opaque_calls(loop.body, module):
+            # Döngüde çağrılan bir fonksiyon listeyi değiştirebilir
+            return
+        loads = []
+        for node in _walk_local(loop.body):
+            if id(node) in module.in_fstring:
+                return
+            if isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name) and node.value.id == seq:
+                if isinstance(node.slice, ast.Name) and node.slice.id == index_name:
+                    if not isinstance(node.ctx, ast.Load):
+                        return
+                    loads.append(node)
+            elif isinstance(node, ast.Name) and node.id in (seq, index_name) and not isinstance(node.ctx, ast.Load):
+                return
+            elif isinstance(node, ast.Name) and node.id == seq and not module.is_readonly_use(node):
+                # Liste döngüde değişebilir: enumerate'in elemanı bayatlar
+                return
+        if not loads:
+            return
+
+        # Dizin başka yerde kullanılmıyorsa yalnızca elemanlar üzerinde dön
+        load_slices = {id(node.slice) for node in loads}
+        index_used = any(isinstance(n.ctx, ast.Load) and id(n) not in load_slices
+                         for n in module.names_by_id.get(index_name, []))
+
+        replacement = 'enumerate()' if index_used else 'direct iteration'
+        if not _is_sequence(inner.args[0], module):
+            # dict gibi bir eşlemede d[i] anahtar araması, enumerate ise anahtarları verir
+            yield {
+                "rule": "range_len_to_enumerate",
+                "line": loop.lineno,
+                "message": f"Line {loop.lineno}: range(len({seq})) indexing could use {replacement} "
+                           f"if '{seq}' is a list, tuple or str (type not known, left unchanged)",
+            }
+            return
+
+        base = seq[:-1] if len(seq) > 3 and seq.endswith("s") and not seq.endswith("ss") else "item"
+        item = module.fresh_name(base)
+        target = f"{index_name}, {item}" if index_used else item
+        iterable = f"enumerate({seq})" if index_used else seq
+
+        edits = [(*src.span(loop.target), target), (*src.span(it), iterable)]
+        edits.extend((*src.span(node), item) for node in loads)
+        yield {
+            "rule": "range_len_to_enumerate",
+            "line": loop.lineno,
+            "message": f"Line {loop.lineno}: replaced range(len({seq})) indexing with {replacement}",
+            "edits": edits,
+        }
+
+    def _string_concat_to_join(self, loop, block, index, src, module):
+        if loop.orelse:
+            return
+        candidates: Dict[str, List[ast.AugAssign]] = {}
+        for node in _walk_local(loop.body):
+            if (isinstance(node, ast.AugAssign) and isinstance(node.op, ast.Add)
+                    and isinstance(node.target, ast.Name)):
+                candidates.setdefault(node.target.id, []).append(node)
+
+        for name, augs in candidates.items():
+            if name in module.declared_global or any(id(a) in module.in_fstring for a in augs):
+                continue
+            aug_targets = {id(a.target) for a in augs}
+            # Döngü içinde okunuyor ya da başka türlü atanıyorsa ara sonuç gerekir
+            if any(isinstance(n, ast.Name) and n.id == name and id(n) not in aug_targets
+                   for n in _walk_local(loop)):
+                continue
+            init = self._string_init(block[:index], name)
+            if init is None:
+                continue
+
+            parts = module.fresh_name(f"{name}_parts")
+            init_src = src.segment(init.value)
+            quote = init_src[-1] if init_src[-1] in "'\"" else '"'
+            join = f"{quote}{quote}.join({parts})"
+
+            edits = [(*src.span(aug), f"{parts}.append({src.segment(aug.value)})") for aug in augs]
+            if block[index - 1] is init and isinstance(init.value, ast.Constant) and init.value.value == "":
+                # s = "" hemen döngüden önceyse: s_parts = [] ... s = "".join(s_parts)
+                edits.append((*src.span(init), f"{parts} = []"))
+                edits.append(src.insert_after(loop, f"{name} = {join}"))
+            else:
+                edits.append(src.insert_before(loop, f"{parts} = []"))
+                edits.append(src.insert_after(loop, f"{name} += {join}"))
+            yield {
+                "rule": "string_concat_to_join",
+                "line": loop.lineno,
+                "message": f"Line {loop.lineno}: replaced repeated '{name} +=' string concatenation "
+                           f"in a loop with list append + join",
+                "edits": edits,
+            }
+
+    def _string_init(self, preceding: List[ast.stmt], name: str) -> Optional[ast.Assign]:
+        """Döngüden önce ismin str ile başlatıldığı atamayı bul"""
+        for stmt in reversed(preceding):
+            if isinstance(stmt, ast.AugAssign) and isinstance(stmt.target, ast.Name) and stmt.target.id == name:
+                if not isinstance(stmt.op, ast.Add):
+                    return None
+                continue
+            if (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1
+                    and isinstance(stmt.targets[0], ast.Name) and stmt.targets[0].id == name):
+                value = stmt.value
+                if isinstance(value, ast.Constant) and isinstance(value.value, str):
+                    return stmt
+                if isinstance(value, ast.JoinedStr):
+                    return stmt
+                return None
+            if _stores_in(stmt, name):
+                return None
+        return None
+
+    def _membership_to_set(self, loop, src, module):
+        names: Dict[str, List[ast.Name]] = {}
+        for node in _walk_local(loop):
+            if not isinstance(node, ast.Compare) or id(node) in module.in_fstring:
+                continue
+            for op, comparator in zip(node.ops, node.comparators):
+                if not isinstance(op, (ast.In, ast.NotIn)):
+                    continue
+                if (isinstance(comparator, ast.List) and len(comparator.elts) >= 3
+                        and all(_is_hashable_constant(e) for e in comparator.elts)):
+                    if not _is_hashable(_membership_operand(node, comparator), module):
+                        yield self._membership_hint(comparator.lineno, "a list literal")
+                        continue
+                    start, end = src.span(comparator)
+                    yield {
+                        "rule": "list_membership_to_set",
+                        "line": comparator.lineno,
+                        "message": f"Line {comparator.lineno}: membership test against a list literal "
+                                   f"inside a loop now uses a set literal",
+                        "edits": [(start, start + 1, "{"), (end - 1, end, "}")],
+                    }
+                elif isinstance(comparator, ast.Name):
+                    names.setdefault(comparator.id, []).append(comparator)
+
+        for name, uses in names.items():
+            definition = self._constant_list_definition(name, module)
+            if definition is None or definition.lineno >= loop.lineno:
+                continue
+            membership_only = all(
+                isinstance(module.parent(n), ast.Compare) and n in module.parent(n).comparators
+                and isinstance(module.parent(n).ops[module.parent(n).comparators.index(n)], (ast.In, ast.NotIn))
+                for n in module.names_by_id[name] if isinstance(n.ctx, ast.Load)
+            )
+            # Set'e çevrilen her üyelik testinin sol tarafı hashable olmalı (yoksa TypeError)
+            checked = [n for n in module.names_by_id[name] if isinstance(n.ctx, ast.Load)] \
+                if membership_only else uses
+            if not all(_is_hashable(_membership_operand(module.parent(n), n), module) for n in checked):
+                yield self._membership_hint(loop.lineno, f"list '{name}'")
+                continue
+            if membership_only:
+                # Liste yalnızca üyelik testinde kullanılıyor: tanımı set yap
+                start, end = src.span(definition.value)
+                edits = [(start, start + 1, "{"), (end - 1, end, "}")]
+                message = f"Line {definition.lineno}: '{name}' is only used for membership tests; defined as a set"
+            else:
+                lookup = module.fresh_name(f"{name}_set")
+                edits = [src.insert_before(loop, f"{lookup} = set({name})")]
+                edits.extend((*src.span(n), lookup) for n in uses)
+                message = f"Line {loop.lineno}: membership tests on list '{name}' inside the loop use a set"
+            yield {"rule": "list_membership_to_set", "line": loop.lineno, "message": message, "edits": edits}
+
+    def _membership_hint(self, line: int, target: str) -> Dict[str, Any]:
+        return {
+            "rule": "list_membership_to_set",
+            "line": line,
+            "message": f"Line {line}: membership tests on {target} inside the loop could use a set "
+                       f"if the tested values are hashable (not known, left unchanged)",
+        }
+
+    def _constant_list_definition(self, name: str, module: _Module) -> Optional[ast.Assign]:
+        if not module.is_readonly_name(name, single_store=True):
+            return None
+        store = next(n for n in module.names_by_id[name] if not isinstance(n.ctx, ast.Load))
+        stmt = module.parent(store)
+        if (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and stmt.targets[0] is store
+                and isinstance(stmt.value, ast.List) and len(stmt.value.elts) >= 3
+                and all(_is_hashable_constant(e) for e in stmt.value.elts)):
+            return stmt
+        return None
+
+    def _hoist_regex(self, loop, src, module):
+        if not module.imports_re or "re" in module.shadowed:
+            return
+        hoisted: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for node in _walk_local(loop):
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and isinstance(node.func.value, ast.Name) and node.func.value.id == "re"):
+                continue
+            if id(node) in module.in_fstring or not node.args:
+                continue
+            pattern = node.args[0]
+            if not (isinstance(pattern, ast.Constant) and isinstance(pattern.value, (str, bytes))):
+                continue
+            try:
+                # Geçersiz desen döngüden önce hata vermesin
+                re.compile(pattern.value)
+            except re.error:
+                continue
+            func = node.func.attr
+            if func == "compile":
+                if len(node.args) > 2 or node.keywords and any(k.arg != "flags" for k in node.keywords):
+                    continue
+                flags = node.args[1] if len(node.args) == 2 else next((k.value for k in node.keywords), None)
+                rest = None
+            elif func in RE_FUNCTIONS:
+                if len(node.args) > RE_FUNCTIONS[func] or any(k.arg is None for k in node.keywords):
+                    continue
+                flags = next((k.value for k in node.keywords if k.arg == "flags"), None)
+                rest = [src.segment(a) for a in node.args[1:]]
+                rest += [f"{k.arg}={src.segment(k.value)}" for k in node.keywords if k.arg != "flags"]
+            else:
+                continue
+            if flags is not None and not self._is_invariant_flag(flags):
+                continue
+
+            key = (src.segment(pattern), src.segment(flags) if flags is not None else "")
+            entry = hoisted.get(key)
+            if entry is None:
+                compiled = f"re.compile({key[0]}{', ' + key[1] if key[1] else ''})"
+                entry = hoisted[key] = {"name": module.fresh_name("pattern"), "compiled": compiled, "edits": []}
+            replacement = entry["name"] if rest is None else f"{entry['name']}.{func}({', '.join(rest)})"
+            entry["edits"].append((*src.span(node), replacement))
+
+        for entry in hoisted.values():
+            yield {
+                "rule": "hoist_regex_compile",
+                "line": loop.lineno,
+                "message": f"Line {loop.lineno}: compiled constant regex once before the loop "
+                           f"({entry['name']} = {entry['compiled']})",
+                "edits": [src.insert_before(loop, f"{entry['name']} = {entry['compiled']}")] + entry["edits"],
+            }
+
+    def _is_invariant_flag(self, node) -> bool:
+        if isinstance(node, ast.Constant):
+            return True
+        if isinstance(node, ast.Attribute):
+            return isinstance(node.value, ast.Name) and node.value.id == "re"
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+            return self._is_invariant_flag(node.left) and self._is_invariant_flag(node.right)
+        return False
+
+    def _hoist_len(self, loop, src, module):
+        # Yalnızca while: koşul en az bir kez değerlendirildiğinden len() döngü öncesine
+        # taşındığında yeni bir hata yolu açılmaz
+        if not isinstance(loop, ast.While) or "len" in module.shadowed:
+            return
+        calls: Dict[str, List[ast.Call]] = {}
+        for node in _walk_local([loop.test] + loop.body):
+            if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "len"
+                    and len(node.args) == 1 and not node.keywords and isinstance(node.args[0], ast.Name)
+                    and id(node) not in module.in_fstring):
+                calls.setdefault(node.args[0].id, []).append(node)
+
+        in_test = {id(n) for n in _walk_local(loop.test)}
+        for name, nodes in calls.items():
+            if not any(id(n) in in_test for n in nodes):
+                continue
+            if _stores_in(loop, name) or not module.is_readonly_name(name):
+                continue
+            if any(not isinstance(n.ctx, ast.Load) and n.lineno >= loop.lineno
+                   for n in module.names_by_id[name]):
+                continue
+            hoisted = module.fresh_name(f"{name}_len")
+            edits = [src.insert_before(loop, f"{hoisted} = len({name})")]
+            edits.extend((*src.span(n), hoisted) for n in nodes)
+            yield {
+                "rule": "hoist_loop_invariant_call",
+                "line": loop.lineno,
+                "message": f"Line {loop.lineno}: hoisted loop-invariant len({name}) out of the loop",
+                "edits": edits,
+            }
+
+
+# --- Düzenleme yardımcıları ------------------------------------------------
+
+class _EditSet:
+    """Çakışmayan düzenlemeler; çakışma kontrolü bisect ile O(log n)"""
+
+    def __init__(self):
+        self.edits: List[Tuple[int, int, str]] = []
+        self._ranges: List[Tuple[int, int]] = []  # sıralı, çakışmasız değiştirmeler
+        self._inserts: List[int] = []  # sıralı ekleme noktaları
+
+    def _conflicts(self, start: int, end: int) -> bool:
+        index = bisect.bisect_left(self._ranges, (end, end)) if end > start else \
+            bisect.bisect_left(self._ranges, (start, start))
+        if index and self._ranges[index - 1][1] > start:
+            return True
+        if end > start:
+            i = bisect.bisect_right(self._inserts, start)
+            return i < len(self._inserts) and self._inserts[i] < end
+        return False
+
+    def can_add(self, edits: List[Tuple[int, int, str]]) -> bool:
+        probe = _EditSet()
+        for start, end, _ in edits:
+            # Grubun kendi düzenlemeleri de birbiriyle çakışmamalı
+            if self._conflicts(start, end) or probe._conflicts(start, end):
+                return False
+            probe._insert(start, end)
+        return True
+
+    def _insert(self, start: int, end: int):
+        if end > start:
+            bisect.insort(self._ranges, (start, end))
+        else:
+            bisect.insort(self._inserts, start)
+
+    def add(self, edits: List[Tuple[int, int, str]]):
+        for start, end, text in edits:
+            self._insert(start, end)
+            self.edits.append((start, end, text))
+
+
+def _apply(code: str, edits: List[Tuple[int, int, str]]) -> str:
+    # Aynı noktadaki eklemeler, o noktadan başlayan değiştirmeden önce gelir
+    ordered = sorted(enumerate(edits), key=lambda item: (item[1][0], item[1][0] != item[1][1], item[0]))
+    out, cursor = [], 0
+    for _, (start, end, text) in ordered:
+        out.append(code[cursor:start])
+        out.append(text)
+        cursor = max(cursor, end)
+    out.append(code[cursor:])
+    return "".join(out)
+
+
+def _describe(src: _Source, edits: List[Tuple[int, int, str]]) -> Dict[str, Any]:
+    """Bir kuralın düzenlemeleri için yerel unified diff hunk'ı"""
+    first = min(src.line_of(start) for start, _, _ in edits)
+    last = max(src.line_of(max(start, end - 1)) for start, end, _ in edits)
+    region_start, region_end = src.starts[first - 1], src.starts[last]
+    shifted = [(s - region_start, e - region_start, t) for s, e, t in edits]
+    old = src.code[region_start:region_end].splitlines()
+    new = _apply(src.code[region_start:region_end], shifted).splitlines()
+
+    hunk = [f"@@ -{first},{len(old)} +@START@,{len(new)} @@\n"]
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old, new, autojunk=False).get_opcodes():
+        if tag == "equal":
+            hunk.extend(f" {line}\n" for line in old[i1:i2])
+            continue
+        hunk.extend(f"-{line}\n" for line in old[i1:i2])
+        hunk.extend(f"+{line}\n" for line in new[j1:j2])
+    return {"diff": "".join(hunk), "span": (first, last)}
+
+
+def _count_lines(text: str) -> int:
+    return text.count("\n") + (1 if text and not text.endswith("\n") else 0)
+
+
+def _edit_blocks(src: _Source, edits: List[Tuple[int, int, str]]) -> List[Tuple[int, int, int]]:
+    """Düzenlemelerden değişmeyen satır bloklarını hesapla (difflib gerekmez)"""
+    regions: List[List] = []  # [ilk satır, son satır, düzenlemeler]; son < ilk: saf ekleme
+    for edit in sorted(edits, key=lambda e: (e[0], e[1])):
+        start, end, _ = edit
+        first = src.line_of(start)
+        if start == end and start == src.starts[first - 1]:
+            last = first - 1
+        else:
+            last = src.line_of(max(start, end - 1))
+        if regions and first <= regions[-1][1]:
+            regions[-1][1] = max(regions[-1][1], last)
+            regions[-1][2].append(edit)
+        else:
+            regions.append([first, last, [edit]])
+
+    blocks, old_line, new_line = [], 1, 1
+    for first, last, region_edits in regions:
+        region_start, region_end = src.starts[first - 1], src.starts[last]
+        shifted = [(s - region_start, e - region_start, t) for s, e, t in region_edits]
+        new_count = _count_lines(_apply(src.code[region_start:region_end], shifted))
+        unchanged = first - old_line
+        if unchanged > 0:
+            blocks.append((old_line - 1, new_line - 1, unchanged))
+        new_line += unchanged + new_count
+        old_line = last + 1
+    total = _count_lines(src.code)
+    if total - old_line + 1 > 0:
+        blocks.append((old_line - 1, new_line - 1, total - old_line + 1))
+    return blocks
+
+
+def _to_original_line(record: Dict[str, Any], to_original):
+    """Kaydın satırını (ve mesajdaki satırı) orijinal koda çevir"""
+    line = _map_line(to_original, record["line"]) or record["line"]
+    record["message"] = record["message"].replace(f"Line {record['line']}:", f"Line {line}:", 1)
+    record["line"] = line
+
+
+def _map_line(blocks, line: int) -> Optional[int]:
+    """1 tabanlı satırı eşleşen bloklar üzerinden karşı tarafa çevir"""
+    index = bisect.bisect_right(blocks, line - 1, key=lambda block: block[0]) - 1
+    if index >= 0:
+        a, b, size = blocks[index]
+        if a < line <= a + size:
+            return b + (line - a)
+    return None
+
+
+def _compose(first, second) -> List[Tuple[int, int, int]]:
+    """A->B ve B->C bloklarından A->C blokları"""
+    composed = []
+    for a, b, size in first:
+        for b2, c, size2 in second:
+            low, high = max(b, b2), min(b + size, b2 + size2)
+            if low < high:
+                composed.append((a + low - b, c + low - b2, high - low))
+    return composed
+
+
+def _unified_diff(old: str, new: str, blocks, context: int = 3) -> str:
+    """Bilinen satır bloklarından unified diff üret"""
+    old_lines, new_lines = old.splitlines(keepends=True), new.splitlines(keepends=True)
+    opcodes, i, j = [], 0, 0
+    for a, b, size in list(blocks) + [(len(old_lines), len(new_lines), 0)]:
+        if i < a or j < b:
+            tag = "replace" if i < a and j < b else ("delete" if i < a else "insert")
+            opcodes.append((tag, i, a, j, b))
+        if size:
+            opcodes.append(("equal", a, a + size, b, b + size))
+        i, j = a + size, b + size
+
+    out = ["--- original.py\n", "+++ refactored.py\n"]
+    for group in _KnownOpcodes(opcodes).get_grouped_opcodes(context):
+        i1, i2, j1, j2 = group[0][1], group[-1][2], group[0][3], group[-1][4]
+        out.append(f"@@ -{_format_range(i1, i2 - i1)} +{_format_range(j1, j2 - j1)} @@\n")
+        for tag, a1, a2, b1, b2 in group:
+            if tag == "equal":
+                out.extend(" " + line for line in old_lines[a1:a2])
+                continue
+            out.extend("-" + line for line in old_lines[a1:a2])
+            out.extend("+" + line for line in new_lines[b1:b2])
+    return "".join(line if line.endswith("\n") else line + "\n" for line in out)
+
+
+def _format_range(start: int, length: int) -> str:
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+class _KnownOpcodes(difflib.SequenceMatcher):
+    """Opcode'ları önceden bilinen matcher (yalnızca gruplama için)"""
+
+    def __init__(self, opcodes):
+        super().__init__(None, [], [])
+        self._known = opcodes
+
+    def get_opcodes(self):
+        return self._known
+
+
+def optimize_python(code: str) -> Dict[str, Any]:
+    return PerformanceRewriter().rewrite(code)
@@ -0,0 +1,145 @@
+import math
+import random
+from typing import Dict, List, Optional, Sequence
+
+
+def quantile(samples: Sequence[float], q: float) -> float:
+    """Doğrusal enterpolasyonlu kantil (numpy 'linear' yöntemiyle aynı)"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def median(samples: Sequence[float]) -> float:
+    return quantile(samples, 0.5)
+
+
+def describe(samples: Sequence[float]) -> Dict[str, float]:
+    """Zaman örnekleri için sağlam özet: medyan, IQR, min"""
+    q1, q3 = quantile(samples, 0.25), quantile(samples, 0.75)
+    return {
+        "samples": len(samples),
+        "min": min(samples) if samples else 0.0,
+        "median": median(samples),
+        "q1": q1,
+        "q3": q3,
+        "iqr": q3 - q1,
+        "mean": sum(samples) / len(samples) if samples else 0.0,
+    }
+
+
+def bootstrap_ratio(baseline: Sequence[float], candidate: Sequence[float], confidence: float = 0.95,
+                    iterations: int = 2000, seed: Optional[int] = 0) -> Dict[str, float]:
+    """median(baseline) / median(candidate) oranı ve bootstrap güven aralığı"""
+    rng = random.Random(seed)
+    ratios: List[float] = []
+    for _ in range(iterations):
+        a = median(rng.choices(baseline, k=len(baseline)))
+        b = median(rng.choices(candidate, k=len(candidate)))
+        if b > 0:
+            ratios.append(a / b)
+    candidate_median = median(candidate)
+    alpha = (1 - confidence) / 2
+    return {
+        "ratio": median(baseline) / candidate_median if candidate_median > 0 else float("inf"),
+        "low": quantile(ratios, alpha),
+        "high": quantile(ratios, 1 - alpha),
+        "confidence": confidence,
+    }
+
+
+# Basitten karmaşığa; hataları yakın modeller arasında basit olan seçilir
+COMPLEXITY_MODELS = [
+    ("O(1)", lambda n: 1.0),
+    ("O(log n)", lambda n: math.log2(max(n, 2))),
+    ("O(n)", lambda n: float(n)),
+    ("O(n log n)", lambda n: n * math.log2(max(n, 2))),
+    ("O(n^2)", lambda n: float(n) ** 2),
+]
+# Üstel model c^n: taban bu aralıkta taranır (ör. özyinelemeli fibonacci için c ≈ 1.618)
+EXPONENTIAL_BASES = [1.1 * (3.0 / 1.1) ** (i / 59) for i in range(60)]
+
+
+def _fit_exponential(sizes: Sequence[float], times: Sequence[float]) -> Optional[Dict[str, float]]:
+    if max(sizes) * math.log(EXPONENTIAL_BASES[-1]) > 700:
+        # Bu boyutlarda üstel bir fonksiyon zaten ölçülemezdi
+        return None
+    best = None
+    for base in EXPONENTIAL_BASES:
+        fit = _fit_model(sizes, times, lambda n, base=base: base ** n)
+        if fit is not None and (best is None or fit["error"] < best["error"]):
+            best = dict(fit, base=base)
+    return best
+
+
+def _fit_model(sizes: Sequence[float], times: Sequence[float], func) -> Optional[Dict[str, float]]:
+    """t ≈ a + b·f(n) ağırlıklı en küçük kareler (ağırlık 1/t²: göreli hata)"""
+    features = [func(n) for n in sizes]
+    weights = [1.0 / (t * t) for t in times]
+    s_w = sum(weights)
+    s_f = sum(w * f for w, f in zip(weights, features))
+    s_ff = sum(w * f * f for w, f in zip(weights, features))
+    s_t = sum(w * t for w, t in zip(weights, times))
+    s_ft = sum(w * f * t for w, f, t in zip(weights, features, times))
+
+    det = s_w * s_ff - s_f * s_f
+    a, b = s_t / s_w, 0.0
+    if det > 1e-12 * s_w * s_ff:
+        b = (s_w * s_ft - s_f * s_t) / det
+        a = (s_t - b * s_f) / s_w
+        if a < 0:
+            # Negatif sabit anlamsız: orijinden geçen doğru
+            a, b = 0.0, s_ft / s_ff
+        if b < 0:
+            a, b = s_t / s_w, 0.0
+
+    residuals = [(a + b * f - t) / t for f, t in zip(features, times)]
+    return {
+        "constant": a,
+        "coefficient": b,
+        "error": math.sqrt(sum(r * r for r in residuals) / len(residuals)),
+        "residuals": residuals,
+    }
+
+
+def fit_complexity(sizes: Sequence[float], times: Sequence[float], tolerance: float = 0.05) -> Dict:
+    """Ölçümleri karmaşıklık modellerine uydur, en iyi modeli ve göreli artıkları döndür"""
+    if len(sizes) < 4:
+        return {"best_fit": None, "reason": "insufficient_data", "models": []}
+
+    models = []
+    for name, func in COMPLEXITY_MODELS:
+        fit = _fit_model(sizes, times, func)
+        if fit is not None:
+            models.append(dict(fit, model=name))
+    exponential = _fit_exponential(sizes, times)
+    if exponential is not None:
+        models.append(dict(exponential, model="O(2^n)"))
+
+    lowest = min(model["error"] for model in models)
+    # Hatası en iyiye çok yakın olan en basit model
+    best = next(model for model in models if model["error"] <= lowest * (1 + tolerance) + 1e-3)
+    ranked = sorted(models, key=lambda model: model["error"])
+    runner_up = next((model for model in ranked if model is not best), None)
+
+    # Log-log eğim: büyük boyutlardaki yerel polinom derecesi
+    half = len(sizes) // 2
+    xs = [math.log(n) for n in sizes[half:]]
+    ys = [math.log(t) for t in times[half:]]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread if spread else 0.0
+
+    return {
+        "best_fit": best["model"],
+        "ambiguous": runner_up is not None and runner_up["error"] <= best["error"] * 1.25 + 1e-3,
+        "runner_up": runner_up["model"] if runner_up else None,
+        "loglog_slope": slope,
+        "residuals": [{"size": n, "relative_residual": r} for n, r in zip(sizes, best["residuals"])],
+        "models": [{key: model[key] for key in ("model", "constant", "coefficient", "error", "base")
+                    if key in model} for model in ranked],
+    }
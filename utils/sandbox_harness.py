@@ -0,0 +1,519 @@
+"""Sandbox ölçüm düzeneği.
+
+DemoRunner tarafından ayrı bir süreçte çalıştırılır: stdin'den JSON yük okur,
+kullanıcı kodunu çalıştırıp ölçer ve sonucu stdout'a tek satır JSON olarak yazar.
+Kullanıcı kodunun çıktısı yakalanır, böylece stdout'taki JSON bozulmaz.
+"""
+import base64
+import builtins
+import cProfile
+import io
+import json
+import marshal
+import math
+import os
+import pstats
+import random
+import signal
+import string
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+
+# Tek bir örneğin hedef süresi; kısa kodlar bu süreyi dolduracak kadar tekrar edilir
+DEFAULT_MIN_SAMPLE_TIME = 0.02
+MAX_NUMBER = 10000
+SNIPPET = "<snippet>"
+MAX_PROFILE_ROWS = 40
+MIN_SNAPSHOT_BYTES = 64 * 1024
+HARNESS_CALLS = {"<built-in method builtins.exec>", "<method 'disable' of '_lsprof.Profiler' objects>"}
+
+
+def run_once(code_obj, stdin_text, start_hook=None, stop_hook=None):
+    """Kodu temiz bir modül ortamında bir kez çalıştır; (çıktı, hata, süre) döndürür.
+
+    start_hook/stop_hook ölçüm araçlarını (profiler, tracer) yalnızca kullanıcı kodu
+    çalışırken açıp kapatmak için kullanılır.
+    """
+    namespace = {"__name__": "__main__", "__builtins__": builtins}
+    stdout, stdin = io.StringIO(), io.StringIO(stdin_text or "")
+    real_stdout, real_stdin = sys.stdout, sys.stdin
+    sys.stdout, sys.stdin = stdout, stdin
+    error = None
+    start = time.perf_counter()
+    try:
+        if start_hook:
+            start_hook()
+        exec(code_obj, namespace)
+    except SystemExit as e:
+        # sys.exit(0)/sys.exit() normal bitiş; diğer kodlar hata sayılır
+        if e.code not in (None, 0):
+            error = f"SystemExit: {e.code}"
+    except CallTimeout:
+        # Zaman aşımı kullanıcı hatası değil; çağıran karar verir
+        raise
+    except BaseException:
+        error = user_traceback()
+    finally:
+        if stop_hook:
+            stop_hook()
+        elapsed = time.perf_counter() - start
+        sys.stdout, sys.stdin = real_stdout, real_stdin
+    return stdout.getvalue(), error, elapsed
+
+
+def user_traceback():
+    """Şu an işlenen istisnanın traceback'i; düzeneğin kendi çerçeveleri atılır"""
+    exc_type, exc, tb = sys.exc_info()
+    user_tb = tb
+    while user_tb is not None and user_tb.tb_frame.f_code.co_filename != SNIPPET:
+        user_tb = user_tb.tb_next
+    return "".join(traceback.format_exception(exc_type, exc, user_tb or tb))
+
+
+def compile_snippet(payload):
+    # Sunucu kodu bir kez derleyip marshal edilmiş bytecode gönderebilir
+    if payload.get("bytecode"):
+        return marshal.loads(base64.b64decode(payload["bytecode"]))
+    return compile(payload["code"], SNIPPET, "exec")
+
+
+def run_benchmark(payload):
+    """Varyantları dönüşümlü çalıştırarak örnek başına ortalama süreleri topla"""
+    stdin_text = payload.get("stdin")
+    warmup = max(0, int(payload.get("warmup", 1)))
+    repeat = max(1, int(payload.get("repeat", 7)))
+    min_sample_time = float(payload.get("min_sample_time", DEFAULT_MIN_SAMPLE_TIME))
+    deadline = time.perf_counter() + float(payload.get("time_budget", 8.0))
+
+    variants = []
+    for index, code in enumerate(payload["variants"]):
+        result = {"output": "", "error": None, "samples": [], "number": 1}
+        variants.append(result)
+        try:
+            result["code"] = compile(code, f"<variant-{index}>", "exec")
+        except SyntaxError:
+            result["error"] = traceback.format_exc(limit=0)
+            continue
+        # İlk çalıştırma: çıktı karşılaştırması ve döngü sayısının kalibrasyonu
+        output, error, elapsed = run_once(result["code"], stdin_text)
+        result["output"], result["error"] = output, error
+        for _ in range(warmup):
+            elapsed = run_once(result["code"], stdin_text)[2]
+        result["number"] = max(1, min(MAX_NUMBER, math.ceil(min_sample_time / max(elapsed, 1e-9))))
+
+    runnable = [v for v in variants if v["error"] is None]
+    for round_index in range(repeat):
+        # Bütçe aşılsa da her varyant için en az 3 örnek topla
+        if round_index >= 3 and time.perf_counter() > deadline:
+            break
+        for variant in runnable:
+            total = 0.0
+            for _ in range(variant["number"]):
+                total += run_once(variant["code"], stdin_text)[2]
+            variant["samples"].append(total / variant["number"])
+
+    for variant in variants:
+        variant.pop("code", None)
+    return {"variants": variants}
+
+
+def _frame_label(code):
+    if code.co_filename == SNIPPET:
+        return f"{code.co_name}:{code.co_firstlineno}"
+    return f"{code.co_name} ({os.path.basename(code.co_filename)})"
+
+
+class StackSampler:
+    """Ana iş parçacığının yığınını aralıklarla örnekleyip collapsed-stack sayaçları tutar"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.counts = {}
+        self._target = threading.get_ident()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        # Örnekleyici iş parçacığı GIL'i sık alabilsin
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            sys.setswitchinterval(self._switch_interval)
+
+    def _run(self):
+        while self._running:
+            time.sleep(self.interval)
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            # Düzeneğin kendi çerçevelerini at: yığın kullanıcı kodunun modül seviyesinden başlar
+            for index in range(len(stack) - 1, -1, -1):
+                if stack[index].co_filename == SNIPPET:
+                    labels = [_frame_label(code) for code in reversed(stack[:index + 1])]
+                    key = ";".join(labels)
+                    self.counts[key] = self.counts.get(key, 0) + 1
+                    break
+
+
+class LineTimer:
+    """Tek bir fonksiyonun satır bazında isabet ve sürelerini ölçer (line_profiler benzeri).
+
+    Bir satırın süresi oradan yapılan çağrıları içerir; ancak aynı fonksiyona yapılan
+    özyinelemeli çağrıların süresi düşülür, aksi halde toplam süre katlanarak şişer.
+    """
+
+    def __init__(self, target_name, target_line):
+        self.target_name = target_name
+        self.target_line = target_line
+        self.lines = {}
+        # çerçeve -> [satır, satırın başlangıcı, iç içe hedef çağrılarda geçen süre]
+        self._current = {}
+        self._entered = {}
+
+    def start(self):
+        sys.settrace(self._global_trace)
+
+    def stop(self):
+        sys.settrace(None)
+
+    def _global_trace(self, frame, event, arg):
+        code = frame.f_code
+        if event == "call" and code.co_filename == SNIPPET and code.co_firstlineno == self.target_line \
+                and code.co_name == self.target_name:
+            self._entered[frame] = time.perf_counter()
+            return self._local_trace
+        return None
+
+    def _local_trace(self, frame, event, arg):
+        now = time.perf_counter()
+        current = self._current.get(frame)
+        if current is not None:
+            line, started, nested = current
+            hits, total = self.lines.get(line, (0, 0.0))
+            self.lines[line] = (hits + 1, total + now - started - nested)
+        if event != "return":
+            self._current[frame] = [frame.f_lineno, time.perf_counter(), 0.0]
+            return self._local_trace
+
+        self._current.pop(frame, None)
+        elapsed = now - self._entered.pop(frame, now)
+        caller = frame.f_back
+        while caller is not None and caller not in self._current:
+            caller = caller.f_back
+        if caller is not None:
+            self._current[caller][2] += elapsed
+        return self._local_trace
+
+
+def _profile_rows(profiler):
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, name), (primitive, calls, self_time, cumulative, _) in stats.stats.items():
+        # Düzeneğin kendi çağrıları (exec, profiler.disable) tabloya girmez
+        if filename == __file__ or name in HARNESS_CALLS:
+            continue
+        rows.append({
+            "function": name,
+            "file": filename if filename in (SNIPPET, "~") else os.path.basename(filename),
+            "line": line,
+            "calls": calls,
+            "primitive_calls": primitive,
+            "self_time": self_time,
+            "cumulative_time": cumulative,
+            "per_call": cumulative / calls if calls else 0.0,
+            "user_code": filename == SNIPPET,
+        })
+    rows.sort(key=lambda row: row["cumulative_time"], reverse=True)
+    return rows
+
+
+def run_profile(payload):
+    """cProfile tablosu + örneklemeli collapsed-stack verisi (+ isteğe bağlı satır süreleri)"""
+    code_obj = compile_snippet(payload)
+    stdin_text = payload.get("stdin")
+    profiler = cProfile.Profile()
+    sampler = StackSampler(float(payload.get("sample_interval", 0.001)))
+
+    def start():
+        sampler.start()
+        profiler.enable()
+
+    def stop():
+        profiler.disable()
+        sampler.stop()
+
+    output, error, elapsed = run_once(code_obj, stdin_text, start, stop)
+    rows = _profile_rows(profiler)
+    result = {
+        "output": output,
+        "error": error,
+        "wall_time": elapsed,
+        "functions": rows[:MAX_PROFILE_ROWS],
+        "total_functions": len(rows),
+        "sample_interval": sampler.interval,
+        "stacks": [{"stack": stack, "samples": count}
+                   for stack, count in sorted(sampler.counts.items(), key=lambda item: -item[1])],
+        "line_timings": None,
+    }
+
+    # En çok öz süre harcayan kullanıcı fonksiyonu (modül gövdesi hariç)
+    hottest = max((row for row in rows if row["user_code"] and row["function"] != "<module>"),
+                  key=lambda row: row["self_time"], default=None)
+    if payload.get("line_profile") and hottest is not None:
+        timer = LineTimer(hottest["function"], hottest["line"])
+        run_once(code_obj, stdin_text, timer.start, timer.stop)
+        source = payload["code"].split("\n")
+        result["line_timings"] = {
+            "function": hottest["function"],
+            "line": hottest["line"],
+            "lines": [{"line": line, "hits": hits, "time": total,
+                       "source": source[line - 1] if 0 < line <= len(source) else ""}
+                      for line, (hits, total) in sorted(timer.lines.items())],
+        }
+    return result
+
+
+class PeakSnapshotter:
+    """tracemalloc'u açıp yeni bir tepe görüldükçe anlık görüntü alır.
+
+    tracemalloc yalnızca tepe değerini tutar, tepe anındaki ayırma yerlerini değil;
+    izlenen bellek son görüntüden %25 fazla arttığında yeni görüntü alınır (görüntü
+    almak canlı blok sayısıyla orantılı maliyetlidir, bu yüzden adımlar seyrek tutulur).
+    """
+
+    def __init__(self, interval, nframes):
+        self.interval = interval
+        self.nframes = nframes
+        self.peak_snapshot = None
+        self.final_snapshot = None
+        self._peak_at_snapshot = 0
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        tracemalloc.start(self.nframes)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._thread.join()
+        current, peak = tracemalloc.get_traced_memory()
+        self._maybe_snapshot(current)
+        self.final_snapshot = tracemalloc.take_snapshot()
+        self.current, self.peak = current, peak
+        tracemalloc.stop()
+
+    def _maybe_snapshot(self, current):
+        if current > max(self._peak_at_snapshot * 1.25, MIN_SNAPSHOT_BYTES):
+            self.peak_snapshot = tracemalloc.take_snapshot()
+            self._peak_at_snapshot = current
+
+    def _run(self):
+        while self._running:
+            time.sleep(self.interval)
+            self._maybe_snapshot(tracemalloc.get_traced_memory()[0])
+
+
+def _allocation_sites(snapshot, source, limit):
+    """Ayırmaları kullanıcı kodundaki en içteki satıra göre grupla"""
+    sites = {}
+    # Aynı traceback'e sahip izler gruplanmış gelir; tek tek izlerde dolaşmaktan çok daha hızlı
+    for stat in snapshot.statistics("traceback"):
+        line = None
+        for frame in reversed(stat.traceback):
+            if frame.filename == SNIPPET:
+                line = frame.lineno
+                break
+        size, count = sites.get(line, (0, 0))
+        sites[line] = (size + stat.size, count + stat.count)
+    rows = [{"line": line,
+             "source": source[line - 1].strip() if line and 0 < line <= len(source) else "(runtime)",
+             "size_bytes": size, "count": count}
+            for line, (size, count) in sites.items()]
+    rows.sort(key=lambda row: row["size_bytes"], reverse=True)
+    return rows[:limit]
+
+
+def run_memory(payload):
+    """tracemalloc ile tepe bellek, satır bazında ayırma yerleri ve blok sayıları"""
+    code_obj = compile_snippet(payload)
+    snapshotter = PeakSnapshotter(float(payload.get("sample_interval", 0.005)), int(payload.get("nframes", 8)))
+    output, error, elapsed = run_once(code_obj, payload.get("stdin"), snapshotter.start, snapshotter.stop)
+    source = payload["code"].split("\n")
+    limit = int(payload.get("top", 10))
+    peak_snapshot = snapshotter.peak_snapshot or snapshotter.final_snapshot
+    return {
+        "output": output,
+        "error": error,
+        "wall_time": elapsed,
+        "memory": {
+            "peak_bytes": snapshotter.peak,
+            "final_bytes": snapshotter.current,
+            "allocation_count": len(peak_snapshot.traces),
+            "top_allocations": _allocation_sites(peak_snapshot, source, limit),
+            "live_at_exit": _allocation_sites(snapshotter.final_snapshot, source, limit),
+        },
+    }
+
+
+class CallTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise CallTimeout()
+
+
+def make_input(spec, size, rng, namespace):
+    """Girdi tanımından verilen boyutta tek bir argüman üret"""
+    kind = spec.get("kind", "list")
+    if kind == "int":
+        return size
+    if kind == "list":
+        return [rng.randint(0, size) for _ in range(size)]
+    if kind == "sorted_list":
+        return sorted(rng.randint(0, size) for _ in range(size))
+    if kind == "str":
+        return "".join(rng.choice(string.ascii_lowercase) for _ in range(size))
+    if kind == "dict":
+        return {i: rng.randint(0, size) for i in range(size)}
+    if kind == "generator":
+        # Kullanıcının kendi üreticisi: gen(n) -> argüman
+        return namespace[spec["generator"]](size)
+    raise ValueError(f"Unknown input kind: {kind}")
+
+
+def _time_calls(func, inputs):
+    # Ayrı fonksiyon: döngü değişkeni önceki girdiyi tutmaz, büyük girdilerin serbest
+    # bırakılma süresi ölçüme karışmaz
+    start = time.perf_counter()
+    for argument in inputs:
+        func(argument)
+    return time.perf_counter() - start
+
+
+def run_complexity(payload):
+    """Fonksiyonu artan girdi boyutlarında ölç; her boyut için en iyi çağrı süresi"""
+    namespace = {"__name__": "__snippet__", "__builtins__": builtins}
+    stdout = io.StringIO()
+    real_stdout = sys.stdout
+    sys.stdout = stdout
+    try:
+        exec(compile_snippet(payload), namespace)
+    except BaseException:
+        return {"error": user_traceback()}
+    finally:
+        sys.stdout = real_stdout
+    func = namespace.get(payload["function"])
+    if not callable(func):
+        return {"error": f"Function '{payload['function']}' not found in code"}
+
+    spec = payload.get("input", {})
+    rng = random.Random(spec.get("seed", 0))
+    repeat = max(1, int(payload.get("repeat", 3)))
+    min_sample_time = float(payload.get("min_sample_time", 0.005))
+    per_call_limit = float(payload.get("per_call_limit", 1.0))
+    deadline = time.perf_counter() + float(payload.get("time_budget", 8.0))
+    signal.signal(signal.SIGALRM, _raise_timeout)
+
+    points, stopped = [], None
+    for size in payload["sizes"]:
+        if time.perf_counter() > deadline:
+            stopped = "time_budget"
+            break
+        sys.stdout = stdout
+        # Tek bir yavaş çağrı (ör. üstel algoritma) tüm bütçeyi yiyemesin
+        signal.setitimer(signal.ITIMER_REAL, per_call_limit * (repeat + 1))
+        try:
+            argument = make_input(spec, size, rng, namespace)
+            first = _time_calls(func, [argument])
+            number = max(1, min(MAX_NUMBER, math.ceil(min_sample_time / max(first, 1e-9))))
+            samples = []
+            for _ in range(repeat):
+                # Girdiler önceden üretilir, üretim süresi ölçüme girmez. Girdisini yerinde
+                # değiştiren fonksiyonlar ("mutates") her çağrıda taze girdi alır.
+                if spec.get("mutates"):
+                    inputs = [make_input(spec, size, rng, namespace) for _ in range(number)]
+                else:
+                    inputs = [argument] * number
+                samples.append(_time_calls(func, inputs) / number)
+                del inputs
+        except CallTimeout:
+            stopped = "call_timeout"
+            break
+        except Exception:
+            return {"error": user_traceback(), "points": points}
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            sys.stdout = real_stdout
+        samples.sort()
+        points.append({"size": size, "time": samples[0], "median": samples[len(samples) // 2],
+                       "number": number})
+        if samples[0] > per_call_limit:
+            stopped = "call_limit"
+            break
+
+    return {"points": points, "stopped": stopped, "output": stdout.getvalue()[:10000]}
+
+
+def run_code(payload):
+    """Tek çalıştırma (/api/demo/run): önceden derlenmiş bytecode'u çalıştır"""
+    output, error, elapsed = run_once(compile_snippet(payload), payload.get("stdin"))
+    return {"output": output, "error": error, "wall_time": elapsed}
+
+
+def run_batch(payload):
+    """Aynı derlenmiş kodu her stdin durumu için temiz bir modül ortamında çalıştır"""
+    code_obj = compile_snippet(payload)
+    case_timeout = float(payload.get("case_timeout", 5.0))
+    signal.signal(signal.SIGALRM, _raise_timeout)
+
+    results = []
+    for case in payload["cases"]:
+        # Sonsuz döngüye giren bir durum diğerlerini engellemesin
+        signal.setitimer(signal.ITIMER_REAL, case_timeout)
+        try:
+            output, error, elapsed = run_once(code_obj, case.get("input"))
+        except CallTimeout:
+            output, error, elapsed = "", f"Timeout ({case_timeout:g}s limit)", case_timeout
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        results.append({"index": case["index"], "output": output, "error": error, "time": elapsed})
+    return {"results": results}
+
+
+MODES = {
+    "run": run_code,
+    "benchmark": run_benchmark,
+    "profile": run_profile,
+    "complexity": run_complexity,
+    "memory": run_memory,
+    "batch": run_batch,
+}
+
+
+def main():
+    payload = json.loads(sys.stdin.read())
+    try:
+        result = MODES[payload["mode"]](payload)
+    except Exception as e:
+        result = {"error": f"Harness failed: {e}"}
+    sys.stdout.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import hashlib
+import re
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+
+import numpy as np
+
+# Mesajdaki kod: çitli bloklar veya kod gibi görünen satırlar
+_FENCE = re.compile(r"```[\w+-]*\n?(.*?)```", re.S)
+_CODE_LINE = re.compile(
+    r"^\s*(def |class |async def |for |while |if |elif |else:|try:|except|return\b|import |from \S+ import|"
+    r"function\b|const |let |var |print\(|console\.)|[;{}]\s*$|^\s{4,}\S"
+)
+_WORD = re.compile(r"\w+", re.U)
+# Anlamı değiştirmeyen dolgu kelimeler; "this/bu", soru kelimeleri, bağlaçlar ve yön bildirenler içerik sayılır
+STOPWORDS = frozenset(
+    "a an the is are am was were be been do does did i me you can could would will please "
+    "of in on at for with by about so just bir ile için mi mı mu mü da de lütfen bana".split()
+)
+# Yalnızca bir tarafta geçerse anlamı tersine çevirir
+NEGATIONS = frozenset("not no never without don t doesn isn aren değil olmadan yok".split())
+# "list to tuple" / "tuple to list": iki yanındaki kelimeler yer değiştirince anlam değişir
+DIRECTIONAL = frozenset("to from into than vs versus".split())
+
+
+def split_message(message: str) -> Tuple[str, str]:
+    """Mesajı (düz metin, kod) olarak ayır"""
+    blocks = _FENCE.findall(message)
+    if blocks:
+        return _FENCE.sub(" ", message), "\n".join(blocks)
+    prose, code = [], []
+    for line in message.splitlines():
+        (code if _CODE_LINE.search(line) else prose).append(line)
+    return "\n".join(prose), "\n".join(code)
+
+
+def code_fingerprint(code: str) -> str:
+    """Boşluk farklarından bağımsız kod özeti; boş kod için boş dizi"""
+    normalized = " ".join(code.split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest() if normalized else ""
+
+
+def content_terms(text: str) -> Tuple[str, ...]:
+    """Sıralı içerik kelimeleri (küçük harf, dolgu kelimeler atılmış, basit çoğul eki kırpılmış)"""
+    terms = []
+    for word in _WORD.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return tuple(terms)
+
+
+def compatible_terms(a: Tuple[str, ...], b: Tuple[str, ...], min_overlap: float) -> bool:
+    """İki sorunun içerik kelimeleri aynı soruyu sorabilir mi?
+
+    Kelime eklemek ("explain this recursion" / "explain recursion") kabul edilir; kelime
+    değiştirmek ("list and tuple" / "list and set"), tek tarafta olumsuzluk veya yön
+    kelimesinin iki yanının yer değiştirmesi kabul edilmez.
+    """
+    left, right = set(a), set(b)
+    if not (left <= right or right <= left):
+        return False
+    union = left | right
+    if union and len(left & right) / len(union) < min_overlap:
+        return False
+    if left & NEGATIONS != right & NEGATIONS:
+        return False
+    directions = {(x, m, y) for x, m, y in zip(b, b[1:], b[2:]) if m in DIRECTIONAL}
+    return not any(x != y and (y, m, x) in directions
+                   for x, m, y in zip(a, a[1:], a[2:]) if m in DIRECTIONAL)
+
+
+class Embedder(Protocol):
+    dim: int
+
+    def embed(self, text: str) -> np.ndarray:
+        """Birim uzunlukta float32 vektör"""
+        ...
+
+
+class HashingEmbedder:
+    """Çevrimdışı CPU gömücüsü: kelime ve karakter n-gram'ları işaretli hash ile `dim` boyuta katlanır"""
+
+    def __init__(self, dim: int = 1024, char_ngrams: Tuple[int, int] = (3, 5)):
+        self.dim = dim
+        self.char_ngrams = char_ngrams
+
+    def _features(self, text: str) -> List[str]:
+        words = _WORD.findall(text.lower())
+        features = [f"w:{w}" for w in words]
+        features += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+        low, high = self.char_ngrams
+        for word in words:
+            # Kelime sınırlarıyla karakter n-gram'ları: ek/çekim farklarına dayanıklı
+            marked = f"<{word}>"
+            for n in range(low, high + 1):
+                features += [marked[i:i + n] for i in range(len(marked) - n + 1)]
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        features = self._features(text)
+        if not features:
+            return vector
+        hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint32, count=len(features))
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, hashes % self.dim, signs)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """Yakın-eş mesajlar için yanıt önbelleği.
+
+    Gömmeler tek bir NumPy matrisinde tutulur; arama tek bir matris-vektör çarpımıyla
+    kosinüs benzerliğidir. Gömme içerik kelimelerinden hesaplanır (dolgu kelimeler, büyük/küçük
+    harf ve noktalama eşleşmeyi bozmaz). Eşik üstü adaylar, en benzerden başlayarak
+    `compatible_terms` ile süzülür: n-gram benzerliği tek başına "list ve tuple" ile "list ve set"
+    sorularını ayıramaz. Girdiler yalnızca aynı kapsamda (ör. aynı kod) eşleşir. Dolunca en uzun
+    süredir kullanılmayan girdi çıkarılır.
+    """
+
+    def __init__(self, embedder: Optional[Embedder] = None, threshold: float = 0.85,
+                 min_overlap: float = 0.6, max_entries: int = 1024, ttl: float = 3600.0):
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold
+        self.min_overlap = min_overlap
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._vectors = np.zeros((max_entries, self.embedder.dim), dtype=np.float32)
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._expires = np.zeros(max_entries, dtype=np.float64)
+        # Kapsamlar hash olarak tutulur: maske tek bir vektörel karşılaştırma
+        self._scopes = np.zeros(max_entries, dtype=np.int64)
+        self._terms: List[Tuple[str, ...]] = [()] * max_entries
+        self._values: List[Any] = [None] * max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _live(self, now: float) -> np.ndarray:
+        return self._expires > now
+
+    def _search(self, vector: np.ndarray, scope: str, now: float, threshold: float,
+                accept: Callable[[Tuple[str, ...]], bool]) -> Tuple[int, float]:
+        """Eşik üstü ve `accept` ile uyumlu en benzer yuva; yoksa (-1, -inf)"""
+        scores = self._vectors @ vector
+        mask = self._live(now) & (self._scopes == hash(scope)) & (scores >= threshold)
+        candidates = np.flatnonzero(mask)
+        for slot in candidates[np.argsort(-scores[candidates], kind="stable")]:
+            if accept(self._terms[slot]):
+                return int(slot), float(scores[slot])
+        return -1, float("-inf")
+
+    def get(self, text: str, scope: str = "") -> Optional[Tuple[Any, float]]:
+        """Eşik üstü en benzer girdi: (değer, benzerlik) ya da None"""
+        if not self.max_entries:
+            return None
+        now = time.monotonic()
+        terms = content_terms(text)
+        slot, score = self._search(self.embedder.embed(" ".join(terms)), scope, now, self.threshold,
+                                   lambda cached: compatible_terms(terms, cached, self.min_overlap))
+        if slot < 0:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._last_used[slot] = now
+        return self._values[slot], score
+
+    def set(self, text: str, value: Any, scope: str = ""):
+        if not self.max_entries:
+            return
+        now = time.monotonic()
+        terms = content_terms(text)
+        vector = self.embedder.embed(" ".join(terms))
+        slot, _ = self._search(vector, scope, now, 0.999, lambda cached: cached == terms)
+        if slot < 0:
+            # Aynı içerik kelimeleriyle girdi yoksa boş/süresi dolmuş yuva, yoksa LRU yuvası
+            free = np.flatnonzero(~self._live(now))
+            if free.size:
+                slot = int(free[0])
+            else:
+                slot = int(np.argmin(self._last_used))
+                self.evictions += 1
+        self._vectors[slot] = vector
+        self._scopes[slot] = hash(scope)
+        self._terms[slot] = terms
+        self._values[slot] = value
+        self._last_used[slot] = now
+        self._expires[slot] = now + self.ttl
+
+    def clear(self):
+        self._expires[:] = 0
+        self._values = [None] * self.max_entries
+        self._terms = [()] * self.max_entries
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": int(self._live(time.monotonic()).sum()),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "min_overlap": self.min_overlap,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
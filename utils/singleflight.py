@@ -0,0 +1,59 @@
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict
+
+
+def content_hash(*parts: Any) -> str:
+    """İstek içeriğinden kararlı anahtar üret"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SingleFlight:
+    """Aynı anahtarla eşzamanlı gelen işleri tek bir hesaplamada birleştirir"""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+        self.executions = 0
+        self.shared = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """İş zaten çalışıyorsa sonucunu bekle, yoksa başlat"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+            self.executions += 1
+        else:
+            self.shared += 1
+
+        self._waiters[key] += 1
+        try:
+            # shield: bir bekleyenin iptali diğerlerinin sonucunu etkilemesin
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._waiters.get(key) == 1:
+                # Son bekleyen de ayrıldı, hesaplamayı durdur
+                task.cancel()
+            raise
+        finally:
+            if key in self._waiters and self._inflight.get(key) is task:
+                self._waiters[key] -= 1
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            self._waiters.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._inflight),
+            "executions": self.executions,
+            "shared": self.shared
+        }
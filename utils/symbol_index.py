@@ -0,0 +1,413 @@
+import ast
+import gzip
+import json
+import os
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Çözümleme sırasında yeniden dışa aktarım (from x import y) ve taban sınıf zinciri sınırı
+MAX_RESOLVE_DEPTH = 8
+
+
+def module_name(path: str) -> str:
+    """Dosya yolundan modül adı: "app/services.py" -> "app.services", "pkg/__init__.py" -> "pkg" """
+    path = path.replace("\\", "/").lstrip("./")
+    if path.endswith(".py"):
+        path = path[:-3]
+    parts = [p for p in path.split("/") if p]
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def _dotted(node: ast.AST) -> Optional[str]:
+    """Çağrılan ifadenin noktalı adı (a.b.c); isim zinciri değilse None"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+class _Extractor(ast.NodeVisitor):
+    """Tek dosyanın tanımları, importları ve çağrıları (çözümlenmemiş ham adlarla)"""
+
+    def __init__(self, module: str, is_package: bool):
+        self.module = module
+        self.package = module if is_package else module.rpartition(".")[0]
+        self.defs: List[List[Any]] = []      # [qualname, kind, line, end_line, bases]
+        self.imports: Dict[str, str] = {}    # yerel ad -> hedef noktalı ad
+        self.star_imports: List[str] = []
+        self.calls: List[List[Any]] = []     # [çağıran qualname, ham ad, satır]
+        # Örnek türleri: self.x = Sınıf(...) -> {sınıf: {x: "Sınıf"}}; yerel değişkenler fonksiyon başına
+        self.attrs: Dict[str, Dict[str, str]] = {}
+        self._scope: List[Tuple[str, str]] = []  # (ad, tür)
+        self._locals: List[Dict[str, str]] = []
+
+    def _qualname(self, name: str) -> str:
+        return ".".join([self.module] + [n for n, _ in self._scope] + [name])
+
+    @property
+    def _caller(self) -> str:
+        return ".".join([self.module] + [n for n, _ in self._scope]) if self._scope else self.module
+
+    def _define(self, node: ast.AST, kind: str, bases: List[str]):
+        start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+        self.defs.append([self._qualname(node.name), kind, start, node.end_lineno, bases])
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        kind = "method" if self._scope and self._scope[-1][1] == "class" else "function"
+        self._define(node, kind, [])
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        # Tür ipucu olan parametreler yerel örnek türü sayılır (def f(repo: Repository))
+        arguments = node.args.posonlyargs + node.args.args + node.args.kwonlyargs
+        local_types = {a.arg: _dotted(a.annotation) for a in arguments if a.annotation is not None}
+        self._scope.append((node.name, "function"))
+        self._locals.append({name: kind for name, kind in local_types.items() if kind})
+        for child in node.body:
+            self.visit(child)
+        self._locals.pop()
+        self._scope.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self._define(node, "class", [b for b in (_dotted(base) for base in node.bases) if b])
+        self._scope.append((node.name, "class"))
+        for child in node.body:
+            self.visit(child)
+        self._scope.pop()
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            if alias.asname:
+                self.imports[alias.asname] = alias.name
+            else:
+                # "import a.b" yerelde "a" adını bağlar
+                first = alias.name.split(".")[0]
+                self.imports[first] = first
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        base = node.module or ""
+        if node.level:
+            package = self.package.split(".") if self.package else []
+            package = package[:len(package) - (node.level - 1)] if node.level > 1 else package
+            base = ".".join([p for p in package + ([node.module] if node.module else []) if p])
+        for alias in node.names:
+            if alias.name == "*":
+                self.star_imports.append(base)
+            else:
+                self.imports[alias.asname or alias.name] = f"{base}.{alias.name}" if base else alias.name
+
+    def visit_Assign(self, node: ast.Assign):
+        constructor = _dotted(node.value.func) if isinstance(node.value, ast.Call) else None
+        if constructor:
+            for target in node.targets:
+                if isinstance(target, ast.Name) and self._locals:
+                    self._locals[-1][target.id] = constructor
+                elif (isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)
+                      and target.value.id == "self" and len(self._scope) >= 2 and self._scope[-2][1] == "class"):
+                    owner = ".".join([self.module] + [n for n, _ in self._scope[:-1]])
+                    self.attrs.setdefault(owner, {})[target.attr] = constructor
+        self.generic_visit(node)
+
+    def _call_name(self, func: ast.AST) -> Optional[str]:
+        """Ham çağrı adı; örnek üzerinden çağrılar "Sınıf#metot" biçiminde"""
+        name = _dotted(func)
+        if name:
+            first, _, rest = name.partition(".")
+            if rest and self._locals and first in self._locals[-1]:
+                return f"{self._locals[-1][first]}#{rest}"
+            return name
+        # Sınıf(...).metot(...)
+        parts = []
+        while isinstance(func, ast.Attribute):
+            parts.append(func.attr)
+            func = func.value
+        if parts and isinstance(func, ast.Call):
+            constructor = _dotted(func.func)
+            if constructor:
+                return f"{constructor}#{'.'.join(reversed(parts))}"
+        return None
+
+    def visit_Call(self, node: ast.Call):
+        name = self._call_name(node.func)
+        if name:
+            self.calls.append([self._caller, name, node.lineno])
+        self.generic_visit(node)
+
+
+def extract_symbols(path: str, source: str) -> Dict[str, Any]:
+    """Dosya kaydı: {"module", "defs", "imports", "star_imports", "attrs", "calls", "error"}"""
+    module = module_name(path)
+    record = {"module": module, "defs": [], "imports": {}, "star_imports": [], "attrs": {}, "calls": [],
+              "error": None}
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+    extractor = _Extractor(module, path.replace("\\", "/").endswith("__init__.py"))
+    extractor.visit(tree)
+    record.update(defs=extractor.defs, imports=extractor.imports, star_imports=extractor.star_imports,
+                  attrs=extractor.attrs, calls=extractor.calls)
+    return record
+
+
+class SymbolIndex:
+    """Proje genelinde tanım/referans/import dizini ve çağrı grafiği (yalnızca Python dosyaları).
+
+    Dosya değişince yalnızca o dosyanın AST'si yeniden çıkarılır; modüller arası
+    bağlama ham çağrılar üzerinde tek doğrusal geçiştir. Sorgular önceden kurulmuş
+    sözlüklerden okunur.
+    """
+
+    def __init__(self):
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.version = 0
+        self._defs: Dict[str, Dict[str, Any]] = {}
+        self._modules: Dict[str, str] = {}  # modül -> yol
+        self._by_name: Dict[str, List[str]] = {}
+        self._attrs: Dict[str, Dict[str, str]] = {}
+        self._callees: Dict[str, List[Dict[str, Any]]] = {}
+        self._callers: Dict[str, List[Dict[str, Any]]] = {}
+        self.unresolved = 0
+
+    # --- güncelleme ---
+    def update(self, files: Dict[str, str]) -> int:
+        """Dosyaları yeniden çıkar; Python dışı dosyalar yok sayılır. Dizinlenen dosya sayısı"""
+        changed = 0
+        for path, source in files.items():
+            if path.endswith(".py"):
+                self.files[path] = extract_symbols(path, source)
+                changed += 1
+        if changed:
+            self._link()
+        return changed
+
+    def remove(self, paths: Iterable[str]):
+        removed = [path for path in paths if self.files.pop(path, None) is not None]
+        if removed:
+            self._link()
+
+    def _link(self):
+        self._defs, self._modules, self._by_name, self._attrs = {}, {}, {}, {}
+        for path, record in self.files.items():
+            self._modules[record["module"]] = path
+            self._attrs.update(record.get("attrs", {}))
+            for qualname, kind, line, end_line, bases in record["defs"]:
+                self._defs[qualname] = {"symbol": qualname, "kind": kind, "path": path, "line": line,
+                                        "end_line": end_line, "bases": bases, "module": record["module"]}
+                self._by_name.setdefault(qualname.rsplit(".", 1)[-1], []).append(qualname)
+
+        callees: Dict[str, List[Dict[str, Any]]] = {}
+        callers: Dict[str, List[Dict[str, Any]]] = {}
+        unresolved = 0
+        for path, record in self.files.items():
+            for caller, raw, line in record["calls"]:
+                target, external = self._resolve(record, caller, raw)
+                if target is None:
+                    unresolved += 1
+                    continue
+                callees.setdefault(caller, []).append({"symbol": target, "path": path, "line": line,
+                                                       "external": external})
+                if not external:
+                    callers.setdefault(target, []).append({"symbol": caller, "path": path, "line": line})
+        self._callees, self._callers, self.unresolved = callees, callers, unresolved
+        self.version += 1
+
+    # --- çözümleme ---
+    def _resolve(self, record: Dict[str, Any], caller: str, raw: str) -> Tuple[Optional[str], bool]:
+        """Ham çağrı adını tanım adına çevir: (hedef, harici mi); çözülemezse (None, False)"""
+        if "#" in raw:
+            # Örnek üzerinden çağrı: önce sınıf, sonra üye çözülür
+            constructor, _, member = raw.partition("#")
+            cls, external = self._resolve(record, caller, constructor)
+            if cls is None:
+                return None, False
+            if external:
+                return f"{cls}.{member}", True
+            found = self._member(cls, member, 0)
+            return (found, False) if found else (None, False)
+
+        first, _, rest = raw.partition(".")
+        module = record["module"]
+
+        if first in ("self", "cls") and rest:
+            owner = self._enclosing_class(caller)
+            if owner:
+                found = self._member(owner, rest, 0)
+                if found is None and "." in rest:
+                    # self.depo.kaydet(): __init__ içinde atanan örneğin türü üzerinden
+                    found = self._attribute_member(owner, rest, 0)
+                return (found, False) if found else (None, False)
+
+        # İç içe kapsamlar: çağıranın kendi ve üst fonksiyonlarındaki tanımlar (sınıf gövdesi görünmez)
+        scope = caller
+        while scope and scope != module:
+            candidate = f"{scope}.{raw}"
+            if candidate in self._defs and self._defs.get(scope, {}).get("kind") != "class":
+                return candidate, False
+            scope = scope.rpartition(".")[0]
+        if f"{module}.{raw}" in self._defs:
+            return f"{module}.{raw}", False
+
+        if first in record["imports"]:
+            target = record["imports"][first] + (f".{rest}" if rest else "")
+            found = self._canonical(target, 0)
+            return (found, False) if found else (target, True)
+        for star in record["star_imports"]:
+            found = self._canonical(f"{star}.{raw}", 0)
+            if found:
+                return found, False
+        return None, False
+
+    def _enclosing_class(self, caller: str) -> Optional[str]:
+        scope = caller
+        while scope:
+            if self._defs.get(scope, {}).get("kind") == "class":
+                return scope
+            scope = scope.rpartition(".")[0]
+        return None
+
+    def _member(self, cls: str, rest: str, depth: int) -> Optional[str]:
+        """Sınıf üyesi; bulunamazsa taban sınıflarda aranır"""
+        if f"{cls}.{rest}" in self._defs:
+            return f"{cls}.{rest}"
+        if depth >= MAX_RESOLVE_DEPTH:
+            return None
+        definition = self._defs.get(cls)
+        record = self.files.get(definition["path"]) if definition else None
+        for base in (definition or {}).get("bases", []):
+            resolved, external = self._resolve(record, cls, base) if record else (None, False)
+            if resolved and not external:
+                found = self._member(resolved, rest, depth + 1)
+                if found:
+                    return found
+        return None
+
+    def _attribute_member(self, cls: str, rest: str, depth: int) -> Optional[str]:
+        attribute, _, member = rest.partition(".")
+        definition = self._defs.get(cls)
+        constructor = self._attrs.get(cls, {}).get(attribute)
+        if constructor is None or definition is None or depth >= MAX_RESOLVE_DEPTH:
+            return None
+        target, external = self._resolve(self.files[definition["path"]], cls, constructor)
+        if target is None or external or self._defs.get(target, {}).get("kind") != "class":
+            return None
+        return self._member(target, member, depth + 1) or (
+            self._attribute_member(target, member, depth + 1) if "." in member else None)
+
+    def _canonical(self, target: str, depth: int) -> Optional[str]:
+        """Noktalı hedefi tanıma çevir; paket üzerinden yeniden dışa aktarılan adları izler"""
+        if target in self._defs:
+            return target
+        if depth >= MAX_RESOLVE_DEPTH:
+            return None
+        parts = target.split(".")
+        # En uzun dizinlenmiş modül öneki
+        for cut in range(len(parts) - 1, 0, -1):
+            module = ".".join(parts[:cut])
+            path = self._modules.get(module)
+            if path is None:
+                continue
+            record = self.files[path]
+            name, rest = parts[cut], parts[cut + 1:]
+            if name in record["imports"]:
+                return self._canonical(".".join([record["imports"][name]] + rest), depth + 1)
+            for star in record["star_imports"]:
+                found = self._canonical(".".join([star, name] + rest), depth + 1)
+                if found:
+                    return found
+            return None
+        return None
+
+    def resolve_name(self, path: str, name: str) -> Optional[str]:
+        """Bir dosyada görülen adın modül düzeyindeki çözümü (ör. diyagram etiketleri için)"""
+        record = self.files.get(path)
+        if record is None:
+            return None
+        return self._resolve(record, record["module"], name)[0]
+
+    # --- sorgular ---
+    def lookup(self, symbol: str) -> List[str]:
+        """Tam ad, kısa ad veya "Sınıf.metot" soneki ile eşleşen tanımlar"""
+        if symbol in self._defs:
+            return [symbol]
+        short = symbol.rsplit(".", 1)[-1]
+        candidates = self._by_name.get(short, [])
+        if "." in symbol:
+            candidates = [c for c in candidates if c.endswith(f".{symbol}")]
+        return sorted(candidates)
+
+    def definition(self, symbol: str) -> Optional[Dict[str, Any]]:
+        definition = self._defs.get(symbol)
+        return {k: v for k, v in definition.items() if k != "bases"} if definition else None
+
+    def callers(self, symbol: str) -> List[Dict[str, Any]]:
+        return self._callers.get(symbol, [])
+
+    def callees(self, symbol: str) -> List[Dict[str, Any]]:
+        return self._callees.get(symbol, [])
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        query = query.lower()
+        matches = [self.definition(name) for name in self._defs if query in name.lower()]
+        return sorted(matches, key=lambda d: (len(d["symbol"]), d["symbol"]))[:limit]
+
+    def call_graph(self, root: str, direction: str = "callees", depth: int = 3,
+                   max_nodes: int = 60, include_external: bool = False) -> Dict[str, Any]:
+        """Kökten BFS ile çağrı alt grafiği: {"nodes": {ad: tanım}, "edges": [[çağıran, çağrılan]], "truncated"}"""
+        edges_of = self.callers if direction == "callers" else self.callees
+        nodes: Dict[str, Dict[str, Any]] = {root: self.definition(root) or {"symbol": root, "external": True}}
+        edges, seen_edges, truncated = [], set(), False
+        queue = deque([(root, 0)])
+        while queue:
+            symbol, level = queue.popleft()
+            if level >= depth:
+                continue
+            for edge in edges_of(symbol):
+                other = edge["symbol"]
+                if edge.get("external") and not include_external:
+                    continue
+                pair = (other, symbol) if direction == "callers" else (symbol, other)
+                if pair in seen_edges:
+                    continue
+                if other not in nodes:
+                    if len(nodes) >= max_nodes:
+                        truncated = True
+                        continue
+                    nodes[other] = self.definition(other) or {"symbol": other, "external": True}
+                    queue.append((other, level + 1))
+                seen_edges.add(pair)
+                edges.append(list(pair))
+        return {"root": root, "direction": direction, "nodes": nodes, "edges": edges, "truncated": truncated}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "files": len(self.files),
+            "definitions": len(self._defs),
+            "call_edges": sum(len(edges) for edges in self._callees.values()),
+            "unresolved_calls": self.unresolved,
+            "parse_errors": sum(1 for record in self.files.values() if record["error"]),
+            "version": self.version,
+        }
+
+    # --- kalıcılık ---
+    def save(self, path: str):
+        temporary = path + ".tmp"
+        with gzip.open(temporary, "wt", encoding="utf-8") as f:
+            json.dump({"files": self.files}, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temporary, path)
+
+    def load(self, path: str) -> bool:
+        if not os.path.exists(path):
+            return False
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            self.files = json.load(f)["files"]
+        self._link()
+        return True
@@ -0,0 +1,43 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """Boyutu sınırlı LRU önbellek; ttl verilirse girdiler bu süre sonunda geçersizleşir"""
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or (self.ttl is not None and time.monotonic() - entry[1] > self.ttl):
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any):
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}